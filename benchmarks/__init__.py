@@ -0,0 +1,6 @@
+"""
+Scaling benchmarks for pdf_to_excel.py.
+
+- ``synthetic_statements``: generates statements for each bank in ``BANK_CONFIGS`` (text and rasterized).
+- ``run_benchmarks``: converts them with ``convert_statement()`` and stores stage timings as JSON.
+"""
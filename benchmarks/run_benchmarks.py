@@ -0,0 +1,171 @@
+"""
+Time pdf_to_excel.py on synthetic statements and store the results as JSON.
+
+Each case (bank x pages x text/rasterized) is converted with ``convert_statement()`` in this process;
+the per-stage wall/CPU/peak RSS come from the converter's own metrics (see ``RunMetrics``). With
+``--repeat N`` the fastest run is kept. Results go to ``benchmarks/results/<commit>.json`` by default, and
+``--compare <older.json>`` prints the change per case, so scaling claims can be checked across commits.
+
+Example:
+  python -m benchmarks.run_benchmarks --sizes 1,10,100 --banks BBVA,Santander
+  python -m benchmarks.run_benchmarks --sizes 10 --rasterized --compare benchmarks/results/abc1234.json
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.synthetic_statements import DEFAULT_SIZES, generate_suite, load_pdf_to_excel, parse_list
+
+
+def _repo_root() -> str:
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _git_commit() -> str:
+    try:
+        out = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=_repo_root(),
+            capture_output=True, text=True, check=True,
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def run_case(converter, case: dict, repeat: int = 1, options: dict = None, verbose: bool = False) -> dict:
+    """
+    Convert one generated statement ``repeat`` times and keep the fastest run.
+
+    Returns:
+        Dictionary with the case, outcome (bank, rows, error) and the fastest run's metrics
+    """
+    best = None
+    with tempfile.TemporaryDirectory(prefix='pdf_to_excel_bench_') as tmp_dir:
+        run_options = dict(options or {}, output_excel=os.path.join(tmp_dir, 'out.xlsx'))
+        for _ in range(max(1, repeat)):
+            output = io.StringIO()
+            with contextlib.ExitStack() as stack:
+                if not verbose:
+                    stack.enter_context(contextlib.redirect_stdout(output))
+                    stack.enter_context(contextlib.redirect_stderr(output))
+                result = converter.convert_statement(case['path'], run_options)
+            if best is None or result.metrics['total']['wall_s'] < best.metrics['total']['wall_s']:
+                best = result
+    total = best.metrics['total']
+    return {
+        'file': os.path.basename(case['path']),
+        'bank': case['bank'],
+        'pages': case['pages'],
+        'rasterized': case['rasterized'],
+        'expected_movements': case.get('movements'),
+        'detected_bank': best.bank,
+        'used_ocr': best.used_ocr,
+        'movement_rows': best.movement_rows,
+        'excel_created': best.excel_created,
+        'error_type': best.error_type,
+        'runs': max(1, repeat),
+        'wall_s': total['wall_s'],
+        'cpu_s': total['cpu_s'],
+        'peak_rss_growth_mb': total.get('peak_rss_growth_mb'),
+        'process_peak_rss_mb': total.get('process_peak_rss_mb'),
+        'seconds_per_page': total['wall_s'] / max(case['pages'], 1),
+        'stages': best.metrics['stages'],
+        'ocr_pages': len(best.metrics.get('ocr_pages') or []),
+    }
+
+
+def _case_key(case: dict) -> tuple:
+    return (case['bank'], case['pages'], case['rasterized'])
+
+
+def print_results(results: list, previous: dict = None):
+    """Table of wall time per case; with ``previous`` (an older results JSON), also the ratio new/old."""
+    old = {_case_key(c): c for c in (previous or {}).get('cases', [])}
+    header = f"{'case':<28} {'wall':>9} {'s/page':>8} {'rows':>11}"
+    if previous:
+        header += f" {'old wall':>9} {'new/old':>8}"
+    print(header)
+    print('-' * len(header))
+    for case in results:
+        name = f"{case['bank']} {case['pages']}p{' raster' if case['rasterized'] else ''}"
+        rows = f"{case['movement_rows']}/{case['expected_movements']}"
+        line = f"{name:<28} {case['wall_s']:>8.2f}s {case['seconds_per_page']:>8.3f} {rows:>11}"
+        if previous:
+            before = old.get(_case_key(case))
+            if before:
+                line += f" {before['wall_s']:>8.2f}s {case['wall_s'] / max(before['wall_s'], 1e-9):>7.2f}x"
+            else:
+                line += f" {'-':>9} {'-':>8}"
+        if case['error_type'] and case['error_type'] != 'Validation error':
+            line += f"  ❌ {case['error_type']}"
+        print(line, flush=True)
+
+
+def main() -> int:
+    root = _repo_root()
+    ap = argparse.ArgumentParser(description='Scaling benchmark for pdf_to_excel.py on synthetic statements')
+    ap.add_argument('--banks', help='Comma-separated BANK_CONFIGS keys (default: all)')
+    ap.add_argument('--sizes', default=','.join(str(s) for s in DEFAULT_SIZES), help='Comma-separated page counts')
+    ap.add_argument('--rasterized', action='store_true', help='Also run image-only variants (needs Tesseract)')
+    ap.add_argument('--repeat', type=int, default=1, help='Runs per case; the fastest is kept (default: 1)')
+    ap.add_argument('--ocr-workers', type=int, help='Passed to convert_statement() (default: CPU count)')
+    ap.add_argument('--data-dir', default=os.path.join(root, 'benchmarks', '_generated'),
+                    help='Where generated statements are kept between runs')
+    ap.add_argument('--output', help='Results JSON (default: benchmarks/results/<commit>.json)')
+    ap.add_argument('--compare', help='Older results JSON to compare against')
+    ap.add_argument('--verbose', action='store_true', help='Show the converter output')
+    args = ap.parse_args()
+
+    converter = load_pdf_to_excel()
+    banks = parse_list(args.banks)
+    sizes = parse_list(args.sizes, int)
+    cases = generate_suite(args.data_dir, banks, sizes)
+    if args.rasterized:
+        if not (converter.TESSERACT_AVAILABLE and converter.configure_tesseract()):
+            print('[WARNING] Tesseract not available: rasterized cases will not exercise OCR', flush=True)
+        cases += generate_suite(args.data_dir, banks, sizes, rasterized=True)
+
+    options = {'no_ocr_cache': True}
+    if args.ocr_workers:
+        options['ocr_workers'] = args.ocr_workers
+
+    results = []
+    for idx, case in enumerate(cases, 1):
+        print(f"[{idx}/{len(cases)}] {os.path.basename(case['path'])}...", flush=True)
+        results.append(run_case(converter, case, repeat=args.repeat, options=options, verbose=args.verbose))
+
+    commit = _git_commit()
+    report = {
+        'commit': commit,
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'cases': results,
+    }
+    output = args.output or os.path.join(root, 'benchmarks', 'results', f'{commit}.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    previous = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            previous = json.load(f)
+        print(f"\nComparing with {previous.get('commit', '?')} ({args.compare})")
+    print()
+    print_results(results, previous)
+    print(f'\n✅ Results written to -> {os.path.abspath(output)}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
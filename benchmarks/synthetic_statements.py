@@ -0,0 +1,322 @@
+"""
+Generate synthetic bank statements for benchmarking pdf_to_excel.py.
+
+Each statement follows one bank in ``BANK_CONFIGS``: a header with the bank name, RFC and period,
+a summary block, the bank's ``movements_start`` marker, movement rows whose words sit inside that
+bank's ``columns`` ranges, and the ``movements_end`` marker after the last row. Amounts come from a
+seeded random generator, so the same (bank, pages, seed) always gives the same PDF.
+
+Rasterized variants replace every page with a grayscale image of itself (no text layer), which sends
+the statement through the Tesseract OCR path.
+
+Example:
+  python -m benchmarks.synthetic_statements --out-dir benchmarks/_generated --sizes 1,10 --banks BBVA,Banorte
+  python -m benchmarks.synthetic_statements --sizes 10 --rasterized
+"""
+
+import argparse
+import os
+import random
+import sys
+import unicodedata
+
+import fitz  # PyMuPDF
+
+PAGE_WIDTH = 612.0   # US Letter, PDF points
+PAGE_HEIGHT = 792.0
+FONT_SIZE = 7.0
+ROW_STEP = 11.0
+TOP_MARGIN = 50.0
+BOTTOM_MARGIN = 50.0
+DEFAULT_SIZES = (1, 10, 100, 1000)
+DEFAULT_RASTER_ZOOM = 3.0  # ~216 DPI, enough for Tesseract on 7 pt text
+
+# First header line per bank: must hit that bank's BANK_KEYWORDS in bank detection
+BANK_HEADERS = {
+    'BBVA': 'GRUPO FINANCIERO BBVA MEXICO',
+    'Santander': 'BANCO SANTANDER MEXICO',
+    'Scotiabank': 'SCOTIABANK INVERLAT',
+    'Inbursa': 'BANCO INBURSA',
+    'INTERCAM': 'INTERCAM BANCO',
+    'Konfio': 'KONFIO',
+    'Clara': 'CLARA',
+    'Banregio': 'BANREGIO',
+    'Banorte': 'BANORTE',
+    'Banbajío': 'BANCO DEL BAJIO',
+    'Banamex': 'CITIBANAMEX',
+    'HSBC': 'HSBC MEXICO',
+    'Base': 'BANCO BASE',
+    'Hey': 'HEY BANCO',
+    'Mercury': 'MERCURY',
+}
+
+# Date text per bank, formatted with day=<1..31> (the main loop's date_pattern for that bank)
+DATE_FORMATS = {
+    'Banregio': '{day:02d}',
+    'Hey': '{day:02d}',
+    'HSBC': '{day:02d}',
+    'Clara': '{day:02d} ENE',
+    'INTERCAM': '{day}',
+    'Base': '{day:02d}/01/2025',
+    'Banorte': '{day:02d}-ENE-25',
+    'Banbajío': '{day} ENE',
+    'Mercury': 'Jan {day:02d}',
+    'Konfio': '{day:02d} ENE 2025',
+    'Inbursa': 'ENE {day:02d}',
+}
+DEFAULT_DATE_FORMAT = '{day:02d}/ENE'
+
+DESCRIPTIONS = [
+    'SPEI RECIBIDO CLIENTE {ref}',
+    'PAGO PROVEEDOR REF {ref}',
+    'COMISION MANEJO DE CUENTA',
+    'DEPOSITO EN EFECTIVO SUC {ref}',
+    'TRASPASO ENTRE CUENTAS {ref}',
+    'IVA COMISION',
+    'PAGO DE NOMINA QNA {ref}',
+    'DOMICILIACION SERVICIO {ref}',
+]
+
+
+def _repo_root() -> str:
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_pdf_to_excel():
+    """Import pdf_to_excel.py from the repository root (same module the CLI runs)."""
+    root = _repo_root()
+    if root not in sys.path:
+        sys.path.insert(0, root)
+    import pdf_to_excel
+    return pdf_to_excel
+
+
+def statement_file_name(bank: str, pages: int, rasterized: bool = False) -> str:
+    """e.g. ``banbajio_0100p.pdf`` / ``bbva_0010p_raster.pdf``"""
+    slug = unicodedata.normalize('NFKD', bank).encode('ascii', 'ignore').decode('ascii').lower()
+    return f"{slug}_{pages:04d}p{'_raster' if rasterized else ''}.pdf"
+
+
+FIRST_ROWS_Y = TOP_MARGIN + 13 * ROW_STEP  # below the header, summary block and movements_start marker
+
+
+def movement_count(pages: int) -> int:
+    """Number of movement rows in a ``pages``-page statement (the last page keeps two rows for the end marker)."""
+    rows_per_page = int((PAGE_HEIGHT - BOTTOM_MARGIN - TOP_MARGIN) / ROW_STEP) + 1
+    rows_first_page = int((PAGE_HEIGHT - BOTTOM_MARGIN - FIRST_ROWS_Y) / ROW_STEP) + 1
+    return rows_first_page + (pages - 1) * rows_per_page - 2
+
+
+def _format_amount(value: float, bank: str, kind: str) -> str:
+    # Mercury shares one Amount column: negative = cargo, positive = abono
+    if bank == 'Mercury':
+        return f'-${value:,.2f}' if kind == 'cargos' else f'${value:,.2f}'
+    return f'{value:,.2f}'
+
+
+class _PageWriter:
+    """Places words on one page; columns are scaled down when calibrated in OCR coordinates."""
+
+    font = None
+    char_widths = {}
+
+    def __init__(self, page, column_scale: float):
+        if _PageWriter.font is None:
+            _PageWriter.font = fitz.Font('helv')
+        self.page = page
+        self.column_scale = column_scale
+        # One TextWriter per page: far faster than one insert_text() call per word on 1,000-page files
+        self.writer = fitz.TextWriter(page.rect)
+
+    def text(self, x: float, y: float, text: str):
+        self.writer.append((x, y), text, font=self.font, fontsize=FONT_SIZE)
+
+    def in_column(self, column: tuple, y: float, text: str, align: str = 'left'):
+        x0, x1 = column[0] * self.column_scale, column[1] * self.column_scale
+        if align == 'left':
+            x = x0
+        else:
+            width = sum(self._char_width(c) for c in text)
+            x = max((x0 + x1) / 2.0 - width / 2.0, 0.0)
+        self.text(x, y, text)
+
+    def _char_width(self, char: str) -> float:
+        width = self.char_widths.get(char)
+        if width is None:
+            width = self.char_widths[char] = self.font.text_length(char, fontsize=FONT_SIZE)
+        return width
+
+    def close(self):
+        self.writer.write_text(self.page)
+
+
+def generate_statement(bank: str, pages: int, out_path: str, rasterized: bool = False, seed: int = 0,
+                       raster_zoom: float = DEFAULT_RASTER_ZOOM) -> dict:
+    """
+    Write a synthetic ``pages``-page statement for ``bank`` to ``out_path``.
+
+    Args:
+        bank: Key of BANK_CONFIGS
+        pages: Exact number of pages of the generated PDF
+        out_path: Output PDF path
+        rasterized: If True, pages are images only (OCR path)
+        seed: Seed for descriptions and amounts
+        raster_zoom: Render scale used for rasterized pages
+
+    Returns:
+        Dictionary with path, bank, pages, rasterized and the expected movements / totals
+    """
+    converter = load_pdf_to_excel()
+    bank_config = converter.BANK_CONFIGS[bank]
+    columns = bank_config['columns']
+    # Banks whose "columns" exceed the page width are calibrated in OCR coordinates (HSBC)
+    max_x = max(end for _, end in columns.values())
+    column_scale = 1.0 / converter.OCR_COORDINATE_SCALE if max_x > PAGE_WIDTH else 1.0
+    rng = random.Random(f'{bank}:{pages}:{seed}')
+    date_format = DATE_FORMATS.get(bank, DEFAULT_DATE_FORMAT)
+
+    n_movements = movement_count(pages)
+
+    # Movements first, so the summary block can show the real totals
+    saldo_inicial = round(rng.uniform(10000, 500000), 2)
+    saldo = saldo_inicial
+    movements = []
+    for i in range(n_movements):
+        kind = 'cargos' if rng.random() < 0.6 else 'abonos'
+        amount = round(rng.uniform(50, 25000), 2)
+        saldo = round(saldo - amount if kind == 'cargos' else saldo + amount, 2)
+        movements.append({
+            'fecha': date_format.format(day=min(31, 1 + i * 31 // max(n_movements, 1))),
+            'descripcion': rng.choice(DESCRIPTIONS).format(ref=rng.randint(100000, 999999)),
+            'kind': kind,
+            'amount': amount,
+            'saldo': saldo,
+        })
+    total_cargos = round(sum(m['amount'] for m in movements if m['kind'] == 'cargos'), 2)
+    total_abonos = round(sum(m['amount'] for m in movements if m['kind'] == 'abonos'), 2)
+    n_cargos = sum(1 for m in movements if m['kind'] == 'cargos')
+
+    doc = fitz.open()
+    page = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+    writer = _PageWriter(page, column_scale)
+    header_lines = [
+        BANK_HEADERS.get(bank, bank.upper()),
+        'ESTADO DE CUENTA',
+        'Periodo DEL 01/ENE/2025 AL 31/ENE/2025',
+        'RFC XAXX010101000',
+        'EMPRESA DE PRUEBA SA DE CV',
+        '',
+        f'Saldo Anterior {saldo_inicial:,.2f}',
+        f'Depósitos / Abonos (+) {n_movements - n_cargos} {total_abonos:,.2f}',
+        f'Retiros / Cargos (-) {n_cargos} {total_cargos:,.2f}',
+        f'Saldo Final (+) {saldo:,.2f}',
+        '',
+        bank_config['movements_start'],
+    ]
+    y = TOP_MARGIN
+    for line in header_lines:
+        if line:
+            writer.text(40, y, line)
+        y += ROW_STEP
+    for name, column in columns.items():
+        writer.in_column(column, y, name.upper())
+
+    y = FIRST_ROWS_Y
+    for movement in movements:
+        if y > PAGE_HEIGHT - BOTTOM_MARGIN:
+            writer.close()
+            page = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+            writer = _PageWriter(page, column_scale)
+            y = TOP_MARGIN
+        writer.in_column(columns['fecha'], y, movement['fecha'])
+        writer.in_column(columns['descripcion'], y, movement['descripcion'])
+        writer.in_column(columns[movement['kind']], y, _format_amount(movement['amount'], bank, movement['kind']), align='center')
+        if 'saldo' in columns:
+            writer.in_column(columns['saldo'], y, f"{movement['saldo']:,.2f}", align='center')
+        y += ROW_STEP
+    # Several banks only accept the end marker when it is followed by the period totals
+    writer.text(40, y + ROW_STEP, f"{bank_config['movements_end']} {total_cargos:,.2f} {total_abonos:,.2f} {saldo:,.2f}")
+    writer.close()
+
+    if rasterized:
+        doc = _rasterize(doc, raster_zoom)
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    doc.save(out_path, garbage=3, deflate=True)
+    page_count = len(doc)
+    doc.close()
+    return {
+        'path': os.path.abspath(out_path),
+        'bank': bank,
+        'pages': page_count,
+        'rasterized': rasterized,
+        'movements': n_movements,
+        'total_cargos': total_cargos,
+        'total_abonos': total_abonos,
+    }
+
+
+def _rasterize(doc, zoom: float):
+    """Return a new document whose pages are grayscale images of ``doc`` (no text layer)."""
+    raster = fitz.open()
+    matrix = fitz.Matrix(zoom, zoom)
+    for page in doc:
+        pix = page.get_pixmap(matrix=matrix, colorspace=fitz.csGRAY)
+        new_page = raster.new_page(width=page.rect.width, height=page.rect.height)
+        new_page.insert_image(new_page.rect, pixmap=pix)
+    doc.close()
+    return raster
+
+
+def generate_suite(out_dir: str, banks: list = None, sizes: list = None, rasterized: bool = False,
+                   seed: int = 0, overwrite: bool = False) -> list:
+    """
+    Generate one statement per (bank, size), reusing files that already exist unless ``overwrite``.
+
+    Returns:
+        List of generate_statement() dictionaries (existing files are described without regenerating)
+    """
+    converter = load_pdf_to_excel()
+    banks = banks or list(converter.BANK_CONFIGS.keys())
+    sizes = sizes or list(DEFAULT_SIZES)
+    cases = []
+    for bank in banks:
+        if bank not in converter.BANK_CONFIGS:
+            raise ValueError(f"Unknown bank: {bank} (expected one of {', '.join(converter.BANK_CONFIGS)})")
+        for pages in sizes:
+            out_path = os.path.join(out_dir, statement_file_name(bank, pages, rasterized))
+            if os.path.isfile(out_path) and not overwrite:
+                with fitz.open(out_path) as existing:
+                    page_count = len(existing)
+                cases.append({'path': os.path.abspath(out_path), 'bank': bank, 'pages': page_count,
+                              'rasterized': rasterized, 'movements': movement_count(page_count)})
+                continue
+            print(f'[INFO] Generating {os.path.basename(out_path)}...', flush=True)
+            cases.append(generate_statement(bank, pages, out_path, rasterized=rasterized, seed=seed))
+    return cases
+
+
+def parse_list(value: str, cast=str) -> list:
+    """'1,10,100' -> [1, 10, 100]; empty -> None"""
+    if not value:
+        return None
+    return [cast(v.strip()) for v in value.split(',') if v.strip()]
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description='Generate synthetic bank statements for benchmarks')
+    ap.add_argument('--out-dir', default=os.path.join(_repo_root(), 'benchmarks', '_generated'))
+    ap.add_argument('--banks', help='Comma-separated BANK_CONFIGS keys (default: all)')
+    ap.add_argument('--sizes', default=','.join(str(s) for s in DEFAULT_SIZES), help='Comma-separated page counts')
+    ap.add_argument('--rasterized', action='store_true', help='Image-only pages (OCR path)')
+    ap.add_argument('--seed', type=int, default=0)
+    ap.add_argument('--overwrite', action='store_true', help='Regenerate files that already exist')
+    args = ap.parse_args()
+
+    cases = generate_suite(args.out_dir, parse_list(args.banks), parse_list(args.sizes, int),
+                           rasterized=args.rasterized, seed=args.seed, overwrite=args.overwrite)
+    print(f'✅ {len(cases)} statement(s) in {os.path.abspath(args.out_dir)}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
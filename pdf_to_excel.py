@@ -2,19 +2,53 @@ import sys
 import os
 import re
 import subprocess
+import time
+import gzip
+import hashlib
+import json
+import pickle
+import importlib.util
+import tempfile
+import contextvars
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from abc import ABC, abstractmethod
+from contextlib import contextmanager, nullcontext
+from functools import partial
+from bisect import bisect_left
+from dataclasses import dataclass
 import pdfplumber
+import numpy as np
 import pandas as pd
 
 # NEW IMPORTS for Tesseract OCR (minimal):
 try:
     import pytesseract
     import fitz  # PyMuPDF - to convert PDF to images
-    from PIL import Image
+    from PIL import Image, ImageEnhance
     TESSERACT_AVAILABLE = True
 except ImportError:
     TESSERACT_AVAILABLE = False
     print("[WARNING] Tesseract OCR not available. Install: pip install pytesseract pymupdf pillow")
 
+try:
+    import fitz  # PyMuPDF: page rendering for OCR and the optional --text-engine pymupdf
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+
+# Optional in-process Tesseract (libtesseract C API) for --ocr-engine. Only looked up here: TesserocrEngine
+# imports it on first use, after OCR workers have set OMP_THREAD_LIMIT.
+TESSEROCR_AVAILABLE = importlib.util.find_spec('tesserocr') is not None
+
+try:
+    import resource  # POSIX only; used for peak RSS in --metrics-json
+except ImportError:
+    resource = None
+
 # Configure UTF-8 encoding for Windows (improves compatibility with Windows Server)
 if sys.platform == 'win32':
     import io
@@ -401,12 +435,74 @@ DEC_AMOUNT_RE = re.compile(r"\d{1,3}(?:[\.,\s]\d{3})*(?:[\.,]\d{2})")
 #
 OCR_RENDER_ZOOM = 4.0
 
+# OCR word coordinates are reported in PDF points x OCR_COORDINATE_SCALE (render zoom / 2.0), the space
+# BANK_CONFIGS "columns_ocr" (and the OCR-calibrated "columns" of OCR-only banks) are measured in.
+OCR_COORDINATE_SCALE = 2.0
+
+# Tesseract config for page OCR (same as pdf_to_excel-BUP.py: PSM 6, OEM 1 LSTM)
+TESSERACT_PAGE_CONFIG = r'--oem 1 --psm 6'
+
+# OCR engine (--ocr-engine, see get_ocr_engine): 'tesserocr' keeps one libtesseract API handle per process,
+# 'pytesseract' starts a tesseract process per call, 'auto' uses tesserocr when it is installed.
+# tesserocr is opt-in until its recognition has been compared with pytesseract on real statements.
+OCR_ENGINES = ('auto', 'tesserocr', 'pytesseract')
+DEFAULT_OCR_ENGINE = 'pytesseract'
+
+# Region-of-interest OCR (--ocr-roi, see _ocr_roi_scout): a scout pass at OCR_ROI_SCOUT_ZOOM locates the
+# movements table, then only the header, the table rows and the totals are OCR'd at the full zoom.
+OCR_ROI_SCOUT_ZOOM = 1.5
+OCR_ROI_MARGIN_PT = 12.0      # padding around a region (PDF points)
+OCR_ROI_FOOTER_GAP_PT = 18.0  # vertical gap below the last table row that starts the page footer
+OCR_ROI_HEADER_STRIP = 0.12   # pages after the table: only this top share of the page (page header) is OCR'd
+
+# Adaptive OCR (--ocr-adaptive, see _ocr_page_adaptive): pages are OCR'd at OCR_ADAPTIVE_BASE_ZOOM and only the
+# lines with a word below OCR_ADAPTIVE_MIN_CONF or a malformed amount are re-OCR'd at the full zoom.
+OCR_ADAPTIVE_BASE_ZOOM = 2.0
+OCR_ADAPTIVE_MIN_CONF = 60
+OCR_ADAPTIVE_BAND_PAD_PT = 3.0          # max padding above/below a re-OCR'd band (PDF points)
+OCR_ADAPTIVE_MAX_BAND_FRACTION = 0.5    # bands taller than this share of the page: re-OCR the whole page
+# Token shaped like an amount (digits, or O/S/l/I misreads, ending in a 1-2 character decimal part)
+OCR_AMOUNT_LIKE_PATTERN = re.compile(r"^[$+\-(]*[\dOoSlI][\dOoSlI,. ]*[.,][\dOoSlI]{1,2}[+\-)]*$")
+
+# In-process OCR pipeline (see _ocr_pages_pipelined): a render thread keeps up to OCR_PIPELINE_QUEUE_DEPTH page
+# rasters ready while Tesseract reads the current one (--ocr-queue-depth <int>; 0 renders and OCRs page by page).
+OCR_PIPELINE_QUEUE_DEPTH = 2
+
+# Persistent OCR page cache (see _ocr_cache_load/_ocr_cache_store).
+# Entries are gzip JSON files keyed by PDF content hash + page + zoom + lang + config + Tesseract version.
+# Override with --ocr-cache-dir <path> / --ocr-cache-max-mb <int>; disable with --no-ocr-cache.
+OCR_CACHE_DEFAULT_DIR = os.path.join(os.path.expanduser('~'), '.pdf_to_excel_ocr_cache')
+OCR_CACHE_DEFAULT_MAX_MB = 512
+
+
+# Argument list read by the CLI option helpers below. main() uses sys.argv; convert_statement() sets
+# a list built from its ``options`` dict for the duration of one conversion (see _run_options).
+# A ContextVar, so conversions running in several threads, or one started inside another conversion,
+# each read their own options.
+_RUN_ARGV = contextvars.ContextVar('_RUN_ARGV', default=None)
+
+
+def _run_argv() -> list:
+    argv = _RUN_ARGV.get()
+    return sys.argv if argv is None else argv
+
+
+@contextmanager
+def _run_options(pdf_path: str, options: dict):
+    """Make the CLI option helpers read ``options`` (convert_statement() options) in this context."""
+    token = _RUN_ARGV.set(_convert_options_to_argv(pdf_path, options))
+    try:
+        yield
+    finally:
+        _RUN_ARGV.reset(token)
+
 
 def _parse_ocr_zoom_from_argv():
-    for i, arg in enumerate(sys.argv):
-        if arg == '--ocr-zoom' and i + 1 < len(sys.argv):
+    argv = _run_argv()
+    for i, arg in enumerate(argv):
+        if arg == '--ocr-zoom' and i + 1 < len(argv):
             try:
-                z = float(sys.argv[i + 1])
+                z = float(argv[i + 1])
                 if z > 0:
                     return z
             except ValueError:
@@ -414,16 +510,129 @@ def _parse_ocr_zoom_from_argv():
     return None
 
 
+def _parse_ocr_queue_depth_from_argv() -> int:
+    """``--ocr-queue-depth N`` (N >= 0); defaults to OCR_PIPELINE_QUEUE_DEPTH."""
+    argv = _run_argv()
+    for i, arg in enumerate(argv):
+        if arg == '--ocr-queue-depth' and i + 1 < len(argv):
+            try:
+                n = int(argv[i + 1])
+                if n >= 0:
+                    return n
+            except ValueError:
+                break
+    return OCR_PIPELINE_QUEUE_DEPTH
+
+
+def _parse_ocr_contrast_from_argv():
+    """``--ocr-contrast F`` (F > 0): PIL contrast factor for the OCR raster; None (raw raster) when absent or 1.0."""
+    argv = _run_argv()
+    for i, arg in enumerate(argv):
+        if arg == '--ocr-contrast' and i + 1 < len(argv):
+            try:
+                c = float(argv[i + 1])
+                if c > 0 and c != 1.0:
+                    return c
+            except ValueError:
+                break
+    return None
+
+
+def _parse_ocr_workers_from_argv():
+    """``--ocr-workers N`` (N >= 1); defaults to the number of CPU cores."""
+    argv = _run_argv()
+    for i, arg in enumerate(argv):
+        if arg == '--ocr-workers' and i + 1 < len(argv):
+            try:
+                n = int(argv[i + 1])
+                if n >= 1:
+                    return n
+            except ValueError:
+                break
+    return os.cpu_count() or 1
+
+
+def _parse_ocr_cache_dir_from_argv():
+    """OCR cache directory (``--ocr-cache-dir``), or None when ``--no-ocr-cache`` is set."""
+    argv = _run_argv()
+    if '--no-ocr-cache' in argv:
+        return None
+    for i, arg in enumerate(argv):
+        if arg == '--ocr-cache-dir' and i + 1 < len(argv):
+            return os.path.normpath(os.path.abspath(argv[i + 1]))
+    return OCR_CACHE_DEFAULT_DIR
+
+
+def _parse_ocr_cache_max_mb_from_argv():
+    argv = _run_argv()
+    for i, arg in enumerate(argv):
+        if arg == '--ocr-cache-max-mb' and i + 1 < len(argv):
+            try:
+                mb = float(argv[i + 1])
+                if mb >= 0:
+                    return mb
+            except ValueError:
+                break
+    return float(OCR_CACHE_DEFAULT_MAX_MB)
+
+
 def _parse_output_excel_path_from_argv(default_path):
-    for i, arg in enumerate(sys.argv):
-        if arg in ('--output-excel', '--out-xlsx') and i + 1 < len(sys.argv):
-            nxt = sys.argv[i + 1]
+    argv = _run_argv()
+    for i, arg in enumerate(argv):
+        if arg in ('--output-excel', '--out-xlsx') and i + 1 < len(argv):
+            nxt = argv[i + 1]
             if nxt.startswith('-'):
                 continue
             return os.path.normpath(os.path.abspath(nxt))
     return default_path
 
 
+def _parse_text_engine_from_argv() -> str:
+    """``--text-engine pdfplumber|pymupdf|auto`` (default: DEFAULT_TEXT_ENGINE)."""
+    argv = _run_argv()
+    for i, arg in enumerate(argv):
+        if arg == '--text-engine' and i + 1 < len(argv):
+            engine = argv[i + 1].lower()
+            if engine in TEXT_ENGINES:
+                return engine
+            print(f"[WARNING] Unknown --text-engine {argv[i + 1]}; using {DEFAULT_TEXT_ENGINE}", flush=True)
+            break
+    return DEFAULT_TEXT_ENGINE
+
+
+def _parse_ocr_engine_from_argv() -> str:
+    """``--ocr-engine auto|tesserocr|pytesseract`` (default: DEFAULT_OCR_ENGINE)."""
+    argv = _run_argv()
+    for i, arg in enumerate(argv):
+        if arg == '--ocr-engine' and i + 1 < len(argv):
+            engine = argv[i + 1].lower()
+            if engine in OCR_ENGINES:
+                return engine
+            print(f"[WARNING] Unknown --ocr-engine {argv[i + 1]}; using {DEFAULT_OCR_ENGINE}", flush=True)
+            break
+    return DEFAULT_OCR_ENGINE
+
+
+def _parse_metrics_json_path_from_argv():
+    """Path given with ``--metrics-json <path>`` (stage timings as JSON), or None."""
+    argv = _run_argv()
+    for i, arg in enumerate(argv):
+        if arg == '--metrics-json' and i + 1 < len(argv) and not argv[i + 1].startswith('-'):
+            return os.path.normpath(os.path.abspath(argv[i + 1]))
+    return None
+
+
+def _pixmap_to_pil(pix):
+    """
+    PIL image over a PyMuPDF pixmap's samples, without the PNG encode/decode round-trip
+    (same pixels as ``Image.open(BytesIO(pix.tobytes("png")))``). The image shares the pixmap's
+    memory where PyMuPDF exposes it, so keep ``pix`` alive while the image is in use.
+    """
+    mode = {1: 'L', 3: 'RGB', 4: 'RGBA'}[pix.n] if not pix.alpha else {2: 'LA', 4: 'RGBA'}[pix.n]
+    samples = pix.samples_mv if hasattr(pix, 'samples_mv') else pix.samples
+    return Image.frombuffer(mode, (pix.width, pix.height), samples, 'raw', mode, pix.stride, 1)
+
+
 def _preprocess_pil_image_for_tesseract(img):
     """
     Pass PyMuPDF raster to Tesseract without grayscale/contrast/sharpen.
@@ -438,6 +647,15 @@ def _preprocess_pil_image_for_tesseract(img):
     return img.convert('RGB')
 
 
+def _apply_ocr_contrast(img, contrast):
+    """``--ocr-contrast``: PIL contrast enhancement of the Tesseract input (unchanged when ``contrast`` is None or 1.0)."""
+    if not contrast or contrast == 1.0:
+        return img
+    enhanced = ImageEnhance.Contrast(img).enhance(contrast)
+    enhanced.format = img.format
+    return enhanced
+
+
 # Amount normalization function
 def normalize_amount_str(amount_str):
     """Normalize amount string by removing commas, spaces, and converting to float."""
@@ -523,15 +741,539 @@ def fix_duplicated_chars(text_str):
     return ''.join(result)
 
 
-def find_column_coordinates(pdf_path: str, page_number: int = 1):
+# Text-layer extraction backends (--text-engine). "pymupdf" rebuilds pdfplumber's words/text from
+# PyMuPDF characters and is much faster per page; "auto" uses it only for TEXT_ENGINE_PYMUPDF_BANKS.
+TEXT_ENGINES = ('pdfplumber', 'pymupdf', 'auto')
+DEFAULT_TEXT_ENGINE = 'pdfplumber'
+# Banks whose statements convert identically with both engines (see scripts/text_engine_calibration.py).
+# Add a bank here only after the calibration reports parity on a corpus of its real statements.
+TEXT_ENGINE_PYMUPDF_BANKS = frozenset()
+# pdfplumber defaults used by page_words() and extract_text()
+TEXT_X_TOLERANCE = 3
+TEXT_Y_TOLERANCE = 3
+# PyMuPDF text flags: expand ligatures and keep real spaces, but do not add spaces for gaps
+# (word breaks on gaps follow pdfplumber's x_tolerance instead)
+_PYMUPDF_TEXT_FLAGS = (
+    (fitz.TEXT_PRESERVE_WHITESPACE | fitz.TEXT_MEDIABOX_CLIP | fitz.TEXT_INHIBIT_SPACES) if PYMUPDF_AVAILABLE else 0
+)
+
+
+def _cluster_objects(objs: list, key: str, tolerance: float) -> list:
+    """
+    Group objects whose ``key`` values chain within ``tolerance`` (same rule as pdfplumber's
+    cluster_objects): clusters in ascending key order, objects keep their order inside a cluster.
+    """
+    values = sorted(set(o[key] for o in objs))
+    cluster_of = {}
+    cluster = -1
+    last = None
+    for v in values:
+        if last is None or v > last + tolerance:
+            cluster += 1
+        cluster_of[v] = cluster
+        last = v
+    groups = [[] for _ in range(cluster + 1)]
+    for o in objs:
+        groups[cluster_of[o[key]]].append(o)
+    return groups
+
+
+def _pdf_font_descents(page) -> dict:
+    """
+    Font descent (fraction of the font size) per BaseFont on a PyMuPDF page, read the way pdfminer
+    does: FontDescriptor /Descent (of the descendant font for Type0), else the standard-14 metrics.
+    """
+    from pdfminer.fontmetrics import FONT_METRICS
+    doc = page.parent
+    descents = {}
+    for xref, _ext, _type, basefont, _name, _enc in page.get_fonts():
+        base = basefont.split('+', 1)[-1]
+        font_xref = xref
+        kind, value = doc.xref_get_key(xref, "DescendantFonts")
+        if kind == 'xref':
+            value = doc.xref_object(int(value.split()[0]), compressed=True)
+        refs = re.findall(r'(\d+)\s+0\s+R', value) if kind in ('array', 'xref') else []
+        if refs:
+            font_xref = int(refs[0])
+        kind, value = doc.xref_get_key(font_xref, "FontDescriptor")
+        if kind == 'xref':
+            d_kind, d_value = doc.xref_get_key(int(value.split()[0]), "Descent")
+            descents[base] = -abs(float(d_value)) / 1000.0 if d_kind in ('int', 'float') else 0.0
+        elif base in FONT_METRICS:
+            descents[base] = -abs(float(FONT_METRICS[base][0].get('Descent', 0))) / 1000.0
+    return descents
+
+
+def _pymupdf_page_chars(page, doctop_offset: float = 0.0) -> list:
+    """
+    Characters of a PyMuPDF page as pdfplumber-style dicts (text, x0, x1, top, bottom, doctop, upright).
+    top/bottom follow pdfminer (font size box above the font's /Descent), not PyMuPDF's line box, so
+    rows and y thresholds stay comparable with pdfplumber. Unmapped glyphs (U+FFFD) become "(cid:0)"
+    like pdfplumber's "(cid:N)", so the legibility check reads them the same way.
+    """
+    chars = []
+    try:
+        font_descents = _pdf_font_descents(page)
+    except Exception:
+        font_descents = {}
+    raw = page.get_text("rawdict", flags=_PYMUPDF_TEXT_FLAGS)
+    for block in raw.get('blocks', []):
+        for line in block.get('lines', []):
+            upright = abs(line['dir'][1]) < 1e-3 and line['dir'][0] > 0
+            for span in line.get('spans', []):
+                size = span['size']
+                descent = font_descents.get(span['font'].split('+', 1)[-1], span.get('descender', -0.2)) * size
+                for ch in span.get('chars', []):
+                    text = ch['c']
+                    if text == '\ufffd':
+                        text = '(cid:0)'
+                    x0, _, x1, _ = ch['bbox']
+                    baseline = ch['origin'][1]
+                    top = baseline - size - descent
+                    bottom = baseline - descent
+                    chars.append({
+                        'text': text, 'x0': x0, 'x1': x1, 'top': top, 'bottom': bottom,
+                        'doctop': top + doctop_offset, 'upright': upright,
+                    })
+    return chars
+
+
+def _words_from_chars(chars: list, x_tolerance: float = TEXT_X_TOLERANCE, y_tolerance: float = TEXT_Y_TOLERANCE) -> list:
+    """
+    pdfplumber's extract_words() (default options) over pdfplumber-style chars: lines by top within
+    ``y_tolerance``, chars sorted by x0, a new word at whitespace, at a gap above ``x_tolerance`` or
+    when x goes backwards.
+    """
+    words = []
+    for line_chars in _cluster_objects(chars, 'top', y_tolerance):
+        line_chars.sort(key=lambda c: c['x0'])
+        current = []
+        for c in line_chars:
+            if c['text'].isspace():
+                if current:
+                    words.append(current)
+                current = []
+                continue
+            if current:
+                prev = current[-1]
+                if c['x0'] < prev['x0'] or c['x0'] > prev['x1'] + x_tolerance or abs(c['top'] - prev['top']) > y_tolerance:
+                    words.append(current)
+                    current = []
+            current.append(c)
+        if current:
+            words.append(current)
+    merged = []
+    for word_chars in words:
+        x0 = min(c['x0'] for c in word_chars)
+        x1 = max(c['x1'] for c in word_chars)
+        top = min(c['top'] for c in word_chars)
+        bottom = max(c['bottom'] for c in word_chars)
+        first = word_chars[0]
+        merged.append({
+            'text': ''.join(c['text'] for c in word_chars),
+            'x0': x0,
+            'x1': x1,
+            'top': top,
+            'doctop': top + (first['doctop'] - first['top']),
+            'bottom': bottom,
+            'upright': first['upright'],
+            'height': bottom - top,
+            'width': x1 - x0,
+            'direction': 'ltr',
+        })
+    return merged
+
+
+def _text_from_words(words: list, y_tolerance: float = TEXT_Y_TOLERANCE) -> str:
+    """pdfplumber's extract_text() (non-layout): words clustered into lines by top, joined by spaces."""
+    return "\n".join(" ".join(w['text'] for w in line) for line in _cluster_objects(words, 'top', y_tolerance))
+
+
+class PdfSession:
+    """
+    One pdfplumber handle shared by all extraction stages of a single PDF.
+    Per-page text, words and chars are extracted lazily on first access and memoized,
+    so illegibility check, bank detection, extraction, summary and section scans
+    parse each page at most once.
+    With ``text_engine="pymupdf"`` page text, words and image coverage come from PyMuPDF
+    (same structure as pdfplumber); ``"auto"`` picks PyMuPDF only for TEXT_ENGINE_PYMUPDF_BANKS.
+    With ``stream_pages=True`` (``--stream-pages``) a page is parsed once for its text, words and image coverage
+    and its parsed objects are freed right away; its words go to a temporary spill file and are read back on
+    each request, so memory stays at one page instead of growing with the document (see iter_text_pages).
+
+    Usage:
+        with PdfSession(pdf_path) as session:
+            detect_bank_from_pdf(pdf_path, session=session)
+    """
+
+    def __init__(self, pdf_path: str, text_engine: str = DEFAULT_TEXT_ENGINE, stream_pages: bool = False):
+        self.pdf_path = pdf_path
+        self._pdf = None
+        self._fitz_doc = None
+        self._doctops = None
+        self._text = {}
+        self._words = {}
+        self._image_coverage = {}
+        self.stream_pages = stream_pages
+        # Stream mode: words spill file and {page index: (offset, size)} of each page's pickled words
+        self._spill = None
+        self._spilled = {}
+        if text_engine not in TEXT_ENGINES:
+            raise ValueError(f"Unknown text engine: {text_engine} (expected one of {', '.join(TEXT_ENGINES)})")
+        if text_engine != 'pdfplumber' and not PYMUPDF_AVAILABLE:
+            print(f"[WARNING] PyMuPDF not available: --text-engine {text_engine} falls back to pdfplumber", flush=True)
+            text_engine = 'pdfplumber'
+        self._text_engine = text_engine
+        # Memoized result of detect_bank_from_pdf (raw pdfplumber text, not OCR)
+        self.detected_bank = None
+        # Set when several pipeline runs share this session (zoom sweep): the pipeline's early close() is skipped
+        self.keep_open = False
+
+    @property
+    def pdf(self):
+        if self._pdf is None:
+            self._pdf = pdfplumber.open(self.pdf_path)
+        return self._pdf
+
+    @property
+    def fitz_doc(self):
+        if self._fitz_doc is None:
+            self._fitz_doc = fitz.open(self.pdf_path)
+        return self._fitz_doc
+
+    @property
+    def text_engine(self) -> str:
+        """Engine used for page text/words; "auto" is resolved on first use from the bank on page 1."""
+        if self._text_engine == 'auto':
+            first_text = _text_from_words(self._pymupdf_words(0)) if self.page_count else ''
+            bank = detect_bank_from_pages([first_text])
+            self._text_engine = 'pymupdf' if bank in TEXT_ENGINE_PYMUPDF_BANKS else 'pdfplumber'
+            if '--debug' in _run_argv():
+                print(f"[DEBUG] text engine auto -> {self._text_engine} (bank on page 1: {bank})", flush=True)
+        return self._text_engine
+
+    @property
+    def page_count(self) -> int:
+        if self._text_engine != 'pdfplumber':
+            return self.fitz_doc.page_count
+        return len(self.pdf.pages)
+
+    def page(self, index: int):
+        """pdfplumber page by 0-based index (negative indexes allowed)."""
+        return self.pdf.pages[index]
+
+    def _norm_index(self, index: int) -> int:
+        return index + self.page_count if index < 0 else index
+
+    def _pymupdf_words(self, index: int) -> list:
+        if self._doctops is None:
+            # doctop = top + heights of the previous pages, as in pdfplumber
+            self._doctops = [0.0]
+            for i in range(self.fitz_doc.page_count - 1):
+                self._doctops.append(self._doctops[-1] + self.fitz_doc[i].rect.height)
+        chars = _pymupdf_page_chars(self.fitz_doc[index], self._doctops[index])
+        return _words_from_chars(chars)
+
+    def page_text(self, index: int):
+        """page.extract_text() for 0-based page index (None when the page has no text)."""
+        index = self._norm_index(index)
+        if index not in self._text:
+            if self.stream_pages:
+                self._load_streamed_page(index)
+            elif self.text_engine == 'pymupdf':
+                self._text[index] = _text_from_words(self._page_words_cached(index))
+            else:
+                self._text[index] = self.pdf.pages[index].extract_text()
+        return self._text[index]
+
+    def _page_words_cached(self, index: int) -> list:
+        if index not in self._words:
+            if self.text_engine == 'pymupdf':
+                self._words[index] = self._pymupdf_words(index)
+            else:
+                self._words[index] = self.pdf.pages[index].extract_words(
+                    x_tolerance=TEXT_X_TOLERANCE, y_tolerance=TEXT_Y_TOLERANCE
+                )
+        return self._words[index]
+
+    def _load_streamed_page(self, index: int):
+        """
+        Stream mode: text, words and image coverage of a page in one parse, then free the parse.
+        The words are spilled to disk (see _spill_words), not kept in memory.
+        """
+        if self.text_engine == 'pymupdf':
+            words = self._pymupdf_words(index)
+            self._text[index] = _text_from_words(words)
+            self._spill_words(index, words)
+            return
+        page = self.pdf.pages[index]
+        try:
+            if index not in self._text:
+                self._text[index] = page.extract_text()
+            if index not in self._spilled:
+                self._spill_words(index, page.extract_words(x_tolerance=TEXT_X_TOLERANCE, y_tolerance=TEXT_Y_TOLERANCE))
+            if index not in self._image_coverage:
+                self._image_coverage[index] = _page_image_coverage(page)
+        finally:
+            page.close()
+
+    def _spill_words(self, index: int, words: list):
+        """Stream mode: append the pickled words of a page to the session's temporary spill file."""
+        if self._spill is None:
+            self._spill = tempfile.TemporaryFile(prefix='pdf_to_excel_words_')
+        data = pickle.dumps(words, pickle.HIGHEST_PROTOCOL)
+        self._spill.seek(0, os.SEEK_END)
+        self._spilled[index] = (self._spill.tell(), len(data))
+        self._spill.write(data)
+
+    def _streamed_page_words(self, index: int) -> list:
+        """Stream mode: a fresh copy of a page's words read back from the spill file (parsed on first request)."""
+        if index not in self._spilled:
+            self._load_streamed_page(index)
+        offset, size = self._spilled[index]
+        self._spill.seek(offset)
+        return pickle.loads(self._spill.read(size))
+
+    def release_page(self, index: int):
+        """
+        Stream mode: drop pdfplumber's cached layout objects of a page that has been consumed (e.g. after
+        page_chars). Page text stays memoized for the summary and section scans, words stay in the spill file.
+        """
+        index = self._norm_index(index)
+        self._words.pop(index, None)
+        if self._pdf is not None and self.text_engine == 'pdfplumber':
+            self._pdf.pages[index].close()
+
+    def page_words(self, index: int) -> list:
+        """
+        page.extract_words(x_tolerance=3, y_tolerance=3) for 0-based page index.
+        Returns fresh dict copies so callers may modify them (e.g. Konfio text fixes).
+        In stream mode they are read back from the spill file on every call instead of memoized.
+        """
+        index = self._norm_index(index)
+        if self.stream_pages:
+            return self._streamed_page_words(index)
+        return [dict(w) for w in self._page_words_cached(index)]
+
+    def page_image_coverage(self, index: int) -> float:
+        """Fraction (0..1) of the page area covered by embedded images."""
+        if self.text_engine == 'pymupdf':
+            page = self.fitz_doc[self._norm_index(index)]
+            rect = page.rect
+            page_area = float(rect.width * rect.height) or 1.0
+            covered = 0.0
+            for img in page.get_image_info():
+                box = fitz.Rect(img['bbox']) & rect
+                if not box.is_empty:
+                    covered += box.width * box.height
+            return min(covered / page_area, 1.0)
+        if self.stream_pages:
+            index = self._norm_index(index)
+            if index not in self._image_coverage:
+                self._load_streamed_page(index)
+            return self._image_coverage[index]
+        return _page_image_coverage(self.page(index))
+
+    def page_chars(self, index: int) -> list:
+        """Raw pdfplumber chars for 0-based page index (cached by pdfplumber on the page)."""
+        return self.pdf.pages[index].chars
+
+    def close(self):
+        if self._pdf is not None:
+            try:
+                self._pdf.close()
+            except Exception:
+                pass
+            self._pdf = None
+        if self._fitz_doc is not None:
+            self._fitz_doc.close()
+            self._fitz_doc = None
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+        self._text.clear()
+        self._words.clear()
+        self._image_coverage.clear()
+        self._spilled.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+@contextmanager
+def _pdf_session(pdf_path: str, session: 'PdfSession' = None):
+    """Yield the caller's session, or a temporary one closed on exit when none is given."""
+    if session is not None:
+        yield session
+        return
+    with PdfSession(pdf_path) as own_session:
+        yield own_session
+
+
+def _peak_rss_mb(children: bool = False):
+    """
+    Peak resident memory in MB over the whole process lifetime (None when the platform does not expose it).
+    With ``children=True``: largest finished child process (OCR workers, Tesseract); POSIX only.
+    """
+    if resource is not None:
+        who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+        peak = resource.getrusage(who).ru_maxrss
+        # ru_maxrss is KB on Linux, bytes on macOS
+        return peak / (1024.0 * 1024.0) if sys.platform == 'darwin' else peak / 1024.0
+    if sys.platform == 'win32' and not children:
+        try:
+            import ctypes
+            from ctypes import wintypes
+
+            class _ProcessMemoryCounters(ctypes.Structure):
+                _fields_ = [
+                    ('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+                    ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                    ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                    ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t), ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                    ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t),
+                ]
+
+            counters = _ProcessMemoryCounters()
+            counters.cb = ctypes.sizeof(counters)
+            handle = ctypes.windll.kernel32.GetCurrentProcess()
+            if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+                return counters.PeakWorkingSetSize / (1024.0 * 1024.0)
+        except Exception:
+            pass
+    return None
+
+
+def _cpu_seconds() -> float:
+    """CPU time of this process plus waited-for children (Tesseract subprocesses, finished OCR workers)."""
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+class RunMetrics:
+    """
+    Wall time, CPU time and memory per pipeline stage for one conversion (see --metrics-json).
+    Stages nest: time spent in an inner stage (e.g. row_grouping inside movement_parsing) is
+    counted only for the inner stage, so stage times add up to the run total.
+    
+    The OS only reports the process-lifetime RSS high-water mark, so each stage records
+    ``peak_rss_growth_mb``, how far the stage raised that mark (0 when it stayed under an earlier peak,
+    including peaks of earlier PDFs in a warm batch worker), and ``process_peak_rss_mb``, the cumulative
+    mark itself when the stage ended.
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self.ocr_pages = []
+        self._stack = []
+        self._start_wall = time.perf_counter()
+        self._start_cpu = _cpu_seconds()
+        self._start_peak = _peak_rss_mb()
+
+    def begin(self, name: str):
+        self._stack.append([name, time.perf_counter(), _cpu_seconds(), _peak_rss_mb(), 0.0, 0.0, 0.0])
+
+    def end(self, name: str = None):
+        if not self._stack or (name is not None and self._stack[-1][0] != name):
+            return
+        stage_name, start_wall, start_cpu, start_peak, child_wall, child_cpu, child_growth = self._stack.pop()
+        wall = time.perf_counter() - start_wall
+        cpu = _cpu_seconds() - start_cpu
+        peak = _peak_rss_mb()
+        growth = peak - start_peak if peak is not None and start_peak is not None else None
+        entry = self.stages.setdefault(stage_name, {
+            'wall_s': 0.0, 'cpu_s': 0.0, 'calls': 0, 'peak_rss_growth_mb': None, 'process_peak_rss_mb': None,
+        })
+        entry['wall_s'] += max(wall - child_wall, 0.0)
+        entry['cpu_s'] += max(cpu - child_cpu, 0.0)
+        entry['calls'] += 1
+        if growth is not None:
+            entry['peak_rss_growth_mb'] = (entry['peak_rss_growth_mb'] or 0.0) + max(growth - child_growth, 0.0)
+        entry['process_peak_rss_mb'] = peak
+        if self._stack:
+            self._stack[-1][4] += wall
+            self._stack[-1][5] += cpu
+            self._stack[-1][6] += growth or 0.0
+
+    @contextmanager
+    def stage(self, name: str):
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end(name)
+
+    def add_ocr_page(self, page: int, wall: float, cpu: float = None, cached: bool = False):
+        self.ocr_pages.append({'page': page, 'wall_s': wall, 'cpu_s': cpu, 'cached': cached})
+
+    def finish(self) -> dict:
+        """Close any open stage (e.g. after an error) and return the report as a dict."""
+        while self._stack:
+            self.end()
+        peak = _peak_rss_mb()
+        return {
+            'total': {
+                'wall_s': time.perf_counter() - self._start_wall,
+                'cpu_s': _cpu_seconds() - self._start_cpu,
+                'peak_rss_growth_mb': peak - self._start_peak if peak is not None and self._start_peak is not None else None,
+                'process_peak_rss_mb': peak,
+                'process_peak_rss_children_mb': _peak_rss_mb(children=True),
+            },
+            'stages': self.stages,
+            'ocr_pages': sorted(self.ocr_pages, key=lambda p: p['page']),
+        }
+
+    @staticmethod
+    def summary_line(report: dict) -> str:
+        parts = [f"{name} {st['wall_s']:.2f}s" for name, st in report['stages'].items()]
+        total = report['total']
+        rss = ''
+        if total.get('process_peak_rss_mb') is not None:
+            rss = f", peak RSS +{total['peak_rss_growth_mb']:.0f} MB (process {total['process_peak_rss_mb']:.0f} MB)"
+        return f"⏱️  Stages: {' | '.join(parts)} || total {total['wall_s']:.2f}s wall, {total['cpu_s']:.2f}s CPU{rss}"
+
+
+# Metrics of the conversion running in this context (set by convert_statement, per thread like _RUN_ARGV)
+_RUN_METRICS = contextvars.ContextVar('_RUN_METRICS', default=None)
+
+
+def _metrics_stage(name: str):
+    """Context manager timing ``name`` in the current run's metrics (no-op outside convert_statement)."""
+    metrics = _RUN_METRICS.get()
+    return metrics.stage(name) if metrics is not None else nullcontext()
+
+
+def _metrics_begin(name: str):
+    metrics = _RUN_METRICS.get()
+    if metrics is not None:
+        metrics.begin(name)
+
+
+def _metrics_end(name: str):
+    metrics = _RUN_METRICS.get()
+    if metrics is not None:
+        metrics.end(name)
+
+
+def _metrics_ocr_page(page: int, wall: float, cpu: float = None, cached: bool = False):
+    metrics = _RUN_METRICS.get()
+    if metrics is not None:
+        metrics.add_ocr_page(page, wall, cpu, cached=cached)
+
+
+def find_column_coordinates(pdf_path: str, page_number: int = 1, session: PdfSession = None):
     """Extract all words from a page and show their coordinates.
     Helps user find exact X ranges for columns.
     Automatically detects if OCR should be used for illegible PDFs or Banamex mixed format.
     """
     try:
         # STEP 1: Detect if PDF is illegible or Banamex mixed (needs OCR for coordinates)
-        is_illegible, cid_ratio, ascii_ratio = is_pdf_text_illegible(pdf_path)
-        detected_bank_early = detect_bank_from_pdf(pdf_path)
+        is_illegible, cid_ratio, ascii_ratio = is_pdf_text_illegible(pdf_path, session=session)
+        detected_bank_early = detect_bank_from_pdf(pdf_path, session=session)
         use_ocr_banamex_mixed = (
             detected_bank_early == 'Banamex' and ascii_ratio < 0.99 and TESSERACT_AVAILABLE
         )
@@ -608,16 +1350,15 @@ def find_column_coordinates(pdf_path: str, page_number: int = 1):
         
         # STEP 2: Legible PDF - normal behavior (pdfplumber)
         # Detect bank to apply Konfio-specific fixes
-        detected_bank = detect_bank_from_pdf(pdf_path)
+        detected_bank = detect_bank_from_pdf(pdf_path, session=session)
         is_konfio = (detected_bank == "Konfio")
         
-        with pdfplumber.open(pdf_path) as pdf:
-            if page_number < 1 or page_number > len(pdf.pages):
-                print(f"❌ Page {page_number} does not exist. PDF has {len(pdf.pages)} page(s).", flush=True)
+        with _pdf_session(pdf_path, session) as pdf_session:
+            if page_number < 1 or page_number > pdf_session.page_count:
+                print(f"❌ Page {page_number} does not exist. PDF has {pdf_session.page_count} page(s).", flush=True)
                 return
             
-            page = pdf.pages[page_number - 1]
-            words = page.extract_words(x_tolerance=3, y_tolerance=3)
+            words = pdf_session.page_words(page_number - 1)
             
             if not words:
                 # print("❌ No words found on page")
@@ -698,104 +1439,309 @@ BANK_DETECTION_DATE_PATTERN = re.compile(
 )
 
 
-def detect_bank_from_text(text: str, from_ocr: bool = False) -> str:
+# Movement date patterns shared by the extractors (compiled once instead of per row).
+# Generic: "DIA MES" (01 ABR), "MES DIA" (ABR 01), "DIA MES AÑO" (06 mar 2023), "DIA-MES-AÑO" (12-ENE-23)
+MOVEMENT_DATE_PATTERN = re.compile(r"\b(?:(?:0[1-9]|[12][0-9]|3[01])(?:[\/\-\s])[A-Za-z]{3}(?:[\/\-\s]\d{2,4})?|[A-Za-z]{3}(?:[\/\-\s])(?:0[1-9]|[12][0-9]|3[01])|(?:0[1-9]|[12][0-9]|3[01])\s+[A-Za-z]{3}\s+\d{2,4})\b", re.I)
+# HSBC / Banregio: 2-digit day at the start of the text ("03" or "03 RETIRO ..." but not "003")
+DAY_PREFIX_DATE_PATTERN = re.compile(r"^(0[1-9]|[12][0-9]|3[01])(?=\s|$)")
+# INTERCAM: fecha column is day only (1-31)
+DAY_ONLY_DATE_PATTERN = re.compile(r"^(0?[1-9]|[12][0-9]|3[01])$")
+# Base: DD/MM/YYYY (e.g. "30/04/2024")
+SLASH_DATE_PATTERN = re.compile(r'\b(0[1-9]|[12][0-9]|3[01])/(0[1-9]|1[0-2])/(\d{4})\b')
+# Banorte: DD/MM/YYYY and DIA-MES-AÑO (DD-MMM-YY only)
+BANORTE_DATE_PATTERN = re.compile(r'\b(0[1-9]|[12][0-9]|3[01])/(0[1-9]|1[0-2])/(\d{4})\b|\b(\d{1,2}-[A-Z]{3}-\d{2})\b', re.I)
+# BanBajío: "DIA MES" (e.g. "3 ENE") without year
+BANBAJIO_DATE_PATTERN = re.compile(r'\b(0?[1-9]|[12][0-9]|3[01])\s+[A-Z]{3}\b', re.I)
+# Mercury: "Jul 01"
+MERCURY_DATE_PATTERN = re.compile(r'\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(0?[1-9]|[12][0-9]|3[01])\b', re.I)
+# Inbursa: "MES. DD" or "MES DD" at the start of the line, or the month alone (date split across 2 lines)
+INBURSA_DATE_PATTERN = re.compile(r'^(ENE|FEB|MAR|ABR|MAY|JUN|JUL|AGO|SEP|OCT|NOV|DIC)\.?\s+(0[1-9]|[12][0-9]|3[01])\b', re.I)
+INBURSA_MONTH_ONLY_PATTERN = re.compile(r'^(ENE|FEB|MAR|ABR|MAY|JUN|JUL|AGO|SEP|OCT|NOV|DIC)\.?$', re.I)
+# Konfio: "DIA MES AÑO" (e.g. "14 mar 2023") and the sub-row reference ("SPEI ABC12345678 - 14 mar 2023")
+KONFIO_FULL_DATE_PATTERN = re.compile(r'\b(0[1-9]|[12][0-9]|3[01])\s+[A-Za-z]{3}\s+\d{2,4}\b', re.I)
+KONFIO_SUB_ROW_PATTERN = re.compile(r'^[A-Z]{2,4}\s*[A-Z0-9]{8,15}\s*-\s*\d{1,2}\s+[A-Za-z]{3}\s+\d{2,4}', re.I)
+# Clara: "01 ENE" or OCR-spaced "01 E N E"
+CLARA_DATE_PATTERN = re.compile(r'\d{1,2}\s+[A-Z]{3}|\d{1,2}\s+[A-Z]\s+[A-Z]\s+[A-Z]', re.I)
+# Banamex: classic "30 ENE", new format "13-oct-2025", and the page footer ("123.ABC.OD.0001.01")
+BANAMEX_DATE_PATTERN = re.compile(r'\b(0[1-9]|[12][0-9]|3[01])\s+[A-Z]{3}\b', re.I)
+BANAMEX_NEW_FORMAT_DATE_PATTERN = re.compile(r'\b(0?[1-9]|[12][0-9]|3[01])-[a-z]{3}-\d{4}\b', re.I)
+BANAMEX_FOOTER_PATTERN = re.compile(r'\d+\.\w+\.OD\.\d+\.\d+', re.I)
+# Hours ("17:47:53" or "17:47") must not be taken as dates when splitting rows
+HOUR_PATTERN = re.compile(r'\b\d{1,2}:\d{2}(?::\d{2})?\b')
+
+# Date pattern used by the movements loop to spot rows, per bank (default: MOVEMENT_DATE_PATTERN)
+BANK_DATE_PATTERNS = {
+    'Banregio': DAY_PREFIX_DATE_PATTERN,
+    'INTERCAM': DAY_ONLY_DATE_PATTERN,
+    'Base': SLASH_DATE_PATTERN,
+    'Banorte': BANORTE_DATE_PATTERN,
+    'Banbajío': BANBAJIO_DATE_PATTERN,
+    'Mercury': MERCURY_DATE_PATTERN,
+}
+# Date pattern extract_movement_row() uses to separate the date from the description when none is given
+BANK_ROW_DATE_PATTERNS = {
+    'HSBC': DAY_PREFIX_DATE_PATTERN,
+    'Banregio': DAY_PREFIX_DATE_PATTERN,
+    'INTERCAM': DAY_ONLY_DATE_PATTERN,
+    'Base': SLASH_DATE_PATTERN,
+    'Banorte': BANORTE_DATE_PATTERN,
+}
+
+
+def _movements_start_pattern(bank_config: dict):
     """
-    Detect the bank from extracted text content.
-    Phase 1: If BANK_KEYWORDS match, return that bank immediately.
-      - When from_ocr=True (OCR path): check all lines of the text (full first page).
-      - Otherwise: check only the first 30 lines.
-    Phase 2: Otherwise, search all lines, count matches per bank (excluding matches near a date),
-    and return the bank with the most occurrences.
-    When from_ocr=True and no bank is detected (Phase 2 max_count=0), returns "HSBC" as fallback.
+    Compile the movements_start marker of a bank config (with its secondary/tertiary alternatives).
+
+    Returns:
+        Compiled pattern, or None when the config has no movements_start
     """
-    if not text:
-        return "HSBC" if from_ocr else DEFAULT_BANK
-    
-    amount_pattern = re.compile(r"\b\d{1,3}(?:[\.,\s]\d{3})*(?:[\.,]\d{2})")
-    lines = text.split('\n')
-    n_lines = len(lines)
-    
-    # Phase 1: first match wins. OCR: check full first page; else first 30 lines only
-    phase1_lines = lines if from_ocr else lines[:30]
-    for line_idx, line in enumerate(phase1_lines):
-        line_clean = line.strip()
-        if not line_clean:
-            continue
-        if amount_pattern.search(line_clean):
+    movement_start_string = bank_config.get('movements_start')
+    if not movement_start_string:
+        return None
+    # INTERCAM: header may appear as "DIA" or "DÍA" with variable spacing; normalize for match
+    if bank_config.get('name') == 'INTERCAM':
+        return re.compile(
+            r'D[IÍ]A\s+FOLIO\s+CONCEPTO\s+DEP[OÓ]SITOS\s+RETIROS\s+SALDO',
+            re.I
+        )
+    movement_start_secondary = bank_config.get('movements_start_secondary')
+    movement_start_tertiary = bank_config.get('movements_start_tertiary')  # list of regex strings (e.g. OCR-duplicated)
+    if not (movement_start_secondary or movement_start_tertiary):
+        # Create pattern from movements_start string (escape special chars)
+        return re.compile(re.escape(movement_start_string), re.I)
+    parts = [re.escape(movement_start_string)]
+    if movement_start_secondary:
+        # Secondary can be a string (literal) or list of strings (literals and/or regex)
+        sec_list = movement_start_secondary if isinstance(movement_start_secondary, list) else [movement_start_secondary]
+        for s in sec_list:
+            # Treat as regex if it contains '+' (one-or-more pattern) or other regex metacharacters we use
+            if '+' in s or '(\s' in s or '+)' in s:
+                parts.append(s)
+            else:
+                parts.append(re.escape(s))
+    if movement_start_tertiary:
+        parts.extend(movement_start_tertiary)
+    return re.compile(
+        r'(?:%s)' % '|'.join(parts),
+        re.I
+    )
+
+
+class BankProfile:
+    """
+    Everything derived from one BANK_CONFIGS / BANK_KEYWORDS entry, compiled once per process:
+    detection keywords, movements start/end markers, date patterns and column layouts.
+    Use get_bank_profile() to obtain one; the extractors receive it instead of re-deriving patterns.
+    """
+
+    def __init__(self, name: str, config: dict = None):
+        self.name = name
+        self.config = config if config is not None else {"name": name, "columns": {}}
+        self.keyword_patterns = tuple(re.compile(p, re.I) for p in BANK_KEYWORDS.get(name, ()))
+        # Bank name as a whole word, searched on the upper-cased line
+        self.name_pattern = re.compile(rf'\b{re.escape(name.upper())}\b')
+        self.date_pattern = BANK_DATE_PATTERNS.get(name, MOVEMENT_DATE_PATTERN)
+        self.row_date_pattern = BANK_ROW_DATE_PATTERNS.get(name, MOVEMENT_DATE_PATTERN)
+        self.movements_start_pattern = _movements_start_pattern(self.config)
+        self.movements_start_ocr_pattern = (
+            re.compile(self.config['movements_start_ocr'], re.I) if self.config.get('movements_start_ocr') else None
+        )
+        secondary_end = self.config.get('movements_end_secondary')
+        self.movements_end_secondary_pattern = re.compile(re.escape(secondary_end), re.I) if secondary_end else None
+        self.movements_end_fallback_patterns = tuple(
+            re.compile(p, re.I) for p in self.config.get('movements_end_patterns', [])
+        )
+        self._layouts = {}
+
+    def matches_keyword(self, line: str, line_upper: str = None) -> bool:
+        """True if the line has one of the bank's keywords (or the bank name as a whole word)."""
+        for pattern in self.keyword_patterns:
+            if pattern.search(line):
+                return True
+        return bool(self.name_pattern.search(line_upper if line_upper is not None else line.upper()))
+
+    def column_layout(self, key: str = 'columns'):
+        """ColumnLayout for ``columns``, ``columns_ocr`` or ``columns_new_format`` (None if not configured)."""
+        if key not in self._layouts:
+            columns = self.config.get(key)
+            self._layouts[key] = ColumnLayout.for_columns(columns) if columns else None
+        return self._layouts[key]
+
+
+_BANK_PROFILES = {}
+
+
+def get_bank_profile(bank_name: str) -> BankProfile:
+    """
+    BankProfile for a bank, built on first use and reused afterwards.
+    Banks without a BANK_CONFIGS entry get a profile over the generic config (no columns).
+    """
+    profile = _BANK_PROFILES.get(bank_name)
+    if profile is None:
+        profile = BankProfile(bank_name, BANK_CONFIGS.get(bank_name))
+        _BANK_PROFILES[bank_name] = profile
+    return profile
+
+
+# Lines in the first part of the text that Phase 1 of bank detection checks (non-OCR text)
+BANK_DETECTION_PHASE1_LINES = 30
+# Amount on a line: those lines are movements/totals and never count for bank detection
+BANK_DETECTION_AMOUNT_PATTERN = re.compile(r"\b\d{1,3}(?:[\.,\s]\d{3})*(?:[\.,]\d{2})")
+
+_BANK_DETECTION_MATCHER = None
+
+
+def _bank_detection_matcher() -> tuple:
+    """
+    Profiles in BANK_KEYWORDS order plus two combined alternations (one named group per bank):
+    all keywords (case insensitive, on the line) and all bank names (on the upper-cased line).
+    A line that matches neither can be skipped with a single regex call.
+    """
+    global _BANK_DETECTION_MATCHER
+    if _BANK_DETECTION_MATCHER is None:
+        profiles = [get_bank_profile(bank_name) for bank_name in BANK_KEYWORDS]
+        keyword_re = re.compile('|'.join(
+            f'(?P<b{i}>{"|".join(p.pattern for p in profile.keyword_patterns)})'
+            for i, profile in enumerate(profiles) if profile.keyword_patterns
+        ), re.I)
+        name_re = re.compile('|'.join(
+            f'(?P<b{i}>{profile.name_pattern.pattern})' for i, profile in enumerate(profiles)
+        ))
+        _BANK_DETECTION_MATCHER = (profiles, keyword_re, name_re)
+    return _BANK_DETECTION_MATCHER
+
+
+def _phase1_bank(line_clean: str):
+    """Phase 1 check of one line: first bank (BANK_KEYWORDS order) whose keyword, then whose name, matches."""
+    profiles, keyword_re, name_re = _bank_detection_matcher()
+    match = keyword_re.search(line_clean)
+    if match:
+        # Several banks may match the same line: keep BANK_KEYWORDS order, not leftmost match
+        for profile in profiles:
+            for keyword_pattern in profile.keyword_patterns:
+                if keyword_pattern.search(line_clean):
+                    return profile.name
+    line_upper = line_clean.upper()
+    if name_re.search(line_upper):
+        for profile in profiles:
+            if profile.name_pattern.search(line_upper):
+                return profile.name
+    return None
+
+
+def detect_bank_from_pages(page_texts, from_ocr: bool = False, fallback: bool = True) -> str:
+    """
+    Detect the bank from page texts given one at a time (list or generator), reading no more than needed.
+    Same rules as detect_bank_from_text() on the pages joined with newlines:
+    Phase 1: the first line (first 30 lines; all lines when from_ocr=True) with a BANK_KEYWORDS match
+      wins and returns at once, so later pages are never read.
+    Phase 2: otherwise count matches per bank over all lines, skipping lines with an amount or with a
+    date on the line or within 2 lines (precomputed per line), and return the bank with the most occurrences.
+    When from_ocr=True and no bank is detected, returns "HSBC" as fallback.
+
+    Args:
+        page_texts: Iterable of page texts (None/empty pages are skipped)
+        from_ocr: Text comes from OCR (check every line in Phase 1; HSBC/Santander fallbacks)
+        fallback: If False, return None instead of the default bank when none matches
+
+    Returns:
+        Bank name, or DEFAULT_BANK ("HSBC" for OCR) when none matches
+    """
+    profiles, keyword_re, name_re = _bank_detection_matcher()
+    lines = []
+    head = ''
+    # Phase 1 while the pages stream in: first match wins
+    for text in page_texts:
+        if not text:
             continue
-        for bank_name, keywords in BANK_KEYWORDS.items():
-            for keyword_pattern in keywords:
-                if re.search(keyword_pattern, line_clean, re.I):
-                    return bank_name
-        line_upper = line_clean.upper()
-        for bank_name in BANK_KEYWORDS.keys():
-            if re.search(rf'\b{re.escape(bank_name.upper())}\b', line_upper):
+        if from_ocr and len(head) < 8000:
+            head += text + "\n"
+        page_lines = text.split('\n')
+        phase1_start = len(lines)
+        lines.extend(page_lines)
+        phase1_end = len(lines) if from_ocr else min(len(lines), BANK_DETECTION_PHASE1_LINES)
+        for line in lines[phase1_start:phase1_end]:
+            line_clean = line.strip()
+            if not line_clean:
+                continue
+            if BANK_DETECTION_AMOUNT_PATTERN.search(line_clean):
+                continue
+            bank_name = _phase1_bank(line_clean)
+            if bank_name:
                 return bank_name
+    if not lines:
+        return ("HSBC" if from_ocr else DEFAULT_BANK) if fallback else None
     
-    # Phase 2: No match in Phase 1 — use new logic on all lines (count + filter near date)
-    bank_counts = {bank_name: 0 for bank_name in BANK_KEYWORDS.keys()}
+    # Phase 2: No match in Phase 1 — count matches on all lines, skipping lines with a date nearby
+    n_lines = len(lines)
+    has_date = None
+    bank_counts = {profile.name: 0 for profile in profiles}
     for i, line in enumerate(lines):
         line_clean = line.strip()
         if not line_clean:
             continue
-        if amount_pattern.search(line_clean):
+        line_upper = line_clean.upper()
+        if not (keyword_re.search(line_clean) or name_re.search(line_upper)):
             continue
-        
-        has_date_nearby = BANK_DETECTION_DATE_PATTERN.search(line_clean)
-        if not has_date_nearby:
-            for offset in (-2, -1, 1, 2):
-                j = i + offset
-                if 0 <= j < n_lines:
-                    neighbor = lines[j].strip()
-                    if neighbor and BANK_DETECTION_DATE_PATTERN.search(neighbor):
-                        has_date_nearby = True
-                        break
-        if has_date_nearby:
+        if BANK_DETECTION_AMOUNT_PATTERN.search(line_clean):
             continue
-        
-        for bank_name, keywords in BANK_KEYWORDS.items():
-            matched = False
-            for keyword_pattern in keywords:
-                if re.search(keyword_pattern, line_clean, re.I):
-                    matched = True
-                    break
-            if not matched:
-                line_upper = line_clean.upper()
-                if re.search(rf'\b{re.escape(bank_name.upper())}\b', line_upper):
-                    matched = True
-            if matched:
-                bank_counts[bank_name] += 1
+        if has_date is None:
+            # Date bitmap for the whole text, so the ±2 neighbour check is a lookup
+            has_date = [bool(BANK_DETECTION_DATE_PATTERN.search(l.strip())) for l in lines]
+        if any(has_date[max(i - 2, 0):min(i + 3, n_lines)]):
+            continue
+        for profile in profiles:
+            if profile.matches_keyword(line_clean, line_upper):
+                bank_counts[profile.name] += 1
     
     max_count = max(bank_counts.values()) if bank_counts else 0
     if max_count == 0:
         # OCR: header lines often include amounts/dates so Phase 1/2 skip them; recognize institution names in first chunk.
         if from_ocr:
-            head = (text or '')[:8000]
+            head = head[:8000]
             if re.search(r'\bBANCO\s+SANTANDER\b', head, re.I) or re.search(
                 r'\bGRUPO\s+FINANCIERO\s+SANTANDER\b', head, re.I
             ):
                 return 'Santander'
-        return "HSBC" if from_ocr else DEFAULT_BANK
+        return ("HSBC" if from_ocr else DEFAULT_BANK) if fallback else None
     return max(bank_counts, key=bank_counts.get)
 
 
-def detect_bank_from_pdf(pdf_path: str) -> str:
+def detect_bank_from_text(text: str, from_ocr: bool = False) -> str:
+    """
+    Detect the bank from extracted text content.
+    Phase 1: If BANK_KEYWORDS match, return that bank immediately.
+      - When from_ocr=True (OCR path): check all lines of the text (full first page).
+      - Otherwise: check only the first 30 lines.
+    Phase 2: Otherwise, search all lines, count matches per bank (excluding matches near a date),
+    and return the bank with the most occurrences.
+    When from_ocr=True and no bank is detected (Phase 2 max_count=0), returns "HSBC" as fallback.
+    See detect_bank_from_pages() for the page-streaming form.
+    """
+    if not text:
+        return "HSBC" if from_ocr else DEFAULT_BANK
+    return detect_bank_from_pages([text], from_ocr=from_ocr)
+
+
+def detect_bank_from_pdf(pdf_path: str, session: PdfSession = None, fallback: bool = True) -> str:
     """
     Detect the bank from PDF content by reading line by line.
-    Returns the bank name if detected, otherwise returns DEFAULT_BANK.
+    Returns the bank name if detected, otherwise returns DEFAULT_BANK (None with ``fallback=False``).
+    Pages are read one at a time and detection stops at the first Phase 1 match (usually page 1).
+    When a PdfSession is given, page text is shared and the result is memoized on the session
+    ('' when no bank matched).
     """
+    if session is not None and session.detected_bank is not None:
+        return session.detected_bank or (DEFAULT_BANK if fallback else None)
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            # Read all pages so BANK_KEYWORDS are checked across the entire PDF
-            all_text = ""
-            for page_num in range(len(pdf.pages)):
-                page = pdf.pages[page_num]
-                text = page.extract_text()
-                if text:
-                    all_text += text + "\n"
-            
-            if all_text:
-                return detect_bank_from_text(all_text)
+        with _pdf_session(pdf_path, session) as pdf_session:
+            # Generator: later pages are only extracted if Phase 1 finds nothing in the first lines
+            page_texts = (pdf_session.page_text(page_num) for page_num in range(pdf_session.page_count))
+            detected = detect_bank_from_pages(page_texts, fallback=False)
+            if session is not None:
+                session.detected_bank = detected or ''
+            if detected:
+                return detected
     
     except Exception as e:
         pass
@@ -803,10 +1749,94 @@ def detect_bank_from_pdf(pdf_path: str) -> str:
     
     # If no bank detected, return default
     #print(f"⚠️  No se pudo detectar el banco, usando: {DEFAULT_BANK}")
-    return DEFAULT_BANK
+    return DEFAULT_BANK if fallback else None
+
+
+def _page_text_legibility(page_text: str, cid_threshold: float = 0.05) -> dict:
+    """
+    Legibility of one page's text layer: CID ratio, ASCII ratio and whether it is illegible
+    (fewer than 50 chars, CID ratio above ``cid_threshold`` or ASCII ratio below 70%).
+    """
+    if not page_text or len(page_text) < 50:
+        # If page has no text or very short, consider it illegible
+        return {'is_illegible': True, 'cid_ratio': 1.0, 'ascii_ratio': 0.0}
+    
+    # Count CID characters for this page
+    page_total_chars = len(page_text)
+    page_cid_ratio = page_text.count('(cid:') / page_total_chars
+    
+    # Count ASCII characters for this page
+    page_ascii_ratio = sum(1 for c in page_text if ord(c) < 128) / page_total_chars
+    
+    return {
+        'is_illegible': (page_cid_ratio > cid_threshold) or (page_ascii_ratio < 0.7),
+        'cid_ratio': page_cid_ratio,
+        'ascii_ratio': page_ascii_ratio,
+    }
 
 
-def is_pdf_text_illegible(pdf_path: str, cid_threshold: float = 0.05) -> tuple:
+# Minimum fraction of a page covered by images for a page without a usable text layer to be
+# treated as scanned (and OCR'd) inside an otherwise legible PDF. Blank separator pages stay as they are.
+SCANNED_PAGE_MIN_IMAGE_COVERAGE = 0.5
+
+
+def _page_image_coverage(page) -> float:
+    """Fraction (0..1) of a pdfplumber page area covered by embedded images."""
+    page_area = float(page.width * page.height) or 1.0
+    covered = 0.0
+    for img in page.images:
+        x0 = max(float(img.get('x0', 0)), 0.0)
+        x1 = min(float(img.get('x1', 0)), float(page.width))
+        top = max(float(img.get('top', 0)), 0.0)
+        bottom = min(float(img.get('bottom', 0)), float(page.height))
+        if x1 > x0 and bottom > top:
+            covered += (x1 - x0) * (bottom - top)
+    return min(covered / page_area, 1.0)
+
+
+def classify_pdf_page(pdf_session: PdfSession, index: int, cid_threshold: float = 0.05) -> dict:
+    """
+    OCR classification of one page (0-based ``index``), same text-layer rules as is_pdf_text_illegible.
+    
+    Returns:
+        {page (1-based), text_chars, cid_ratio, ascii_ratio, image_coverage, is_illegible, is_scanned}.
+        ``is_scanned`` = illegible and either has a (garbled) text layer or is mostly covered by images.
+    """
+    page_text = pdf_session.page_text(index) or ""
+    info = _page_text_legibility(page_text, cid_threshold)
+    try:
+        image_coverage = pdf_session.page_image_coverage(index)
+    except Exception:
+        image_coverage = 0.0
+    info.update({
+        'page': index + 1,
+        'text_chars': len(page_text),
+        'image_coverage': image_coverage,
+    })
+    info['is_scanned'] = info['is_illegible'] and (
+        len(page_text) >= 50 or image_coverage >= SCANNED_PAGE_MIN_IMAGE_COVERAGE
+    )
+    return info
+
+
+def classify_pdf_pages(pdf_path: str, cid_threshold: float = 0.05, session: PdfSession = None) -> list:
+    """
+    Per-page OCR classification (classify_pdf_page) of every page.
+    extract_text_from_pdf() classifies lazily instead, while it reads each page (iter_text_pages).
+    
+    Args:
+        pdf_path: Path to PDF file
+        cid_threshold: Minimum ratio of CID characters to consider a page illegible (default: 5%)
+        session: Optional PdfSession to reuse the open PDF and its cached page text
+    
+    Returns:
+        List of classify_pdf_page() dicts, one per page
+    """
+    with _pdf_session(pdf_path, session) as pdf_session:
+        return [classify_pdf_page(pdf_session, i, cid_threshold) for i in range(pdf_session.page_count)]
+
+
+def is_pdf_text_illegible(pdf_path: str, cid_threshold: float = 0.05, session: PdfSession = None) -> tuple:
     """
     Detects if a PDF has illegible text (CID characters).
     Analyzes first and second page (if available) to determine if PDF is illegible.
@@ -816,52 +1846,25 @@ def is_pdf_text_illegible(pdf_path: str, cid_threshold: float = 0.05) -> tuple:
     Args:
         pdf_path: Path to PDF file
         cid_threshold: Minimum ratio of CID characters to consider illegible (default: 5%)
+        session: Optional PdfSession to reuse the open PDF and its cached page text
     
     Returns:
         Tuple: (is_illegible: bool, cid_ratio: float, ascii_ratio: float)
     """
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            if len(pdf.pages) == 0:
+        with _pdf_session(pdf_path, session) as pdf_session:
+            if pdf_session.page_count == 0:
                 return False, 0.0, 0.0
             
             # Analyze first and second page (if available)
             # Strategy: PDF is illegible only if BOTH pages are illegible (majority strategy)
-            pages_to_check = min(2, len(pdf.pages))
+            pages_to_check = min(2, pdf_session.page_count)
             page_results = []
             
             for i in range(pages_to_check):
-                page = pdf.pages[i]
-                page_text = page.extract_text() or ""
-                
-                if not page_text or len(page_text) < 50:
-                    # If page has no text or very short, consider it illegible
-                    page_results.append({
-                        'page_num': i + 1,
-                        'is_illegible': True,
-                        'cid_ratio': 1.0,
-                        'ascii_ratio': 0.0
-                    })
-                    continue
-                
-                # Count CID characters for this page
-                page_cid_count = page_text.count('(cid:')
-                page_total_chars = len(page_text)
-                page_cid_ratio = page_cid_count / page_total_chars if page_total_chars > 0 else 0.0
-                
-                # Count ASCII characters for this page
-                page_ascii_count = sum(1 for c in page_text if ord(c) < 128)
-                page_ascii_ratio = page_ascii_count / page_total_chars if page_total_chars > 0 else 0.0
-                
-                # Check if this page is illegible
-                page_is_illegible = (page_cid_ratio > cid_threshold) or (page_ascii_ratio < 0.7)
-                
-                page_results.append({
-                    'page_num': i + 1,
-                    'is_illegible': page_is_illegible,
-                    'cid_ratio': page_cid_ratio,
-                    'ascii_ratio': page_ascii_ratio
-                })
+                page_result = _page_text_legibility(pdf_session.page_text(i) or "", cid_threshold)
+                page_result['page_num'] = i + 1
+                page_results.append(page_result)
             
             # Determine overall illegibility using majority strategy
             if pages_to_check == 1:
@@ -887,20 +1890,95 @@ def is_pdf_text_illegible(pdf_path: str, cid_threshold: float = 0.05) -> tuple:
         return True, 1.0, 0.0
 
 
-def _ocr_word_confidence_strict(conf) -> bool:
-    """Default OCR pipeline: same as historical behavior (exclude conf 0 and -1)."""
+def _ocr_float_column(values: list) -> np.ndarray:
+    """Numeric image_to_data column as float64; cells that are not numbers become NaN."""
     try:
-        return float(conf) > 0
+        return np.asarray(values, dtype=np.float64)
     except (TypeError, ValueError):
-        return False
+        out = np.empty(len(values), dtype=np.float64)
+        for i, value in enumerate(values):
+            try:
+                out[i] = float(value)
+            except (TypeError, ValueError):
+                out[i] = np.nan
+        return out
 
 
-def _ocr_word_confidence_included_weak(conf) -> bool:
-    """Banamex mixed RFC-only pass: include conf 0; exclude -1 only."""
-    try:
-        return float(conf) >= 0.0
-    except (TypeError, ValueError):
-        return False
+def _ocr_data_columns(ocr_data: dict) -> dict:
+    """
+    image_to_data dict -> NumPy columns, built once per page and shared by the strict and weak word sets
+    (see _ocr_page_entry). Columns shorter than 'text' are padded with the defaults the per-item
+    conversion used (level/conf/coordinates/line_num 0).
+
+    Returns:
+        Dictionary with 'text' and 'line_num' (lists), 'left', 'top', 'width', 'height' (float arrays),
+        'strict' (level-5 words with conf > 0, the default pipeline) and 'weak' (conf >= 0: also conf 0,
+        for the Banamex mixed RFC pass) boolean masks
+    """
+    text = list(ocr_data.get('text', []))
+    n_items = len(text)
+
+    def column(key):
+        values = list(ocr_data.get(key, [])[:n_items])
+        return values + [0] * (n_items - len(values))
+
+    levels = column('level')
+    level = np.asarray(levels)
+    if level.dtype.kind in 'iuf':
+        is_word = level == 5
+    else:
+        is_word = np.fromiter((v == 5 for v in levels), dtype=bool, count=n_items)
+    is_word &= np.fromiter(map(bool, text), dtype=bool, count=n_items)
+    conf = _ocr_float_column(column('conf'))  # NaN (unparseable conf) fails both comparisons
+    return {
+        'text': text,
+        'line_num': column('line_num'),
+        'left': _ocr_float_column(column('left')),
+        'top': _ocr_float_column(column('top')),
+        'width': _ocr_float_column(column('width')),
+        'height': _ocr_float_column(column('height')),
+        'conf': conf,
+        'strict': is_word & (conf > 0),
+        'weak': is_word & (conf >= 0),
+    }
+
+
+def _ocr_text_from_columns(columns: dict, include_weak_confidence: bool = False) -> str:
+    text = columns['text']
+    return ' '.join(text[i] for i in np.flatnonzero(columns['weak' if include_weak_confidence else 'strict']).tolist())
+
+
+def _ocr_words_from_columns(
+    columns: dict, zoom_normalization_factor: float = 1.0, include_weak_confidence: bool = False
+) -> list:
+    idx = np.flatnonzero(columns['weak' if include_weak_confidence else 'strict'])
+    left, top = columns['left'][idx], columns['top'][idx]
+    width, height = columns['width'][idx], columns['height'][idx]
+    # Normalize coordinates if necessary (to maintain compatibility with calibrated ranges)
+    if zoom_normalization_factor != 1.0:
+        left = left / zoom_normalization_factor
+        top = top / zoom_normalization_factor
+        width = width / zoom_normalization_factor
+        height = height / zoom_normalization_factor
+    text, line_num = columns['text'], columns['line_num']
+    # Clean OCR errors: replace underscores with spaces (common OCR error for spaces)
+    # This helps with cases like "30_ PAGO" → "30  PAGO" → "30 PAGO" after normalization
+    # Examples: "30_ PAGO SERVICIO" → "30 PAGO SERVICIO", "06_1V.A." → "06 1V.A."
+    return [
+        {
+            'text': text[i].replace('_', ' ').strip(),
+            'x0': x0,
+            'top': y0,
+            'x1': x1,
+            'bottom': y1,
+            'conf': conf,
+            'line_num': int(line_num[i]),
+        }
+        for i, x0, y0, x1, y1, conf in zip(
+            idx.tolist(), left.tolist(), top.tolist(), (left + width).tolist(), (top + height).tolist(),
+            columns['conf'][idx].tolist(),
+        )
+    ]
 
 
 def build_multiline_text_from_ocr_words(words: list) -> str:
@@ -938,19 +2016,7 @@ def extract_text_from_ocr_data(ocr_data: dict, include_weak_confidence: bool = F
     Returns:
         Plain text extracted from OCR
     """
-    ok = _ocr_word_confidence_included_weak if include_weak_confidence else _ocr_word_confidence_strict
-    text_parts = []
-    n_items = len(ocr_data.get('text', []))
-    
-    for i in range(n_items):
-        level = ocr_data.get('level', [])[i] if i < len(ocr_data.get('level', [])) else 0
-        text = ocr_data.get('text', [])[i] if i < len(ocr_data.get('text', [])) else ''
-        conf = ocr_data.get('conf', [])[i] if i < len(ocr_data.get('conf', [])) else 0
-        
-        if level == 5 and text and ok(conf):
-            text_parts.append(text)
-    
-    return ' '.join(text_parts)
+    return _ocr_text_from_columns(_ocr_data_columns(ocr_data), include_weak_confidence)
 
 
 def convert_ocr_data_to_words_format(
@@ -958,7 +2024,9 @@ def convert_ocr_data_to_words_format(
 ) -> list:
     """
     Converts OCR data from pytesseract.image_to_data() to word format with real coordinates.
-    Compatible with the format expected by the rest of the code.
+    Compatible with the format expected by the rest of the code. Filtering and zoom normalization run on
+    NumPy columns (_ocr_data_columns); callers needing several word sets of one page should build the
+    columns once and use _ocr_words_from_columns, as _ocr_page_entry does.
     
     Args:
         ocr_data: Dictionary with data from pytesseract.image_to_data()
@@ -970,49 +2038,7 @@ def convert_ocr_data_to_words_format(
         List of dictionaries with format: 
         [{'text': str, 'x0': float, 'top': float, 'x1': float, 'bottom': float, 'conf': float, 'line_num': int}, ...]
     """
-    ok = _ocr_word_confidence_included_weak if include_weak_confidence else _ocr_word_confidence_strict
-    words = []
-    n_items = len(ocr_data.get('text', []))
-    
-    for i in range(n_items):
-        level = ocr_data.get('level', [])[i] if i < len(ocr_data.get('level', [])) else 0
-        text = ocr_data.get('text', [])[i] if i < len(ocr_data.get('text', [])) else ''
-        conf = ocr_data.get('conf', [])[i] if i < len(ocr_data.get('conf', [])) else 0
-        
-        if level == 5 and text and ok(conf):
-            left = float(ocr_data.get('left', [])[i]) if i < len(ocr_data.get('left', [])) else 0
-            top = float(ocr_data.get('top', [])[i]) if i < len(ocr_data.get('top', [])) else 0
-            width = float(ocr_data.get('width', [])[i]) if i < len(ocr_data.get('width', [])) else 0
-            height = float(ocr_data.get('height', [])[i]) if i < len(ocr_data.get('height', [])) else 0
-            line_num = int(ocr_data.get('line_num', [])[i]) if i < len(ocr_data.get('line_num', [])) else 0
-            
-            # Normalize coordinates if necessary (to maintain compatibility with calibrated ranges)
-            if zoom_normalization_factor != 1.0:
-                left = left / zoom_normalization_factor
-                top = top / zoom_normalization_factor
-                width = width / zoom_normalization_factor
-                height = height / zoom_normalization_factor
-            
-            # Clean OCR errors: replace underscores with spaces (common OCR error for spaces)
-            # This helps with cases like "30_ PAGO" → "30  PAGO" → "30 PAGO" after normalization
-            # Examples: "30_ PAGO SERVICIO" → "30 PAGO SERVICIO", "06_1V.A." → "06 1V.A."
-            text_cleaned = text.replace('_', ' ').strip()
-            
-            try:
-                conf_f = float(conf)
-            except (TypeError, ValueError):
-                conf_f = 0.0
-            words.append({
-                'text': text_cleaned,
-                'x0': left,
-                'top': top,
-                'x1': left + width,
-                'bottom': top + height,
-                'conf': conf_f,
-                'line_num': line_num
-            })
-    
-    return words
+    return _ocr_words_from_columns(_ocr_data_columns(ocr_data), zoom_normalization_factor, include_weak_confidence)
 
 
 def fix_ocr_date_errors(date_text: str, bank_name: str = None) -> str:
@@ -1213,231 +2239,1430 @@ def convert_ocr_text_to_words_format(ocr_text: str, page_number: int = 1) -> lis
     return words
 
 
-def extract_text_with_tesseract_ocr(
-    pdf_path: str,
-    lang: str = 'spa+eng',
-    pages: list = None,
-    zoom_factor: float = None,
-    banamex_mixed_rfc: bool = False,
-) -> list:
+def _file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _ocr_cache_key(pdf_hash: str, page_num: int, ocr_params: dict, tesseract_version: str) -> str:
+    """Content-addressed key for one OCR'd page (0-based ``page_num``)."""
+    parts = [
+        pdf_hash,
+        str(page_num),
+        repr(float(ocr_params['zoom_factor'])),
+        ocr_params['lang'],
+        TESSERACT_PAGE_CONFIG,
+        tesseract_version,
+        'banamex_rfc' if ocr_params['banamex_mixed_rfc'] else 'default',
+        repr(float(ocr_params['coordinate_scale'])),
+    ]
+    if ocr_params.get('roi'):
+        parts.append('roi')
+    if ocr_params.get('adaptive'):
+        parts.append('adaptive')
+    if ocr_params.get('contrast') and ocr_params['contrast'] != 1.0:
+        parts.append(f"contrast={float(ocr_params['contrast'])!r}")
+    return hashlib.sha256('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+
+def _ocr_cache_load(cache_dir: str, key: str):
+    """Return the cached page entry for ``key`` (and mark it recently used), or None."""
+    path = os.path.join(cache_dir, key + '.json.gz')
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            entry = json.load(f)
+        os.utime(path, None)  # LRU: eviction removes least recently modified files first
+        return entry
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"[WARNING] OCR cache: ignoring unreadable entry {path}: {e}", flush=True)
+        return None
+
+
+def _ocr_cache_store(cache_dir: str, key: str, entry: dict):
+    """Write one page entry atomically (temp file + rename)."""
+    path = os.path.join(cache_dir, key + '.json.gz')
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except (OSError, TypeError, ValueError) as e:
+        print(f"[WARNING] OCR cache: could not write {path}: {e}", flush=True)
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def _ocr_cache_evict(cache_dir: str, max_mb: float):
+    """Delete least recently used entries until the cache directory fits in ``max_mb``."""
+    try:
+        entries = []
+        for name in os.listdir(cache_dir):
+            if not name.endswith('.json.gz'):
+                continue
+            path = os.path.join(cache_dir, name)
+            st = os.stat(path)
+            entries.append((st.st_mtime, st.st_size, path))
+    except OSError:
+        return
+    total = sum(size for _, size, _ in entries)
+    max_bytes = int(max_mb * 1024 * 1024)
+    if total <= max_bytes:
+        return
+    entries.sort()
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+
+# Columns of Tesseract's TSV output, i.e. the keys of pytesseract.image_to_data(output_type=DICT)
+OCR_DATA_COLUMNS = (
+    'level', 'page_num', 'block_num', 'par_num', 'line_num', 'word_num',
+    'left', 'top', 'width', 'height', 'conf', 'text',
+)
+
+
+def _ocr_tsv_int_column(cells: tuple) -> list:
+    """TSV numeric column -> ints like pytesseract (int(float(cell)), the cell itself if it is not a number)."""
+    try:
+        values = np.asarray(cells, dtype=np.float64)
+        if np.isfinite(values).all():
+            return values.astype(np.int64).tolist()
+    except ValueError:
+        pass
+    out = []
+    for value in cells:
+        try:
+            value = int(float(value))
+        except (ValueError, OverflowError):
+            pass
+        out.append(value)
+    return out
+
+
+def _ocr_tsv_to_dict(tsv: str) -> dict:
     """
-    Extracts text from PDF using local Tesseract OCR.
-    100% private - does not send data to external servers.
-    Uses PyMuPDF to convert PDF to images (does not require Poppler).
+    Tesseract TSV rows -> the dict pytesseract builds for ``image_to_data(output_type=DICT)``: one list per
+    OCR_DATA_COLUMNS key, numeric cells as int (conf truncated like pytesseract), text as str. A header row
+    (the executable's TSV has one, tesserocr's GetTSVText does not) is skipped. Rows are split once and
+    each numeric column is converted as a whole.
+    """
+    n_cols = len(OCR_DATA_COLUMNS)
+    rows = []
+    for row in tsv.strip('\n').split('\n'):
+        if not row.strip():
+            continue
+        cells = row.split('\t')
+        if len(cells) < n_cols:
+            cells.extend([''] * (n_cols - len(cells)))  # empty text at the end of the row
+        rows.append(cells)
+    if rows and rows[0][0] == OCR_DATA_COLUMNS[0]:
+        rows.pop(0)
+    if not rows:
+        return {col: [] for col in OCR_DATA_COLUMNS}
+    columns = list(zip(*rows))
+    data = {col: _ocr_tsv_int_column(columns[i]) for i, col in enumerate(OCR_DATA_COLUMNS[:-1])}
+    data[OCR_DATA_COLUMNS[-1]] = list(columns[n_cols - 1])
+    return data
+
+
+def _parse_tesseract_config(config: str) -> tuple:
+    """``--oem N --psm N -c name=value`` -> (oem or None, psm or None, {name: value})."""
+    oem = psm = None
+    variables = {}
+    tokens = (config or '').split()
+    i = 0
+    while i < len(tokens):
+        tok = tokens[i]
+        nxt = tokens[i + 1] if i + 1 < len(tokens) else None
+        if tok == '--oem' and nxt is not None:
+            oem = int(nxt)
+            i += 1
+        elif tok == '--psm' and nxt is not None:
+            psm = int(nxt)
+            i += 1
+        elif tok == '-c' and nxt is not None and '=' in nxt:
+            name, value = nxt.split('=', 1)
+            variables[name] = value
+            i += 1
+        i += 1
+    return oem, psm, variables
+
+
+class PytesseractEngine:
+    """OCR through the ``tesseract`` executable: one subprocess per call (the fallback engine)."""
+
+    name = 'pytesseract'
+
+    def image_to_data(self, img, lang: str, config: str = TESSERACT_PAGE_CONFIG) -> dict:
+        # Raw TSV parsed by column (_ocr_tsv_to_dict) instead of pytesseract's cell-by-cell DICT building
+        tsv = pytesseract.image_to_data(img, lang=lang, output_type=pytesseract.Output.STRING, config=config)
+        return _ocr_tsv_to_dict(tsv.strip())  # strip() as pytesseract does before splitting rows
+
+    def image_to_string(self, img, lang: str, config: str = TESSERACT_PAGE_CONFIG) -> str:
+        return pytesseract.image_to_string(img, lang=lang, config=config)
+
+    @staticmethod
+    def version() -> str:
+        return str(pytesseract.get_tesseract_version())
+
+
+class TesserocrEngine:
+    """
+    OCR in this process through libtesseract (tesserocr). One initialized API handle is kept per
+    (lang, config), so a page costs SetImage + recognition instead of starting ``tesseract`` and
+    loading the language models again. Returns the same data as PytesseractEngine (``GetTSVText``
+    is the TSV the executable writes for ``image_to_data``).
+    """
+
+    name = 'tesserocr'
+
+    def __init__(self, lang: str, tessdata_path: str = None):
+        import tesserocr
+        self._tesserocr = tesserocr
+        self._tessdata_path = tessdata_path
+        self._apis = {}
+        self._api(lang, TESSERACT_PAGE_CONFIG)  # fail here (missing language data...) rather than mid-run
+
+    def _api(self, lang: str, config: str):
+        key = (lang, config)
+        api = self._apis.get(key)
+        if api is None:
+            oem, psm, variables = _parse_tesseract_config(config)
+            kwargs = {'lang': lang, 'variables': variables}
+            if oem is not None:
+                kwargs['oem'] = oem
+            if psm is not None:
+                kwargs['psm'] = psm
+            if self._tessdata_path:
+                kwargs['path'] = self._tessdata_path
+            api = self._tesserocr.PyTessBaseAPI(**kwargs)
+            self._apis[key] = api
+        return api
+
+    def image_to_data(self, img, lang: str, config: str = TESSERACT_PAGE_CONFIG) -> dict:
+        api = self._api(lang, config)
+        try:
+            api.SetImage(img)
+            return _ocr_tsv_to_dict(api.GetTSVText(0))
+        finally:
+            api.Clear()  # drop this page's image and results; the loaded models stay
+
+    def image_to_string(self, img, lang: str, config: str = TESSERACT_PAGE_CONFIG) -> str:
+        api = self._api(lang, config)
+        try:
+            api.SetImage(img)
+            return api.GetUTF8Text()
+        finally:
+            api.Clear()
+
+    @staticmethod
+    def version() -> str:
+        """Wheel, libtesseract and traineddata versions (part of the OCR cache key)."""
+        global _TESSEROCR_VERSION
+        if _TESSEROCR_VERSION is None:
+            from importlib.metadata import version
+            _TESSEROCR_VERSION = f"tesserocr {version('tesserocr')}; {_tesserocr_library_version()}"
+        return _TESSEROCR_VERSION
+
+
+# TesserocrEngine.version() of this process (computed once)
+_TESSEROCR_VERSION = None
+
+
+def _tesserocr_library_version() -> str:
+    """
+    libtesseract version plus a fingerprint of the traineddata files tesserocr loads. Asked in a child
+    process: importing tesserocr here would load libtesseract in the parent process (see
+    _ocr_pages_in_process_pool).
+    """
+    script = "import tesserocr; print(tesserocr.get_languages()[0]); print(tesserocr.tesseract_version())"
+    try:
+        out = subprocess.run(
+            [sys.executable, '-c', script], capture_output=True, text=True, timeout=120, check=True,
+        ).stdout.split('\n')
+    except (OSError, subprocess.SubprocessError) as e:
+        return f"libtesseract unknown ({type(e).__name__})"
+    library = out[1].strip() if len(out) > 1 else 'libtesseract unknown'
+    tessdata = _tessdata_dir() or out[0].strip()
+    h = hashlib.sha256()
+    try:
+        for name in sorted(os.listdir(tessdata)):
+            if name.endswith('.traineddata'):
+                st = os.stat(os.path.join(tessdata, name))
+                h.update(f"{name}:{st.st_size}:{int(st.st_mtime)};".encode('utf-8'))
+    except OSError:
+        pass
+    return f"{library}; traineddata {h.hexdigest()[:16]}"
+
+
+_OCR_ENGINE_CLASSES = {'pytesseract': PytesseractEngine, 'tesserocr': TesserocrEngine}
+
+# Engines created in this process (one per process: each OCR worker builds its own)
+_OCR_ENGINE_CACHE = {}
+
+
+def resolve_ocr_engine_name(name: str = None) -> str:
+    """'tesserocr' or 'pytesseract' for ``name`` (default ``--ocr-engine``); 'auto' prefers tesserocr."""
+    name = name or _parse_ocr_engine_from_argv()
+    if name == 'auto':
+        return 'tesserocr' if TESSEROCR_AVAILABLE else 'pytesseract'
+    if name == 'tesserocr' and not TESSEROCR_AVAILABLE:
+        print("[WARNING] --ocr-engine tesserocr: tesserocr is not installed (pip install tesserocr); using pytesseract", flush=True)
+        return 'pytesseract'
+    return name
+
+
+def _tessdata_dir() -> str:
+    """tessdata folder next to a configured tesseract executable (Windows installs), else None (library default)."""
+    cmd = pytesseract.pytesseract.tesseract_cmd if TESSERACT_AVAILABLE else None
+    if cmd and os.path.isabs(cmd):
+        path = os.path.join(os.path.dirname(cmd), 'tessdata')
+        if os.path.isdir(path):
+            return path
+    return None
+
+
+def get_ocr_engine(name: str = None, lang: str = 'spa+eng'):
+    """
+    OCR engine for this process, created on first use and reused for every page.
     
     Args:
-        pdf_path: Path to PDF file
-        lang: Language for OCR (default: 'spa+eng' for Spanish+English)
-        pages: Optional 1-based page numbers to process (e.g. [1, 3]). If None, all pages are processed.
-        zoom_factor: PyMuPDF render scale. If None, uses ``--ocr-zoom`` from sys.argv if set, else ``OCR_RENDER_ZOOM``.
-        banamex_mixed_rfc: If True (Banamex mixed PDFs only), also fill per-page ``banamex_rfc_ocr_text`` and
-            ``words_rfc`` using row-ordered text and weaker confidence thresholds — **RFC extraction only**;
-            on pages 1–2, may also set ``banamex_rfc_band_ocr_text`` from a second OCR pass on the pixel band
-            between tarjeta and sucursal (bold/image RFC values). Default ``content`` / ``words`` stay unchanged
-            for movements and the rest of the pipeline.
-    
-    CLI:
-        --ocr-zoom <float>  Render scale (default ``OCR_RENDER_ZOOM``). Word coordinates use ``zoom_factor / 2.0``.
-        --ocr-zoom-sweep        OCR only: zoom 1..8 → ``{stem}_ocr_zoom_sweep/*.txt`` (no Excel).
-        --ocr-zoom-sweep-excel  Full PDF→Excel per zoom → ``{stem}_ocr_zoom_sweep_excel/*_zoom{N}.xlsx``.
-        --ocr-save-visual  Optional debug: writes PNGs per page next to the PDF (not in BUP):
-            ``{pdf_stem}_ocr_visual/page_NNN_raw_rgb.png`` — PNG from PyMuPDF before mode normalization
-            ``{pdf_stem}_ocr_visual/page_NNN_tesseract_input.png`` — exact image passed to Tesseract (RGB; same pixels as raw when already RGB)
-            Use these to zoom in and check whether misread digits (e.g. 7 vs 1) come from the bitmap.
-        Tesseract config matches pdf_to_excel-BUP.py: ``--oem 1 --psm 6``; no PIL contrast/sharpen (raw raster).
+        name: 'auto', 'tesserocr' or 'pytesseract' (default: ``--ocr-engine``)
+        lang: Tesseract language(s) loaded when the tesserocr handle is created
     
     Returns:
-        List of dictionaries with format: [{"page": int, "content": str, "words": list}, ...]
-        Compatible with the return format of extract_text_from_pdf.
-    
-    Raises:
-        Exception: If Tesseract is not available or there is an error
+        Object with ``image_to_data(img, lang, config)`` (pytesseract DICT layout, as consumed by
+        ``convert_ocr_data_to_words_format``) and ``image_to_string(img, lang, config)``. Falls back to
+        pytesseract if tesserocr cannot be started.
     """
-    if not TESSERACT_AVAILABLE:
-        raise Exception("Tesseract OCR is not available. Install: pip install pytesseract pymupdf pillow")
+    name = resolve_ocr_engine_name(name)
+    engine = _OCR_ENGINE_CACHE.get(name)
+    if engine is None:
+        if name == 'tesserocr':
+            try:
+                engine = TesserocrEngine(lang, tessdata_path=_tessdata_dir())
+            except Exception as e:
+                print(f"[WARNING] tesserocr could not start ({e}); using pytesseract", flush=True)
+                engine = PytesseractEngine()
+        else:
+            engine = PytesseractEngine()
+        _OCR_ENGINE_CACHE[name] = engine
+    return engine
+
+
+def _ocr_roi_scout_page(doc, page_num: int, ocr_params: dict) -> dict:
+    """
+    Cheap OCR pass for ``--ocr-roi``: the page rendered at OCR_ROI_SCOUT_ZOOM, reduced to text lines.
     
-    # Configure Tesseract if necessary
-    if not configure_tesseract():
-        raise Exception("Tesseract OCR not found. Install Tesseract from: https://github.com/UB-Mannheim/tesseract/wiki")
+    Returns:
+        {"page": int, "width": float, "height": float, "content": str, "lines": [(text, top, bottom), ...],
+        "entry": page entry}: lines in PDF points sorted top to bottom; "entry" is the page entry of this
+        OCR (``_ocr_page_entry`` at the scout zoom), kept for pages outside the table. "lines" and "entry"
+        are None on rotated pages (they are always OCR'd whole)
+    """
+    page = doc[page_num]
+    entry = {
+        "page": page_num + 1, "width": page.rect.width, "height": page.rect.height,
+        "content": "", "lines": None, "entry": None,
+    }
+    if page.rotation:
+        return entry
+    zoom = OCR_ROI_SCOUT_ZOOM
+    _pix, img = _render_for_ocr(page, zoom)
+    lang = ocr_params['lang']
+    engine = get_ocr_engine(ocr_params.get('ocr_engine'), lang)
+    ocr_data = engine.image_to_data(img, lang=lang, config=TESSERACT_PAGE_CONFIG)
+    entry["entry"] = _ocr_page_entry(ocr_data, img, page_num, dict(ocr_params, zoom_factor=zoom), engine)
+    lines = {}
+    for i, text in enumerate(ocr_data.get('text', [])):
+        if ocr_data['level'][i] != 5 or not str(text).strip():
+            continue
+        key = (ocr_data['block_num'][i], ocr_data['par_num'][i], ocr_data['line_num'][i])
+        top = ocr_data['top'][i] / zoom
+        bottom = (ocr_data['top'][i] + ocr_data['height'][i]) / zoom
+        line = lines.get(key)
+        if line is None:
+            lines[key] = [[str(text)], top, bottom]
+        else:
+            line[0].append(str(text))
+            line[1] = min(line[1], top)
+            line[2] = max(line[2], bottom)
+    entry["lines"] = sorted(((' '.join(w), top, bottom) for w, top, bottom in lines.values()), key=lambda l: l[1])
+    entry["content"] = '\n'.join(l[0] for l in entry["lines"])
+    return entry
+
+
+def _ocr_roi_regions(scouts: list, bank_name: str) -> tuple:
+    """
+    Page regions to OCR at full zoom in ``--ocr-roi`` mode, from the scout pass (pages outside the table
+    are handled by ``_ocr_roi_scout``). On the page with
+    movements_start, everything above the marker is kept at full width (header, RFC, period, summary).
+    Table rows are kept down to the last line with an amount plus the lines packed right below it
+    (wrapped descriptions); below the next gap of OCR_ROI_FOOTER_GAP_PT (page footer, legal text) the
+    page is skipped. When the bank has "columns_ocr", the table band is narrowed to their X extent. On
+    the page with movements_end, everything from the marker down is kept at full width (totals).
     
-    print("[INFO] Extracting text with local Tesseract OCR (100% private)...", flush=True)
+    Args:
+        scouts: Scout entries in page order (see _ocr_roi_scout_page). Pages without "lines" (cached,
+            rotated) only carry the table state through their "content".
+        bank_name: Detected bank; None or unknown keeps every page whole
     
-    if zoom_factor is not None:
-        zf = float(zoom_factor)
-    else:
-        zf = _parse_ocr_zoom_from_argv()
-        if zf is None:
-            zf = float(OCR_RENDER_ZOOM)
-    zoom_factor = zf
-    print(f"[INFO] OCR render zoom: {zoom_factor} (≈{72.0 * zoom_factor:.0f} DPI effective)", flush=True)
+    Returns:
+        (regions, table): regions is {0-based page: [(x0, y0, x1, y1), ...]} in PDF points, top to bottom,
+        for the pages to crop; table is (first page, last page) of the movements table (0-based, last is
+        None while movements_end has not been seen), or None when movements_start was not found
+    """
+    bank_config = BANK_CONFIGS.get(bank_name) if bank_name else None
+    if not bank_config:
+        return {}, None
+    profile = get_bank_profile(bank_name)
+    start_patterns = [p for p in (profile.movements_start_ocr_pattern, profile.movements_start_pattern) if p]
+    end_patterns = [
+        re.compile(re.escape(bank_config[key]), re.I)
+        for key in ('movements_end_ocr', 'movements_end', 'movements_end_new_format') if bank_config.get(key)
+    ]
+    if not start_patterns or not end_patterns:
+        return {}, None
+    layout = profile.column_layout('columns_ocr')
+    if layout:
+        table_x0 = max(0.0, layout.bounds[0] / OCR_COORDINATE_SCALE - OCR_ROI_MARGIN_PT)
+        table_x1 = layout.bounds[-1] / OCR_COORDINATE_SCALE + OCR_ROI_MARGIN_PT
+    
+    def _first_match(patterns, lines, first=0):
+        return next((i for i in range(first, len(lines)) if any(p.search(lines[i][0]) for p in patterns)), None)
+    
+    def _gap_above(lines, i):
+        return (lines[i - 1][2] + lines[i][1]) / 2 if i > 0 else max(0.0, lines[i][1] - OCR_ROI_MARGIN_PT)
+    
+    regions = {}
+    first_page = None
+    for scout in scouts:
+        page_num = scout["page"] - 1
+        lines = scout.get("lines")
+        if lines is None:
+            content = scout.get("content") or ""
+            start = None if first_page is not None else next((m for m in (p.search(content) for p in start_patterns) if m), None)
+            if first_page is not None or start:
+                if first_page is None:
+                    first_page = page_num
+                if any(p.search(content, start.end() if start else 0) for p in end_patterns):
+                    return regions, (first_page, page_num)
+            continue
+        start_idx = None
+        if first_page is None:
+            start_idx = _first_match(start_patterns, lines)
+            if start_idx is None:
+                continue
+            first_page = page_num
+        first_row = start_idx + 1 if start_idx is not None else 0
+        end_idx = _first_match(end_patterns, lines, first_row)
+        width, height = scout["width"], scout["height"]
+        table_top = _gap_above(lines, start_idx) if start_idx is not None else 0.0
+        if end_idx is not None:
+            table_bottom = _gap_above(lines, end_idx)
+        else:
+            amount_idx = [i for i in range(first_row, len(lines)) if BANK_DETECTION_AMOUNT_PATTERN.search(lines[i][0])]
+            if not amount_idx:
+                continue
+            last = amount_idx[-1]
+            while last + 1 < len(lines) and lines[last + 1][1] - lines[last][2] <= OCR_ROI_FOOTER_GAP_PT:
+                last += 1
+            table_bottom = min(height, lines[last][2] + OCR_ROI_MARGIN_PT)
+        rects = []
+        if table_top > 0:
+            rects.append((0.0, 0.0, width, table_top))
+        if table_bottom > table_top:
+            x0, x1 = (table_x0, min(width, table_x1)) if layout else (0.0, width)
+            rects.append((x0, table_top, x1, table_bottom))
+        if end_idx is not None:
+            rects.append((0.0, table_bottom, width, height))
+        regions[page_num] = rects
+        if end_idx is not None:
+            return regions, (first_page, page_num)
+    return regions, None if first_page is None else (first_page, None)
+
+
+def _ocr_roi_scout(
+    pdf_path: str,
+    page_indices: list,
+    cached: dict,
+    total_pages: int,
+    ocr_params: dict,
+    n_workers: int,
+    bank_name: str = None,
+    subset: bool = False,
+) -> tuple:
+    """
+    Scout pass of ``--ocr-roi``: pages are scouted in page order, ``n_workers`` at a time, until the
+    page with movements_end; pages after it are never scouted.
     
-    ocr_save_visual = '--ocr-save-visual' in sys.argv
-    ocr_visual_dir = None
-    if ocr_save_visual:
-        _base = os.path.splitext(os.path.abspath(pdf_path))[0]
-        ocr_visual_dir = _base + '_ocr_visual'
-        try:
-            os.makedirs(ocr_visual_dir, exist_ok=True)
-            print(f"[INFO] --ocr-save-visual: writing page images -> {ocr_visual_dir}", flush=True)
-        except OSError as e:
-            print(f"[WARNING] --ocr-save-visual: could not create {ocr_visual_dir}: {e}", flush=True)
-            ocr_visual_dir = None
+    When the movements table is found, only its pages are OCR'd again at full zoom (cropped by
+    ``_ocr_roi_regions``, whole when the scout found no rows on them). Scouted pages before or after the
+    table keep the scout OCR, and pages after the scouted ones are OCR'd only over their top
+    OCR_ROI_HEADER_STRIP (page header). When no table is found, every page is OCR'd whole.
     
-    extracted_data = []
+    Args:
+        page_indices: 0-based pages of the run, in order
+        cached: {page: entry} already read from the OCR cache (not scouted; their text carries the table state)
+        bank_name: Detected bank; if None, it is detected from the scouted text
     
+    Returns:
+        (regions, entries, bank): regions is {page: [(x0, y0, x1, y1), ...]} to OCR at full zoom (see
+        ``_ocr_page_regions``), entries is {page: page entry} for pages that need no further OCR, bank the
+        bank used to find the table
+    """
+    scout_params = dict(ocr_params, roi_scout=True, zoom_factor=OCR_ROI_SCOUT_ZOOM)
+    scouts = {p: {"page": p + 1, "content": e.get('content') or ''} for p, e in cached.items()}
+    window = max(1, n_workers)
+    regions, table, bank = {}, None, bank_name
+    scouted = 0
+    while scouted < len(page_indices) and not (table and table[1] is not None):
+        chunk = [p for p in page_indices[scouted:scouted + window] if p not in scouts]
+        scouted += window
+        if chunk:
+            scouts.update(_ocr_pages(pdf_path, chunk, total_pages, scout_params, n_workers, subset))
+        scout_list = [scouts[p] for p in page_indices[:scouted]]
+        # Without a fallback until every page is scouted: an early page may just lack the bank name
+        bank = bank_name or detect_bank_from_pages(
+            (sc["content"] for sc in scout_list), from_ocr=True, fallback=scouted >= len(page_indices)
+        )
+        regions, table = _ocr_roi_regions(scout_list, bank)
+    if table is None:
+        return {}, {}, bank
+    first_page, last_page = table
+    entries = {}
+    doc = fitz.open(pdf_path)
     try:
-        # Use PyMuPDF to convert PDF to images (does not require Poppler)
-        doc = fitz.open(pdf_path)
-        
-        # Get page dimensions for DPI calculation (use first page as reference)
-        first_page = doc[0]
-        page_width_pts = first_page.rect.width
-        page_height_pts = first_page.rect.height
-        page_width_inches = page_width_pts / 72.0
-        page_height_inches = page_height_pts / 72.0
-        
-        # Render zoom resolved above (OCR_RENDER_ZOOM, --ocr-zoom, or zoom_factor argument)
-        target_dpi = int(round(72.0 * zoom_factor))
-        effective_dpi = 72.0 * zoom_factor
-        
-        # Calculate resulting image dimensions in pixels
-        img_width_px = int(page_width_pts * zoom_factor)
-        img_height_px = int(page_height_pts * zoom_factor)
-        
-        # Show DPI calculation info (only for first page to avoid spam) — commented to reduce console noise
-        # print(f"[INFO] Page dimensions: {page_width_pts:.1f} x {page_height_pts:.1f} pts ({page_width_inches:.2f} x {page_height_inches:.2f} inches)")
-        # print(f"[INFO] Target DPI: {target_dpi} DPI (zoom: {zoom_factor:.1f}x)")
-        # print(f"[INFO] Using zoom: {zoom_factor:.1f}x → Effective DPI: {effective_dpi:.0f} DPI")
-        # print(f"[INFO] Image size: {img_width_px} x {img_height_px} pixels")
-        # if effective_dpi < 300:
-        #     print(f"[WARNING] DPI ({effective_dpi:.0f}) is below recommended 300 DPI for OCR")
-        # elif effective_dpi > 500:
-        #     print(f"[INFO] DPI ({effective_dpi:.0f}) is high - may have diminishing returns beyond 400-500 DPI")
-        # else:
-        #     print(f"[INFO] DPI ({effective_dpi:.0f}) is within optimal range for OCR accuracy")
-        
-        total_pages = len(doc)
-        if pages is not None:
-            invalid = [p for p in pages if p < 1 or p > total_pages]
-            if invalid:
-                doc.close()
-                raise ValueError(f"Page(s) {invalid} do not exist. PDF has {total_pages} page(s).")
-            page_indices = [p - 1 for p in pages]
-        else:
-            page_indices = list(range(total_pages))
-        
-        for page_num in page_indices:
-            page = doc[page_num]
-            if pages is not None:
-                print(f"[INFO] Processing page {page_num + 1} with OCR...", flush=True)
-            else:
-                print(f"[INFO] Processing page {page_num + 1}/{total_pages} with OCR...", flush=True)
-            
-            # Convert page to image (high resolution)
-            # Coordinates will be normalized later to maintain compatibility with column ranges calibrated for 2.0x
-            mat = fitz.Matrix(zoom_factor, zoom_factor)
-            pix = page.get_pixmap(matrix=mat)
-            img_data = pix.tobytes("png")
-            
-            # Convert to PIL Image
-            from io import BytesIO
-            img = Image.open(BytesIO(img_data))
-            
-            # Tesseract input: PyMuPDF bitmap with RGB/RGBA normalization only (no contrast/sharpen).
-            img_for_ocr = _preprocess_pil_image_for_tesseract(img)
-            
-            if ocr_visual_dir:
-                try:
-                    _pl = f"page_{page_num + 1:03d}"
-                    img.save(os.path.join(ocr_visual_dir, f"{_pl}_raw_rgb.png"))
-                    img_for_ocr.save(os.path.join(ocr_visual_dir, f"{_pl}_tesseract_input.png"))
-                except OSError as e:
-                    print(f"[WARNING] --ocr-save-visual: could not save {_pl} PNGs: {e}", flush=True)
-            
-            # Perform OCR (same as pdf_to_excel-BUP.py: PSM 6, OEM 1 LSTM)
-            tesseract_config = r'--oem 1 --psm 6'
-            ocr_data = pytesseract.image_to_data(img_for_ocr, lang=lang, output_type=pytesseract.Output.DICT, config=tesseract_config)
-            
-            # Default pipeline: strict confidence + legacy flat text (same as pdf_to_excel-BUP).
-            zn = zoom_factor / 2.0
-            words = convert_ocr_data_to_words_format(ocr_data, zoom_normalization_factor=zn, include_weak_confidence=False)
-            text = extract_text_from_ocr_data(ocr_data, include_weak_confidence=False)
-            page_entry = {
-                "page": page_num + 1,
-                "content": text,
-                "words": words,
-            }
-            # Banamex mixed only: auxiliary row-ordered text + weaker words for RFC regex / geometry (not for movements).
-            if banamex_mixed_rfc:
-                words_rfc = convert_ocr_data_to_words_format(ocr_data, zoom_normalization_factor=zn, include_weak_confidence=True)
-                page_entry["words_rfc"] = words_rfc
-                page_entry["banamex_rfc_ocr_text"] = build_multiline_text_from_ocr_words(words_rfc)
-                # Bold / image-only RFC between tarjeta and sucursal: second pass on that pixel band only.
-                if page_num + 1 in (1, 2):
-                    _raw_band, _rfc_band = banamex_second_pass_rfc_tarjeta_sucursal_band(
-                        img_for_ocr, words_rfc, zoom_factor, lang=lang
-                    )
-                    if _raw_band:
-                        page_entry["banamex_rfc_band_ocr_text"] = _raw_band
-            extracted_data.append(page_entry)
-        
+        for p in page_indices:
+            if p in cached or p in regions:
+                continue
+            if p in scouts:
+                if (p < first_page or (last_page is not None and p > last_page)) and scouts[p].get("entry"):
+                    entries[p] = scouts[p]["entry"]
+            elif not doc[p].rotation:
+                rect = doc[p].rect
+                regions[p] = [(0.0, 0.0, rect.width, rect.height * OCR_ROI_HEADER_STRIP)]
+    finally:
         doc.close()
-        
-        print(f"[OK] OCR completed. Pages processed: {len(extracted_data)}", flush=True)
-        return extracted_data
-        
-    except Exception as e:
-        raise Exception(f"Error en Tesseract OCR: {e}")
+    return regions, entries, bank
 
 
-def run_ocr_zoom_sweep(pdf_path: str, zoom_min: int = 1, zoom_max: int = 8) -> str:
+def _ocr_page_regions(page, page_num: int, regions: list, ocr_params: dict, engine) -> dict:
     """
-    Run ``extract_text_with_tesseract_ocr`` at integer zoom ``zoom_min``..``zoom_max`` (OCR only, no Excel).
-    Writes ``full_text_zoom{N}.txt`` per zoom and ``summary.txt`` under ``{pdf_stem}_ocr_zoom_sweep/``.
-    For the full pipeline (movements, validation, .xlsx), use ``run_ocr_zoom_sweep_excel`` or ``--ocr-zoom-sweep-excel``.
-
-    Returns:
-        Path to the output directory.
+    OCR only ``regions`` (PDF points) of ``page`` at the run's zoom and merge the results into one
+    image_to_data dict in full-page pixel coordinates (as if the whole page had been OCR'd).
+    """
+    zoom_factor = ocr_params['zoom_factor']
+    lang = ocr_params['lang']
+    ocr_visual_dir = ocr_params['ocr_visual_dir']
+    merged = {col: [] for col in OCR_DATA_COLUMNS}
+    block_offset = 0
+    for region_idx, rect in enumerate(regions, start=1):
+        clip = fitz.Rect(rect) & page.rect
+        if clip.is_empty:
+            continue
+        pix, img_for_ocr = _render_for_ocr(page, zoom_factor, clip, ocr_params.get('contrast'))
+        if ocr_visual_dir:
+            try:
+                img_for_ocr.save(os.path.join(ocr_visual_dir, f"page_{page_num + 1:03d}_roi{region_idx}_tesseract_input.png"))
+            except OSError as e:
+                print(f"[WARNING] --ocr-save-visual: could not save page {page_num + 1} region {region_idx}: {e}", flush=True)
+        data = engine.image_to_data(img_for_ocr, lang=lang, config=TESSERACT_PAGE_CONFIG)
+        # pix.x / pix.y: the crop's origin in the full-page pixel grid
+        n_rows = len(data.get('text', []))
+        for col in OCR_DATA_COLUMNS:
+            values = data.get(col) or [0] * n_rows
+            if col == 'left':
+                values = [v + pix.x if isinstance(v, int) else v for v in values]
+            elif col == 'top':
+                values = [v + pix.y if isinstance(v, int) else v for v in values]
+            elif col == 'block_num':
+                values = [v + block_offset if isinstance(v, int) else v for v in values]
+            merged[col].extend(values)
+        block_offset = max([block_offset] + [v for v in merged['block_num'] if isinstance(v, int)])
+    return merged
+
+
+def _render_for_ocr(page, zoom: float, clip=None, contrast=None) -> tuple:
+    """
+    Render ``page`` (or the ``clip`` rect, PDF points) at ``zoom``; returns (pixmap, Tesseract input image).
+    ``contrast``: ``--ocr-contrast`` factor applied to the Tesseract input.
+    """
+    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), clip=clip)
+    img_for_ocr = _preprocess_pil_image_for_tesseract(_pixmap_to_pil(pix))
+    img_for_ocr.format = 'PPM'
+    return pix, _apply_ocr_contrast(img_for_ocr, contrast)
+
+
+def _ocr_suspect_word(text: str, conf) -> bool:
+    """Word worth a second look at higher zoom: low Tesseract confidence, or an amount that fails DEC_AMOUNT_RE."""
+    token = str(text).strip()
+    if not any(c.isalnum() for c in token):
+        return False  # specks and punctuation
+    try:
+        if 0 <= float(conf) < OCR_ADAPTIVE_MIN_CONF:
+            return True
+    except (TypeError, ValueError):
+        pass
+    return bool(OCR_AMOUNT_LIKE_PATTERN.match(token)) and not DEC_AMOUNT_RE.fullmatch(token.strip('$+-()'))
+
+
+def _ocr_page_adaptive(page, page_num: int, ocr_params: dict, engine) -> dict:
+    """
+    ``--ocr-adaptive``: OCR the page at OCR_ADAPTIVE_BASE_ZOOM, then re-OCR at the run's zoom only the
+    bands of lines holding a suspect word (``_ocr_suspect_word``). Lines that overlap vertically are
+    kept in the same band, and band edges fall in the gaps between lines. When the bands cover more than
+    OCR_ADAPTIVE_MAX_BAND_FRACTION of the page, the whole page is OCR'd at the run's zoom instead.
+    
+    Returns:
+        image_to_data dict in the pixel space of the run's zoom (as if the page had been OCR'd at it);
+        words of the re-OCR'd lines come from the higher zoom, in their original reading position
+    """
+    zoom_factor = ocr_params['zoom_factor']
+    lang = ocr_params['lang']
+    ocr_visual_dir = ocr_params['ocr_visual_dir']
+    base = OCR_ADAPTIVE_BASE_ZOOM
+    _pl = f"page_{page_num + 1:03d}"
+    
+    _pix, img_for_ocr = _render_for_ocr(page, base, contrast=ocr_params.get('contrast'))
+    if ocr_visual_dir:
+        try:
+            img_for_ocr.save(os.path.join(ocr_visual_dir, f"{_pl}_tesseract_input.png"))
+        except OSError as e:
+            print(f"[WARNING] --ocr-save-visual: could not save {_pl} PNGs: {e}", flush=True)
+    low = engine.image_to_data(img_for_ocr, lang=lang, config=TESSERACT_PAGE_CONFIG)
+    
+    # Line boxes (PDF points) and the lines with a suspect word
+    line_boxes = {}
+    suspect = set()
+    for i, text in enumerate(low.get('text', [])):
+        if low['level'][i] != 5 or not str(text).strip():
+            continue
+        key = (low['block_num'][i], low['par_num'][i], low['line_num'][i])
+        top = low['top'][i] / base
+        bottom = (low['top'][i] + low['height'][i]) / base
+        box = line_boxes.setdefault(key, [top, bottom])
+        box[0] = min(box[0], top)
+        box[1] = max(box[1], bottom)
+        if _ocr_suspect_word(text, low['conf'][i]):
+            suspect.add(key)
+    
+    scale = zoom_factor / base
+    scaled = {
+        col: [int(round(v * scale)) if col in ('left', 'top', 'width', 'height') and isinstance(v, int) else v for v in values]
+        for col, values in low.items()
+    }
+    if not suspect:
+        return scaled
+    
+    # Clusters of vertically overlapping lines, top to bottom: [top, bottom, has_suspect, line keys]
+    clusters = []
+    for key, (top, bottom) in sorted(line_boxes.items(), key=lambda kv: kv[1][0]):
+        if clusters and top <= clusters[-1][1]:
+            cluster = clusters[-1]
+            cluster[1] = max(cluster[1], bottom)
+            cluster[2] = cluster[2] or key in suspect
+            cluster[3].add(key)
+        else:
+            clusters.append([top, bottom, key in suspect, {key}])
+    # Bands: runs of consecutive suspect clusters, cut halfway to the neighbouring clusters
+    page_rect = page.rect
+    bands = []  # [y0, y1, line keys]
+    for j, (top, bottom, has_suspect, keys) in enumerate(clusters):
+        if not has_suspect:
+            continue
+        y0 = max(top - OCR_ADAPTIVE_BAND_PAD_PT, (clusters[j - 1][1] + top) / 2 if j > 0 else page_rect.y0)
+        y1 = min(bottom + OCR_ADAPTIVE_BAND_PAD_PT, (bottom + clusters[j + 1][0]) / 2 if j + 1 < len(clusters) else page_rect.y1)
+        if bands and j > 0 and clusters[j - 1][2]:
+            bands[-1][1] = y1
+            bands[-1][2] |= keys
+        else:
+            bands.append([y0, y1, set(keys)])
+    
+    if sum(y1 - y0 for y0, y1, _ in bands) > OCR_ADAPTIVE_MAX_BAND_FRACTION * page_rect.height:
+        _pix, img_full = _render_for_ocr(page, zoom_factor, contrast=ocr_params.get('contrast'))
+        return engine.image_to_data(img_full, lang=lang, config=TESSERACT_PAGE_CONFIG)
+    
+    # Re-OCR each band at the run's zoom, shifted into full-page pixels
+    block_offset = max([v for v in low.get('block_num', []) if isinstance(v, int)] or [0])
+    band_data = []
+    for band_idx, (y0, y1, _keys) in enumerate(bands, start=1):
+        pix, img_band = _render_for_ocr(
+            page, zoom_factor, fitz.Rect(page_rect.x0, y0, page_rect.x1, y1) & page_rect, ocr_params.get('contrast')
+        )
+        if ocr_visual_dir:
+            try:
+                img_band.save(os.path.join(ocr_visual_dir, f"{_pl}_band{band_idx}_tesseract_input.png"))
+            except OSError as e:
+                print(f"[WARNING] --ocr-save-visual: could not save {_pl} band {band_idx}: {e}", flush=True)
+        data = engine.image_to_data(img_band, lang=lang, config=TESSERACT_PAGE_CONFIG)
+        for col, delta in (('left', pix.x), ('top', pix.y), ('block_num', block_offset)):
+            data[col] = [v + delta if isinstance(v, int) else v for v in data.get(col, [])]
+        block_offset = max([block_offset] + [v for v in data['block_num'] if isinstance(v, int)])
+        band_data.append(data)
+    
+    # Merge: word rows of re-OCR'd lines are replaced by their band's rows, at the first replaced row
+    band_of_line = {key: k for k, (_y0, _y1, keys) in enumerate(bands) for key in keys}
+    merged = {col: [] for col in OCR_DATA_COLUMNS}
+    emitted = set()
+    for i in range(len(scaled.get('text', []))):
+        k = None
+        if scaled['level'][i] == 5:
+            k = band_of_line.get((scaled['block_num'][i], scaled['par_num'][i], scaled['line_num'][i]))
+        if k is None:
+            for col in OCR_DATA_COLUMNS:
+                merged[col].append(scaled[col][i])
+        elif k not in emitted:
+            emitted.add(k)
+            for col in OCR_DATA_COLUMNS:
+                merged[col].extend(band_data[k].get(col, []))
+    return merged
+
+
+# Per-process state for parallel OCR workers (see _ocr_pages_in_process_pool)
+_OCR_WORKER_DOC = None
+
+
+def _ocr_single_page(doc, page_num: int, ocr_params: dict) -> dict:
+    """
+    Render one page (0-based ``page_num``) of an open PyMuPDF document and OCR it.
+    ``ocr_params`` holds zoom_factor, lang, banamex_mixed_rfc, ocr_visual_dir, coordinate_scale, ocr_engine
+    and contrast (see ``extract_text_with_tesseract_ocr``).
+    Returns the page entry used by ``extract_text_with_tesseract_ocr`` ({"page", "content", "words"} plus
+    Banamex RFC extras when ``banamex_mixed_rfc`` is set). With ``roi_scout`` set, returns the scout entry of
+    ``_ocr_roi_scout_page`` instead; ``roi_regions`` ({page: regions}) limits OCR to those page regions.
+    """
+    if ocr_params.get('roi_scout'):
+        return _ocr_roi_scout_page(doc, page_num, ocr_params)
+    zoom_factor = ocr_params['zoom_factor']
+    lang = ocr_params['lang']
+    ocr_visual_dir = ocr_params['ocr_visual_dir']
+    engine = get_ocr_engine(ocr_params.get('ocr_engine'), lang)
+    page = doc[page_num]
+    img_for_ocr = None
+    
+    # --ocr-roi: only the regions found by the scout pass (see _ocr_roi_regions)
+    regions = (ocr_params.get('roi_regions') or {}).get(page_num)
+    if regions:
+        ocr_data = _ocr_page_regions(page, page_num, regions, ocr_params, engine)
+    elif ocr_params.get('adaptive') and zoom_factor > OCR_ADAPTIVE_BASE_ZOOM:
+        ocr_data = _ocr_page_adaptive(page, page_num, ocr_params, engine)
+    else:
+        # Convert page to image (high resolution)
+        # Coordinates will be normalized later to maintain compatibility with column ranges calibrated for 2.0x
+        mat = fitz.Matrix(zoom_factor, zoom_factor)
+        pix = page.get_pixmap(matrix=mat)
+        
+        # Convert to PIL Image straight from the pixmap samples (no PNG encode/decode)
+        img = _pixmap_to_pil(pix)
+        
+        # Tesseract input: PyMuPDF bitmap with RGB/RGBA normalization only (contrast only with --ocr-contrast).
+        img_for_ocr = _preprocess_pil_image_for_tesseract(img)
+        # pytesseract writes the image to a temp file in img.format (PNG when unset): PPM is the same
+        # bitmap without the compression cost (tesserocr reads the pixels directly)
+        img_for_ocr.format = 'PPM'
+        img_for_ocr = _apply_ocr_contrast(img_for_ocr, ocr_params.get('contrast'))
+        
+        if ocr_visual_dir:
+            try:
+                _pl = f"page_{page_num + 1:03d}"
+                img.save(os.path.join(ocr_visual_dir, f"{_pl}_raw_rgb.png"))
+                img_for_ocr.save(os.path.join(ocr_visual_dir, f"{_pl}_tesseract_input.png"))
+            except OSError as e:
+                print(f"[WARNING] --ocr-save-visual: could not save {_pl} PNGs: {e}", flush=True)
+        
+        # Perform OCR (same as pdf_to_excel-BUP.py: PSM 6, OEM 1 LSTM)
+        ocr_data = engine.image_to_data(img_for_ocr, lang=lang, config=TESSERACT_PAGE_CONFIG)
+    return _ocr_page_entry(ocr_data, img_for_ocr, page_num, ocr_params, engine)
+
+
+def _ocr_page_entry(ocr_data: dict, img_for_ocr, page_num: int, ocr_params: dict, engine) -> dict:
+    """
+    Page entry of ``_ocr_single_page`` from the page's image_to_data dict. ``img_for_ocr`` (the full-page
+    Tesseract input) is only used by the Banamex mixed RFC band pass.
+    """
+    zoom_factor = ocr_params['zoom_factor']
+    lang = ocr_params['lang']
+    banamex_mixed_rfc = ocr_params['banamex_mixed_rfc']
+    # Default pipeline: strict confidence + legacy flat text (same as pdf_to_excel-BUP).
+    zn = zoom_factor / ocr_params['coordinate_scale']
+    columns = _ocr_data_columns(ocr_data)  # one conversion for the strict and (Banamex) weak word sets
+    words = _ocr_words_from_columns(columns, zoom_normalization_factor=zn, include_weak_confidence=False)
+    text = _ocr_text_from_columns(columns, include_weak_confidence=False)
+    page_entry = {
+        "page": page_num + 1,
+        "content": text,
+        "words": words,
+    }
+    # Banamex mixed only: auxiliary row-ordered text + weaker words for RFC regex / geometry (not for movements).
+    if banamex_mixed_rfc:
+        words_rfc = _ocr_words_from_columns(columns, zoom_normalization_factor=zn, include_weak_confidence=True)
+        page_entry["words_rfc"] = words_rfc
+        page_entry["banamex_rfc_ocr_text"] = build_multiline_text_from_ocr_words(words_rfc)
+        # Bold / image-only RFC between tarjeta and sucursal: second pass on that pixel band only.
+        if page_num + 1 in (1, 2):
+            _raw_band, _rfc_band = banamex_second_pass_rfc_tarjeta_sucursal_band(
+                img_for_ocr, words_rfc, zoom_factor, lang=lang, ocr_engine=engine
+            )
+            if _raw_band:
+                page_entry["banamex_rfc_band_ocr_text"] = _raw_band
+    return page_entry
+
+
+def _ocr_image_page(image, page_num: int, ocr_params: dict) -> tuple:
+    """
+    OCR an already rendered full-page Tesseract input of page ``page_num`` (0-based), applying
+    ``ocr_params['contrast']`` first. Returns (page_entry, wall_s, cpu_s) like ``_ocr_worker_page``.
+    """
+    start_wall, start_cpu = time.perf_counter(), _cpu_seconds()
+    image.format = 'PPM'  # lost when the image is pickled to a worker
+    engine = get_ocr_engine(ocr_params.get('ocr_engine'), ocr_params['lang'])
+    img_for_ocr = _apply_ocr_contrast(image, ocr_params.get('contrast'))
+    ocr_data = engine.image_to_data(img_for_ocr, lang=ocr_params['lang'], config=TESSERACT_PAGE_CONFIG)
+    entry = _ocr_page_entry(ocr_data, img_for_ocr, page_num, ocr_params, engine)
+    return entry, time.perf_counter() - start_wall, _cpu_seconds() - start_cpu
+
+
+def _ocr_worker_contrast_page(page_num: int, ocr_params: dict, contrasts: list) -> list:
+    """
+    Contrast sweep pool task: render page ``page_num`` (0-based) once in the worker and OCR it at every
+    contrast, so the raster is never pickled. Returns [(page_entry, wall_s, cpu_s), ...] in ``contrasts`` order.
+    """
+    _pix, image = _render_for_ocr(_OCR_WORKER_DOC[page_num], ocr_params['zoom_factor'])
+    return [_ocr_image_page(image, page_num, dict(ocr_params, contrast=contrast)) for contrast in contrasts]
+
+
+def _ocr_pool_workers(n_workers: int) -> int:
+    """
+    ``n_workers``, or 1 inside a daemonic process (e.g. a multiprocessing.Pool worker of a batch run):
+    those cannot start the OCR process pool, so their pages are OCR'd sequentially.
+    """
+    if n_workers > 1 and multiprocessing.current_process().daemon:
+        print("[WARNING] OCR worker pool not available in a daemonic process; running OCR sequentially", flush=True)
+        return 1
+    return n_workers
+
+
+def _ocr_worker_init(pdf_path: str, tesseract_cmd: str, ocr_engine: str, lang: str):
+    """Process-pool initializer: one Tesseract thread, one open document and one OCR engine per process."""
+    global _OCR_WORKER_DOC
+    # Workers already use every core; Tesseract's own OpenMP threads would oversubscribe the CPU.
+    os.environ['OMP_THREAD_LIMIT'] = '1'
+    if tesseract_cmd:
+        pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+    _OCR_WORKER_DOC = fitz.open(pdf_path)
+    get_ocr_engine(ocr_engine, lang)
+
+
+def _ocr_worker_page(page_num: int, ocr_params: dict) -> tuple:
+    """Returns (page_entry, wall_s, cpu_s); CPU includes the Tesseract subprocess (or in-process call) of this page."""
+    start_wall, start_cpu = time.perf_counter(), _cpu_seconds()
+    entry = _ocr_single_page(_OCR_WORKER_DOC, page_num, ocr_params)
+    return entry, time.perf_counter() - start_wall, _cpu_seconds() - start_cpu
+
+
+def _ocr_pages_in_process_pool(
+    pdf_path: str,
+    page_indices: list,
+    total_pages: int,
+    ocr_params: dict,
+    n_workers: int,
+) -> list:
+    """
+    Render + OCR ``page_indices`` (0-based) across ``n_workers`` processes.
+    Returns page entries in the same order as ``page_indices``.
+    """
+    scout = bool(ocr_params.get('roi_scout'))
+    label = 'OCR scout' if scout else 'OCR'
+    print(f"[INFO] {label} with {n_workers} parallel workers ({len(page_indices)} pages)...", flush=True)
+    results = {}
+    # libtesseract reads OMP_THREAD_LIMIT when it loads. If this process has loaded it (sequential OCR
+    # earlier), forked workers would inherit it without the limit: spawn them so they load it after
+    # _ocr_worker_init.
+    mp_context = multiprocessing.get_context('spawn') if 'tesserocr' in sys.modules else None
+    with ProcessPoolExecutor(
+        max_workers=n_workers,
+        mp_context=mp_context,
+        initializer=_ocr_worker_init,
+        initargs=(pdf_path, pytesseract.pytesseract.tesseract_cmd, ocr_params['ocr_engine'], ocr_params['lang']),
+    ) as executor:
+        futures = {
+            executor.submit(_ocr_worker_page, page_num, ocr_params): page_num
+            for page_num in page_indices
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            page_num = futures[future]
+            results[page_num], page_wall, page_cpu = future.result()
+            if not scout:
+                _metrics_ocr_page(page_num + 1, page_wall, page_cpu)
+            print(f"[INFO] {label} page {page_num + 1}/{total_pages} done ({done}/{len(page_indices)})", flush=True)
+    return [results[page_num] for page_num in page_indices]
+
+
+def _ocr_run_params(
+    zoom_factor: float,
+    lang: str,
+    banamex_mixed_rfc: bool,
+    coordinate_scale: float,
+    ocr_engine: str,
+    ocr_visual_dir: str = None,
+    roi: bool = False,
+) -> dict:
+    """``ocr_params`` of one OCR run (see ``_ocr_single_page``); also what its cache keys are built from."""
+    return {
+        'zoom_factor': zoom_factor,
+        'lang': lang,
+        'banamex_mixed_rfc': banamex_mixed_rfc,
+        'ocr_visual_dir': ocr_visual_dir,
+        'coordinate_scale': float(coordinate_scale),
+        'ocr_engine': ocr_engine,
+        'roi': roi and not banamex_mixed_rfc,
+        'adaptive': '--ocr-adaptive' in _run_argv() and not banamex_mixed_rfc,
+        'contrast': _parse_ocr_contrast_from_argv(),
+    }
+
+
+def _ocr_pipeline_supported(ocr_params: dict) -> bool:
+    """
+    True when every page of the run is a plain full-page OCR (what ``_ocr_pages_pipelined`` renders ahead):
+    ROI scout/regions, adaptive bands, Banamex RFC band and --ocr-save-visual render inside the OCR step.
+    """
+    return not (
+        ocr_params.get('roi_scout') or ocr_params.get('roi_regions') or ocr_params['banamex_mixed_rfc']
+        or ocr_params['ocr_visual_dir']
+        or (ocr_params.get('adaptive') and ocr_params['zoom_factor'] > OCR_ADAPTIVE_BASE_ZOOM)
+    )
+
+
+def _ocr_pages_pipelined(
+    pdf_path: str,
+    page_indices: list,
+    total_pages: int,
+    ocr_params: dict,
+    depth: int,
+    subset: bool = False,
+) -> dict:
+    """
+    In-process OCR of ``page_indices`` (0-based) as a three-stage pipeline with bounded queues:
+    a render thread rasterizes pages ahead (at most ``depth`` waiting), this thread runs Tesseract on them,
+    and a post-processing thread turns each image_to_data dict into its page entry (words + text), in page
+    order. Rendering and post-processing overlap the time Tesseract runs, so the CPU does not sit idle
+    during the image hand-off and the tesseract process. Only for ``_ocr_pipeline_supported`` runs;
+    PyMuPDF is only used from the render thread.
+    
+    Returns:
+        {page_num: page entry}, same entries as ``_ocr_single_page``
+    """
+    rendered = queue.Queue(maxsize=depth)
+    recognized = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    errors = []
+    results = {}
+    
+    def put(q, item):
+        # Give up when the pipeline is stopping, instead of blocking on a full queue forever
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def render_stage():
+        try:
+            doc = fitz.open(pdf_path)
+            try:
+                for page_num in page_indices:
+                    pix, img_for_ocr = _render_for_ocr(doc[page_num], ocr_params['zoom_factor'], contrast=ocr_params.get('contrast'))
+                    if not put(rendered, (page_num, pix, img_for_ocr)):
+                        return
+            finally:
+                doc.close()
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            put(rendered, None)
+    
+    def post_stage():
+        try:
+            while not stop.is_set():
+                try:
+                    item = recognized.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if item is None:
+                    return
+                page_num, ocr_data = item
+                results[page_num] = _ocr_page_entry(ocr_data, None, page_num, ocr_params, None)
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+    
+    engine = get_ocr_engine(ocr_params.get('ocr_engine'), ocr_params['lang'])
+    # Stage threads run in a copy of this context, so they read this conversion's options and metrics
+    threads = [
+        threading.Thread(target=contextvars.copy_context().run, args=(stage,), daemon=True)
+        for stage in (render_stage, post_stage)
+    ]
+    for t in threads:
+        t.start()
+    try:
+        while not stop.is_set():
+            try:
+                item = rendered.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if item is None:
+                break
+            page_num, pix, img_for_ocr = item
+            if subset:
+                print(f"[INFO] Processing page {page_num + 1} with OCR...", flush=True)
+            else:
+                print(f"[INFO] Processing page {page_num + 1}/{total_pages} with OCR...", flush=True)
+            start_wall, start_cpu = time.perf_counter(), _cpu_seconds()
+            ocr_data = engine.image_to_data(img_for_ocr, lang=ocr_params['lang'], config=TESSERACT_PAGE_CONFIG)
+            del pix, img_for_ocr
+            _metrics_ocr_page(page_num + 1, time.perf_counter() - start_wall, _cpu_seconds() - start_cpu)
+            if not put(recognized, (page_num, ocr_data)):
+                break
+    except BaseException:
+        stop.set()
+        raise
+    finally:
+        put(recognized, None)
+        for t in threads:
+            t.join()
+    if errors:
+        raise errors[0]
+    return results
+
+
+def _ocr_pages(
+    pdf_path: str,
+    page_indices: list,
+    total_pages: int,
+    ocr_params: dict,
+    n_workers: int,
+    subset: bool = False,
+) -> dict:
+    """
+    Render + OCR ``page_indices`` (0-based) in a pool of ``n_workers`` processes, or in this process
+    when ``n_workers`` is 1 or the pool breaks (pipelined with ``--ocr-queue-depth``, see
+    ``_ocr_pages_pipelined``). ``subset``: only some pages of the PDF (progress messages).
+    Returns {page_num: page entry}.
+    """
+    n_workers = _ocr_pool_workers(n_workers)
+    if n_workers > 1:
+        try:
+            entries = _ocr_pages_in_process_pool(pdf_path, page_indices, total_pages, ocr_params, n_workers)
+            return dict(zip(page_indices, entries))
+        except BrokenProcessPool as e:
+            print(f"[WARNING] OCR worker pool failed ({e}). Retrying pages sequentially...", flush=True)
+    depth = _parse_ocr_queue_depth_from_argv()
+    if depth > 0 and len(page_indices) > 1 and _ocr_pipeline_supported(ocr_params):
+        return _ocr_pages_pipelined(pdf_path, page_indices, total_pages, ocr_params, depth, subset)
+    scout = bool(ocr_params.get('roi_scout'))
+    label = 'OCR scout' if scout else 'OCR'
+    results = {}
+    doc = fitz.open(pdf_path)
+    try:
+        for page_num in page_indices:
+            if subset:
+                print(f"[INFO] Processing page {page_num + 1} with {label}...", flush=True)
+            else:
+                print(f"[INFO] Processing page {page_num + 1}/{total_pages} with {label}...", flush=True)
+            start_wall, start_cpu = time.perf_counter(), _cpu_seconds()
+            results[page_num] = _ocr_single_page(doc, page_num, ocr_params)
+            if not scout:
+                _metrics_ocr_page(page_num + 1, time.perf_counter() - start_wall, _cpu_seconds() - start_cpu)
+    finally:
+        doc.close()
+    return results
+
+
+def extract_text_with_tesseract_ocr(
+    pdf_path: str,
+    lang: str = 'spa+eng',
+    pages: list = None,
+    zoom_factor: float = None,
+    banamex_mixed_rfc: bool = False,
+    workers: int = None,
+    coordinate_scale: float = OCR_COORDINATE_SCALE,
+    bank_name: str = None,
+) -> list:
+    """
+    Extracts text from PDF using local Tesseract OCR.
+    100% private - does not send data to external servers.
+    Uses PyMuPDF to convert PDF to images (does not require Poppler).
+    
+    Args:
+        pdf_path: Path to PDF file
+        lang: Language for OCR (default: 'spa+eng' for Spanish+English)
+        pages: Optional 1-based page numbers to process (e.g. [1, 3]). If None, all pages are processed.
+        zoom_factor: PyMuPDF render scale. If None, uses ``--ocr-zoom`` from the CLI options if set, else ``OCR_RENDER_ZOOM``.
+        banamex_mixed_rfc: If True (Banamex mixed PDFs only), also fill per-page ``banamex_rfc_ocr_text`` and
+            ``words_rfc`` using row-ordered text and weaker confidence thresholds — **RFC extraction only**;
+            on pages 1–2, may also set ``banamex_rfc_band_ocr_text`` from a second OCR pass on the pixel band
+            between tarjeta and sucursal (bold/image RFC values). Default ``content`` / ``words`` stay unchanged
+            for movements and the rest of the pipeline.
+        workers: Number of OCR processes. If None, uses ``--ocr-workers`` from the CLI options if set, else all CPU cores.
+            1 keeps the sequential in-process loop.
+        coordinate_scale: Word coordinates are PDF points x ``coordinate_scale``. Default ``OCR_COORDINATE_SCALE``
+            (2.0, OCR-calibrated columns); 1.0 gives pdfplumber-compatible points for OCR'd pages merged into
+            a text-layer document.
+        bank_name: Bank already detected, used by ``--ocr-roi`` to find the movements table. If None, the bank
+            is detected from the scout pass.
+    
+    CLI:
+        --ocr-zoom <float>  Render scale (default ``OCR_RENDER_ZOOM``). Word coordinates use ``zoom_factor / 2.0``.
+        --ocr-workers <int>  Pages are rendered and OCR'd in parallel processes (default: CPU count).
+            Each worker runs Tesseract with ``OMP_THREAD_LIMIT=1``; output stays in page order.
+        --ocr-queue-depth <int>  With one worker, pages are rendered ahead in a thread while Tesseract reads the
+            current page; at most this many rendered pages wait (default ``OCR_PIPELINE_QUEUE_DEPTH``; 0 = page by page).
+        --ocr-engine auto|tesserocr|pytesseract  ``tesserocr`` OCRs in-process with one libtesseract handle per
+            worker; ``pytesseract`` starts a tesseract process per call. ``auto`` uses tesserocr when installed (default: pytesseract).
+        --ocr-cache-dir <path>  Persistent per-page OCR cache (default ``OCR_CACHE_DEFAULT_DIR``). A hit skips
+            rendering and Tesseract for that page. ``--ocr-cache-max-mb <int>`` caps its size (LRU eviction);
+            ``--no-ocr-cache`` disables it. Not used together with ``--ocr-save-visual``.
+        --ocr-roi  Layout-aware OCR: a scout pass at ``OCR_ROI_SCOUT_ZOOM`` finds movements_start/movements_end,
+            then table pages are OCR'd at full zoom only over the header, the table rows (within the "columns_ocr"
+            extent) and the totals; page footers below the table are skipped. Scouting stops at movements_end:
+            pages before/after the table keep the scout OCR, later pages only get their page header OCR'd
+            (see ``_ocr_roi_scout``). Word coordinates stay in page space. Not used for Banamex mixed (RFC band
+            pass needs the full page).
+        --ocr-adaptive  Pages are OCR'd at ``OCR_ADAPTIVE_BASE_ZOOM``; only lines with a low-confidence word or an
+            amount that fails ``DEC_AMOUNT_RE`` are re-OCR'd at the render zoom and merged back. Pages cropped
+            by ``--ocr-roi`` and Banamex mixed are OCR'd at the render zoom.
+        --ocr-zoom-sweep        OCR only: zoom 1..8 → ``{stem}_ocr_zoom_sweep/*.txt`` (no Excel).
+        --ocr-zoom-sweep-excel  Full PDF→Excel per zoom → ``{stem}_ocr_zoom_sweep_excel/*_zoom{N}.xlsx``.
+        --ocr-save-visual  Optional debug: writes PNGs per page next to the PDF (not in BUP):
+            ``{pdf_stem}_ocr_visual/page_NNN_raw_rgb.png`` — PNG from PyMuPDF before mode normalization
+            ``{pdf_stem}_ocr_visual/page_NNN_tesseract_input.png`` — exact image passed to Tesseract (RGB; same pixels as raw when already RGB)
+            Use these to zoom in and check whether misread digits (e.g. 7 vs 1) come from the bitmap.
+        --ocr-contrast <float>  PIL contrast factor applied to the rendered page before Tesseract (default: raw
+            raster). ``scripts/ocr_contrast_sweep.py`` compares several values (see ``run_ocr_contrast_sweep``).
+        Tesseract config matches pdf_to_excel-BUP.py: ``--oem 1 --psm 6``; no PIL sharpen.
+    
+    Returns:
+        List of dictionaries with format: [{"page": int, "content": str, "words": list}, ...]
+        Compatible with the return format of extract_text_from_pdf.
+    
+    Raises:
+        Exception: If Tesseract is not available or there is an error
+    """
+    if not TESSERACT_AVAILABLE:
+        raise Exception("Tesseract OCR is not available. Install: pip install pytesseract pymupdf pillow")
+    
+    # Configure Tesseract if necessary (tesserocr does not need the executable)
+    ocr_engine = resolve_ocr_engine_name()
+    if not configure_tesseract() and ocr_engine != 'tesserocr':
+        raise Exception("Tesseract OCR not found. Install Tesseract from: https://github.com/UB-Mannheim/tesseract/wiki")
+    
+    print(f"[INFO] Extracting text with local Tesseract OCR (100% private, engine: {ocr_engine})...", flush=True)
+    
+    if zoom_factor is not None:
+        zf = float(zoom_factor)
+    else:
+        zf = _parse_ocr_zoom_from_argv()
+        if zf is None:
+            zf = float(OCR_RENDER_ZOOM)
+    zoom_factor = zf
+    print(f"[INFO] OCR render zoom: {zoom_factor} (≈{72.0 * zoom_factor:.0f} DPI effective)", flush=True)
+    
+    ocr_save_visual = '--ocr-save-visual' in _run_argv()
+    ocr_visual_dir = None
+    if ocr_save_visual:
+        _base = os.path.splitext(os.path.abspath(pdf_path))[0]
+        ocr_visual_dir = _base + '_ocr_visual'
+        try:
+            os.makedirs(ocr_visual_dir, exist_ok=True)
+            print(f"[INFO] --ocr-save-visual: writing page images -> {ocr_visual_dir}", flush=True)
+        except OSError as e:
+            print(f"[WARNING] --ocr-save-visual: could not create {ocr_visual_dir}: {e}", flush=True)
+            ocr_visual_dir = None
+    
+    extracted_data = []
+    
+    try:
+        # Use PyMuPDF to convert PDF to images (does not require Poppler)
+        doc = fitz.open(pdf_path)
+        
+        # Get page dimensions for DPI calculation (use first page as reference)
+        first_page = doc[0]
+        page_width_pts = first_page.rect.width
+        page_height_pts = first_page.rect.height
+        page_width_inches = page_width_pts / 72.0
+        page_height_inches = page_height_pts / 72.0
+        
+        # Render zoom resolved above (OCR_RENDER_ZOOM, --ocr-zoom, or zoom_factor argument)
+        target_dpi = int(round(72.0 * zoom_factor))
+        effective_dpi = 72.0 * zoom_factor
+        
+        # Calculate resulting image dimensions in pixels
+        img_width_px = int(page_width_pts * zoom_factor)
+        img_height_px = int(page_height_pts * zoom_factor)
+        
+        # Show DPI calculation info (only for first page to avoid spam) — commented to reduce console noise
+        # print(f"[INFO] Page dimensions: {page_width_pts:.1f} x {page_height_pts:.1f} pts ({page_width_inches:.2f} x {page_height_inches:.2f} inches)")
+        # print(f"[INFO] Target DPI: {target_dpi} DPI (zoom: {zoom_factor:.1f}x)")
+        # print(f"[INFO] Using zoom: {zoom_factor:.1f}x → Effective DPI: {effective_dpi:.0f} DPI")
+        # print(f"[INFO] Image size: {img_width_px} x {img_height_px} pixels")
+        # if effective_dpi < 300:
+        #     print(f"[WARNING] DPI ({effective_dpi:.0f}) is below recommended 300 DPI for OCR")
+        # elif effective_dpi > 500:
+        #     print(f"[INFO] DPI ({effective_dpi:.0f}) is high - may have diminishing returns beyond 400-500 DPI")
+        # else:
+        #     print(f"[INFO] DPI ({effective_dpi:.0f}) is within optimal range for OCR accuracy")
+        
+        total_pages = len(doc)
+        if pages is not None:
+            invalid = [p for p in pages if p < 1 or p > total_pages]
+            if invalid:
+                doc.close()
+                raise ValueError(f"Page(s) {invalid} do not exist. PDF has {total_pages} page(s).")
+            page_indices = [p - 1 for p in pages]
+        else:
+            page_indices = list(range(total_pages))
+        
+        ocr_params = _ocr_run_params(
+            zoom_factor, lang, banamex_mixed_rfc, coordinate_scale, ocr_engine,
+            ocr_visual_dir=ocr_visual_dir, roi='--ocr-roi' in _run_argv(),
+        )
+        
+        # Persistent cache: pages already OCR'd with the same bytes/zoom/lang/config/Tesseract are reused
+        # without rendering. Skipped with --ocr-save-visual, which needs the rendered images.
+        ocr_results = {}
+        cache_keys = {}
+        cache_dir = None if ocr_visual_dir else _parse_ocr_cache_dir_from_argv()
+        if cache_dir:
+            try:
+                pdf_hash = _file_sha256(pdf_path)
+                tesseract_version = _OCR_ENGINE_CLASSES[ocr_engine].version()
+                for page_num in page_indices:
+                    cache_keys[page_num] = _ocr_cache_key(pdf_hash, page_num, ocr_params, tesseract_version)
+                    entry = _ocr_cache_load(cache_dir, cache_keys[page_num])
+                    if entry is not None:
+                        ocr_results[page_num] = entry
+            except Exception as e:
+                print(f"[WARNING] OCR cache disabled for this run: {e}", flush=True)
+                cache_dir = None
+            if ocr_results:
+                print(f"[INFO] OCR cache: reusing {len(ocr_results)}/{len(page_indices)} page(s) from {cache_dir}", flush=True)
+                for page_num in ocr_results:
+                    _metrics_ocr_page(page_num + 1, 0.0, 0.0, cached=True)
+        pending_indices = [p for p in page_indices if p not in ocr_results]
+        
+        n_workers = workers if workers is not None else _parse_ocr_workers_from_argv()
+        n_workers = _ocr_pool_workers(max(1, min(int(n_workers), len(pending_indices))))
+        doc.close()
+        
+        scout_results = {}
+        if ocr_params['roi'] and pending_indices:
+            # Scout up to the end of the movements table, then crop (cached pages only carry the table state)
+            ocr_params['roi_regions'], scout_results, roi_bank = _ocr_roi_scout(
+                pdf_path, page_indices, ocr_results, total_pages, ocr_params, n_workers, bank_name, pages is not None
+            )
+            pending_indices = [p for p in pending_indices if p not in scout_results]
+            print(
+                f"[INFO] --ocr-roi: bank {roi_bank or 'not detected'}, "
+                f"{len(ocr_params['roi_regions'])}/{len(pending_indices)} page(s) cropped to their regions, "
+                f"{len(scout_results)} page(s) kept from the scout",
+                flush=True,
+            )
+        
+        new_results = _ocr_pages(pdf_path, pending_indices, total_pages, ocr_params, n_workers, pages is not None)
+        new_results.update(scout_results)
+        
+        if cache_dir and new_results:
+            for page_num, entry in new_results.items():
+                _ocr_cache_store(cache_dir, cache_keys[page_num], entry)
+            _ocr_cache_evict(cache_dir, _parse_ocr_cache_max_mb_from_argv())
+        ocr_results.update(new_results)
+        extracted_data = [ocr_results[page_num] for page_num in page_indices]
+        
+        print(f"[OK] OCR completed. Pages processed: {len(extracted_data)}", flush=True)
+        return extracted_data
+        
+    except Exception as e:
+        raise Exception(f"Error en Tesseract OCR: {e}")
+
+
+def _ocr_plan(pdf_path: str, session: PdfSession = None) -> list:
+    """
+    The OCR calls extract_text_from_pdf() makes for this PDF, without running them (same page
+    classification, bank and Banamex mixed rules).
+    
+    Returns:
+        List of {"pages": 1-based page list or None (all pages), "banamex_mixed_rfc": bool,
+        "coordinate_scale": float}; empty when no page needs OCR
+    """
+    if not TESSERACT_AVAILABLE:
+        return []
+    is_illegible, _cid_ratio, ascii_ratio = is_pdf_text_illegible(pdf_path, session=session)
+    banamex_mixed = detect_bank_from_pdf(pdf_path, session=session) == 'Banamex' and ascii_ratio < 0.99
+    if is_illegible or banamex_mixed:
+        return [{"pages": None, "banamex_mixed_rfc": banamex_mixed, "coordinate_scale": OCR_COORDINATE_SCALE}]
+    scanned_pages = [c['page'] for c in classify_pdf_pages(pdf_path, session=session) if c['is_scanned']]
+    if scanned_pages:
+        return [{"pages": scanned_pages, "banamex_mixed_rfc": False, "coordinate_scale": 1.0}]
+    return []
+
+
+def _ocr_zoom_sweep_pages(pdf_path: str, zooms: list, plan: list, workers: int = None) -> dict:
+    """
+    OCR every page of ``plan`` at every zoom of a sweep in one process pool: the zoom levels run
+    concurrently and each worker opens the PDF once (sequential in this process with one worker).
+    
+    Returns:
+        {zoom: [(ocr_params, page_num (0-based), page entry, wall_s, cpu_s), ...]} in plan/page order
+    """
+    ocr_engine = resolve_ocr_engine_name()
+    lang = 'spa+eng'
+    doc = fitz.open(pdf_path)
+    total_pages = len(doc)
+    tasks = []
+    # Highest zoom first: the slowest pages start early and the pool stays busy until the end
+    for zoom in sorted(zooms, reverse=True):
+        for call in plan:
+            params = _ocr_run_params(float(zoom), lang, call['banamex_mixed_rfc'], call['coordinate_scale'], ocr_engine)
+            for page in call['pages'] or range(1, total_pages + 1):
+                tasks.append((zoom, params, page - 1))
+    n_workers = _ocr_pool_workers(max(1, min(int(workers or _parse_ocr_workers_from_argv()), len(tasks))))
+    print(f"[INFO] Zoom sweep: OCR of {len(tasks)} page(s) at zoom {', '.join(str(z) for z in sorted(zooms))} "
+          f"with {n_workers} worker(s)...", flush=True)
+    done_results = {}
+    if n_workers > 1:
+        doc.close()
+        doc = None
+        try:
+            with ProcessPoolExecutor(
+                max_workers=n_workers,
+                mp_context=multiprocessing.get_context('spawn') if 'tesserocr' in sys.modules else None,
+                initializer=_ocr_worker_init,
+                initargs=(pdf_path, pytesseract.pytesseract.tesseract_cmd, ocr_engine, lang),
+            ) as executor:
+                futures = {
+                    executor.submit(_ocr_worker_page, page_num, params): idx
+                    for idx, (_zoom, params, page_num) in enumerate(tasks)
+                }
+                for done, future in enumerate(as_completed(futures), start=1):
+                    idx = futures[future]
+                    done_results[idx] = future.result()
+                    zoom, _params, page_num = tasks[idx]
+                    print(f"[INFO] Zoom sweep: zoom {zoom} page {page_num + 1} done ({done}/{len(tasks)})", flush=True)
+        except BrokenProcessPool as e:
+            print(f"[WARNING] OCR worker pool failed ({e}). Retrying pages sequentially...", flush=True)
+            doc = fitz.open(pdf_path)
+    if doc is not None:
+        try:
+            for idx, (zoom, params, page_num) in enumerate(tasks):
+                if idx in done_results:
+                    continue
+                print(f"[INFO] Zoom sweep: zoom {zoom} page {page_num + 1} ({idx + 1}/{len(tasks)})...", flush=True)
+                start_wall, start_cpu = time.perf_counter(), _cpu_seconds()
+                entry = _ocr_single_page(doc, page_num, params)
+                done_results[idx] = (entry, time.perf_counter() - start_wall, _cpu_seconds() - start_cpu)
+        finally:
+            doc.close()
+    results = {zoom: [] for zoom in zooms}
+    for idx, (zoom, params, page_num) in enumerate(tasks):
+        results[zoom].append((params, page_num) + tuple(done_results[idx]))
+    for zoom in results:
+        results[zoom].sort(key=lambda r: r[1])
+    return results
+
+
+def _zoom_sweep_stats(page_results: list) -> dict:
+    """OCR time, word count and mean word confidence of one sweep value's (zoom or contrast) pages."""
+    confs = [w.get('conf', 0.0) for _p, _n, entry, _w, _c in page_results for w in entry.get('words') or []]
+    return {
+        'ocr_wall_s': sum(r[3] for r in page_results),
+        'ocr_cpu_s': sum(r[4] for r in page_results),
+        'pages': len(page_results),
+        'words': len(confs),
+        'mean_conf': sum(confs) / len(confs) if confs else 0.0,
+    }
+
+
+def _print_zoom_sweep_table(rows: list, columns: list) -> list:
+    """Print the per-zoom comparison table; returns its lines (tab-separated, for the summary file)."""
+    widths = {c: max(len(c), *(len(str(r.get(c, ''))) for r in rows)) for c in columns}
+    print("\n" + "  ".join(c.ljust(widths[c]) for c in columns), flush=True)
+    print("  ".join("-" * widths[c] for c in columns), flush=True)
+    for r in rows:
+        print("  ".join(str(r.get(c, '')).ljust(widths[c]) for c in columns), flush=True)
+    return ["\t".join(columns)] + ["\t".join(str(r.get(c, '')) for c in columns) for r in rows]
+
+
+def run_ocr_zoom_sweep(pdf_path: str, zoom_min: int = 1, zoom_max: int = 8, workers: int = None) -> str:
+    """
+    OCR every page at integer zoom ``zoom_min``..``zoom_max`` (OCR only, no Excel); all zoom levels run
+    concurrently in one process pool (``workers``, default ``--ocr-workers`` / CPU count).
+    Writes ``full_text_zoom{N}.txt`` per zoom and ``summary.txt`` (per-zoom OCR time, chars, words, mean
+    confidence) under ``{pdf_stem}_ocr_zoom_sweep/``.
+    For the full pipeline (movements, validation, .xlsx), use ``run_ocr_zoom_sweep_excel`` or ``--ocr-zoom-sweep-excel``.
+
+    Returns:
+        Path to the output directory.
     """
     if not TESSERACT_AVAILABLE:
         raise RuntimeError("Tesseract OCR is not available. Install: pip install pytesseract pymupdf pillow")
+    if not configure_tesseract() and resolve_ocr_engine_name() != 'tesserocr':
+        raise RuntimeError("Tesseract OCR not found. Install Tesseract from: https://github.com/UB-Mannheim/tesseract/wiki")
     base = os.path.splitext(os.path.abspath(pdf_path))[0]
     out_dir = base + '_ocr_zoom_sweep'
     os.makedirs(out_dir, exist_ok=True)
-    summary_lines = [
-        f"# pdf: {pdf_path}",
-        f"# zoom range: {zoom_min}..{zoom_max}",
-        "zoom\tchars\twords\tfile",
-    ]
-    for z in range(zoom_min, zoom_max + 1):
-        print(f"\n========== OCR zoom sweep: zoom={z} ==========", flush=True)
-        data = extract_text_with_tesseract_ocr(pdf_path, zoom_factor=float(z))
+    zooms = list(range(zoom_min, zoom_max + 1))
+    plan = [{"pages": None, "banamex_mixed_rfc": False, "coordinate_scale": OCR_COORDINATE_SCALE}]
+    sweep = _ocr_zoom_sweep_pages(pdf_path, zooms, plan, workers)
+    rows = []
+    for z in zooms:
         parts = []
-        nwords = 0
-        for p in data:
-            parts.append(f"\n--- page {p['page']} ---\n")
-            tc = p.get('content') or ''
-            parts.append(tc)
-            nwords += len(p.get('words') or [])
+        for _params, _page_num, entry, _wall, _cpu in sweep[z]:
+            parts.append(f"\n--- page {entry['page']} ---\n")
+            parts.append(entry.get('content') or '')
         blob = ''.join(parts)
         fname = f'full_text_zoom{z}.txt'
-        out_txt = os.path.join(out_dir, fname)
-        with open(out_txt, 'w', encoding='utf-8') as f:
+        with open(os.path.join(out_dir, fname), 'w', encoding='utf-8') as f:
             f.write(blob)
-        summary_lines.append(f"{z}\t{len(blob)}\t{nwords}\t{fname}")
+        stats = _zoom_sweep_stats(sweep[z])
+        rows.append({
+            'zoom': z, 'chars': len(blob), 'words': stats['words'], 'mean_conf': f"{stats['mean_conf']:.1f}",
+            'ocr_s': f"{stats['ocr_wall_s']:.2f}", 'file': fname,
+        })
+    table = _print_zoom_sweep_table(rows, ['zoom', 'ocr_s', 'chars', 'words', 'mean_conf', 'file'])
     sum_path = os.path.join(out_dir, 'summary.txt')
     with open(sum_path, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(summary_lines) + '\n')
+        f.write('\n'.join([f"# pdf: {pdf_path}", f"# zoom range: {zoom_min}..{zoom_max}"] + table) + '\n')
     print(f"\n[OK] OCR zoom sweep finished.\n  Directory: {out_dir}\n  Summary:   {sum_path}", flush=True)
     return out_dir
 
 
-def run_ocr_zoom_sweep_excel(pdf_path: str, zoom_min: int = 1, zoom_max: int = 8) -> str:
+def run_ocr_zoom_sweep_excel(pdf_path: str, zoom_min: int = 1, zoom_max: int = 8, workers: int = None) -> str:
     """
-    Run the **full** pdf_to_excel pipeline once per integer zoom (subprocess per zoom so behavior matches a normal run).
+    Run the **full** pdf_to_excel pipeline once per integer zoom, in this process.
 
-    Writes ``{stem}_zoom{N}.xlsx`` and ``summary_excel.txt`` under ``{pdf_stem}_ocr_zoom_sweep_excel/``.
-    Forwards ``--debug`` from the parent argv if present.
+    The pages that need OCR are OCR'd at every zoom first, concurrently in one process pool, into a
+    temporary OCR cache. Each zoom is then converted with ``convert_statement`` on one shared PdfSession,
+    so the text layer, illegibility check and bank detection are computed once and OCR is a cache hit.
+    Writes ``{stem}_zoom{N}.xlsx`` and ``summary_excel.txt`` (per-zoom OCR time, words, mean confidence,
+    movement rows, validation) under ``{pdf_stem}_ocr_zoom_sweep_excel/``.
+    Forwards ``--debug``, ``--ocr-engine`` and ``--ocr-adaptive`` from the parent options if present.
 
     Returns:
         Path to the output directory.
@@ -1445,31 +3670,199 @@ def run_ocr_zoom_sweep_excel(pdf_path: str, zoom_min: int = 1, zoom_max: int = 8
     base = os.path.splitext(os.path.abspath(pdf_path))[0]
     out_dir = base + '_ocr_zoom_sweep_excel'
     os.makedirs(out_dir, exist_ok=True)
-    script = os.path.abspath(__file__)
+    pdf_path = os.path.abspath(os.path.normpath(pdf_path))
     stem = os.path.splitext(os.path.basename(pdf_path))[0]
-    summary_lines = [
-        f"# pdf: {pdf_path}",
-        f"# full PDF→Excel per zoom {zoom_min}..{zoom_max}",
-        "zoom\texcel_path\tbytes",
-    ]
-    for z in range(zoom_min, zoom_max + 1):
-        out_xlsx = os.path.join(out_dir, f'{stem}_zoom{z}.xlsx')
-        cmd = [sys.executable, script, pdf_path, '--ocr-zoom', str(z), '--output-excel', out_xlsx]
-        if '--debug' in sys.argv:
-            cmd.append('--debug')
-        print(f"\n========== PDF→Excel zoom sweep: zoom={z} → {out_xlsx} ==========", flush=True)
-        proc = subprocess.run(cmd)
-        if proc.returncode != 0:
-            raise RuntimeError(f"pdf_to_excel subprocess failed for zoom={z} (exit code {proc.returncode})")
-        sz = os.path.getsize(out_xlsx) if os.path.isfile(out_xlsx) else -1
-        summary_lines.append(f"{z}\t{out_xlsx}\t{sz}")
+    zooms = list(range(zoom_min, zoom_max + 1))
+    parent_options = convert_options_from_argv(_run_argv())
+    options = {k: parent_options[k] for k in ('debug', 'ocr_engine', 'ocr_adaptive') if k in parent_options}
+    rows = []
+    with PdfSession(pdf_path, text_engine=_parse_text_engine_from_argv()) as session, \
+            tempfile.TemporaryDirectory(prefix='ocr_zoom_sweep_') as cache_dir:
+        session.keep_open = True
+        plan = _ocr_plan(pdf_path, session)
+        sweep = {z: [] for z in zooms}
+        if not plan:
+            print("[INFO] Zoom sweep: no page of this PDF needs OCR; every zoom gives the same result", flush=True)
+        else:
+            if not configure_tesseract() and resolve_ocr_engine_name() != 'tesserocr':
+                raise RuntimeError("Tesseract OCR not found. Install Tesseract from: https://github.com/UB-Mannheim/tesseract/wiki")
+            sweep = _ocr_zoom_sweep_pages(pdf_path, zooms, plan, workers)
+            pdf_hash = _file_sha256(pdf_path)
+            tesseract_version = _OCR_ENGINE_CLASSES[resolve_ocr_engine_name()].version()
+            for page_results in sweep.values():
+                for params, page_num, entry, _wall, _cpu in page_results:
+                    _ocr_cache_store(cache_dir, _ocr_cache_key(pdf_hash, page_num, params, tesseract_version), entry)
+        for z in zooms:
+            out_xlsx = os.path.join(out_dir, f'{stem}_zoom{z}.xlsx')
+            print(f"\n========== PDF→Excel zoom sweep: zoom={z} → {out_xlsx} ==========", flush=True)
+            result = convert_statement(pdf_path, dict(
+                options, ocr_zoom=z, output_excel=out_xlsx, ocr_cache_dir=cache_dir, ocr_cache_max_mb=1024 * 1024,
+            ), session=session)
+            stats = _zoom_sweep_stats(sweep[z])
+            if result.validation_ok is None:
+                validation = '-'
+            else:
+                validation = 'OK' if result.validation_ok else 'FAILED'
+            rows.append({
+                'zoom': z,
+                'ocr_s': f"{stats['ocr_wall_s']:.2f}",
+                'convert_s': f"{result.elapsed:.2f}",
+                'words': stats['words'],
+                'mean_conf': f"{stats['mean_conf']:.1f}",
+                'movements': result.movement_rows,
+                'validation': validation,
+                'error': result.error_type or '-',
+                'excel': os.path.basename(out_xlsx) if result.excel_created else '-',
+            })
+    table = _print_zoom_sweep_table(
+        rows, ['zoom', 'ocr_s', 'convert_s', 'words', 'mean_conf', 'movements', 'validation', 'error', 'excel']
+    )
     sum_path = os.path.join(out_dir, 'summary_excel.txt')
     with open(sum_path, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(summary_lines) + '\n')
+        f.write('\n'.join([f"# pdf: {pdf_path}", f"# full PDF→Excel per zoom {zoom_min}..{zoom_max}"] + table) + '\n')
     print(f"\n[OK] PDF→Excel zoom sweep finished.\n  Directory: {out_dir}\n  Summary:   {sum_path}", flush=True)
     return out_dir
 
 
+def _ocr_contrast_sweep_pages(pdf_path: str, contrasts: list, plan: list, zoom: float, workers: int = None) -> dict:
+    """
+    OCR every page of ``plan`` at every contrast of a sweep. Each page is rendered once and its contrast
+    variants are made from that raster: pages are spread over one process pool, each worker rendering
+    its pages itself (no raster crosses processes), or rendered one at a time in this process with one worker.
+    Pages are OCR'd whole: ``--ocr-roi`` / ``--ocr-adaptive`` would render their own crops.
+    
+    Returns:
+        {contrast: [(ocr_params, page_num (0-based), page entry, wall_s, cpu_s), ...]} in plan/page order
+    """
+    ocr_engine = resolve_ocr_engine_name()
+    lang = 'spa+eng'
+    doc = fitz.open(pdf_path)
+    try:
+        pages = []
+        for call in plan:
+            params = _ocr_run_params(float(zoom), lang, call['banamex_mixed_rfc'], call['coordinate_scale'], ocr_engine)
+            params.update(roi=False, adaptive=False)
+            for page in call['pages'] or range(1, len(doc) + 1):
+                pages.append((params, page - 1))
+        n_tasks = len(pages) * len(contrasts)
+        n_workers = _ocr_pool_workers(max(1, min(int(workers or _parse_ocr_workers_from_argv()), len(pages))))
+        print(f"[INFO] Contrast sweep: OCR of {len(pages)} page(s) x {len(contrasts)} contrast value(s) at zoom {zoom} "
+              f"with {n_workers} worker(s)...", flush=True)
+        done_results = {}
+        
+        def page_images(skip_done: bool = False):
+            for idx, (_params, page_num) in enumerate(pages):
+                if skip_done and all((c, idx) in done_results for c in contrasts):
+                    continue
+                _pix, img = _render_for_ocr(doc[page_num], zoom)
+                yield idx, img
+        
+        def store(key, outcome):
+            done_results[key] = outcome
+            contrast, idx = key
+            print(f"[INFO] Contrast sweep: contrast {contrast} page {pages[idx][1] + 1} done "
+                  f"({len(done_results)}/{n_tasks})", flush=True)
+        
+        if n_workers > 1:
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=n_workers,
+                    mp_context=multiprocessing.get_context('spawn') if 'tesserocr' in sys.modules else None,
+                    initializer=_ocr_worker_init,
+                    initargs=(pdf_path, pytesseract.pytesseract.tesseract_cmd, ocr_engine, lang),
+                ) as executor:
+                    futures = {
+                        executor.submit(_ocr_worker_contrast_page, page_num, params, contrasts): idx
+                        for idx, (params, page_num) in enumerate(pages)
+                    }
+                    for future in as_completed(futures):
+                        for contrast, outcome in zip(contrasts, future.result()):
+                            store((contrast, futures[future]), outcome)
+            except BrokenProcessPool as e:
+                print(f"[WARNING] OCR worker pool failed ({e}). Retrying pages sequentially...", flush=True)
+        for idx, image in page_images(skip_done=True):
+            params, page_num = pages[idx]
+            for contrast in contrasts:
+                if (contrast, idx) not in done_results:
+                    store((contrast, idx), _ocr_image_page(image, page_num, dict(params, contrast=contrast)))
+    finally:
+        doc.close()
+    return {
+        contrast: [(dict(params, contrast=contrast), page_num) + tuple(done_results[(contrast, idx)])
+                   for idx, (params, page_num) in enumerate(pages)]
+        for contrast in contrasts
+    }
+
+
+def run_ocr_contrast_sweep(
+    pdf_path: str,
+    contrasts: list,
+    output_dir: str = None,
+    options: dict = None,
+    workers: int = None,
+) -> list:
+    """
+    Run the **full** pdf_to_excel pipeline once per ``--ocr-contrast`` value, in this process.
+    
+    The pages that need OCR are rendered once; the contrast variants of each page are OCR'd concurrently
+    in one process pool into a temporary OCR cache. Each value is then converted with ``convert_statement``
+    on one shared PdfSession, as in ``run_ocr_zoom_sweep_excel``, and written to
+    ``{pdf_stem}_ocr_contrast_{value:.2f}.xlsx``.
+    
+    Args:
+        pdf_path: Path to PDF file
+        contrasts: Contrast factors to compare (1.0 = raw raster)
+        output_dir: Folder for the Excel files (default: the PDF's folder)
+        options: convert_statement() options for every run (e.g. {'ocr_zoom': 4, 'debug': True}). The OCR cache,
+            ``ocr_roi``, ``ocr_adaptive`` and ``ocr_save_visual`` options are not used.
+        workers: OCR processes (default: the ``ocr_workers`` option, else CPU count)
+    
+    Returns:
+        List of {"contrast", "result" (ConversionResult; ``result.movements`` holds the movement rows),
+        "ocr_wall_s", "words", "mean_conf"} in ``contrasts`` order
+    """
+    pdf_path = os.path.abspath(os.path.normpath(pdf_path))
+    stem = os.path.splitext(os.path.basename(pdf_path))[0]
+    output_dir = output_dir or os.path.dirname(pdf_path)
+    os.makedirs(output_dir, exist_ok=True)
+    unused = ('output_excel', 'ocr_contrast', 'ocr_cache_dir', 'ocr_cache_max_mb', 'no_ocr_cache',
+              'ocr_roi', 'ocr_adaptive', 'ocr_save_visual', 'metrics_json')
+    options = {k: v for k, v in (options or {}).items() if k not in unused}
+    rows = []
+    # Plan and OCR read the run options (zoom, workers, text and OCR engines) like convert_statement()
+    with _run_options(pdf_path, options):
+        zoom = _parse_ocr_zoom_from_argv() or float(OCR_RENDER_ZOOM)
+        with PdfSession(pdf_path, text_engine=_parse_text_engine_from_argv()) as session, \
+                tempfile.TemporaryDirectory(prefix='ocr_contrast_sweep_') as cache_dir:
+            session.keep_open = True
+            plan = _ocr_plan(pdf_path, session)
+            sweep = {c: [] for c in contrasts}
+            if not plan:
+                print("[INFO] Contrast sweep: no page of this PDF needs OCR; every contrast gives the same result", flush=True)
+            else:
+                if not configure_tesseract() and resolve_ocr_engine_name() != 'tesserocr':
+                    raise RuntimeError("Tesseract OCR not found. Install Tesseract from: https://github.com/UB-Mannheim/tesseract/wiki")
+                sweep = _ocr_contrast_sweep_pages(pdf_path, contrasts, plan, zoom, workers)
+                pdf_hash = _file_sha256(pdf_path)
+                tesseract_version = _OCR_ENGINE_CLASSES[resolve_ocr_engine_name()].version()
+                for page_results in sweep.values():
+                    for params, page_num, entry, _wall, _cpu in page_results:
+                        _ocr_cache_store(cache_dir, _ocr_cache_key(pdf_hash, page_num, params, tesseract_version), entry)
+            for c in contrasts:
+                out_xlsx = os.path.join(output_dir, f'{stem}_ocr_contrast_{c:.2f}.xlsx')
+                print(f"\n========== PDF→Excel contrast sweep: contrast={c} → {out_xlsx} ==========", flush=True)
+                result = convert_statement(pdf_path, dict(
+                    options, ocr_zoom=zoom, ocr_contrast=c, output_excel=out_xlsx,
+                    ocr_cache_dir=cache_dir, ocr_cache_max_mb=1024 * 1024,
+                ), session=session)
+                stats = _zoom_sweep_stats(sweep[c])
+                rows.append({
+                    'contrast': c, 'result': result,
+                    'ocr_wall_s': stats['ocr_wall_s'], 'words': stats['words'], 'mean_conf': stats['mean_conf'],
+                })
+    return rows
+
+
 def filter_hsbc_movements_section(pages_data: list, start_string: str, end_string: str, end_strings_also: list = None) -> list:
     """
     Filtra palabras que están entre start_string y end_string para HSBC.
@@ -2356,7 +4749,7 @@ def enrich_santander_ocr_pdf_summary_header(
     m_direct = bbva_rfc_after_label_re.search(pre_movement_text_ocr or '')
     if m_direct:
         rfc_pref = re.sub(r'\s+', '', m_direct.group(1)).upper()
-        if '--debug' in sys.argv:
+        if '--debug' in _run_argv():
             print(f"RFC_MATCH (Santander OCR pre-mov R.F.C direct): {rfc_pref}", flush=True)
 
     for i, ln in enumerate(pre_movement_lines):
@@ -2368,7 +4761,7 @@ def enrich_santander_ocr_pdf_summary_header(
         m_label = bbva_rfc_label_re.search(line)
         if not m_label:
             continue
-        if '--debug' in sys.argv:
+        if '--debug' in _run_argv():
             print(
                 "RFC_CHECK (Santander OCR pre-mov R.F.C): %s"
                 % (line[:220] + '...' if len(line) > 220 else line),
@@ -2378,7 +4771,7 @@ def enrich_santander_ocr_pdf_summary_header(
         m_val = bbva_rfc_value_re.search(after) or bbva_rfc_value_re.search(line)
         if m_val is None and i + 1 < len(pre_movement_lines):
             nxt = (pre_movement_lines[i + 1] or '').strip()
-            if '--debug' in sys.argv and nxt:
+            if '--debug' in _run_argv() and nxt:
                 print(
                     "RFC_CHECK (Santander OCR pre-mov next): %s"
                     % (nxt[:220] + '...' if len(nxt) > 220 else nxt),
@@ -2387,7 +4780,7 @@ def enrich_santander_ocr_pdf_summary_header(
             m_val = bbva_rfc_value_re.search(nxt)
         if m_val:
             rfc_pref = re.sub(r'\s+', '', m_val.group(1)).upper()
-            if '--debug' in sys.argv:
+            if '--debug' in _run_argv():
                 print(f"RFC_MATCH (Santander OCR pre-mov R.F.C): {rfc_pref}", flush=True)
             break
 
@@ -2401,7 +4794,7 @@ def enrich_santander_ocr_pdf_summary_header(
     name_ocr = _santander_ocr_name_before_codigo_cliente(pre_movement_text_ocr)
     if name_ocr:
         pdf_summary['name'] = name_ocr
-        if '--debug' in sys.argv:
+        if '--debug' in _run_argv():
             print(f"NOMBRE_MATCH (Santander OCR pre-mov CODIGO DE CLIENTE): {name_ocr}", flush=True)
 
 
@@ -2582,11 +4975,13 @@ def banamex_second_pass_rfc_tarjeta_sucursal_band(
     words_rfc: list,
     zoom_factor: float,
     lang: str = 'spa+eng',
+    ocr_engine=None,
 ):
     """
     Re-OCR a tight vertical crop between the 'Número de tarjeta' and 'Número de sucursal' rows.
     Banamex often prints the RFC in bold or as an image between those labels; the main pass can miss it
     while still finding the label lines from weaker words.
+    ``ocr_engine`` is the page's engine (see ``get_ocr_engine``); default: this process's ``--ocr-engine``.
 
     Returns:
         (raw_band_text: str, rfc: str|None) or (None, None) if the band cannot be built or OCR fails.
@@ -2660,7 +5055,8 @@ def banamex_second_pass_rfc_tarjeta_sucursal_band(
 
     tesseract_config = r'--oem 1 --psm 6'
     try:
-        raw = pytesseract.image_to_string(band_up, lang=lang, config=tesseract_config)
+        engine = ocr_engine or get_ocr_engine(lang=lang)
+        raw = engine.image_to_string(band_up, lang=lang, config=tesseract_config)
     except Exception:
         return None, None
     if not raw or not raw.strip():
@@ -2762,9 +5158,18 @@ def extract_banamex_rfc_from_ocr_words(words: list) -> str:
     return None
 
 
-# When --debug: collect lines for RFC/Nombre extraction log (written to _movements_debug.txt)
-RFC_DEBUG_LINES = []
-NAME_DEBUG_LINES = []
+# When --debug: collect lines for RFC/Nombre extraction log (written to _movements_debug.txt).
+# One list per conversion (convert_statement sets them), read through _debug_lines().
+RFC_DEBUG_LINES = contextvars.ContextVar('RFC_DEBUG_LINES', default=None)
+NAME_DEBUG_LINES = contextvars.ContextVar('NAME_DEBUG_LINES', default=None)
+
+
+def _debug_lines(var: contextvars.ContextVar) -> list:
+    lines = var.get()
+    if lines is None:
+        lines = []
+        var.set(lines)
+    return lines
 
 
 def extract_name_from_tarjeta_titular_line(full_text: str):
@@ -3081,20 +5486,20 @@ def extract_rfc_and_name_from_text(full_text: str, detected_bank=None):
     bank_keywords = BANK_KEYWORDS.get(detected_bank, []) if detected_bank else []
 
     def _rfc_debug(msg):
-        if '--debug' not in sys.argv:
+        if '--debug' not in _run_argv():
             return
-        RFC_DEBUG_LINES.append(msg)
+        _debug_lines(RFC_DEBUG_LINES).append(msg)
         print(msg, flush=True)
 
     def _name_debug(msg):
-        if '--debug' not in sys.argv:
+        if '--debug' not in _run_argv():
             return
-        NAME_DEBUG_LINES.append(msg)
+        _debug_lines(NAME_DEBUG_LINES).append(msg)
         print(msg, flush=True)
 
-    if '--debug' in sys.argv:
-        RFC_DEBUG_LINES.clear()
-        NAME_DEBUG_LINES.clear()
+    if '--debug' in _run_argv():
+        _debug_lines(RFC_DEBUG_LINES).clear()
+        _debug_lines(NAME_DEBUG_LINES).clear()
         _rfc_debug("--- RFC extraction (bank=%s) ---" % (detected_bank or 'None'))
         _name_debug("--- Nombre extraction (bank=%s) ---" % (detected_bank or 'None'))
 
@@ -3906,10 +6311,95 @@ def extract_rfc_and_name_from_text(full_text: str, detected_bank=None):
     return (rfc, name)
 
 
-def extract_summary_from_pdf(pdf_path: str, movement_start_page: int = None) -> dict:
+class _SessionSummaryPages:
+    """Page text for ``_extract_summary`` from a PdfSession's text layer (Konfio: ``fix_duplicated_chars`` once per page)."""
+
+    def __init__(self, session: PdfSession, fix_duplicates: bool):
+        self.session = session
+        self.fix_duplicates = fix_duplicates
+        self._fixed = {}
+
+    @property
+    def page_count(self) -> int:
+        return self.session.page_count
+
+    def page_text(self, index: int):
+        text = self.session.page_text(index)
+        if not (self.fix_duplicates and text):
+            return text
+        if index not in self._fixed:
+            self._fixed[index] = fix_duplicated_chars(text)
+        return self._fixed[index]
+
+    def raw_page_text(self, index: int):
+        return self.session.page_text(index)
+
+
+class _ExtractedSummaryPages:
+    """
+    Page text for ``_extract_summary`` from the pages extract_text_from_pdf() already built (text layer or OCR
+    content; Konfio text-layer pages are already fixed). ``raw_page_text`` reads the session's cached text layer
+    for text-layer pages (Konfio RFC).
+    """
+
+    def __init__(self, extracted_data: list, session: PdfSession = None):
+        self.extracted_data = extracted_data
+        self.session = session
+
+    @property
+    def page_count(self) -> int:
+        return len(self.extracted_data)
+
+    def page_text(self, index: int):
+        return self.extracted_data[index].get('content') or ''
+
+    def raw_page_text(self, index: int):
+        if self.session is not None and self.extracted_data[index].get('_page_source') == 'text':
+            return self.session.page_text(index)
+        return self.page_text(index)
+
+
+def extract_summary_from_pdf(pdf_path: str, movement_start_page: int = None, session: PdfSession = None) -> dict:
+    """
+    Extract summary information from the PDF text layer (totals, deposits, withdrawals, balance, movement count).
+    Detects the bank and parses the pages it needs with ``_extract_summary``. When a PdfSession is given, the open
+    PDF, its cached page text and its bank detection are reused.
+    To reuse the pages and bank of a conversion instead, use ``extract_summary_from_pages``.
+    """
+    with _pdf_session(pdf_path, session) as pdf_session:
+        bank_name = detect_bank_from_pdf(pdf_path, session=pdf_session)
+        return _extract_summary(_SessionSummaryPages(pdf_session, bank_name == "Konfio"), bank_name, movement_start_page)
+
+
+def extract_summary_from_pages(
+    extracted_data: list,
+    bank_name: str,
+    movement_start_page: int = None,
+    session: PdfSession = None,
+) -> dict:
+    """
+    Summary of a statement from the pages already extracted for its movements: no second bank detection and no
+    second parse of the document, and OCR'd statements are read from their OCR text instead of the illegible
+    text layer. Only the pages the bank's patterns need are read (first pages, last page, movement start page;
+    every page for Banregio/Konfio).
+    
+    Args:
+        extracted_data: Page entries from extract_text_from_pdf()
+        bank_name: Bank detected for the conversion
+        movement_start_page: 1-based page where movements start (INTERCAM Saldo Final)
+        session: Open PdfSession of the PDF; Konfio reads the raw first page from it for the RFC
+    
+    Returns:
+        Same dictionary as extract_summary_from_pdf
     """
-    Extract summary information from PDF (totals, deposits, withdrawals, balance, movement count).
-    Uses bank-specific patterns to extract summary data accurately.
+    return _extract_summary(_ExtractedSummaryPages(extracted_data, session), bank_name, movement_start_page)
+
+
+def _extract_summary(pages, bank_name: str, movement_start_page: int = None) -> dict:
+    """
+    Extract summary information (totals, deposits, withdrawals, balance, movement count) with bank-specific patterns.
+    ``pages`` gives ``page_count``, ``page_text(index)`` (0-based, -1 = last page; Konfio text already passed through
+    fix_duplicated_chars) and ``raw_page_text(index)``.
     Returns a dictionary with extracted values or None if not found.
     For INTERCAM, when movement_start_page is provided, Saldo Final is taken only from that page.
     """
@@ -3927,936 +6417,923 @@ def extract_summary_from_pdf(pdf_path: str, movement_start_page: int = None) ->
     }
     
     try:
-        # First, detect the bank
-        bank_name = detect_bank_from_pdf(pdf_path)
         # print(f"🏦 Extrayendo resumen para banco: {bank_name}")
         
-        with pdfplumber.open(pdf_path) as pdf:
-            # Check first few pages and last page for summary information
-            # For Banregio, check all pages to find "Total" line which can be on any page
-            pages_to_check = min(3, len(pdf.pages))
-            all_text = ""
-            all_lines = []
-            
-            # For Konfio, read page 2 for summary information and all pages for "Subtotal" line
-            if bank_name == "Konfio":
-                # Read page 2 for summary information (Pagos, Devoluciones, Compras y cargos, Saldo total al corte)
-                if len(pdf.pages) >= 2:
-                    page = pdf.pages[1]  # Page 2 (0-indexed)
-                    text = page.extract_text()
-                    if text:
-                        # Fix duplicated characters issue (e.g., "PPaaggoo" -> "Pagos")
-                        # This happens with some PDF encodings where each character is duplicated
-                        text = fix_duplicated_chars(text)
-                        all_text = text + "\n"
-                        all_lines = text.split('\n')
-                else:
-                    all_lines = []  # Not enough pages
-                
-                # Also read all pages to find "Subtotal" line (usually at the end of movements)
-                # This line contains: "Subtotal $ X,XXX.XX $ Y,YYY.YY" where first is cargos, second is abonos
-                for page_num in range(len(pdf.pages)):
-                    page = pdf.pages[page_num]
-                    text = page.extract_text()
-                    if text:
-                        text = fix_duplicated_chars(text)
-                        all_lines.extend(text.split('\n'))
-            # For Banregio, collect text from all pages to find "Total" line
-            elif bank_name == "Banregio":
-                for page_num in range(len(pdf.pages)):
-                    page = pdf.pages[page_num]
-                    text = page.extract_text()
-                    if text:
-                        all_text += text + "\n"
-                        all_lines.extend(text.split('\n'))
+        # Check first few pages and last page for summary information
+        # For Banregio, check all pages to find "Total" line which can be on any page
+        pages_to_check = min(3, pages.page_count)
+        all_text = ""
+        all_lines = []
+        
+        # For Konfio, read page 2 for summary information and all pages for "Subtotal" line
+        if bank_name == "Konfio":
+            # Read page 2 for summary information (Pagos, Devoluciones, Compras y cargos, Saldo total al corte)
+            if pages.page_count >= 2:
+                # Duplicated characters (e.g., "PPaaggoo" -> "Pagos") are already fixed in ``pages``
+                text = pages.page_text(1)  # Page 2 (0-indexed)
+                if text:
+                    all_text = text + "\n"
+                    all_lines = text.split('\n')
             else:
-                # Collect text from first pages
-                # For INTERCAM, keep lines per page so Saldo Final can be taken from movements_start page only
-                lines_by_page = {} if bank_name == "INTERCAM" else None
-                for page_num in range(pages_to_check):
-                    page = pdf.pages[page_num]
-                    text = page.extract_text()
-                    if text:
-                        all_text += text + "\n"
-                        page_lines = text.split('\n')
-                        all_lines.extend(page_lines)
-                        if lines_by_page is not None:
-                            lines_by_page[page_num + 1] = page_lines  # 1-based page number
-                
-                # Also check last page for Santander and BanRegio
-                if len(pdf.pages) > pages_to_check:
-                    last_page = pdf.pages[-1]
-                    last_text = last_page.extract_text()
-                    if last_text:
-                        last_lines = last_text.split('\n')
-                        all_lines.extend(last_lines)
-                        if lines_by_page is not None:
-                            lines_by_page[len(pdf.pages)] = last_lines  # 1-based last page number
-                
-                # For INTERCAM, ensure we have the movements_start page for Saldo Final (may be beyond first pages)
-                if lines_by_page is not None and movement_start_page is not None:
-                    if 1 <= movement_start_page <= len(pdf.pages) and movement_start_page not in lines_by_page:
-                        page = pdf.pages[movement_start_page - 1]
-                        text = page.extract_text()
-                        if text:
-                            lines_by_page[movement_start_page] = text.split('\n')
-            
-            # Extract RFC, name, period from full text (all banks)
-            full_text = all_text if all_text else '\n'.join(all_lines)
-            if full_text:
-                summary_data['period_text'] = extract_period_text_from_text(full_text)
-                # INTERCAM: trim period to only "DEL YYYY-MM-DD AL YYYY-MM-DD" (drop Número, Año, etc.)
-                if bank_name == "INTERCAM" and summary_data.get('period_text'):
-                    pt = summary_data['period_text']
-                    intercam_period = re.search(r'DEL\s+\d{4}-\d{2}-\d{2}\s+AL\s+\d{4}-\d{2}-\d{2}', pt, re.IGNORECASE)
-                    if intercam_period:
-                        summary_data['period_text'] = intercam_period.group(0).strip()
-                # Banamex: trim period to only "DD-mon-YYYY al DD-mon-YYYY" (e.g. 20-sep-2025 al 21-oct-2025; drop Fecha de corte, Número de días, etc.)
-                if bank_name == "Banamex" and summary_data.get('period_text'):
-                    pt = summary_data['period_text']
-                    banamex_period = re.search(r'\d{1,2}-[a-z]{3}-\d{4}\s+al\s+\d{1,2}-[a-z]{3}-\d{4}', pt, re.IGNORECASE)
-                    if banamex_period:
-                        summary_data['period_text'] = banamex_period.group(0).strip()
-                # Konfio: RFC from raw first page (RRFFCC/AMM160915BU4); name and period from fixed text
-                if bank_name == "Konfio" and len(pdf.pages) >= 1:
-                    first_page_raw = pdf.pages[0].extract_text() or ""
-                    first_page_fixed = fix_duplicated_chars(first_page_raw) if first_page_raw else ""
-                    rfc_val, name_val = extract_rfc_and_name_from_text(first_page_fixed or full_text, detected_bank=bank_name)
-                    rfc_from_raw = extract_rfc_from_raw_konfio(first_page_raw)
-                    if rfc_from_raw is not None:
-                        rfc_val = rfc_from_raw
-                else:
-                    rfc_val, name_val = extract_rfc_and_name_from_text(full_text, detected_bank=bank_name)
-                summary_data['rfc'] = rfc_val
-                summary_data['name'] = name_val
-            
-            # Bank-specific extraction
-            if bank_name == "BBVA":
-                # BBVA: "Depósitos / Abonos (+) 1 25,000.00" - el último número es el total
-                # "Retiros / Cargos (-) 25 53,877.37"
-                # "Saldo Final (+) 166,301.83"
-                #print(f"🔍 Buscando patrones BBVA en {len(all_lines)} líneas...")
-                for i, line in enumerate(all_lines):
-                    # Try multiple patterns for BBVA depósitos
-                    if not summary_data['total_abonos']:
-                        patterns_bbva = [
-                            r'Dep[oó]sitos\s*/\s*Abonos\s*\(\+\)\s+\d+\s+([\d,\.]+)',  # Original pattern
-                            r'Dep[oó]sitos\s*/\s*Abonos\s*\(\+\).*?([\d,\.]+)',  # More flexible
-                            r'Dep[oó]sitos.*?Abonos.*?\(\+\).*?([\d,\.]+)',  # Even more flexible
-                        ]
-                        for pattern in patterns_bbva:
-                            match = re.search(pattern, line, re.I)
-                            if match:
-                                amount = normalize_amount_str(match.group(1))
-                                if amount > 0:
-                                    #print(f"✅ BBVA: Encontrado depósitos/abonos: ${amount:,.2f} en línea {i+1}: {line[:80]}")
-                                    summary_data['total_abonos'] = amount
-                                    summary_data['total_depositos'] = amount
-                                    break
-                    
-                    # Search for Retiros / Cargos
-                    if not summary_data['total_cargos']:
-                        patterns_retiros = [
-                            r'Retiros\s*/\s*Cargos\s*\(\-\)\s+\d+\s+([\d,\.]+)',
-                            r'Retiros\s*/\s*Cargos\s*\(\-\).*?([\d,\.]+)',
-                            r'Retiros.*?Cargos.*?\(\-\).*?([\d,\.]+)',
-                        ]
-                        for pattern in patterns_retiros:
-                            match = re.search(pattern, line, re.I)
-                            if match:
-                                amount = normalize_amount_str(match.group(1))
-                                if amount > 0:
-                                    summary_data['total_cargos'] = amount
-                                    summary_data['total_retiros'] = amount
-                                    break
-                    
-                    # Search for Saldo Final
-                    if not summary_data['saldo_final']:
-                        patterns_saldo = [
-                            r'Saldo\s+Final\s*\(\+\)\s+([\d,\.]+)',
-                            r'Saldo\s+Final.*?([\d,\.]+)',
-                        ]
-                        for pattern in patterns_saldo:
-                            match = re.search(pattern, line, re.I)
-                            if match:
-                                amount = normalize_amount_str(match.group(1))
-                                if amount > 0:
-                                    summary_data['saldo_final'] = amount
-                                    break
+                all_lines = []  # Not enough pages
             
-            elif bank_name == "Inbursa":
-                # Inbursa: "ABONOS 9,375.49" - el número después de ABONOS
-                # "CARGOS 58,927.68"
-                # "SALDO ACTUAL 546,409.22"
-                # "SALDO ANTERIOR 595,961.41"
-                #print(f"🔍 Buscando patrones Inbursa en {len(all_lines)} líneas...")
-                for i, line in enumerate(all_lines):
-                    if not summary_data['total_abonos']:
-                        match = re.search(r'ABONOS\s+([\d,\.]+)', line, re.I)
-                        if match:
-                            amount = normalize_amount_str(match.group(1))
-                            if amount > 0:
-                                #print(f"✅ Inbursa: Encontrado abonos: ${amount:,.2f} en línea {i+1}: {line[:80]}")
-                                summary_data['total_abonos'] = amount
-                                summary_data['total_depositos'] = amount
-                    
-                    if not summary_data['total_cargos']:
-                        match = re.search(r'CARGOS\s+([\d,\.]+)', line, re.I)
-                        if match:
-                            amount = normalize_amount_str(match.group(1))
-                            if amount > 0:
-                                #print(f"✅ Inbursa: Encontrado cargos: ${amount:,.2f} en línea {i+1}: {line[:80]}")
-                                summary_data['total_cargos'] = amount
-                                summary_data['total_retiros'] = amount
-                    
-                    if not summary_data['saldo_final']:
-                        match = re.search(r'SALDO\s+ACTUAL\s+([\d,\.]+)', line, re.I)
-                        if match:
-                            amount = normalize_amount_str(match.group(1))
-                            if amount > 0:
-                                #print(f"✅ Inbursa: Encontrado saldo actual: ${amount:,.2f} en línea {i+1}: {line[:80]}")
-                                summary_data['saldo_final'] = amount
-                    
-                    if not summary_data['saldo_anterior']:
-                        match = re.search(r'SALDO\s+ANTERIOR\s+([\d,\.]+)', line, re.I)
-                        if match:
-                            amount = normalize_amount_str(match.group(1))
-                            if amount > 0:
-                                #print(f"✅ Inbursa: Encontrado saldo anterior: ${amount:,.2f} en línea {i+1}: {line[:80]}")
-                                summary_data['saldo_anterior'] = amount
-            
-            elif bank_name == "Santander":
-                # Santander: Extract from first page, section between "CUENTA DE CHEQUES" and "GRAFICO CUENTA DE CHEQUES"
-                # Patterns:
-                # "+ DEPOSITOS 821,646.20" -> Total de Abonos
-                # "- RETIROS 820,238.73" -> Total de Retiros
-                # "SALDO ACTUAL 1,417.18" -> Saldo Final
-                #print(f"🔍 Buscando patrones Santander en primera página...")
-                
-                # Get first page text for more reliable extraction
-                first_page_text = ""
-                if len(pdf.pages) > 0:
-                    first_page = pdf.pages[0]
-                    first_page_text = first_page.extract_text() or ""
-                
-                # Find the section between "CUENTA DE CHEQUES" and "GRAFICO CUENTA DE CHEQUES"
-                cuenta_match = re.search(r'CUENTA\s+DE\s+CHEQUES', first_page_text, re.I)
-                grafico_match = re.search(r'GRAFICO\s+CUENTA\s+DE\s+CHEQUES', first_page_text, re.I)
-                
-                if cuenta_match and grafico_match:
-                    # Extract the section text
-                    section_start = cuenta_match.start()
-                    section_end = grafico_match.start()
-                    section_text = first_page_text[section_start:section_end]
-                    
-                    # Pattern: "+ DEPOSITOS 821,646.20" or "+DEPOSITOS 821,646.20"
-                    if not summary_data['total_depositos'] or not summary_data['total_abonos']:
-                        match = re.search(r'[+\s]+DEPOSITOS\s+([\d,\.]+)', section_text, re.I)
-                        if match:
-                            depositos = normalize_amount_str(match.group(1))
-                            #print(f"✅ Santander: Encontrado DEPOSITOS: ${depositos:,.2f}")
-                            if depositos > 0:
-                                summary_data['total_depositos'] = depositos
-                                summary_data['total_abonos'] = depositos
-                    
-                    # Pattern: "- RETIROS 820,238.73" or "-RETIROS 820,238.73"
-                    if not summary_data['total_retiros'] or not summary_data['total_cargos']:
-                        match = re.search(r'[-\s]+RETIROS\s+([\d,\.]+)', section_text, re.I)
-                        if match:
-                            retiros = normalize_amount_str(match.group(1))
-                            #print(f"✅ Santander: Found WITHDRAWALS: ${retiros:,.2f}")
-                            if retiros > 0:
-                                summary_data['total_retiros'] = retiros
-                                summary_data['total_cargos'] = retiros
-                    
-                    # Pattern: "SALDO ACTUAL 1,417.18" or "= SALDO ACTUAL 1,417.18"
-                    if not summary_data['saldo_final']:
-                        match = re.search(r'(?:=\s*)?SALDO\s+ACTUAL\s+([\d,\.]+)', section_text, re.I)
-                        if match:
-                            saldo = normalize_amount_str(match.group(1))
-                            #print(f"✅ Santander: Encontrado SALDO ACTUAL: ${saldo:,.2f}")
-                            if saldo > 0:
-                                summary_data['saldo_final'] = saldo
-                else:
-                    # Fallback: search in all text if section markers not found
-                    #print(f"⚠️  No se encontró sección CUENTA DE CHEQUES, buscando en todo el texto...")
-                    full_text = all_text
-                    
-                    # Pattern: "+ DEPOSITOS 821,646.20"
-                    if not summary_data['total_depositos'] or not summary_data['total_abonos']:
-                        match = re.search(r'[+\s]+DEPOSITOS\s+([\d,\.]+)', full_text, re.I)
-                        if match:
-                            depositos = normalize_amount_str(match.group(1))
-                            if depositos > 0:
-                                summary_data['total_depositos'] = depositos
-                                summary_data['total_abonos'] = depositos
-                    
-                    # Pattern: "- RETIROS 820,238.73"
-                    if not summary_data['total_retiros'] or not summary_data['total_cargos']:
-                        match = re.search(r'[-\s]+RETIROS\s+([\d,\.]+)', full_text, re.I)
-                        if match:
-                            retiros = normalize_amount_str(match.group(1))
-                            if retiros > 0:
-                                summary_data['total_retiros'] = retiros
-                                summary_data['total_cargos'] = retiros
-                    
-                    # Pattern: "SALDO ACTUAL 1,417.18"
-                    if not summary_data['saldo_final']:
-                        match = re.search(r'(?:=\s*)?SALDO\s+ACTUAL\s+([\d,\.]+)', full_text, re.I)
-                        if match:
-                            saldo = normalize_amount_str(match.group(1))
-                            if saldo > 0:
-                                summary_data['saldo_final'] = saldo
-            
-            elif bank_name == "Mercury":
-                # Mercury: Total Cargos from line containing "Total withdrawals" (absolute value, e.g. -$9,292.00 -> $9,292.00)
-                for line in all_lines:
-                    if not summary_data['total_cargos'] and 'Total withdrawals' in line.replace('\r', ' '):
-                        # Capture amount: optional minus before/after optional $ (e.g. -$9,292.00 or $-9,292.00 or $9,292.00)
-                        match = re.search(r'Total\s+withdrawals\s+([\-]?\s*\$?\s*[\d,\.]+)', line, re.I)
-                        if match:
-                            amount = normalize_amount_str(match.group(1))
-                            if amount is not None and amount != 0:
-                                summary_data['total_cargos'] = abs(amount)
-                                summary_data['total_retiros'] = summary_data['total_cargos']
-                    if not summary_data['total_abonos'] and 'Total deposits' in line.replace('\r', ' '):
-                        match = re.search(r'Total\s+deposits\s+\$?\s*([\d,\.\-]+)', line, re.I)
-                        if match:
-                            amount = normalize_amount_str(match.group(1))
-                            if amount is not None and amount != 0:
-                                summary_data['total_abonos'] = abs(amount)
-                                summary_data['total_depositos'] = summary_data['total_abonos']
-                    if summary_data.get('saldo_final') is None and 'Statement balance' in line.replace('\r', ' '):
-                        match = re.search(r'Statement\s+balance\s+\$?\s*([\d,\.\-]+)', line, re.I)
-                        if match:
-                            amount = normalize_amount_str(match.group(1))
-                            if amount is not None:
-                                summary_data['saldo_final'] = amount
-            
-            elif bank_name == "Banorte":
-                # Banorte: 
-                # "Saldo inicial del periodo $ 2,284.38"
-                # "+ Total de depósitos $ 38,396.00"
-                # "- Total de retiros $ 36,805.40"
-                # "Saldo actual $ 3,347.18"
-                #print(f"🔍 Buscando patrones Banorte en {len(all_lines)} líneas...")
-                for i, line in enumerate(all_lines):
-                    # Saldo inicial
-                    if not summary_data['saldo_anterior']:
-                        match = re.search(r'Saldo\s+inicial\s+del\s+periodo\s+\$\s*([\d,\.]+)', line, re.I)
-                        if match:
-                            amount = normalize_amount_str(match.group(1))
-                            if amount > 0:
-                                #print(f"✅ Banorte: Encontrado saldo inicial: ${amount:,.2f} en línea {i+1}: {line[:80]}")
-                                summary_data['saldo_anterior'] = amount
-                    
-                    # Depósitos
-                    if not summary_data['total_depositos']:
-                        match = re.search(r'\+\s*Total\s+de\s+dep[oó]sitos\s+\$\s*([\d,\.]+)', line, re.I)
-                        if match:
-                            amount = normalize_amount_str(match.group(1))
-                            if amount > 0:
-                                #print(f"✅ Banorte: Encontrado depósitos: ${amount:,.2f} en línea {i+1}: {line[:80]}")
-                                summary_data['total_depositos'] = amount
-                                summary_data['total_abonos'] = amount
-                    
-                    # Retiros
-                    if not summary_data['total_retiros']:
-                        match = re.search(r'-\s*Total\s+de\s+retiros\s+\$\s*([\d,\.]+)', line, re.I)
-                        if match:
-                            amount = normalize_amount_str(match.group(1))
-                            if amount > 0:
-                                #print(f"✅ Banorte: Encontrado retiros: ${amount:,.2f} en línea {i+1}: {line[:80]}")
-                                summary_data['total_retiros'] = amount
-                                summary_data['total_cargos'] = amount
-                    
-                    # Saldo actual
-                    if not summary_data['saldo_final']:
-                        match = re.search(r'Saldo\s+actual\s+\$\s*([\d,\.]+)', line, re.I)
-                        if match:
-                            amount = normalize_amount_str(match.group(1))
-                            if amount > 0:
-                                #print(f"✅ Banorte: Encontrado saldo actual: ${amount:,.2f} en línea {i+1}: {line[:80]}")
-                                summary_data['saldo_final'] = amount
-            
-            elif bank_name == "Banamex":
-                # Banamex: 
-                # "Saldo Anterior $5,297.64"
-                # "( + ) 8 Depósitos $344,527.26"
-                # "( - ) 16 Retiros $254,072.38"
-                # "SALDO AL 31 DE ENERO DE 2020 $95,752.52"
-                #print(f"🔍 Buscando patrones Banamex en {len(all_lines)} líneas...")
-                for i, line in enumerate(all_lines):
-                    # Saldo Anterior
-                    if not summary_data['saldo_anterior']:
-                        match = re.search(r'Saldo\s+Anterior\s+\$\s*([\d,\.]+)', line, re.I)
-                        if match:
-                            amount = normalize_amount_str(match.group(1))
-                            if amount > 0:
-                                #print(f"✅ Banamex: Encontrado saldo anterior: ${amount:,.2f} en línea {i+1}: {line[:80]}")
-                                summary_data['saldo_anterior'] = amount
-                    
-                    # Depósitos
-                    if not summary_data['total_depositos']:
-                        match = re.search(r'\(\s*\+\s*\)\s+\d+\s+Dep[oó]sitos\s+\$\s*([\d,\.]+)', line, re.I)
+            # Also read all pages to find "Subtotal" line (usually at the end of movements)
+            # This line contains: "Subtotal $ X,XXX.XX $ Y,YYY.YY" where first is cargos, second is abonos
+            for page_num in range(pages.page_count):
+                text = pages.page_text(page_num)
+                if text:
+                    all_lines.extend(text.split('\n'))
+        # For Banregio, collect text from all pages to find "Total" line
+        elif bank_name == "Banregio":
+            for page_num in range(pages.page_count):
+                text = pages.page_text(page_num)
+                if text:
+                    all_text += text + "\n"
+                    all_lines.extend(text.split('\n'))
+        else:
+            # Collect text from first pages
+            # For INTERCAM, keep lines per page so Saldo Final can be taken from movements_start page only
+            lines_by_page = {} if bank_name == "INTERCAM" else None
+            for page_num in range(pages_to_check):
+                text = pages.page_text(page_num)
+                if text:
+                    all_text += text + "\n"
+                    page_lines = text.split('\n')
+                    all_lines.extend(page_lines)
+                    if lines_by_page is not None:
+                        lines_by_page[page_num + 1] = page_lines  # 1-based page number
+            
+            # Also check last page for Santander and BanRegio
+            if pages.page_count > pages_to_check:
+                last_text = pages.page_text(-1)
+                if last_text:
+                    last_lines = last_text.split('\n')
+                    all_lines.extend(last_lines)
+                    if lines_by_page is not None:
+                        lines_by_page[pages.page_count] = last_lines  # 1-based last page number
+            
+            # For INTERCAM, ensure we have the movements_start page for Saldo Final (may be beyond first pages)
+            if lines_by_page is not None and movement_start_page is not None:
+                if 1 <= movement_start_page <= pages.page_count and movement_start_page not in lines_by_page:
+                    text = pages.page_text(movement_start_page - 1)
+                    if text:
+                        lines_by_page[movement_start_page] = text.split('\n')
+        
+        # Extract RFC, name, period from full text (all banks)
+        full_text = all_text if all_text else '\n'.join(all_lines)
+        if full_text:
+            summary_data['period_text'] = extract_period_text_from_text(full_text)
+            # INTERCAM: trim period to only "DEL YYYY-MM-DD AL YYYY-MM-DD" (drop Número, Año, etc.)
+            if bank_name == "INTERCAM" and summary_data.get('period_text'):
+                pt = summary_data['period_text']
+                intercam_period = re.search(r'DEL\s+\d{4}-\d{2}-\d{2}\s+AL\s+\d{4}-\d{2}-\d{2}', pt, re.IGNORECASE)
+                if intercam_period:
+                    summary_data['period_text'] = intercam_period.group(0).strip()
+            # Banamex: trim period to only "DD-mon-YYYY al DD-mon-YYYY" (e.g. 20-sep-2025 al 21-oct-2025; drop Fecha de corte, Número de días, etc.)
+            if bank_name == "Banamex" and summary_data.get('period_text'):
+                pt = summary_data['period_text']
+                banamex_period = re.search(r'\d{1,2}-[a-z]{3}-\d{4}\s+al\s+\d{1,2}-[a-z]{3}-\d{4}', pt, re.IGNORECASE)
+                if banamex_period:
+                    summary_data['period_text'] = banamex_period.group(0).strip()
+            # Konfio: RFC from raw first page (RRFFCC/AMM160915BU4); name and period from fixed text
+            if bank_name == "Konfio" and pages.page_count >= 1:
+                first_page_raw = pages.raw_page_text(0) or ""
+                first_page_fixed = pages.page_text(0) or ""
+                rfc_val, name_val = extract_rfc_and_name_from_text(first_page_fixed or full_text, detected_bank=bank_name)
+                rfc_from_raw = extract_rfc_from_raw_konfio(first_page_raw)
+                if rfc_from_raw is not None:
+                    rfc_val = rfc_from_raw
+            else:
+                rfc_val, name_val = extract_rfc_and_name_from_text(full_text, detected_bank=bank_name)
+            summary_data['rfc'] = rfc_val
+            summary_data['name'] = name_val
+        
+        # Bank-specific extraction
+        if bank_name == "BBVA":
+            # BBVA: "Depósitos / Abonos (+) 1 25,000.00" - el último número es el total
+            # "Retiros / Cargos (-) 25 53,877.37"
+            # "Saldo Final (+) 166,301.83"
+            #print(f"🔍 Buscando patrones BBVA en {len(all_lines)} líneas...")
+            for i, line in enumerate(all_lines):
+                # Try multiple patterns for BBVA depósitos
+                if not summary_data['total_abonos']:
+                    patterns_bbva = [
+                        r'Dep[oó]sitos\s*/\s*Abonos\s*\(\+\)\s+\d+\s+([\d,\.]+)',  # Original pattern
+                        r'Dep[oó]sitos\s*/\s*Abonos\s*\(\+\).*?([\d,\.]+)',  # More flexible
+                        r'Dep[oó]sitos.*?Abonos.*?\(\+\).*?([\d,\.]+)',  # Even more flexible
+                    ]
+                    for pattern in patterns_bbva:
+                        match = re.search(pattern, line, re.I)
                         if match:
                             amount = normalize_amount_str(match.group(1))
                             if amount > 0:
-                                #print(f"✅ Banamex: Encontrado depósitos: ${amount:,.2f} en línea {i+1}: {line[:80]}")
-                                summary_data['total_depositos'] = amount
+                                #print(f"✅ BBVA: Encontrado depósitos/abonos: ${amount:,.2f} en línea {i+1}: {line[:80]}")
                                 summary_data['total_abonos'] = amount
-                    
-                    # Retiros
-                    if not summary_data['total_retiros']:
-                        match = re.search(r'\(\s*-\s*\)\s+\d+\s+Retiros\s+\$\s*([\d,\.]+)', line, re.I)
+                                summary_data['total_depositos'] = amount
+                                break
+                
+                # Search for Retiros / Cargos
+                if not summary_data['total_cargos']:
+                    patterns_retiros = [
+                        r'Retiros\s*/\s*Cargos\s*\(\-\)\s+\d+\s+([\d,\.]+)',
+                        r'Retiros\s*/\s*Cargos\s*\(\-\).*?([\d,\.]+)',
+                        r'Retiros.*?Cargos.*?\(\-\).*?([\d,\.]+)',
+                    ]
+                    for pattern in patterns_retiros:
+                        match = re.search(pattern, line, re.I)
                         if match:
                             amount = normalize_amount_str(match.group(1))
                             if amount > 0:
-                                #print(f"✅ Banamex: Encontrado retiros: ${amount:,.2f} en línea {i+1}: {line[:80]}")
-                                summary_data['total_retiros'] = amount
                                 summary_data['total_cargos'] = amount
-                    
-                    # Saldo Final
-                    if not summary_data['saldo_final']:
-                        match = re.search(r'SALDO\s+AL\s+\d{1,2}\s+DE\s+\w+\s+DE\s+\d{4}\s+\$\s*([\d,\.]+)', line, re.I)
+                                summary_data['total_retiros'] = amount
+                                break
+                
+                # Search for Saldo Final
+                if not summary_data['saldo_final']:
+                    patterns_saldo = [
+                        r'Saldo\s+Final\s*\(\+\)\s+([\d,\.]+)',
+                        r'Saldo\s+Final.*?([\d,\.]+)',
+                    ]
+                    for pattern in patterns_saldo:
+                        match = re.search(pattern, line, re.I)
                         if match:
                             amount = normalize_amount_str(match.group(1))
                             if amount > 0:
-                                #print(f"✅ Banamex: Encontrado saldo final: ${amount:,.2f} en línea {i+1}: {line[:80]}")
                                 summary_data['saldo_final'] = amount
-                        # Also try simpler pattern
-                        if not summary_data['saldo_final']:
-                            match = re.search(r'SALDO\s+AL.*?\$\s*([\d,\.]+)', line, re.I)
-                            if match:
-                                amount = normalize_amount_str(match.group(1))
-                                if amount > 0:
-                                    #print(f"✅ Banamex: Encontrado saldo final (patrón simple): ${amount:,.2f} en línea {i+1}: {line[:80]}")
-                                    summary_data['saldo_final'] = amount
-            
-            elif bank_name == "Banbajío":
-                # BanBajío: tabla con "SALDO ANTERIOR (+) DEPOSITOS (-) CARGOS SALDO ACTUAL" y valores en la siguiente línea
-                # Pattern: "$ 5,280.55 $ 1,441,951.06 $ 1,350,565.02 $ 96,666.59"
-                #print(f"🔍 Buscando patrones BanBajío en {len(all_lines)} líneas...")
-                for i, line in enumerate(all_lines):
-                    if re.search(r'SALDO\s+ANTERIOR.*DEPOSITOS.*CARGOS.*SALDO\s+ACTUAL', line, re.I):
-                        #print(f"✅ BanBajío: Encontrada tabla en línea {i+1}: {line[:100]}")
-                        # Next line should have the values
-                        if i + 1 < len(all_lines):
-                            values_line = all_lines[i + 1]
-                            #print(f"   Línea de valores: {values_line[:100]}")
-                            # Extract all amounts from the line
-                            amounts = re.findall(r'\$\s*([\d,\.]+)', values_line)
-                            if len(amounts) >= 4:
-                                summary_data['saldo_anterior'] = normalize_amount_str(amounts[0])
-                                summary_data['total_depositos'] = normalize_amount_str(amounts[1])
-                                summary_data['total_abonos'] = normalize_amount_str(amounts[1])
-                                summary_data['total_cargos'] = normalize_amount_str(amounts[2])
-                                summary_data['total_retiros'] = normalize_amount_str(amounts[2])
-                                summary_data['saldo_final'] = normalize_amount_str(amounts[3])
-                                #print(f"   Extraídos: Saldo anterior=${summary_data['saldo_anterior']:,.2f}, Depósitos=${summary_data['total_depositos']:,.2f}, Cargos=${summary_data['total_cargos']:,.2f}, Saldo final=${summary_data['saldo_final']:,.2f}")
-                            else:
-                                pass
-                                # print(f"   ⚠️  Solo se encontraron {len(amounts)} valores, se esperaban 4")
-                            break
-            
-            elif bank_name == "Banregio":
-                # BanRegio: 
-                # "Saldo Inicial $903.18"
-                # "+ Abonos $49,675.60"
-                # "- Retiros $7,000.00"
-                # "- Comisiones Efectivamente Cobradas $320.00"
-                # "- Otros Cargos $38,678.00"
-                # "= Saldo Final $4,580.78"
-                # Also: "Total 45,998.00 49,675.60 4,580.78" (Cargos, Abonos, Saldo)
-                #print(f"🔍 Buscando patrones BanRegio en {len(all_lines)} líneas...")
-                for i, line in enumerate(all_lines):
-                    # First, try to extract from "Total" line (most reliable)
-                    # Pattern: "Total 45,998.00 49,675.60 4,580.78" (Cargos, Abonos, Saldo)
-                    # Make pattern more flexible to handle variations in spacing and allow for optional leading text
-                    total_match = re.search(r'\bTotal\s+([\d,\.]+)\s+([\d,\.]+)\s+([\d,\.]+)', line, re.I)
-                    if total_match:
-                        cargos = normalize_amount_str(total_match.group(1))
-                        abonos = normalize_amount_str(total_match.group(2))
-                        saldo = normalize_amount_str(total_match.group(3))
-                        if cargos > 0:
-                            summary_data['total_cargos'] = cargos
-                            summary_data['total_retiros'] = cargos
-                        if abonos > 0:
-                            summary_data['total_abonos'] = abonos
-                            summary_data['total_depositos'] = abonos
+                                break
+        
+        elif bank_name == "Inbursa":
+            # Inbursa: "ABONOS 9,375.49" - el número después de ABONOS
+            # "CARGOS 58,927.68"
+            # "SALDO ACTUAL 546,409.22"
+            # "SALDO ANTERIOR 595,961.41"
+            #print(f"🔍 Buscando patrones Inbursa en {len(all_lines)} líneas...")
+            for i, line in enumerate(all_lines):
+                if not summary_data['total_abonos']:
+                    match = re.search(r'ABONOS\s+([\d,\.]+)', line, re.I)
+                    if match:
+                        amount = normalize_amount_str(match.group(1))
+                        if amount > 0:
+                            #print(f"✅ Inbursa: Encontrado abonos: ${amount:,.2f} en línea {i+1}: {line[:80]}")
+                            summary_data['total_abonos'] = amount
+                            summary_data['total_depositos'] = amount
+                
+                if not summary_data['total_cargos']:
+                    match = re.search(r'CARGOS\s+([\d,\.]+)', line, re.I)
+                    if match:
+                        amount = normalize_amount_str(match.group(1))
+                        if amount > 0:
+                            #print(f"✅ Inbursa: Encontrado cargos: ${amount:,.2f} en línea {i+1}: {line[:80]}")
+                            summary_data['total_cargos'] = amount
+                            summary_data['total_retiros'] = amount
+                
+                if not summary_data['saldo_final']:
+                    match = re.search(r'SALDO\s+ACTUAL\s+([\d,\.]+)', line, re.I)
+                    if match:
+                        amount = normalize_amount_str(match.group(1))
+                        if amount > 0:
+                            #print(f"✅ Inbursa: Encontrado saldo actual: ${amount:,.2f} en línea {i+1}: {line[:80]}")
+                            summary_data['saldo_final'] = amount
+                
+                if not summary_data['saldo_anterior']:
+                    match = re.search(r'SALDO\s+ANTERIOR\s+([\d,\.]+)', line, re.I)
+                    if match:
+                        amount = normalize_amount_str(match.group(1))
+                        if amount > 0:
+                            #print(f"✅ Inbursa: Encontrado saldo anterior: ${amount:,.2f} en línea {i+1}: {line[:80]}")
+                            summary_data['saldo_anterior'] = amount
+        
+        elif bank_name == "Santander":
+            # Santander: Extract from first page, section between "CUENTA DE CHEQUES" and "GRAFICO CUENTA DE CHEQUES"
+            # Patterns:
+            # "+ DEPOSITOS 821,646.20" -> Total de Abonos
+            # "- RETIROS 820,238.73" -> Total de Retiros
+            # "SALDO ACTUAL 1,417.18" -> Saldo Final
+            #print(f"🔍 Buscando patrones Santander en primera página...")
+            
+            # Get first page text for more reliable extraction
+            first_page_text = ""
+            if pages.page_count > 0:
+                first_page_text = pages.page_text(0) or ""
+            
+            # Find the section between "CUENTA DE CHEQUES" and "GRAFICO CUENTA DE CHEQUES"
+            cuenta_match = re.search(r'CUENTA\s+DE\s+CHEQUES', first_page_text, re.I)
+            grafico_match = re.search(r'GRAFICO\s+CUENTA\s+DE\s+CHEQUES', first_page_text, re.I)
+            
+            if cuenta_match and grafico_match:
+                # Extract the section text
+                section_start = cuenta_match.start()
+                section_end = grafico_match.start()
+                section_text = first_page_text[section_start:section_end]
+                
+                # Pattern: "+ DEPOSITOS 821,646.20" or "+DEPOSITOS 821,646.20"
+                if not summary_data['total_depositos'] or not summary_data['total_abonos']:
+                    match = re.search(r'[+\s]+DEPOSITOS\s+([\d,\.]+)', section_text, re.I)
+                    if match:
+                        depositos = normalize_amount_str(match.group(1))
+                        #print(f"✅ Santander: Encontrado DEPOSITOS: ${depositos:,.2f}")
+                        if depositos > 0:
+                            summary_data['total_depositos'] = depositos
+                            summary_data['total_abonos'] = depositos
+                
+                # Pattern: "- RETIROS 820,238.73" or "-RETIROS 820,238.73"
+                if not summary_data['total_retiros'] or not summary_data['total_cargos']:
+                    match = re.search(r'[-\s]+RETIROS\s+([\d,\.]+)', section_text, re.I)
+                    if match:
+                        retiros = normalize_amount_str(match.group(1))
+                        #print(f"✅ Santander: Found WITHDRAWALS: ${retiros:,.2f}")
+                        if retiros > 0:
+                            summary_data['total_retiros'] = retiros
+                            summary_data['total_cargos'] = retiros
+                
+                # Pattern: "SALDO ACTUAL 1,417.18" or "= SALDO ACTUAL 1,417.18"
+                if not summary_data['saldo_final']:
+                    match = re.search(r'(?:=\s*)?SALDO\s+ACTUAL\s+([\d,\.]+)', section_text, re.I)
+                    if match:
+                        saldo = normalize_amount_str(match.group(1))
+                        #print(f"✅ Santander: Encontrado SALDO ACTUAL: ${saldo:,.2f}")
                         if saldo > 0:
                             summary_data['saldo_final'] = saldo
-                        # If we found all values from Total line, we can break early
-                        if summary_data['total_cargos'] and summary_data['total_abonos'] and summary_data['saldo_final']:
-                            break
-                        # Continue to next iteration to avoid checking fallback patterns if we found Total line
-                        continue
-                    
-                    # Saldo Inicial
-                    if not summary_data['saldo_anterior']:
-                        match = re.search(r'Saldo\s+Inicial\s+\$\s*([\d,\.]+)', line, re.I)
-                        if match:
-                            amount = normalize_amount_str(match.group(1))
-                            if amount > 0:
-                                #print(f"✅ BanRegio: Encontrado saldo inicial: ${amount:,.2f} en línea {i+1}: {line[:80]}")
-                                summary_data['saldo_anterior'] = amount
-                    
-                    # Abonos (fallback if not found in Total line)
-                    if not summary_data['total_abonos']:
-                        match = re.search(r'\+\s*Abonos\s+\$\s*([\d,\.]+)', line, re.I)
-                        if match:
-                            amount = normalize_amount_str(match.group(1))
-                            if amount > 0:
-                                #print(f"✅ BanRegio: Encontrado abonos: ${amount:,.2f} en línea {i+1}: {line[:80]}")
-                                summary_data['total_abonos'] = amount
-                                summary_data['total_depositos'] = amount
-                    
-                    # Retiros (fallback if not found in Total line)
-                    if not summary_data['total_retiros']:
-                        # First check if line has "Retiros" and next line has amount
-                        if re.search(r'-\s*Retiros', line, re.I) and i + 1 < len(all_lines):
-                            next_line = all_lines[i + 1]
-                            match = re.search(r'\$\s*([\d,\.]+)', next_line)
-                            if match:
-                                amount = normalize_amount_str(match.group(1))
-                                if amount > 0:
-                                    #print(f"✅ BanRegio: Encontrado retiros: ${amount:,.2f} en línea {i+2}: {next_line[:80]}")
-                                    summary_data['total_retiros'] = amount
-                                    summary_data['total_cargos'] = amount
-                    
-                    # Saldo Final (fallback if not found in Total line)
-                    if not summary_data['saldo_final']:
-                        # First check if line has "Saldo Final" and next line has amount
-                        if re.search(r'=\s*Saldo\s+Final', line, re.I) and i + 1 < len(all_lines):
-                            next_line = all_lines[i + 1]
-                            match = re.search(r'\$\s*([\d,\.]+)', next_line)
-                            if match:
-                                amount = normalize_amount_str(match.group(1))
-                                if amount > 0:
-                                    #print(f"✅ BanRegio: Encontrado saldo final: ${amount:,.2f} en línea {i+2}: {next_line[:80]}")
-                                    summary_data['saldo_final'] = amount
-            
-            elif bank_name == "INTERCAM":
-                # INTERCAM: Total Abonos from "+ Depósitos", Total Cargos from "- Retiros", Saldo Final from "Saldo Final"
-                # For Saldo Final, use only the page where movements_start was found (when movement_start_page is provided)
-                saldo_lines = all_lines
-                if movement_start_page is not None and lines_by_page is not None:
-                    saldo_lines = lines_by_page.get(movement_start_page, all_lines)
-                for i, line in enumerate(all_lines):
-                    # Total Abonos: line with "+ Depósitos" (or "+ Depositos") followed by amount
-                    if not summary_data['total_abonos']:
-                        if re.search(r'\+\s*Dep[oó]sitos', line, re.I):
-                            match = re.search(r'\d{1,3}(?:[\.,\s]\d{3})*(?:[\.,]\d{2})', line)
-                            if match:
-                                amount = normalize_amount_str(match.group(0))
-                                if amount > 0:
-                                    summary_data['total_abonos'] = amount
-                                    summary_data['total_depositos'] = amount
-                    # Total Cargos: line with "- Retiros" followed by amount
-                    if not summary_data['total_cargos']:
-                        if re.search(r'-\s*Retiros', line, re.I):
-                            match = re.search(r'\d{1,3}(?:[\.,\s]\d{3})*(?:[\.,]\d{2})', line)
-                            if match:
-                                amount = normalize_amount_str(match.group(0))
-                                if amount > 0:
-                                    summary_data['total_cargos'] = amount
-                                    summary_data['total_retiros'] = amount
-                # Saldo Final: only from lines on the movements_start page (when provided), else all lines
-                for i, line in enumerate(saldo_lines):
-                    if not summary_data['saldo_final'] and re.search(r'Saldo\s+Final', line, re.I):
-                        match = re.search(r'\d{1,3}(?:[\.,\s]\d{3})*(?:[\.,]\d{2})', line)
-                        if match:
-                            amount = normalize_amount_str(match.group(0))
+            else:
+                # Fallback: search in all text if section markers not found
+                #print(f"⚠️  No se encontró sección CUENTA DE CHEQUES, buscando en todo el texto...")
+                full_text = all_text
+                
+                # Pattern: "+ DEPOSITOS 821,646.20"
+                if not summary_data['total_depositos'] or not summary_data['total_abonos']:
+                    match = re.search(r'[+\s]+DEPOSITOS\s+([\d,\.]+)', full_text, re.I)
+                    if match:
+                        depositos = normalize_amount_str(match.group(1))
+                        if depositos > 0:
+                            summary_data['total_depositos'] = depositos
+                            summary_data['total_abonos'] = depositos
+                
+                # Pattern: "- RETIROS 820,238.73"
+                if not summary_data['total_retiros'] or not summary_data['total_cargos']:
+                    match = re.search(r'[-\s]+RETIROS\s+([\d,\.]+)', full_text, re.I)
+                    if match:
+                        retiros = normalize_amount_str(match.group(1))
+                        if retiros > 0:
+                            summary_data['total_retiros'] = retiros
+                            summary_data['total_cargos'] = retiros
+                
+                # Pattern: "SALDO ACTUAL 1,417.18"
+                if not summary_data['saldo_final']:
+                    match = re.search(r'(?:=\s*)?SALDO\s+ACTUAL\s+([\d,\.]+)', full_text, re.I)
+                    if match:
+                        saldo = normalize_amount_str(match.group(1))
+                        if saldo > 0:
+                            summary_data['saldo_final'] = saldo
+        
+        elif bank_name == "Mercury":
+            # Mercury: Total Cargos from line containing "Total withdrawals" (absolute value, e.g. -$9,292.00 -> $9,292.00)
+            for line in all_lines:
+                if not summary_data['total_cargos'] and 'Total withdrawals' in line.replace('\r', ' '):
+                    # Capture amount: optional minus before/after optional $ (e.g. -$9,292.00 or $-9,292.00 or $9,292.00)
+                    match = re.search(r'Total\s+withdrawals\s+([\-]?\s*\$?\s*[\d,\.]+)', line, re.I)
+                    if match:
+                        amount = normalize_amount_str(match.group(1))
+                        if amount is not None and amount != 0:
+                            summary_data['total_cargos'] = abs(amount)
+                            summary_data['total_retiros'] = summary_data['total_cargos']
+                if not summary_data['total_abonos'] and 'Total deposits' in line.replace('\r', ' '):
+                    match = re.search(r'Total\s+deposits\s+\$?\s*([\d,\.\-]+)', line, re.I)
+                    if match:
+                        amount = normalize_amount_str(match.group(1))
+                        if amount is not None and amount != 0:
+                            summary_data['total_abonos'] = abs(amount)
+                            summary_data['total_depositos'] = summary_data['total_abonos']
+                if summary_data.get('saldo_final') is None and 'Statement balance' in line.replace('\r', ' '):
+                    match = re.search(r'Statement\s+balance\s+\$?\s*([\d,\.\-]+)', line, re.I)
+                    if match:
+                        amount = normalize_amount_str(match.group(1))
+                        if amount is not None:
                             summary_data['saldo_final'] = amount
-                            break
-            
-            elif bank_name == "Clara":
-                # Clara:
-                # "+ Saldo anterior 3,305.40"
-                # "- Pagos -3,305.40"
-                # "+ Compras y cargos del periodo 3,115.30"
-                # "Saldo al corte 3,115.30"
-                #print(f"🔍 Buscando patrones Clara en {len(all_lines)} líneas...")
-                for i, line in enumerate(all_lines):
-                    # Saldo anterior
-                    if not summary_data['saldo_anterior']:
-                        match = re.search(r'\+\s*Saldo\s+anterior\s+([\d,\.]+)', line, re.I)
-                        if match:
-                            amount = normalize_amount_str(match.group(1))
-                            if amount > 0:
-                                #print(f"✅ Clara: Encontrado saldo anterior: ${amount:,.2f} en línea {i+1}: {line[:80]}")
-                                summary_data['saldo_anterior'] = amount
-                    
-                    # Compras y cargos (esto son los cargos)
-                    if not summary_data['total_cargos']:
-                        match = re.search(r'\+\s*Compras\s+y\s+cargos\s+del\s+periodo\s+([\d,\.]+)', line, re.I)
-                        if match:
-                            amount = normalize_amount_str(match.group(1))
-                            if amount > 0:
-                                #print(f"✅ Clara: Encontrado cargos: ${amount:,.2f} en línea {i+1}: {line[:80]}")
-                                summary_data['total_cargos'] = amount
-                                summary_data['total_retiros'] = amount
-                    
-                    # Saldo al corte
+        
+        elif bank_name == "Banorte":
+            # Banorte: 
+            # "Saldo inicial del periodo $ 2,284.38"
+            # "+ Total de depósitos $ 38,396.00"
+            # "- Total de retiros $ 36,805.40"
+            # "Saldo actual $ 3,347.18"
+            #print(f"🔍 Buscando patrones Banorte en {len(all_lines)} líneas...")
+            for i, line in enumerate(all_lines):
+                # Saldo inicial
+                if not summary_data['saldo_anterior']:
+                    match = re.search(r'Saldo\s+inicial\s+del\s+periodo\s+\$\s*([\d,\.]+)', line, re.I)
+                    if match:
+                        amount = normalize_amount_str(match.group(1))
+                        if amount > 0:
+                            #print(f"✅ Banorte: Encontrado saldo inicial: ${amount:,.2f} en línea {i+1}: {line[:80]}")
+                            summary_data['saldo_anterior'] = amount
+                
+                # Depósitos
+                if not summary_data['total_depositos']:
+                    match = re.search(r'\+\s*Total\s+de\s+dep[oó]sitos\s+\$\s*([\d,\.]+)', line, re.I)
+                    if match:
+                        amount = normalize_amount_str(match.group(1))
+                        if amount > 0:
+                            #print(f"✅ Banorte: Encontrado depósitos: ${amount:,.2f} en línea {i+1}: {line[:80]}")
+                            summary_data['total_depositos'] = amount
+                            summary_data['total_abonos'] = amount
+                
+                # Retiros
+                if not summary_data['total_retiros']:
+                    match = re.search(r'-\s*Total\s+de\s+retiros\s+\$\s*([\d,\.]+)', line, re.I)
+                    if match:
+                        amount = normalize_amount_str(match.group(1))
+                        if amount > 0:
+                            #print(f"✅ Banorte: Encontrado retiros: ${amount:,.2f} en línea {i+1}: {line[:80]}")
+                            summary_data['total_retiros'] = amount
+                            summary_data['total_cargos'] = amount
+                
+                # Saldo actual
+                if not summary_data['saldo_final']:
+                    match = re.search(r'Saldo\s+actual\s+\$\s*([\d,\.]+)', line, re.I)
+                    if match:
+                        amount = normalize_amount_str(match.group(1))
+                        if amount > 0:
+                            #print(f"✅ Banorte: Encontrado saldo actual: ${amount:,.2f} en línea {i+1}: {line[:80]}")
+                            summary_data['saldo_final'] = amount
+        
+        elif bank_name == "Banamex":
+            # Banamex: 
+            # "Saldo Anterior $5,297.64"
+            # "( + ) 8 Depósitos $344,527.26"
+            # "( - ) 16 Retiros $254,072.38"
+            # "SALDO AL 31 DE ENERO DE 2020 $95,752.52"
+            #print(f"🔍 Buscando patrones Banamex en {len(all_lines)} líneas...")
+            for i, line in enumerate(all_lines):
+                # Saldo Anterior
+                if not summary_data['saldo_anterior']:
+                    match = re.search(r'Saldo\s+Anterior\s+\$\s*([\d,\.]+)', line, re.I)
+                    if match:
+                        amount = normalize_amount_str(match.group(1))
+                        if amount > 0:
+                            #print(f"✅ Banamex: Encontrado saldo anterior: ${amount:,.2f} en línea {i+1}: {line[:80]}")
+                            summary_data['saldo_anterior'] = amount
+                
+                # Depósitos
+                if not summary_data['total_depositos']:
+                    match = re.search(r'\(\s*\+\s*\)\s+\d+\s+Dep[oó]sitos\s+\$\s*([\d,\.]+)', line, re.I)
+                    if match:
+                        amount = normalize_amount_str(match.group(1))
+                        if amount > 0:
+                            #print(f"✅ Banamex: Encontrado depósitos: ${amount:,.2f} en línea {i+1}: {line[:80]}")
+                            summary_data['total_depositos'] = amount
+                            summary_data['total_abonos'] = amount
+                
+                # Retiros
+                if not summary_data['total_retiros']:
+                    match = re.search(r'\(\s*-\s*\)\s+\d+\s+Retiros\s+\$\s*([\d,\.]+)', line, re.I)
+                    if match:
+                        amount = normalize_amount_str(match.group(1))
+                        if amount > 0:
+                            #print(f"✅ Banamex: Encontrado retiros: ${amount:,.2f} en línea {i+1}: {line[:80]}")
+                            summary_data['total_retiros'] = amount
+                            summary_data['total_cargos'] = amount
+                
+                # Saldo Final
+                if not summary_data['saldo_final']:
+                    match = re.search(r'SALDO\s+AL\s+\d{1,2}\s+DE\s+\w+\s+DE\s+\d{4}\s+\$\s*([\d,\.]+)', line, re.I)
+                    if match:
+                        amount = normalize_amount_str(match.group(1))
+                        if amount > 0:
+                            #print(f"✅ Banamex: Encontrado saldo final: ${amount:,.2f} en línea {i+1}: {line[:80]}")
+                            summary_data['saldo_final'] = amount
+                    # Also try simpler pattern
                     if not summary_data['saldo_final']:
-                        match = re.search(r'Saldo\s+al\s+corte\s+([\d,\.]+)', line, re.I)
+                        match = re.search(r'SALDO\s+AL.*?\$\s*([\d,\.]+)', line, re.I)
                         if match:
                             amount = normalize_amount_str(match.group(1))
                             if amount > 0:
-                                #print(f"✅ Clara: Encontrado saldo al corte: ${amount:,.2f} en línea {i+1}: {line[:80]}")
+                                #print(f"✅ Banamex: Encontrado saldo final (patrón simple): ${amount:,.2f} en línea {i+1}: {line[:80]}")
                                 summary_data['saldo_final'] = amount
-                    
-                    # Total MXN [cargos] MXN [abonos] - el segundo monto es el total de abonos
-                    # Ejemplo: "Total MXN 3,115.30 MXN -3,305.40"
-                    if not summary_data['total_abonos']:
-                        # Try patterns from BANK_CONFIGS if available
-                        clara_config = BANK_CONFIGS.get('Clara', {})
-                        total_patterns = clara_config.get('summary_total_patterns', [])
-                        if not total_patterns:
-                            # Fallback to default patterns if not in config
-                            total_patterns = [
-                                r'Total\s+MXN\s+([\d,\.\-]+)\s+MXN\s+([\d,\.\-]+)',  # "Total MXN 3,115.30 MXN -3,305.40"
-                                r'Total\s+([\d,\.\-]+)\s+([\d,\.\-]+)',  # "Total 3,115.30 -3,305.40" (fallback)
-                            ]
-                        for pattern_str in total_patterns:
-                            pattern = re.compile(pattern_str, re.I)
-                            match = pattern.search(line)
-                            if match:
-                                # First amount is cargos, second amount is abonos
-                                cargos_amount = normalize_amount_str(match.group(1))
-                                abonos_amount = normalize_amount_str(match.group(2))
-                                
-                                # Set total_cargos if not already set
-                                if not summary_data['total_cargos'] and cargos_amount != 0:
-                                    summary_data['total_cargos'] = abs(cargos_amount)  # Use absolute value
-                                    summary_data['total_retiros'] = abs(cargos_amount)
-                                
-                                # Set total_abonos (can be negative)
-                                if abonos_amount != 0:
-                                    summary_data['total_abonos'] = abonos_amount
-                                    summary_data['total_depositos'] = abonos_amount
-                                    #print(f"✅ Clara: Encontrado total abonos: ${abonos_amount:,.2f} en línea {i+1}: {line[:80]}")
-                                    break
-            
-            elif bank_name == "Konfio":
-                # Konfio: Extract from page 2
-                # "Pagos - $ 97,000.00" -> part of Total Abonos (positive)
-                # "Devoluciones y ajustes - $ -115.66" -> part of Total Abonos (convert to positive)
-                # "Compras y cargos $ 56,176.79" -> Total Cargos
-                # "Saldo total al corte $ 312,227.05" -> Saldo Final
-                pagos_amount = None
-                devoluciones_amount = None
-                subtotal_found = False  # Flag to track if Subtotal line was found
+        
+        elif bank_name == "Banbajío":
+            # BanBajío: tabla con "SALDO ANTERIOR (+) DEPOSITOS (-) CARGOS SALDO ACTUAL" y valores en la siguiente línea
+            # Pattern: "$ 5,280.55 $ 1,441,951.06 $ 1,350,565.02 $ 96,666.59"
+            #print(f"🔍 Buscando patrones BanBajío en {len(all_lines)} líneas...")
+            for i, line in enumerate(all_lines):
+                if re.search(r'SALDO\s+ANTERIOR.*DEPOSITOS.*CARGOS.*SALDO\s+ACTUAL', line, re.I):
+                    #print(f"✅ BanBajío: Encontrada tabla en línea {i+1}: {line[:100]}")
+                    # Next line should have the values
+                    if i + 1 < len(all_lines):
+                        values_line = all_lines[i + 1]
+                        #print(f"   Línea de valores: {values_line[:100]}")
+                        # Extract all amounts from the line
+                        amounts = re.findall(r'\$\s*([\d,\.]+)', values_line)
+                        if len(amounts) >= 4:
+                            summary_data['saldo_anterior'] = normalize_amount_str(amounts[0])
+                            summary_data['total_depositos'] = normalize_amount_str(amounts[1])
+                            summary_data['total_abonos'] = normalize_amount_str(amounts[1])
+                            summary_data['total_cargos'] = normalize_amount_str(amounts[2])
+                            summary_data['total_retiros'] = normalize_amount_str(amounts[2])
+                            summary_data['saldo_final'] = normalize_amount_str(amounts[3])
+                            #print(f"   Extraídos: Saldo anterior=${summary_data['saldo_anterior']:,.2f}, Depósitos=${summary_data['total_depositos']:,.2f}, Cargos=${summary_data['total_cargos']:,.2f}, Saldo final=${summary_data['saldo_final']:,.2f}")
+                        else:
+                            pass
+                            # print(f"   ⚠️  Solo se encontraron {len(amounts)} valores, se esperaban 4")
+                        break
+        
+        elif bank_name == "Banregio":
+            # BanRegio: 
+            # "Saldo Inicial $903.18"
+            # "+ Abonos $49,675.60"
+            # "- Retiros $7,000.00"
+            # "- Comisiones Efectivamente Cobradas $320.00"
+            # "- Otros Cargos $38,678.00"
+            # "= Saldo Final $4,580.78"
+            # Also: "Total 45,998.00 49,675.60 4,580.78" (Cargos, Abonos, Saldo)
+            #print(f"🔍 Buscando patrones BanRegio en {len(all_lines)} líneas...")
+            for i, line in enumerate(all_lines):
+                # First, try to extract from "Total" line (most reliable)
+                # Pattern: "Total 45,998.00 49,675.60 4,580.78" (Cargos, Abonos, Saldo)
+                # Make pattern more flexible to handle variations in spacing and allow for optional leading text
+                total_match = re.search(r'\bTotal\s+([\d,\.]+)\s+([\d,\.]+)\s+([\d,\.]+)', line, re.I)
+                if total_match:
+                    cargos = normalize_amount_str(total_match.group(1))
+                    abonos = normalize_amount_str(total_match.group(2))
+                    saldo = normalize_amount_str(total_match.group(3))
+                    if cargos > 0:
+                        summary_data['total_cargos'] = cargos
+                        summary_data['total_retiros'] = cargos
+                    if abonos > 0:
+                        summary_data['total_abonos'] = abonos
+                        summary_data['total_depositos'] = abonos
+                    if saldo > 0:
+                        summary_data['saldo_final'] = saldo
+                    # If we found all values from Total line, we can break early
+                    if summary_data['total_cargos'] and summary_data['total_abonos'] and summary_data['saldo_final']:
+                        break
+                    # Continue to next iteration to avoid checking fallback patterns if we found Total line
+                    continue
                 
-                for i, line in enumerate(all_lines):
-                    # Subtotal line: "Subtotal $ X,XXX.XX $ Y,YYY.YY" (first is cargos, second is abonos)
-                    # This takes priority over "Compras y cargos" and "Pagos + Devoluciones"
-                    # Always check for Subtotal first, as it has the highest priority
-                    if not subtotal_found:
-                        match = re.search(r'Subtotal\s+\$\s*([\d,\.]+)\s+\$\s*([\d,\.]+)', line, re.I)
-                        if match:
-                            cargos_amount = normalize_amount_str(match.group(1))
-                            abonos_amount = normalize_amount_str(match.group(2))
-                            if cargos_amount > 0:
-                                summary_data['total_cargos'] = cargos_amount
-                                summary_data['total_retiros'] = cargos_amount
-                            if abonos_amount > 0:
-                                summary_data['total_abonos'] = abonos_amount
-                                summary_data['total_depositos'] = abonos_amount
-                            subtotal_found = True
-                            continue  # Skip other patterns if Subtotal was found
-                    
-                    # Pagos (positive value) - only if Subtotal not found
-                    if not subtotal_found and pagos_amount is None:
-                        match = re.search(r'Pagos\s*-\s*\$\s*([\d,\.]+)', line, re.I)
-                        if match:
-                            pagos_amount = normalize_amount_str(match.group(1))
-                    
-                    # Devoluciones y ajustes (negative value, convert to positive) - only if Subtotal not found
-                    if not subtotal_found and devoluciones_amount is None:
-                        match = re.search(r'Devoluciones\s+y\s+ajustes\s*-\s*\$\s*-?\s*([\d,\.]+)', line, re.I)
-                        if match:
-                            devoluciones_amount = normalize_amount_str(match.group(1))
-                            # Convert to positive (take absolute value)
-                            devoluciones_amount = abs(devoluciones_amount)
-                    
-                    # Compras y cargos (only if Subtotal not found)
-                    if not subtotal_found and not summary_data['total_cargos']:
-                        match = re.search(r'Compras\s+y\s+cargos\s+\$\s*([\d,\.]+)', line, re.I)
+                # Saldo Inicial
+                if not summary_data['saldo_anterior']:
+                    match = re.search(r'Saldo\s+Inicial\s+\$\s*([\d,\.]+)', line, re.I)
+                    if match:
+                        amount = normalize_amount_str(match.group(1))
+                        if amount > 0:
+                            #print(f"✅ BanRegio: Encontrado saldo inicial: ${amount:,.2f} en línea {i+1}: {line[:80]}")
+                            summary_data['saldo_anterior'] = amount
+                
+                # Abonos (fallback if not found in Total line)
+                if not summary_data['total_abonos']:
+                    match = re.search(r'\+\s*Abonos\s+\$\s*([\d,\.]+)', line, re.I)
+                    if match:
+                        amount = normalize_amount_str(match.group(1))
+                        if amount > 0:
+                            #print(f"✅ BanRegio: Encontrado abonos: ${amount:,.2f} en línea {i+1}: {line[:80]}")
+                            summary_data['total_abonos'] = amount
+                            summary_data['total_depositos'] = amount
+                
+                # Retiros (fallback if not found in Total line)
+                if not summary_data['total_retiros']:
+                    # First check if line has "Retiros" and next line has amount
+                    if re.search(r'-\s*Retiros', line, re.I) and i + 1 < len(all_lines):
+                        next_line = all_lines[i + 1]
+                        match = re.search(r'\$\s*([\d,\.]+)', next_line)
                         if match:
                             amount = normalize_amount_str(match.group(1))
                             if amount > 0:
-                                summary_data['total_cargos'] = amount
+                                #print(f"✅ BanRegio: Encontrado retiros: ${amount:,.2f} en línea {i+2}: {next_line[:80]}")
                                 summary_data['total_retiros'] = amount
-                    
-                    # Saldo total al corte
-                    if not summary_data['saldo_final']:
-                        match = re.search(r'Saldo\s+total\s+al\s+corte\s+\$\s*([\d,\.]+)', line, re.I)
-                        if match:
-                            amount = normalize_amount_str(match.group(1))
-                            if amount > 0:
-                                summary_data['saldo_final'] = amount
+                                summary_data['total_cargos'] = amount
                 
-                # Calculate Total Abonos = Pagos + Devoluciones (both as positive)
-                # Only if Subtotal was NOT found (Subtotal takes priority)
-                if not subtotal_found and not summary_data['total_abonos']:
-                    if pagos_amount is not None and devoluciones_amount is not None:
-                        total_abonos = pagos_amount + devoluciones_amount
-                        summary_data['total_abonos'] = total_abonos
-                        summary_data['total_depositos'] = total_abonos
-                    elif pagos_amount is not None:
-                        # Only Pagos found
-                        summary_data['total_abonos'] = pagos_amount
-                        summary_data['total_depositos'] = pagos_amount
-                elif subtotal_found:
-                    pass  # Total Abonos already set from Subtotal
-                elif devoluciones_amount is not None:
-                    # Only Devoluciones found
-                    summary_data['total_abonos'] = devoluciones_amount
-                    summary_data['total_depositos'] = devoluciones_amount
-                    print(f"✅ Konfio: Total Abonos (solo Devoluciones): ${devoluciones_amount:,.2f}")
-                else:
-                    print(f"⚠️ Konfio: No se encontraron Pagos ni Devoluciones")
-            
-            elif bank_name == "Base":
-                # Base:
-                # "Saldo al Corte $ 733,809.84" -> Saldo Final
-                # "Depósitos/Abonos ( + ) $ 356,742.33" -> Total Abonos
-                # "Retiros/Cargos ( - ) $ 102,609.46" -> Total Cargos
-                #print(f"🔍 Buscando patrones Base en {len(all_lines)} líneas...")
-                for i, line in enumerate(all_lines):
-                    # Saldo al Corte -> Saldo Final
-                    if not summary_data['saldo_final']:
-                        match = re.search(r'Saldo\s+al\s+Corte\s+\$\s*([\d,\.]+)', line, re.I)
+                # Saldo Final (fallback if not found in Total line)
+                if not summary_data['saldo_final']:
+                    # First check if line has "Saldo Final" and next line has amount
+                    if re.search(r'=\s*Saldo\s+Final', line, re.I) and i + 1 < len(all_lines):
+                        next_line = all_lines[i + 1]
+                        match = re.search(r'\$\s*([\d,\.]+)', next_line)
                         if match:
                             amount = normalize_amount_str(match.group(1))
                             if amount > 0:
-                                #print(f"✅ Base: Encontrado saldo al corte: ${amount:,.2f} en línea {i+1}: {line[:80]}")
+                                #print(f"✅ BanRegio: Encontrado saldo final: ${amount:,.2f} en línea {i+2}: {next_line[:80]}")
                                 summary_data['saldo_final'] = amount
-                    
-                    # Depósitos/Abonos -> Total Abonos
-                    if not summary_data['total_abonos']:
-                        match = re.search(r'Dep[oó]sitos\s*/\s*Abonos\s*\(\s*\+\s*\)\s+\$\s*([\d,\.]+)', line, re.I)
+        
+        elif bank_name == "INTERCAM":
+            # INTERCAM: Total Abonos from "+ Depósitos", Total Cargos from "- Retiros", Saldo Final from "Saldo Final"
+            # For Saldo Final, use only the page where movements_start was found (when movement_start_page is provided)
+            saldo_lines = all_lines
+            if movement_start_page is not None and lines_by_page is not None:
+                saldo_lines = lines_by_page.get(movement_start_page, all_lines)
+            for i, line in enumerate(all_lines):
+                # Total Abonos: line with "+ Depósitos" (or "+ Depositos") followed by amount
+                if not summary_data['total_abonos']:
+                    if re.search(r'\+\s*Dep[oó]sitos', line, re.I):
+                        match = re.search(r'\d{1,3}(?:[\.,\s]\d{3})*(?:[\.,]\d{2})', line)
                         if match:
-                            amount = normalize_amount_str(match.group(1))
+                            amount = normalize_amount_str(match.group(0))
                             if amount > 0:
-                                #print(f"✅ Base: Encontrado depósitos/abonos: ${amount:,.2f} en línea {i+1}: {line[:80]}")
                                 summary_data['total_abonos'] = amount
                                 summary_data['total_depositos'] = amount
-                    
-                    # Retiros/Cargos -> Total Cargos
-                    if not summary_data['total_cargos']:
-                        match = re.search(r'Retiros\s*/\s*Cargos\s*\(\s*-\s*\)\s+\$\s*([\d,\.]+)', line, re.I)
+                # Total Cargos: line with "- Retiros" followed by amount
+                if not summary_data['total_cargos']:
+                    if re.search(r'-\s*Retiros', line, re.I):
+                        match = re.search(r'\d{1,3}(?:[\.,\s]\d{3})*(?:[\.,]\d{2})', line)
                         if match:
-                            amount = normalize_amount_str(match.group(1))
+                            amount = normalize_amount_str(match.group(0))
                             if amount > 0:
-                                #print(f"✅ Base: Encontrado retiros/cargos: ${amount:,.2f} en línea {i+1}: {line[:80]}")
                                 summary_data['total_cargos'] = amount
                                 summary_data['total_retiros'] = amount
+            # Saldo Final: only from lines on the movements_start page (when provided), else all lines
+            for i, line in enumerate(saldo_lines):
+                if not summary_data['saldo_final'] and re.search(r'Saldo\s+Final', line, re.I):
+                    match = re.search(r'\d{1,3}(?:[\.,\s]\d{3})*(?:[\.,]\d{2})', line)
+                    if match:
+                        amount = normalize_amount_str(match.group(0))
+                        summary_data['saldo_final'] = amount
+                        break
+        
+        elif bank_name == "Clara":
+            # Clara:
+            # "+ Saldo anterior 3,305.40"
+            # "- Pagos -3,305.40"
+            # "+ Compras y cargos del periodo 3,115.30"
+            # "Saldo al corte 3,115.30"
+            #print(f"🔍 Buscando patrones Clara en {len(all_lines)} líneas...")
+            for i, line in enumerate(all_lines):
+                # Saldo anterior
+                if not summary_data['saldo_anterior']:
+                    match = re.search(r'\+\s*Saldo\s+anterior\s+([\d,\.]+)', line, re.I)
+                    if match:
+                        amount = normalize_amount_str(match.group(1))
+                        if amount > 0:
+                            #print(f"✅ Clara: Encontrado saldo anterior: ${amount:,.2f} en línea {i+1}: {line[:80]}")
+                            summary_data['saldo_anterior'] = amount
+                
+                # Compras y cargos (esto son los cargos)
+                if not summary_data['total_cargos']:
+                    match = re.search(r'\+\s*Compras\s+y\s+cargos\s+del\s+periodo\s+([\d,\.]+)', line, re.I)
+                    if match:
+                        amount = normalize_amount_str(match.group(1))
+                        if amount > 0:
+                            #print(f"✅ Clara: Encontrado cargos: ${amount:,.2f} en línea {i+1}: {line[:80]}")
+                            summary_data['total_cargos'] = amount
+                            summary_data['total_retiros'] = amount
+                
+                # Saldo al corte
+                if not summary_data['saldo_final']:
+                    match = re.search(r'Saldo\s+al\s+corte\s+([\d,\.]+)', line, re.I)
+                    if match:
+                        amount = normalize_amount_str(match.group(1))
+                        if amount > 0:
+                            #print(f"✅ Clara: Encontrado saldo al corte: ${amount:,.2f} en línea {i+1}: {line[:80]}")
+                            summary_data['saldo_final'] = amount
+                
+                # Total MXN [cargos] MXN [abonos] - el segundo monto es el total de abonos
+                # Ejemplo: "Total MXN 3,115.30 MXN -3,305.40"
+                if not summary_data['total_abonos']:
+                    # Try patterns from BANK_CONFIGS if available
+                    clara_config = BANK_CONFIGS.get('Clara', {})
+                    total_patterns = clara_config.get('summary_total_patterns', [])
+                    if not total_patterns:
+                        # Fallback to default patterns if not in config
+                        total_patterns = [
+                            r'Total\s+MXN\s+([\d,\.\-]+)\s+MXN\s+([\d,\.\-]+)',  # "Total MXN 3,115.30 MXN -3,305.40"
+                            r'Total\s+([\d,\.\-]+)\s+([\d,\.\-]+)',  # "Total 3,115.30 -3,305.40" (fallback)
+                        ]
+                    for pattern_str in total_patterns:
+                        pattern = re.compile(pattern_str, re.I)
+                        match = pattern.search(line)
+                        if match:
+                            # First amount is cargos, second amount is abonos
+                            cargos_amount = normalize_amount_str(match.group(1))
+                            abonos_amount = normalize_amount_str(match.group(2))
+                            
+                            # Set total_cargos if not already set
+                            if not summary_data['total_cargos'] and cargos_amount != 0:
+                                summary_data['total_cargos'] = abs(cargos_amount)  # Use absolute value
+                                summary_data['total_retiros'] = abs(cargos_amount)
+                            
+                            # Set total_abonos (can be negative)
+                            if abonos_amount != 0:
+                                summary_data['total_abonos'] = abonos_amount
+                                summary_data['total_depositos'] = abonos_amount
+                                #print(f"✅ Clara: Encontrado total abonos: ${abonos_amount:,.2f} en línea {i+1}: {line[:80]}")
+                                break
+        
+        elif bank_name == "Konfio":
+            # Konfio: Extract from page 2
+            # "Pagos - $ 97,000.00" -> part of Total Abonos (positive)
+            # "Devoluciones y ajustes - $ -115.66" -> part of Total Abonos (convert to positive)
+            # "Compras y cargos $ 56,176.79" -> Total Cargos
+            # "Saldo total al corte $ 312,227.05" -> Saldo Final
+            pagos_amount = None
+            devoluciones_amount = None
+            subtotal_found = False  # Flag to track if Subtotal line was found
+            
+            for i, line in enumerate(all_lines):
+                # Subtotal line: "Subtotal $ X,XXX.XX $ Y,YYY.YY" (first is cargos, second is abonos)
+                # This takes priority over "Compras y cargos" and "Pagos + Devoluciones"
+                # Always check for Subtotal first, as it has the highest priority
+                if not subtotal_found:
+                    match = re.search(r'Subtotal\s+\$\s*([\d,\.]+)\s+\$\s*([\d,\.]+)', line, re.I)
+                    if match:
+                        cargos_amount = normalize_amount_str(match.group(1))
+                        abonos_amount = normalize_amount_str(match.group(2))
+                        if cargos_amount > 0:
+                            summary_data['total_cargos'] = cargos_amount
+                            summary_data['total_retiros'] = cargos_amount
+                        if abonos_amount > 0:
+                            summary_data['total_abonos'] = abonos_amount
+                            summary_data['total_depositos'] = abonos_amount
+                        subtotal_found = True
+                        continue  # Skip other patterns if Subtotal was found
+                
+                # Pagos (positive value) - only if Subtotal not found
+                if not subtotal_found and pagos_amount is None:
+                    match = re.search(r'Pagos\s*-\s*\$\s*([\d,\.]+)', line, re.I)
+                    if match:
+                        pagos_amount = normalize_amount_str(match.group(1))
+                
+                # Devoluciones y ajustes (negative value, convert to positive) - only if Subtotal not found
+                if not subtotal_found and devoluciones_amount is None:
+                    match = re.search(r'Devoluciones\s+y\s+ajustes\s*-\s*\$\s*-?\s*([\d,\.]+)', line, re.I)
+                    if match:
+                        devoluciones_amount = normalize_amount_str(match.group(1))
+                        # Convert to positive (take absolute value)
+                        devoluciones_amount = abs(devoluciones_amount)
+                
+                # Compras y cargos (only if Subtotal not found)
+                if not subtotal_found and not summary_data['total_cargos']:
+                    match = re.search(r'Compras\s+y\s+cargos\s+\$\s*([\d,\.]+)', line, re.I)
+                    if match:
+                        amount = normalize_amount_str(match.group(1))
+                        if amount > 0:
+                            summary_data['total_cargos'] = amount
+                            summary_data['total_retiros'] = amount
+                
+                # Saldo total al corte
+                if not summary_data['saldo_final']:
+                    match = re.search(r'Saldo\s+total\s+al\s+corte\s+\$\s*([\d,\.]+)', line, re.I)
+                    if match:
+                        amount = normalize_amount_str(match.group(1))
+                        if amount > 0:
+                            summary_data['saldo_final'] = amount
             
-            elif bank_name == "Scotiabank":
-                # Scotiabank:
-                # "Saldo inicial $1,031,652.97"
-                # "(+) Depósitos $35,461,511.04"
-                # "(-) Retiros $33,018,203.16"
-                # "(=) Saldo final de la cuenta $3,473,941.21"
-                #print(f"🔍 Buscando patrones Scotiabank en {len(all_lines)} líneas...")
-                for i, line in enumerate(all_lines):
-                    # Saldo inicial
-                    #if not summary_data['saldo_anterior']:
-                     #   match = re.search(r'Saldo\s+inicial\s+\$\s*([\d,\.]+)', line, re.I)
-                      #  if match:
-                       #     amount = normalize_amount_str(match.group(1))
-                        #    if amount > 0:
-                                #print(f"✅ Scotiabank: Encontrado saldo inicial: ${amount:,.2f} en línea {i+1}: {line[:80]}")
-                         #       summary_data['saldo_anterior'] = amount
-                    
-                    # Depósitos
-                    if not summary_data['total_depositos']:
-                        match = re.search(r'\(\+\s*\)\s*Dep[oóOÓ]sitos\s*\$\s*([\d,\.]+)', line, re.I)
-                        #print(f"✅ Scotiabank: Encontrado depósitos: {match}")
+            # Calculate Total Abonos = Pagos + Devoluciones (both as positive)
+            # Only if Subtotal was NOT found (Subtotal takes priority)
+            if not subtotal_found and not summary_data['total_abonos']:
+                if pagos_amount is not None and devoluciones_amount is not None:
+                    total_abonos = pagos_amount + devoluciones_amount
+                    summary_data['total_abonos'] = total_abonos
+                    summary_data['total_depositos'] = total_abonos
+                elif pagos_amount is not None:
+                    # Only Pagos found
+                    summary_data['total_abonos'] = pagos_amount
+                    summary_data['total_depositos'] = pagos_amount
+            elif subtotal_found:
+                pass  # Total Abonos already set from Subtotal
+            elif devoluciones_amount is not None:
+                # Only Devoluciones found
+                summary_data['total_abonos'] = devoluciones_amount
+                summary_data['total_depositos'] = devoluciones_amount
+                print(f"✅ Konfio: Total Abonos (solo Devoluciones): ${devoluciones_amount:,.2f}")
+            else:
+                print(f"⚠️ Konfio: No se encontraron Pagos ni Devoluciones")
+        
+        elif bank_name == "Base":
+            # Base:
+            # "Saldo al Corte $ 733,809.84" -> Saldo Final
+            # "Depósitos/Abonos ( + ) $ 356,742.33" -> Total Abonos
+            # "Retiros/Cargos ( - ) $ 102,609.46" -> Total Cargos
+            #print(f"🔍 Buscando patrones Base en {len(all_lines)} líneas...")
+            for i, line in enumerate(all_lines):
+                # Saldo al Corte -> Saldo Final
+                if not summary_data['saldo_final']:
+                    match = re.search(r'Saldo\s+al\s+Corte\s+\$\s*([\d,\.]+)', line, re.I)
+                    if match:
+                        amount = normalize_amount_str(match.group(1))
+                        if amount > 0:
+                            #print(f"✅ Base: Encontrado saldo al corte: ${amount:,.2f} en línea {i+1}: {line[:80]}")
+                            summary_data['saldo_final'] = amount
+                
+                # Depósitos/Abonos -> Total Abonos
+                if not summary_data['total_abonos']:
+                    match = re.search(r'Dep[oó]sitos\s*/\s*Abonos\s*\(\s*\+\s*\)\s+\$\s*([\d,\.]+)', line, re.I)
+                    if match:
+                        amount = normalize_amount_str(match.group(1))
+                        if amount > 0:
+                            #print(f"✅ Base: Encontrado depósitos/abonos: ${amount:,.2f} en línea {i+1}: {line[:80]}")
+                            summary_data['total_abonos'] = amount
+                            summary_data['total_depositos'] = amount
+                
+                # Retiros/Cargos -> Total Cargos
+                if not summary_data['total_cargos']:
+                    match = re.search(r'Retiros\s*/\s*Cargos\s*\(\s*-\s*\)\s+\$\s*([\d,\.]+)', line, re.I)
+                    if match:
+                        amount = normalize_amount_str(match.group(1))
+                        if amount > 0:
+                            #print(f"✅ Base: Encontrado retiros/cargos: ${amount:,.2f} en línea {i+1}: {line[:80]}")
+                            summary_data['total_cargos'] = amount
+                            summary_data['total_retiros'] = amount
+        
+        elif bank_name == "Scotiabank":
+            # Scotiabank:
+            # "Saldo inicial $1,031,652.97"
+            # "(+) Depósitos $35,461,511.04"
+            # "(-) Retiros $33,018,203.16"
+            # "(=) Saldo final de la cuenta $3,473,941.21"
+            #print(f"🔍 Buscando patrones Scotiabank en {len(all_lines)} líneas...")
+            for i, line in enumerate(all_lines):
+                # Saldo inicial
+                #if not summary_data['saldo_anterior']:
+                 #   match = re.search(r'Saldo\s+inicial\s+\$\s*([\d,\.]+)', line, re.I)
+                  #  if match:
+                   #     amount = normalize_amount_str(match.group(1))
+                    #    if amount > 0:
+                            #print(f"✅ Scotiabank: Encontrado saldo inicial: ${amount:,.2f} en línea {i+1}: {line[:80]}")
+                     #       summary_data['saldo_anterior'] = amount
+                
+                # Depósitos
+                if not summary_data['total_depositos']:
+                    match = re.search(r'\(\+\s*\)\s*Dep[oóOÓ]sitos\s*\$\s*([\d,\.]+)', line, re.I)
+                    #print(f"✅ Scotiabank: Encontrado depósitos: {match}")
+                    if match:
+                        amount = normalize_amount_str(match.group(1))
+                     #   print(f"✅ Scotiabank: Encontrado depósitos: {amount}")
+                        if amount > 0:
+                      #      print(f"✅ Scotiabank: Encontrado depósitos: ${amount:,.2f} en línea {i+1}: {line[:80]}")
+                            summary_data['total_depositos'] = amount
+                            summary_data['total_abonos'] = amount
+                
+                # Retiros
+                if not summary_data['total_retiros']:
+                    match = re.search(r'\(-\s*\)\s+Retiros\s+\$\s*([\d,\.]+)', line, re.I)
+                    #print(f"✅ Scotiabank: Encontrado retiros: {match}")
+                    if not match:
+                        # Try alternative pattern without space after minus
+                        match = re.search(r'\(-\s*\)\s*Retiros\s+\$\s*([\d,\.]+)', line, re.I)
+                    if match:
+                        amount = normalize_amount_str(match.group(1))
+                        if amount > 0:
+                            #print(f"✅ Scotiabank: Encontrado retiros: ${amount:,.2f} en línea {i+1}: {line[:80]}")
+                            summary_data['total_retiros'] = amount
+                            summary_data['total_cargos'] = amount
+                
+                # Saldo final
+                if not summary_data['saldo_final']:
+                    # Try multiple patterns to handle variations
+                    match = re.search(r'\(=\s*\)\s*Saldo\s+final\s+de\s+la\s+cuenta\s*\$\s*([\d,\.]+)', line, re.I)
+                    if not match:
+                        # Try with space before =
+                        match = re.search(r'\(\s*=\s*\)\s*Saldo\s+final\s+de\s+la\s+cuenta\s*\$\s*([\d,\.]+)', line, re.I)
+                    if not match:
+                        # Try more flexible pattern
+                        match = re.search(r'\(=\s*\)\s*Saldo.*?final.*?de.*?la.*?cuenta\s*\$\s*([\d,\.]+)', line, re.I)
+                    # If not found in single line, try with next line (in case text is split)
+                    if not match and i + 1 < len(all_lines):
+                        combined_line = line + " " + all_lines[i + 1]
+                        match = re.search(r'\(=\s*\)\s*Saldo\s+final\s+de\s+la\s+cuenta\s*\$\s*([\d,\.]+)', combined_line, re.I)
+                        if not match:
+                            match = re.search(r'\(\s*=\s*\)\s*Saldo\s+final\s+de\s+la\s+cuenta\s*\$\s*([\d,\.]+)', combined_line, re.I)
+                        if not match:
+                            match = re.search(r'\(=\s*\)\s*Saldo.*?final.*?de.*?la.*?cuenta\s*\$\s*([\d,\.]+)', combined_line, re.I)
+                    #print(f"✅ Scotiabank: Encontrado Saldo Final: {match}")
+                    if match:
+                        amount = normalize_amount_str(match.group(1))
+                        #print(f"✅ Scotiabank: Encontrado Saldo Final: {amount}")
+                        if amount > 0:
+                            #print(f"✅ Scotiabank: Encontrado saldo final: ${amount:,.2f} en línea {i+1}: {line[:80]}")
+                            summary_data['saldo_final'] = amount
+        
+        elif bank_name == "Mercury":
+            # Mercury: Total Cargos from line containing "Total withdrawals" (absolute value, e.g. -$9,292.00 -> $9,292.00)
+            for i, line in enumerate(all_lines):
+                if not summary_data['total_cargos'] and 'Total withdrawals' in line.replace('\r', ' '):
+                    match = re.search(r'Total\s+withdrawals\s+([\-]?\s*\$?\s*[\d,\.]+)', line, re.I)
+                    if match:
+                        amount = normalize_amount_str(match.group(1))
+                        if amount is not None:
+                            summary_data['total_cargos'] = abs(amount)
+                            summary_data['total_retiros'] = summary_data['total_cargos']
+                if not summary_data['total_abonos'] and 'Total deposits' in line.replace('\r', ' '):
+                    match = re.search(r'Total\s+deposits\s+\$?\s*([\d,\.\-]+)', line, re.I)
+                    if match:
+                        amount = normalize_amount_str(match.group(1))
+                        if amount is not None:
+                            summary_data['total_abonos'] = abs(amount)
+                            summary_data['total_depositos'] = summary_data['total_abonos']
+                if not summary_data['saldo_final'] and 'Statement balance' in line.replace('\r', ' '):
+                    match = re.search(r'Statement\s+balance\s+\$?\s*([\d,\.\-]+)', line, re.I)
+                    if match:
+                        amount = normalize_amount_str(match.group(1))
+                        if amount is not None:
+                            summary_data['saldo_final'] = amount
+        
+        else:
+            # Generic patterns for other banks
+            patterns = {
+                'depositos': [
+                    r'(?:dep[oó]sitos?|abonos?)\s*[:\-]?\s*\$?\s*([\d,\.\s]+)',
+                    r'(?:\+\s*)?\d+\s+dep[oó]sitos?\s+([\d,\.\s]+)',
+                    r'total\s+dep[oó]sitos?\s*[:\-]?\s*\$?\s*([\d,\.\s]+)',
+                ],
+                'retiros': [
+                    r'(?:retiros?|cargos?)\s*[:\-]?\s*\$?\s*([\d,\.\s]+)',
+                    r'(?:\-\s*)?\d+\s+retiros?\s+([\d,\.\s]+)',
+                    r'total\s+retiros?\s*[:\-]?\s*\$?\s*([\d,\.\s]+)',
+                    r'total\s+cargos?\s*[:\-]?\s*\$?\s*([\d,\.\s]+)',
+                ],
+                'abonos': [
+                    r'total\s+abonos?\s*[:\-]?\s*\$?\s*([\d,\.\s]+)',
+                    r'abonos?\s*[:\-]?\s*\$?\s*([\d,\.\s]+)',
+                ],
+                'cargos': [
+                    r'total\s+cargos?\s*[:\-]?\s*\$?\s*([\d,\.\s]+)',
+                    r'cargos?\s*[:\-]?\s*\$?\s*([\d,\.\s]+)',
+                ],
+                'saldo_final': [
+                    r'saldo\s+(?:al|final|al\s+\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4})\s*[:\-]?\s*\$?\s*([\d,\.\s]+)',
+                    r'saldo\s+(?:final|total)\s*[:\-]?\s*\$?\s*([\d,\.\s]+)',
+                    r'saldo\s*[:\-]?\s*\$?\s*([\d,\.\s]+)',
+                ],
+                'saldo_anterior': [
+                    r'saldo\s+anterior\s*[:\-]?\s*\$?\s*([\d,\.\s]+)',
+                ],
+                'movimientos': [
+                    r'total\s+de\s+movimientos?\s*[:\-]?\s*(\d+)',
+                    r'(\d+)\s+movimientos?',
+                ]
+            }
+            
+            # Search for patterns in all lines
+            for line in all_lines:
+                # Look for depositos/abonos
+                if not summary_data['total_depositos'] and not summary_data['total_abonos']:
+                    for pattern in patterns['depositos']:
+                        match = re.search(pattern, line, re.I)
                         if match:
                             amount = normalize_amount_str(match.group(1))
-                         #   print(f"✅ Scotiabank: Encontrado depósitos: {amount}")
                             if amount > 0:
-                          #      print(f"✅ Scotiabank: Encontrado depósitos: ${amount:,.2f} en línea {i+1}: {line[:80]}")
                                 summary_data['total_depositos'] = amount
                                 summary_data['total_abonos'] = amount
-                    
-                    # Retiros
-                    if not summary_data['total_retiros']:
-                        match = re.search(r'\(-\s*\)\s+Retiros\s+\$\s*([\d,\.]+)', line, re.I)
-                        #print(f"✅ Scotiabank: Encontrado retiros: {match}")
-                        if not match:
-                            # Try alternative pattern without space after minus
-                            match = re.search(r'\(-\s*\)\s*Retiros\s+\$\s*([\d,\.]+)', line, re.I)
+                                break
+                
+                # Look for retiros/cargos
+                if not summary_data['total_retiros'] and not summary_data['total_cargos']:
+                    for pattern in patterns['retiros']:
+                        match = re.search(pattern, line, re.I)
                         if match:
                             amount = normalize_amount_str(match.group(1))
                             if amount > 0:
-                                #print(f"✅ Scotiabank: Encontrado retiros: ${amount:,.2f} en línea {i+1}: {line[:80]}")
                                 summary_data['total_retiros'] = amount
                                 summary_data['total_cargos'] = amount
-                    
-                    # Saldo final
-                    if not summary_data['saldo_final']:
-                        # Try multiple patterns to handle variations
-                        match = re.search(r'\(=\s*\)\s*Saldo\s+final\s+de\s+la\s+cuenta\s*\$\s*([\d,\.]+)', line, re.I)
-                        if not match:
-                            # Try with space before =
-                            match = re.search(r'\(\s*=\s*\)\s*Saldo\s+final\s+de\s+la\s+cuenta\s*\$\s*([\d,\.]+)', line, re.I)
-                        if not match:
-                            # Try more flexible pattern
-                            match = re.search(r'\(=\s*\)\s*Saldo.*?final.*?de.*?la.*?cuenta\s*\$\s*([\d,\.]+)', line, re.I)
-                        # If not found in single line, try with next line (in case text is split)
-                        if not match and i + 1 < len(all_lines):
-                            combined_line = line + " " + all_lines[i + 1]
-                            match = re.search(r'\(=\s*\)\s*Saldo\s+final\s+de\s+la\s+cuenta\s*\$\s*([\d,\.]+)', combined_line, re.I)
-                            if not match:
-                                match = re.search(r'\(\s*=\s*\)\s*Saldo\s+final\s+de\s+la\s+cuenta\s*\$\s*([\d,\.]+)', combined_line, re.I)
-                            if not match:
-                                match = re.search(r'\(=\s*\)\s*Saldo.*?final.*?de.*?la.*?cuenta\s*\$\s*([\d,\.]+)', combined_line, re.I)
-                        #print(f"✅ Scotiabank: Encontrado Saldo Final: {match}")
+                                break
+                
+                # Look for abonos specifically
+                if not summary_data['total_abonos']:
+                    for pattern in patterns['abonos']:
+                        match = re.search(pattern, line, re.I)
                         if match:
                             amount = normalize_amount_str(match.group(1))
-                            #print(f"✅ Scotiabank: Encontrado Saldo Final: {amount}")
                             if amount > 0:
-                                #print(f"✅ Scotiabank: Encontrado saldo final: ${amount:,.2f} en línea {i+1}: {line[:80]}")
-                                summary_data['saldo_final'] = amount
-            
-            elif bank_name == "Mercury":
-                # Mercury: Total Cargos from line containing "Total withdrawals" (absolute value, e.g. -$9,292.00 -> $9,292.00)
-                for i, line in enumerate(all_lines):
-                    if not summary_data['total_cargos'] and 'Total withdrawals' in line.replace('\r', ' '):
-                        match = re.search(r'Total\s+withdrawals\s+([\-]?\s*\$?\s*[\d,\.]+)', line, re.I)
+                                summary_data['total_abonos'] = amount
+                                break
+                
+                # Look for cargos specifically
+                if not summary_data['total_cargos']:
+                    for pattern in patterns['cargos']:
+                        match = re.search(pattern, line, re.I)
                         if match:
                             amount = normalize_amount_str(match.group(1))
-                            if amount is not None:
-                                summary_data['total_cargos'] = abs(amount)
-                                summary_data['total_retiros'] = summary_data['total_cargos']
-                    if not summary_data['total_abonos'] and 'Total deposits' in line.replace('\r', ' '):
-                        match = re.search(r'Total\s+deposits\s+\$?\s*([\d,\.\-]+)', line, re.I)
+                            if amount > 0:
+                                summary_data['total_cargos'] = amount
+                                break
+                
+                # Look for saldo final
+                if not summary_data['saldo_final']:
+                    for pattern in patterns['saldo_final']:
+                        match = re.search(pattern, line, re.I)
                         if match:
                             amount = normalize_amount_str(match.group(1))
-                            if amount is not None:
-                                summary_data['total_abonos'] = abs(amount)
-                                summary_data['total_depositos'] = summary_data['total_abonos']
-                    if not summary_data['saldo_final'] and 'Statement balance' in line.replace('\r', ' '):
-                        match = re.search(r'Statement\s+balance\s+\$?\s*([\d,\.\-]+)', line, re.I)
+                            if amount > 0:
+                                summary_data['saldo_final'] = amount
+                                break
+                
+                # Look for saldo anterior
+                if not summary_data['saldo_anterior']:
+                    for pattern in patterns['saldo_anterior']:
+                        match = re.search(pattern, line, re.I)
                         if match:
                             amount = normalize_amount_str(match.group(1))
-                            if amount is not None:
-                                summary_data['saldo_final'] = amount
-            
-            else:
-                # Generic patterns for other banks
-                patterns = {
-                    'depositos': [
-                        r'(?:dep[oó]sitos?|abonos?)\s*[:\-]?\s*\$?\s*([\d,\.\s]+)',
-                        r'(?:\+\s*)?\d+\s+dep[oó]sitos?\s+([\d,\.\s]+)',
-                        r'total\s+dep[oó]sitos?\s*[:\-]?\s*\$?\s*([\d,\.\s]+)',
-                    ],
-                    'retiros': [
-                        r'(?:retiros?|cargos?)\s*[:\-]?\s*\$?\s*([\d,\.\s]+)',
-                        r'(?:\-\s*)?\d+\s+retiros?\s+([\d,\.\s]+)',
-                        r'total\s+retiros?\s*[:\-]?\s*\$?\s*([\d,\.\s]+)',
-                        r'total\s+cargos?\s*[:\-]?\s*\$?\s*([\d,\.\s]+)',
-                    ],
-                    'abonos': [
-                        r'total\s+abonos?\s*[:\-]?\s*\$?\s*([\d,\.\s]+)',
-                        r'abonos?\s*[:\-]?\s*\$?\s*([\d,\.\s]+)',
-                    ],
-                    'cargos': [
-                        r'total\s+cargos?\s*[:\-]?\s*\$?\s*([\d,\.\s]+)',
-                        r'cargos?\s*[:\-]?\s*\$?\s*([\d,\.\s]+)',
-                    ],
-                    'saldo_final': [
-                        r'saldo\s+(?:al|final|al\s+\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4})\s*[:\-]?\s*\$?\s*([\d,\.\s]+)',
-                        r'saldo\s+(?:final|total)\s*[:\-]?\s*\$?\s*([\d,\.\s]+)',
-                        r'saldo\s*[:\-]?\s*\$?\s*([\d,\.\s]+)',
-                    ],
-                    'saldo_anterior': [
-                        r'saldo\s+anterior\s*[:\-]?\s*\$?\s*([\d,\.\s]+)',
-                    ],
-                    'movimientos': [
-                        r'total\s+de\s+movimientos?\s*[:\-]?\s*(\d+)',
-                        r'(\d+)\s+movimientos?',
-                    ]
-                }
+                            if amount > 0:
+                                summary_data['saldo_anterior'] = amount
+                                break
                 
-                # Search for patterns in all lines
-                for line in all_lines:
-                    # Look for depositos/abonos
-                    if not summary_data['total_depositos'] and not summary_data['total_abonos']:
-                        for pattern in patterns['depositos']:
-                            match = re.search(pattern, line, re.I)
-                            if match:
-                                amount = normalize_amount_str(match.group(1))
-                                if amount > 0:
-                                    summary_data['total_depositos'] = amount
-                                    summary_data['total_abonos'] = amount
-                                    break
-                    
-                    # Look for retiros/cargos
-                    if not summary_data['total_retiros'] and not summary_data['total_cargos']:
-                        for pattern in patterns['retiros']:
-                            match = re.search(pattern, line, re.I)
-                            if match:
-                                amount = normalize_amount_str(match.group(1))
-                                if amount > 0:
-                                    summary_data['total_retiros'] = amount
-                                    summary_data['total_cargos'] = amount
-                                    break
-                    
-                    # Look for abonos specifically
-                    if not summary_data['total_abonos']:
-                        for pattern in patterns['abonos']:
-                            match = re.search(pattern, line, re.I)
-                            if match:
-                                amount = normalize_amount_str(match.group(1))
-                                if amount > 0:
-                                    summary_data['total_abonos'] = amount
-                                    break
-                    
-                    # Look for cargos specifically
-                    if not summary_data['total_cargos']:
-                        for pattern in patterns['cargos']:
-                            match = re.search(pattern, line, re.I)
-                            if match:
-                                amount = normalize_amount_str(match.group(1))
-                                if amount > 0:
-                                    summary_data['total_cargos'] = amount
-                                    break
-                    
-                    # Look for saldo final
-                    if not summary_data['saldo_final']:
-                        for pattern in patterns['saldo_final']:
-                            match = re.search(pattern, line, re.I)
-                            if match:
-                                amount = normalize_amount_str(match.group(1))
-                                if amount > 0:
-                                    summary_data['saldo_final'] = amount
-                                    break
-                    
-                    # Look for saldo anterior
-                    if not summary_data['saldo_anterior']:
-                        for pattern in patterns['saldo_anterior']:
-                            match = re.search(pattern, line, re.I)
-                            if match:
-                                amount = normalize_amount_str(match.group(1))
-                                if amount > 0:
-                                    summary_data['saldo_anterior'] = amount
-                                    break
-                    
-                    # Look for total movimientos
-                    if not summary_data['total_movimientos']:
-                        for pattern in patterns['movimientos']:
-                            match = re.search(pattern, line, re.I)
-                            if match:
-                                count = int(match.group(1))
-                                if count > 0:
-                                    summary_data['total_movimientos'] = count
-                                    break
-    
+                # Look for total movimientos
+                if not summary_data['total_movimientos']:
+                    for pattern in patterns['movimientos']:
+                        match = re.search(pattern, line, re.I)
+                        if match:
+                            count = int(match.group(1))
+                            if count > 0:
+                                summary_data['total_movimientos'] = count
+                                break
+
     except Exception as e:
         #print(f"⚠️  Error al extraer resumen del PDF: {e}")
         import traceback
@@ -5134,6 +7611,7 @@ def all_differences_are_na(validation_df: pd.DataFrame) -> bool:
 def print_validation_summary(pdf_summary: dict, extracted_totals: dict, validation_df: pd.DataFrame, df_mov: pd.DataFrame):
     """
     Print validation summary to console with checkmarks or X marks.
+    Returns True when validation passed, False when there are differences.
     """
     # print("\n" + "=" * 80)
     # print("📊 VALIDACIÓN DE DATOS")
@@ -5150,7 +7628,8 @@ def print_validation_summary(pdf_summary: dict, extracted_totals: dict, validati
     overall_status = validation_df[validation_df['Concepto'] == 'VALIDACIÓN GENERAL']['Estado'].values[0]
     
     # Reusar código existente: si force_error es True, forzar que caiga en else
-    if '✓' in overall_status and not force_error:
+    validation_ok = '✓' in overall_status and not force_error
+    if validation_ok:
         print("✅ VALIDATION: ALL CORRECT", flush=True)
     else:
         print("❌ VALIDATION: THERE ARE DIFFERENCES")
@@ -5171,190 +7650,262 @@ def print_validation_summary(pdf_summary: dict, extracted_totals: dict, validati
     #             print(f"   Diferencia: {row['Diferencia']}")
     
     # print("=" * 80 + "\n")
+    return validation_ok
+
+
+class _StatementSection(ABC):
+    """
+    A section routed by ``_SectionScanner``. ``mode`` 'words' receives the page's word rows (grouped with
+    ``y_tolerance``), 'lines' its text-layer lines.
+    """
+    mode = 'words'
+    y_tolerance = 5
 
+    def __init__(self):
+        self.rows = []
+        self.ended = False
+        self.failed = False
 
-def extract_digitem_section(pdf_path: str, columns_config: dict, extracted_data: list = None) -> pd.DataFrame:
+    @abstractmethod
+    def page(self, page_num: int, text: str, words: list) -> bool:
+        """Whether the rows of this page belong to the section (called once per page, before its rows)."""
+
+    @abstractmethod
+    def row(self, page_num: int, row, row_text: str):
+        """Consume one row; returns 'end' when the section is over, 'page' to skip the rest of the page, else None."""
+
+    def fail(self, error: Exception):
+        """Error while scanning: this section is dropped (empty result), the others go on."""
+        self.failed = True
+        self.ended = True
+
+
+class _SectionScanner:
+    """
+    Routes statement pages, in page order, to the sections of a statement (Banamex DIGITEM and TRANSFERENCIA,
+    Santander METAS); every section keeps its own start/end markers (see ``_StatementSection``). 'words'
+    sections share the rows of ``extracted_data`` (grouped once per page and ``y_tolerance``); 'lines'
+    sections read the text layer of ``session`` when given, else the page content, so a page's two sources
+    are read in the same step but stay separate: on the Banamex mixed path ``extracted_data`` holds OCR text,
+    while TRANSFERENCIA has always been parsed from the text layer.
+    
+    Pages are fed one at a time (``feed``), so another walk over the pages (the movements loop) can drive
+    the sections as it goes; ``finish`` feeds the pages that walk did not reach. Feeding stops once every
+    section has ended.
     """
-    Extract DIGITEM section from Banamex PDF using the same coordinate-based extraction as Movements.
-    Section starts with "DIGITEM" and ends with "TRANSFERENCIA ELECTRONICA DE FONDOS".
-    Returns a DataFrame with columns: Fecha, Descripción, Importe
 
-    If extracted_data is provided (e.g. from main flow), it is used to avoid re-opening/re-OCR of the PDF.
+    def __init__(self, sections: list, extracted_data: list = None, session: PdfSession = None):
+        self.sections = sections
+        self.extracted_data = extracted_data
+        self.session = session
+        self.word_pages = len(extracted_data) if extracted_data is not None else 0
+        self.line_pages = session.page_count if session is not None else self.word_pages
+        self.next_index = 0
+
+    @property
+    def done(self) -> bool:
+        return self.next_index >= max(self.word_pages, self.line_pages) or all(s.ended for s in self.sections)
+
+    def feed(self, index: int):
+        """Route page ``index`` (0-based) and any earlier page not fed yet."""
+        while self.next_index <= index and not self.done:
+            self._scan_page(self.next_index)
+            self.next_index += 1
+
+    def finish(self):
+        """Route the remaining pages."""
+        while not self.done:
+            self._scan_page(self.next_index)
+            self.next_index += 1
+
+    def _scan_page(self, index: int):
+        page_data = self.extracted_data[index] if index < self.word_pages else None
+        text = (page_data.get('content', '') or '') if page_data else ''
+        rows_by_tolerance = {}
+        for section in [section for section in self.sections if not section.ended]:
+            try:
+                if section.mode == 'lines':
+                    if index >= self.line_pages:
+                        continue
+                    page_num = index + 1
+                    page_text = self.session.page_text(index) if self.session is not None else text
+                    if not section.page(page_num, page_text, None):
+                        continue
+                    rows = [(line, line) for line in page_text.split('\n')]
+                else:
+                    if page_data is None:
+                        continue
+                    page_num = page_data.get('page', index + 1)
+                    words = page_data.get('words', [])
+                    if not section.page(page_num, text, words):
+                        continue
+                    if section.y_tolerance not in rows_by_tolerance:
+                        rows_by_tolerance[section.y_tolerance] = [
+                            (row_words, ' '.join([w.get('text', '') for w in row_words]))
+                            for row_words in group_words_by_row(words, y_tolerance=section.y_tolerance)
+                            if row_words
+                        ]
+                    rows = rows_by_tolerance[section.y_tolerance]
+                for row, row_text in rows:
+                    outcome = section.row(page_num, row, row_text)
+                    if outcome == 'end':
+                        section.ended = True
+                        break
+                    if outcome == 'page':
+                        break
+            except Exception as e:
+                section.fail(e)
+
+
+def scan_statement_sections(sections: list, extracted_data: list = None, session: PdfSession = None):
+    """Walk the statement pages once and route their rows to ``sections`` (see ``_SectionScanner``)."""
+    _SectionScanner(sections, extracted_data, session).finish()
+
+
+class _DigitemSection(_StatementSection):
     """
-    digitem_rows = []
-    
-    try:
-        # Use provided extracted data to avoid second PDF extraction (and second OCR for Banamex mixed)
-        if extracted_data is None:
-            extracted_data = extract_text_from_pdf(pdf_path)
+    Banamex DIGITEM section, coordinate-based like Movements. Starts on the first page after page 1 that mentions
+    "DIGITEM" and ends with "TRANSFERENCIA ELECTRONICA DE FONDOS"; rows need a date and "EMP" in the description,
+    other rows continue the previous one.
+    """
+
+    def __init__(self, columns_config: dict):
+        super().__init__()
+        self.columns_config = columns_config
+        self.in_section = False
+        self.skip_next_line = False
         # Pattern for dates: supports multiple formats:
         # - "DIA MES" (01 ABR)
         # - "MES DIA" (ABR 01)
         # - "DIA MES AÑO" (06 mar 2023) - for Konfio
-        date_pattern = re.compile(r"\b(?:(?:0[1-9]|[12][0-9]|3[01])(?:[\/\-\s])[A-Za-z]{3}(?:[\/\-\s]\d{2,4})?|[A-Za-z]{3}(?:[\/\-\s])(?:0[1-9]|[12][0-9]|3[01])|(?:0[1-9]|[12][0-9]|3[01])\s+[A-Za-z]{3}\s+\d{2,4})\b", re.I)
-        dec_amount_re = re.compile(r"\d{1,3}(?:[\.,\s]\d{3})*(?:[\.,]\d{2})")
+        self.date_pattern = MOVEMENT_DATE_PATTERN
+        self.dec_amount_re = re.compile(r"\d{1,3}(?:[\.,\s]\d{3})*(?:[\.,]\d{2})")
+
+    def page(self, page_num: int, text: str, words: list) -> bool:
+        if not words and not text:
+            return False
+        # DIGITEM section cannot be on the first page - skip page 1
+        if page_num == 1:
+            return False
+        # Check if we're entering DIGITEM section (starting from page 2)
+        if not self.in_section:
+            # Check both text and words for "DIGITEM" (in case text extraction missed it)
+            all_words_text = ' '.join([w.get('text', '') for w in words])
+            if re.search(r'\bDIGITEM\b', text, re.I) or re.search(r'\bDIGITEM\b', all_words_text, re.I):
+                self.in_section = True
+                #print(f"📄 DIGITEM section found on page {page_num}")
+                # Skip the header line "DETALLE DE OPERACIONES" that comes after DIGITEM
+                self.skip_next_line = True
+            else:
+                return False
+        else:
+            self.skip_next_line = False
+        return bool(words)
+
+    def row(self, page_num: int, row_words, all_row_text: str):
+        columns_config = self.columns_config
+        # Check if we're leaving DIGITEM section (check each row)
+        if re.search(r'TRANSFERENCIA\s+ELECTRONICA\s+DE\s+FONDOS', all_row_text, re.I):
+            # print(f"📄 Fin de sección DIGITEM encontrado en página {page_num}")
+            return 'end'
+        
+        # Skip header line "DETALLE DE OPERACIONES" that comes right after DIGITEM
+        if self.skip_next_line:
+            self.skip_next_line = False
+            if re.search(r'DETALLE\s+DE\s+OPERACIONES', all_row_text, re.I):
+                # print(f"   ⏭️  Saltando línea de encabezado: DETALLE DE OPERACIONES")
+                return None
         
-        in_digitem_section = False
-        extraction_stopped = False
+        # Extract structured row using coordinates (same as Movements)
+        # Pass date_pattern to enable date/description separation
+        row_data = extract_movement_row(row_words, columns_config, None, self.date_pattern)
         
-        for page_data in extracted_data:
-            if extraction_stopped:
-                break
-                
-            page_num = page_data['page']
-            words = page_data.get('words', [])
-            text = page_data.get('content', '')
-            
-            if not words and not text:
-                continue
-            
-            # DIGITEM section cannot be on the first page - skip page 1
-            if page_num == 1:
-                continue
+        # Check if this row has a date (same logic as Movements)
+        fecha_val = str(row_data.get('fecha') or '')
+        has_date = bool(self.date_pattern.search(fecha_val))
+        
+        # Check if description contains "EMP" (required for DIGITEM rows)
+        desc_val = str(row_data.get('descripcion') or '')
+        has_emp = 'EMP' in desc_val.upper()
+        
+        if has_date and has_emp:
+            # This is a valid DIGITEM row (has date and EMP in description)
+            row_data['page'] = page_num
+            self.rows.append(row_data)
+            return None
+        # Continuation row: append to previous DIGITEM row if exists and has EMP
+        if not self.rows:
+            return None
+        prev = self.rows[-1]
+        # Check if previous row has EMP (to ensure we're continuing a DIGITEM row)
+        prev_desc = str(prev.get('descripcion') or '')
+        if 'EMP' not in prev_desc.upper():
+            return None
+        # Merge amounts from continuation row
+        cont_amounts = row_data.get('_amounts', [])
+        if cont_amounts and columns_config:
+            # Get description range
+            descripcion_range = None
+            if 'descripcion' in columns_config:
+                x0, x1 = columns_config['descripcion']
+                descripcion_range = (x0, x1)
             
-            # Check if we're entering DIGITEM section (starting from page 2)
-            if not in_digitem_section:
-                # Check both text and words for "DIGITEM"
-                if re.search(r'\bDIGITEM\b', text, re.I):
-                    in_digitem_section = True
-                    #print(f"📄 DIGITEM section found on page {page_num}")
-                    # Skip the header line "DETALLE DE OPERACIONES" that comes after DIGITEM
-                    skip_next_line = True
-                else:
-                    # Also check in words (in case text extraction missed it)
-                    all_words_text = ' '.join([w.get('text', '') for w in words])
-                    if re.search(r'\bDIGITEM\b', all_words_text, re.I):
-                        in_digitem_section = True
-                        # print(f"📄 DIGITEM section found on page {page_num} (from words)")
-                        skip_next_line = True
-                    else:
-                        continue
-            else:
-                skip_next_line = False
+            # Get column ranges for numeric columns
+            col_ranges = {}
+            for col in ('cargos', 'abonos', 'saldo'):
+                if col in columns_config:
+                    x0, x1 = columns_config[col]
+                    col_ranges[col] = (x0, x1)
             
-            # Extract rows using coordinate-based method (same as Movements)
-            if in_digitem_section and words:
-                # Group words by row
-                word_rows = group_words_by_row(words)
-                
-                for row_words in word_rows:
-                    if not row_words:
-                        continue
-                    
-                    # Check if we're leaving DIGITEM section (check each row)
-                    all_row_text = ' '.join([w.get('text', '') for w in row_words])
-                    if re.search(r'TRANSFERENCIA\s+ELECTRONICA\s+DE\s+FONDOS', all_row_text, re.I):
-                        # print(f"📄 Fin de sección DIGITEM encontrado en página {page_num}")
-                        extraction_stopped = True
-                        break
-                    
-                    # Skip header line "DETALLE DE OPERACIONES" that comes right after DIGITEM
-                    if skip_next_line:
-                        if re.search(r'DETALLE\s+DE\s+OPERACIONES', all_row_text, re.I):
-                            # print(f"   ⏭️  Saltando línea de encabezado: DETALLE DE OPERACIONES")
-                            skip_next_line = False
-                            continue
-                        else:
-                            skip_next_line = False  # Reset if we didn't find it
-                    
-                    if extraction_stopped:
-                        break
-                    
-                    # Extract structured row using coordinates (same as Movements)
-                    # Pass date_pattern to enable date/description separation
-                    row_data = extract_movement_row(row_words, columns_config, None, date_pattern)
-                    
-                    # Check if this row has a date (same logic as Movements)
-                    fecha_val = str(row_data.get('fecha') or '')
-                    has_date = bool(date_pattern.search(fecha_val))
-                    
-                    # Check if description contains "EMP" (required for DIGITEM rows)
-                    desc_val = str(row_data.get('descripcion') or '')
-                    has_emp = 'EMP' in desc_val.upper()
-                    
-                    # Debug: print row info for rows that might be DIGITEM
-                    # if has_date or has_emp or any(row_data.get(k) for k in ['cargos', 'abonos', 'saldo'] if row_data.get(k)):
-                    #     print(f"   🔍 Fila potencial DIGITEM - Fecha: {fecha_val[:20] if fecha_val else 'N/A'}, has_date: {has_date}, has_EMP: {has_emp}, Desc: {desc_val[:50] if desc_val else 'N/A'}")
-                    
-                    if has_date and has_emp:
-                        # This is a valid DIGITEM row (has date and EMP in description)
-                        row_data['page'] = page_num
-                        digitem_rows.append(row_data)
-                        # print(f"   ✅ Fila DIGITEM agregada (total: {len(digitem_rows)})")
-                    else:
-                        # Continuation row: append to previous DIGITEM row if exists and has EMP
-                        if digitem_rows:
-                            prev = digitem_rows[-1]
-                            
-                            # Check if previous row has EMP (to ensure we're continuing a DIGITEM row)
-                            prev_desc = str(prev.get('descripcion') or '')
-                            if 'EMP' in prev_desc.upper():
-                                # Merge amounts from continuation row
-                                cont_amounts = row_data.get('_amounts', [])
-                                if cont_amounts and columns_config:
-                                    # Get description range
-                                    descripcion_range = None
-                                    if 'descripcion' in columns_config:
-                                        x0, x1 = columns_config['descripcion']
-                                        descripcion_range = (x0, x1)
-                                    
-                                    # Get column ranges for numeric columns
-                                    col_ranges = {}
-                                    for col in ('cargos', 'abonos', 'saldo'):
-                                        if col in columns_config:
-                                            x0, x1 = columns_config[col]
-                                            col_ranges[col] = (x0, x1)
-                                    
-                                    # Assign amounts from continuation row
-                                    tolerance = 10
-                                    for amt_text, center in cont_amounts:
-                                        if descripcion_range and descripcion_range[0] <= center <= descripcion_range[1]:
-                                            continue
-                                        
-                                        assigned = False
-                                        for col in ('cargos', 'abonos', 'saldo'):
-                                            if col in col_ranges:
-                                                x0, x1 = col_ranges[col]
-                                                if (x0 - tolerance) <= center <= (x1 + tolerance):
-                                                    existing = prev.get(col) or ''
-                                                    if not existing or amt_text not in existing:
-                                                        if existing:
-                                                            prev[col] = (existing + ' ' + amt_text).strip()
-                                                        else:
-                                                            prev[col] = amt_text
-                                                    assigned = True
-                                                    break
-                                
-                                # Merge amounts list
-                                prev_amounts = prev.get('_amounts', [])
-                                prev['_amounts'] = prev_amounts + cont_amounts
-                                
-                                # Collect text pieces from continuation row
-                                cont_parts = []
-                                for k in ('descripcion', 'fecha'):
-                                    v = row_data.get(k)
-                                    if v:
-                                        cont_parts.append(str(v))
-                                
-                                cont_text = ' '.join(cont_parts)
-                                cont_text = dec_amount_re.sub('', cont_text)
-                                cont_text = ' '.join(cont_text.split()).strip()
-                                
-                                if cont_text:
-                                    if prev.get('descripcion'):
-                                        prev['descripcion'] = (prev.get('descripcion') or '') + ' ' + cont_text
-                                    else:
-                                        prev['descripcion'] = cont_text
+            # Assign amounts from continuation row
+            tolerance = 10
+            for amt_text, center in cont_amounts:
+                if descripcion_range and descripcion_range[0] <= center <= descripcion_range[1]:
+                    continue
+                for col in ('cargos', 'abonos', 'saldo'):
+                    if col in col_ranges:
+                        x0, x1 = col_ranges[col]
+                        if (x0 - tolerance) <= center <= (x1 + tolerance):
+                            existing = prev.get(col) or ''
+                            if not existing or amt_text not in existing:
+                                if existing:
+                                    prev[col] = (existing + ' ' + amt_text).strip()
+                                else:
+                                    prev[col] = amt_text
+                            break
         
-        # Debug: print summary
-        # print(f"🔍 Total de filas DIGITEM encontradas: {len(digitem_rows)}")
-        # if digitem_rows:
-        #     print(f"   📋 Primeras 3 filas:")
-        #     for i, r in enumerate(digitem_rows[:3]):
-        #         print(f"      Fila {i+1}: fecha={r.get('fecha', 'N/A')[:20]}, desc={str(r.get('descripcion', 'N/A'))[:50]}")
+        # Merge amounts list
+        prev_amounts = prev.get('_amounts', [])
+        prev['_amounts'] = prev_amounts + cont_amounts
         
-        # Process digitem_rows similar to how movements are processed
-        if digitem_rows:
+        # Collect text pieces from continuation row
+        cont_parts = []
+        for k in ('descripcion', 'fecha'):
+            v = row_data.get(k)
+            if v:
+                cont_parts.append(str(v))
+        
+        cont_text = ' '.join(cont_parts)
+        cont_text = self.dec_amount_re.sub('', cont_text)
+        cont_text = ' '.join(cont_text.split()).strip()
+        
+        if cont_text:
+            if prev.get('descripcion'):
+                prev['descripcion'] = (prev.get('descripcion') or '') + ' ' + cont_text
+            else:
+                prev['descripcion'] = cont_text
+        return None
+
+    def dataframe(self) -> pd.DataFrame:
+        """Columns Fecha, Descripción, Importe (empty when the section is missing or could not be read)."""
+        digitem_rows = self.rows
+        columns_config = self.columns_config
+        dec_amount_re = self.dec_amount_re
+        if self.failed or not digitem_rows:
+            # print("ℹ️  DIGITEM section not found in PDF")
+            return pd.DataFrame(columns=['Fecha', 'Descripción', 'Importe'])
+        try:
+            # Process digitem_rows similar to how movements are processed
             # Reassign amounts to appropriate columns (same logic as Movements)
             col_centers = {}
             col_ranges = {}
@@ -5439,17 +7990,30 @@ def extract_digitem_section(pdf_path: str, columns_config: dict, extracted_data:
             
             #print(f"✅ Extracted {len(df_digitem)} DIGITEM records from PDF")
             return df_digitem
-        else:
-            pass
-            # print("ℹ️  DIGITEM section not found in PDF")
+        except Exception as e:
+            # print(f"⚠️  Error extracting DIGITEM from PDF: {e}")
             return pd.DataFrame(columns=['Fecha', 'Descripción', 'Importe'])
-    
+
+
+def extract_digitem_section(pdf_path: str, columns_config: dict, extracted_data: list = None) -> pd.DataFrame:
+    """
+    Extract DIGITEM section from Banamex PDF using the same coordinate-based extraction as Movements.
+    Section starts with "DIGITEM" and ends with "TRANSFERENCIA ELECTRONICA DE FONDOS".
+    Returns a DataFrame with columns: Fecha, Descripción, Importe
+
+    If extracted_data is provided (e.g. from main flow), it is used to avoid re-opening/re-OCR of the PDF.
+    The pipeline routes DIGITEM and TRANSFERENCIA from its movements walk over the pages (``_SectionScanner``).
+    """
+    try:
+        # Use provided extracted data to avoid second PDF extraction (and second OCR for Banamex mixed)
+        if extracted_data is None:
+            extracted_data = extract_text_from_pdf(pdf_path)
     except Exception as e:
-        pass
         # print(f"⚠️  Error extracting DIGITEM from PDF: {e}")
-        # import traceback
-        # traceback.print_exc()
         return pd.DataFrame(columns=['Fecha', 'Descripción', 'Importe'])
+    section = _DigitemSection(columns_config)
+    scan_statement_sections([section], extracted_data)
+    return section.dataframe()
 
 
 def _extract_two_dates(txt):
@@ -5469,126 +8033,301 @@ def _extract_two_dates(txt):
     return (found[0], found[1])
 
 
-def extract_transferencia_section(pdf_path: str) -> pd.DataFrame:
+class _TransferenciaSection(_StatementSection):
+    """
+    Banamex TRANSFERENCIA ELECTRONICA DE FONDOS section from the text layer lines: starts with that title,
+    "TOTALES:" closes the rest of the page. Date lines start a row, other lines continue the previous one.
+    """
+    mode = 'lines'
+
+    def __init__(self):
+        super().__init__()
+        self.in_section = False
+
+    def page(self, page_num: int, text: str, words: list) -> bool:
+        return bool(text)
+
+    def row(self, page_num: int, line: str, row_text: str):
+        transferencia_rows = self.rows
+        line_clean = line.strip()
+        if not line_clean:
+            return None
+        
+        # Check if we're entering TRANSFERENCIA section
+        if re.search(r'TRANSFERENCIA\s+ELECTRONICA\s+DE\s+FONDOS', line_clean, re.I):
+            self.in_section = True
+            #print(f"📄 Sección TRANSFERENCIA encontrada en página {page_num}")
+            return None
+        
+        if not self.in_section:
+            return None
+        
+        # Check if we're leaving TRANSFERENCIA section
+        if re.search(r'^TOTALES:', line_clean, re.I):
+            #print(f"📄 Fin de sección TRANSFERENCIA encontrado en página {page_num}")
+            return 'page'
+        
+        # Try to extract date (DD MMM format)
+        date_match = re.search(r'(\d{1,2})\s+([A-Z]{3})', line_clean)
+        if date_match:
+            fecha = f"{date_match.group(1)} {date_match.group(2)}"
+            
+            # Extract all amounts in the line
+            amounts = DEC_AMOUNT_RE.findall(line_clean)
+            
+            # Typically: Importe, Comisiones, I.V.A, Total
+            importe = amounts[0] if len(amounts) > 0 else ''
+            comisiones = amounts[1] if len(amounts) > 1 else ''
+            iva = amounts[2] if len(amounts) > 2 else ''
+            total = amounts[3] if len(amounts) > 3 else (amounts[-1] if len(amounts) > 0 else '')
+            
+            # Extract description (everything between date and first amount)
+            desc_start = date_match.end()
+            if amounts:
+                desc_end = line_clean.find(amounts[0])
+                descripcion = line_clean[desc_start:desc_end].strip()
+            else:
+                descripcion = line_clean[desc_start:].strip()
+            
+            if fecha and descripcion:
+                transferencia_rows.append({
+                    'Fecha': fecha,
+                    'Descripción': descripcion,
+                    'Importe': importe,
+                    'Comisiones': comisiones,
+                    'I.V.A': iva,
+                    'Total': total
+                })
+        elif transferencia_rows:
+            # Multi-line entry - append to previous row's description
+            # Check if line has amounts
+            amounts = DEC_AMOUNT_RE.findall(line_clean)
+            if amounts:
+                # Update amounts in previous row
+                if len(amounts) >= 1 and not transferencia_rows[-1]['Importe']:
+                    transferencia_rows[-1]['Importe'] = amounts[0]
+                if len(amounts) >= 2 and not transferencia_rows[-1]['Comisiones']:
+                    transferencia_rows[-1]['Comisiones'] = amounts[1]
+                if len(amounts) >= 3 and not transferencia_rows[-1]['I.V.A']:
+                    transferencia_rows[-1]['I.V.A'] = amounts[2]
+                if len(amounts) >= 4 and not transferencia_rows[-1]['Total']:
+                    transferencia_rows[-1]['Total'] = amounts[3]
+            else:
+                # Just description continuation
+                if transferencia_rows[-1]['Descripción']:
+                    transferencia_rows[-1]['Descripción'] += ' ' + line_clean
+                else:
+                    transferencia_rows[-1]['Descripción'] = line_clean
+        return None
+
+    def fail(self, error: Exception):
+        #print(f"⚠️  Error extracting TRANSFERENCIA from PDF: {error}")
+        import traceback
+        traceback.print_exception(type(error), error, error.__traceback__)
+        super().fail(error)
+
+    def dataframe(self) -> pd.DataFrame:
+        """Columns Fecha, Descripción, Importe, Comisiones, I.V.A, Total (empty when missing or unreadable)."""
+        if self.failed or not self.rows:
+            # print("ℹ️  No se encontró sección TRANSFERENCIA en el PDF")
+            return pd.DataFrame(columns=['Fecha', 'Descripción', 'Importe', 'Comisiones', 'I.V.A', 'Total'])
+        #print(f"✅ Se extrajeron {len(self.rows)} registros de TRANSFERENCIA del PDF")
+        return pd.DataFrame(self.rows)
+
+
+def extract_transferencia_section(pdf_path: str, session: PdfSession = None) -> pd.DataFrame:
     """
     Extract TRANSFERENCIA ELECTRONICA DE FONDOS section from Banamex PDF.
     Section starts with "TRANSFERENCIA ELECTRONICA DE FONDOS" and ends with "TOTALES:".
     Returns a DataFrame with columns: Fecha, Descripción, Importe, Comisiones, I.V.A, Total
+    When a PdfSession is given, the cached page text is reused instead of re-reading the PDF.
     """
-    transferencia_rows = []
-    
+    section = _TransferenciaSection()
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            in_transferencia_section = False
-            
-            for page_num, page in enumerate(pdf.pages, start=1):
-                text = page.extract_text()
-                if not text:
-                    continue
-                
-                lines = text.split('\n')
-                
-                for line in lines:
-                    line_clean = line.strip()
-                    if not line_clean:
-                        continue
-                    
-                    # Check if we're entering TRANSFERENCIA section
-                    if re.search(r'TRANSFERENCIA\s+ELECTRONICA\s+DE\s+FONDOS', line_clean, re.I):
-                        in_transferencia_section = True
-                        #print(f"📄 Sección TRANSFERENCIA encontrada en página {page_num}")
-                        continue
-                    
-                    # Check if we're leaving TRANSFERENCIA section
-                    if in_transferencia_section and re.search(r'^TOTALES:', line_clean, re.I):
-                        #print(f"📄 Fin de sección TRANSFERENCIA encontrado en página {page_num}")
-                        break
-                    
-                    # Extract rows from TRANSFERENCIA section
-                    if in_transferencia_section:
-                        # Try to extract date (DD MMM format)
-                        date_match = re.search(r'(\d{1,2})\s+([A-Z]{3})', line_clean)
-                        if date_match:
-                            fecha = f"{date_match.group(1)} {date_match.group(2)}"
-                            
-                            # Extract all amounts in the line
-                            amounts = DEC_AMOUNT_RE.findall(line_clean)
-                            
-                            # Typically: Importe, Comisiones, I.V.A, Total
-                            importe = amounts[0] if len(amounts) > 0 else ''
-                            comisiones = amounts[1] if len(amounts) > 1 else ''
-                            iva = amounts[2] if len(amounts) > 2 else ''
-                            total = amounts[3] if len(amounts) > 3 else (amounts[-1] if len(amounts) > 0 else '')
-                            
-                            # Extract description (everything between date and first amount)
-                            desc_start = date_match.end()
-                            if amounts:
-                                desc_end = line_clean.find(amounts[0])
-                                descripcion = line_clean[desc_start:desc_end].strip()
-                            else:
-                                descripcion = line_clean[desc_start:].strip()
-                            
-                            if fecha and descripcion:
-                                transferencia_rows.append({
-                                    'Fecha': fecha,
-                                    'Descripción': descripcion,
-                                    'Importe': importe,
-                                    'Comisiones': comisiones,
-                                    'I.V.A': iva,
-                                    'Total': total
-                                })
-                        else:
-                            # Multi-line entry - append to previous row's description
-                            if transferencia_rows and line_clean:
-                                # Check if line has amounts
-                                amounts = DEC_AMOUNT_RE.findall(line_clean)
-                                if amounts:
-                                    # Update amounts in previous row
-                                    if len(amounts) >= 1 and not transferencia_rows[-1]['Importe']:
-                                        transferencia_rows[-1]['Importe'] = amounts[0]
-                                    if len(amounts) >= 2 and not transferencia_rows[-1]['Comisiones']:
-                                        transferencia_rows[-1]['Comisiones'] = amounts[1]
-                                    if len(amounts) >= 3 and not transferencia_rows[-1]['I.V.A']:
-                                        transferencia_rows[-1]['I.V.A'] = amounts[2]
-                                    if len(amounts) >= 4 and not transferencia_rows[-1]['Total']:
-                                        transferencia_rows[-1]['Total'] = amounts[3]
-                                else:
-                                    # Just description continuation
-                                    if transferencia_rows[-1]['Descripción']:
-                                        transferencia_rows[-1]['Descripción'] += ' ' + line_clean
-                                    else:
-                                        transferencia_rows[-1]['Descripción'] = line_clean
-        
-        if transferencia_rows:
-            df_transferencia = pd.DataFrame(transferencia_rows)
-            #print(f"✅ Se extrajeron {len(df_transferencia)} registros de TRANSFERENCIA del PDF")
-            return df_transferencia
+        with _pdf_session(pdf_path, session) as pdf_session:
+            scan_statement_sections([section], session=pdf_session)
+    except Exception as e:
+        section.fail(e)
+    return section.dataframe()
+
+
+class _StreamedPageEntry(dict):
+    """
+    Stream mode page entry (see iter_text_pages): holds the page text but no words. ``entry['words']`` and
+    ``entry.get('words')`` read them back from the session's spill file on each access (``load_words``), so
+    only the page the caller is working on has its words in memory. Assigning ``entry['words']`` stores them as usual.
+    """
+
+    def __init__(self, load_words, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._load_words = load_words
+
+    def __missing__(self, key):
+        if key == 'words':
+            return self._load_words()
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        if key == 'words' and not super().__contains__(key):
+            return self._load_words()
+        return super().get(key, default)
+
+    def __contains__(self, key):
+        return key == 'words' or super().__contains__(key)
+
+
+def iter_text_pages(pdf_session: PdfSession, is_konfio: bool, coordinate_scale: float = 1.0, page_classes: list = None):
+    """
+    Yield the page entries of a PDF one at a time, in page order (text layer, see _extract_text_layer_page).
+    ``page_classes``: when given, the classify_pdf_page() dict of each text-layer page is appended to it, from
+    the text this pass reads anyway.
+    In stream mode (``PdfSession(stream_pages=True)``) entries are _StreamedPageEntry: the words of a page are
+    loaded when a consumer (movement parser, section scans) asks for them and dropped after it, so neither
+    the entries nor the session keep words in memory.
+    """
+    for page_number in range(1, pdf_session.page_count + 1):
+        if pdf_session.stream_pages:
+            entry = _StreamedPageEntry(
+                partial(_text_layer_page_words, pdf_session, page_number, is_konfio, coordinate_scale),
+                _extract_text_layer_page(pdf_session, page_number, is_konfio, coordinate_scale, with_words=False),
+            )
         else:
-            pass
-            # print("ℹ️  No se encontró sección TRANSFERENCIA en el PDF")
-            return pd.DataFrame(columns=['Fecha', 'Descripción', 'Importe', 'Comisiones', 'I.V.A', 'Total'])
+            entry = _extract_text_layer_page(pdf_session, page_number, is_konfio, coordinate_scale)
+        if page_classes is not None:
+            page_classes.append(classify_pdf_page(pdf_session, page_number - 1))
+        if pdf_session.stream_pages:
+            pdf_session.release_page(page_number - 1)
+        yield entry
+
+
+def _extract_text_layer_page(
+    pdf_session: PdfSession, page_number: int, is_konfio: bool, coordinate_scale: float = 1.0, with_words: bool = True
+) -> dict:
+    """
+    Text and word positions of one page (1-based) from the PDF text layer.
+    ``coordinate_scale`` != 1.0 maps word coordinates into OCR space (see OCR_COORDINATE_SCALE).
+    ``with_words=False`` leaves "words" out of the entry (stream mode, see _StreamedPageEntry).
+    """
+    text = pdf_session.page_text(page_number - 1)
+    # For Konfio, fix duplicated characters in text
+    if is_konfio and text:
+        text = fix_duplicated_chars(text)
+    entry = {
+        "page": page_number,
+        "content": text if text else "",
+        "_used_ocr": False,  # Flag para indicar que NO viene de OCR
+        "_page_source": "text",
+    }
+    if with_words:
+        entry["words"] = _text_layer_page_words(pdf_session, page_number, is_konfio, coordinate_scale)
+    return entry
+
+
+def _text_layer_page_words(pdf_session: PdfSession, page_number: int, is_konfio: bool, coordinate_scale: float = 1.0) -> list:
+    """Words with positions of one page (1-based) for coordinate-based column detection (see _extract_text_layer_page)."""
+    try:
+        words = pdf_session.page_words(page_number - 1)
+    except Exception:
+        words = []
     
-    except Exception as e:
-        #print(f"⚠️  Error extracting TRANSFERENCIA from PDF: {e}")
-        import traceback
-        traceback.print_exc()
-        return pd.DataFrame(columns=['Fecha', 'Descripción', 'Importe', 'Comisiones', 'I.V.A', 'Total'])
+    # For Konfio, fix duplicated characters in word texts
+    if is_konfio:
+        for word in words:
+            if 'text' in word and word['text']:
+                word['text'] = fix_duplicated_chars(word['text'])
+    
+    if coordinate_scale != 1.0:
+        for word in words:
+            for key in ('x0', 'x1', 'top', 'bottom', 'doctop', 'width', 'height'):
+                if key in word:
+                    word[key] = word[key] * coordinate_scale
+    return words
 
 
-def extract_text_from_pdf(pdf_path: str) -> list:
+def compare_text_engines(pdf_path: str, bank_name: str = None, position_tolerance: float = 1.0) -> dict:
+    """
+    Calibration check for --text-engine pymupdf: extract every page with pdfplumber and with PyMuPDF,
+    pair the words (same text, x0/top within ``position_tolerance`` points) and check that each pair
+    lands in the same BANK_CONFIGS column (``columns`` and, when present, ``columns_new_format``).
+    
+    Args:
+        pdf_path: Path to PDF file
+        bank_name: Bank whose column ranges are checked (default: detected from the PDF)
+        position_tolerance: Max x0/top difference in points for two words to be the same word
+    
+    Returns:
+        Dictionary with bank, pages, words, missing (pdfplumber words without a PyMuPDF match),
+        extra (unpaired PyMuPDF words), column_mismatches, pages_text_equal, max_dx, max_dtop
+        and ``parity`` (True when nothing is missing/extra/misplaced and every page text matches)
+    """
+    report = {
+        'pdf': pdf_path, 'bank': bank_name, 'pages': 0, 'words': 0, 'missing': 0, 'extra': 0,
+        'column_mismatches': 0, 'pages_text_equal': 0, 'max_dx': 0.0, 'max_dtop': 0.0, 'examples': [],
+    }
+    with PdfSession(pdf_path) as ref, PdfSession(pdf_path, text_engine='pymupdf') as alt:
+        if report['bank'] is None:
+            report['bank'] = detect_bank_from_pdf(pdf_path, session=ref)
+        profile = get_bank_profile(report['bank'])
+        layouts = [layout for layout in (profile.column_layout('columns'), profile.column_layout('columns_new_format')) if layout]
+        report['pages'] = ref.page_count
+        for index in range(ref.page_count):
+            if (ref.page_text(index) or '') == (alt.page_text(index) or ''):
+                report['pages_text_equal'] += 1
+            candidates = {}
+            for word in alt.page_words(index):
+                candidates.setdefault(word['text'], []).append(word)
+            for word in ref.page_words(index):
+                report['words'] += 1
+                best = None
+                for other in candidates.get(word['text'], []):
+                    dx, dtop = abs(other['x0'] - word['x0']), abs(other['top'] - word['top'])
+                    if dx <= position_tolerance and dtop <= position_tolerance and (best is None or dx + dtop < best[0]):
+                        best = (dx + dtop, dx, dtop, other)
+                if best is None:
+                    report['missing'] += 1
+                    if len(report['examples']) < 10:
+                        report['examples'].append(f"page {index + 1}: missing {word['text']!r} at x0={word['x0']:.1f} top={word['top']:.1f}")
+                    continue
+                _, dx, dtop, other = best
+                candidates[other['text']].remove(other)
+                report['max_dx'] = max(report['max_dx'], dx)
+                report['max_dtop'] = max(report['max_dtop'], dtop)
+                for layout in layouts:
+                    if layout.assign(word['x0'], word['x1']) != layout.assign(other['x0'], other['x1']):
+                        report['column_mismatches'] += 1
+                        if len(report['examples']) < 10:
+                            report['examples'].append(f"page {index + 1}: {word['text']!r} changes column")
+                        break
+            report['extra'] += sum(len(v) for v in candidates.values())
+    report['parity'] = (
+        report['missing'] == 0 and report['extra'] == 0 and report['column_mismatches'] == 0
+        and report['pages_text_equal'] == report['pages']
+    )
+    return report
+
+
+def extract_text_from_pdf(pdf_path: str, session: PdfSession = None) -> list:
     """
     Extract text and word positions from each page of a PDF.
     Returns a list of dictionaries (page_number, text, words).
     
-    If it detects illegible text (CID characters), uses Tesseract OCR as fallback.
+    If it detects illegible text (CID characters), uses Tesseract OCR as fallback for the whole document.
+    In a legible PDF, OCR is decided per page (classify_pdf_page, while each page's text is read):
+    scanned pages (e.g. an image annex) are OCR'd in PDF-point coordinates. Each page entry has
+    ``_page_source`` ("text" or "ocr"); ``_used_ocr`` stays a document-level flag (OCR coordinates).
+    When a PdfSession is given, the illegibility check, bank detection and page extraction
+    share one open PDF and its cached per-page text/words; with a stream-mode session the entries hold
+    only text and each page's words are loaded when a consumer reads them (iter_text_pages).
     """
     # STEP 1: Detect if PDF has illegible text
-    is_illegible, cid_ratio, ascii_ratio = is_pdf_text_illegible(pdf_path)
-    if '--debug' in sys.argv:
+    with _metrics_stage('illegibility_check'):
+        is_illegible, cid_ratio, ascii_ratio = is_pdf_text_illegible(pdf_path, session=session)
+    if '--debug' in _run_argv():
         print(f"[DEBUG] is_pdf_text_illegible: is_illegible={is_illegible}, cid_ratio={cid_ratio:.2%}, ascii_ratio={ascii_ratio:.2%}", flush=True)
     
     # Banamex mixed format: if bank is Banamex and ascii_ratio < 99%, use OCR for movements (some content is embedded as images)
-    detected_bank_early = detect_bank_from_pdf(pdf_path)
+    with _metrics_stage('bank_detection'):
+        detected_bank_early = detect_bank_from_pdf(pdf_path, session=session)
     use_ocr_banamex_mixed = (
         detected_bank_early == 'Banamex' and ascii_ratio < 0.99 and TESSERACT_AVAILABLE
     )
@@ -5601,10 +8340,16 @@ def extract_text_from_pdf(pdf_path: str) -> list:
         print(f"[INFO] Using local Tesseract OCR as fallback...", flush=True)
         print(f"[INFO] Bank will be detected after processing with OCR...", flush=True)
         try:
-            # Use Tesseract OCR
-            extracted_data = extract_text_with_tesseract_ocr(pdf_path, banamex_mixed_rfc=use_ocr_banamex_mixed)
+            # Whole-document OCR, without classifying the pages: that would parse every garbled text layer for nothing.
+            # --ocr-roi layout: Banamex mixed keeps its text-layer bank, an illegible PDF gets it from the scout OCR.
+            roi_bank = detected_bank_early if use_ocr_banamex_mixed else None
+            with _metrics_stage('ocr'):
+                extracted_data = extract_text_with_tesseract_ocr(
+                    pdf_path, banamex_mixed_rfc=use_ocr_banamex_mixed, bank_name=roi_bank
+                )
             # Mark that OCR was used
             for page_data in extracted_data:
+                page_data.setdefault('_page_source', 'ocr')
                 page_data['_used_ocr'] = True
             # When OCR was triggered for Banamex mixed, keep Banamex as bank (OCR text may not detect it or may match HSBC fallback)
             if use_ocr_banamex_mixed and extracted_data:
@@ -5612,40 +8357,43 @@ def extract_text_from_pdf(pdf_path: str) -> list:
             return extracted_data
         except Exception as e:
             print(f"[WARNING] Error with Tesseract OCR: {e}")
-            print(f"[INFO] Continuing with normal extraction (may have illegible characters)...")
-            # Continue with normal extraction if OCR fails
-    
-    # STEP 2: Normal extraction with pdfplumber (existing code - NO CHANGES)
-    extracted_data = []
-    
-    # Detect bank to apply Konfio-specific fixes
-    detected_bank = detect_bank_from_pdf(pdf_path)
-    is_konfio = (detected_bank == "Konfio")
-
-    with pdfplumber.open(pdf_path) as pdf:
-        for page_number, page in enumerate(pdf.pages, start=1):
-            text = page.extract_text()
-            # also extract words with positions for coordinate-based column detection
-            try:
-                words = page.extract_words(x_tolerance=3, y_tolerance=3)
-            except Exception:
-                words = []
-            
-            # For Konfio, fix duplicated characters in text and words
-            if is_konfio:
-                if text:
-                    text = fix_duplicated_chars(text)
-                # Fix duplicated characters in word texts
-                for word in words:
-                    if 'text' in word and word['text']:
-                        word['text'] = fix_duplicated_chars(word['text'])
-            
-            extracted_data.append({
-                "page": page_number,
-                "content": text if text else "",
-                "words": words,
-                "_used_ocr": False  # Flag para indicar que NO viene de OCR
-            })
+            print(f"[INFO] Continuing with normal extraction (may have illegible characters)...")
+            # Continue with normal extraction if OCR fails
+    
+    # STEP 2: Normal extraction with pdfplumber
+    # Detect bank to apply Konfio-specific fixes
+    with _metrics_stage('bank_detection'):
+        detected_bank = detect_bank_from_pdf(pdf_path, session=session)
+    is_konfio = (detected_bank == "Konfio")
+
+    page_classes = []
+    with _pdf_session(pdf_path, session) as pdf_session, _metrics_stage('text_extraction'):
+        extracted_data = list(iter_text_pages(pdf_session, is_konfio, page_classes=page_classes))
+    if '--debug' in _run_argv():
+        for c in page_classes:
+            print(
+                f"[DEBUG] page {c['page']}: chars={c['text_chars']}, cid_ratio={c['cid_ratio']:.2%}, "
+                f"ascii_ratio={c['ascii_ratio']:.2%}, image_coverage={c['image_coverage']:.0%}, "
+                f"illegible={c['is_illegible']}, scanned={c['is_scanned']}",
+                flush=True,
+            )
+    
+    # Scanned pages inside a legible PDF (e.g. an image annex): OCR only those pages, with word
+    # coordinates in PDF points so the document keeps using the text-layer "columns".
+    scanned_pages = [c['page'] for c in page_classes if c['is_scanned']]
+    if scanned_pages and TESSERACT_AVAILABLE and not (is_illegible or use_ocr_banamex_mixed):
+        print(f"[INFO] {len(scanned_pages)} scanned page(s) without a usable text layer: {scanned_pages}. Using OCR for those pages...", flush=True)
+        try:
+            with _metrics_stage('ocr'):
+                scanned_entries = extract_text_with_tesseract_ocr(
+                    pdf_path, pages=scanned_pages, coordinate_scale=1.0, bank_name=detected_bank
+                )
+            for entry in scanned_entries:
+                entry['_used_ocr'] = False
+                entry['_page_source'] = 'ocr'
+                extracted_data[entry['page'] - 1] = entry
+        except Exception as e:
+            print(f"[WARNING] Error with Tesseract OCR on scanned pages: {e}")
 
     return extracted_data
 
@@ -5700,73 +8448,84 @@ def _santander_sanitize_row_words_if_duplicated(row_words: list) -> list:
     return out if any_changed else row_words
 
 
+class _MetasSection(_StatementSection):
+    """
+    Santander METAS section (Mis Metas), coordinate-based like Movements: from the page containing ``metas_start``
+    (its title rows skipped) to the row with the word ``metas_end``; keeps rows with a date or an amount.
+    """
+    y_tolerance = 3
+
+    def __init__(self, columns_config: dict, metas_start: str, metas_end: str):
+        super().__init__()
+        self.columns_config = columns_config
+        self.date_pattern = MOVEMENT_DATE_PATTERN
+        self.start_norm = re.sub(r'\s+', '', metas_start).upper()
+        self.end_word = metas_end.strip().upper()
+        self.in_section = False
+        self.skip_next_line = False
+
+    def page(self, page_num: int, text: str, words: list) -> bool:
+        if not words and not text:
+            return False
+        if not self.in_section:
+            text_norm = re.sub(r'\s+', '', text).upper()
+            if self.start_norm not in text_norm:
+                return False
+            self.in_section = True
+            self.skip_next_line = True
+        return bool(words)
+
+    def row(self, page_num: int, row_words, all_row_text: str):
+        if self.skip_next_line:
+            if self.start_norm in re.sub(r'\s+', '', all_row_text).upper() or re.search(r'DETALLE\s+DE\s+MOVIMIENTOS\s+MIS\s+METAS', all_row_text, re.I):
+                self.skip_next_line = False
+            return None
+        if re.search(r'\b' + re.escape(self.end_word) + r'\b', all_row_text, re.I):
+            return 'end'
+        row_words_sanitized = _santander_sanitize_row_words_if_duplicated(row_words)
+        row_data = extract_movement_row(row_words_sanitized, self.columns_config, 'Santander', self.date_pattern)
+        fecha_val = str(row_data.get('fecha') or '').strip()
+        has_date = bool(self.date_pattern.search(fecha_val))
+        has_amount = any(row_data.get(k) for k in ('cargos', 'abonos', 'saldo') if row_data.get(k))
+        if has_date or has_amount:
+            self.rows.append(row_data)
+        return None
+
+    def fail(self, error: Exception):
+        # Not swallowed: a broken METAS read fails the conversion, as before the shared scanner
+        raise error
+
+    def dataframe(self):
+        """Columns Fecha, Descripción, Abonos, Cargos, Saldo, or None when the section has no rows."""
+        if not self.rows:
+            return None
+        return pd.DataFrame([
+            {
+                'Fecha': str(r.get('fecha') or ''),
+                'Descripción': str(r.get('descripcion') or ''),
+                'Abonos': str(r.get('abonos') or ''),
+                'Cargos': str(r.get('cargos') or ''),
+                'Saldo': str(r.get('saldo') or ''),
+            }
+            for r in self.rows
+        ])
+
+
 def extract_santander_metas_from_pdf(extracted_data, columns_config, metas_start, metas_end):
     """Extract Santander METAS section (Mis Metas) using same coordinate-based logic as Movements.
     Section starts with metas_start and ends with a line containing metas_end (e.g. TOTAL).
     Returns a DataFrame with columns: Fecha, Descripción, Abonos, Cargos, Saldo (same structure as main movements)."""
     if not extracted_data or not columns_config or not metas_start or not metas_end:
         return None
-    date_pattern = re.compile(r"\b(?:(?:0[1-9]|[12][0-9]|3[01])(?:[\/\-\s])[A-Za-z]{3}(?:[\/\-\s]\d{2,4})?|[A-Za-z]{3}(?:[\/\-\s])(?:0[1-9]|[12][0-9]|3[01])|(?:0[1-9]|[12][0-9]|3[01])\s+[A-Za-z]{3}\s+\d{2,4})\b", re.I)
-    start_norm = re.sub(r'\s+', '', metas_start).upper()
-    end_word = metas_end.strip().upper()
-    metas_rows = []
-    in_metas = False
-    extraction_stopped = False
-    skip_next_line = False
-    for page_data in extracted_data:
-        if extraction_stopped:
-            break
-        page_num = page_data.get('page', 0)
-        words = page_data.get('words', [])
-        text = page_data.get('content', '') or ''
-        if not words and not text:
-            continue
-        if not in_metas:
-            text_norm = re.sub(r'\s+', '', text).upper()
-            if start_norm in text_norm:
-                in_metas = True
-                skip_next_line = True
-            else:
-                continue
-        if in_metas and words:
-            word_rows = group_words_by_row(words, y_tolerance=3)
-            for row_words in word_rows:
-                if not row_words:
-                    continue
-                all_row_text = ' '.join([w.get('text', '') for w in row_words])
-                if skip_next_line:
-                    if start_norm in re.sub(r'\s+', '', all_row_text).upper() or re.search(r'DETALLE\s+DE\s+MOVIMIENTOS\s+MIS\s+METAS', all_row_text, re.I):
-                        skip_next_line = False
-                    continue
-                if re.search(r'\b' + re.escape(end_word) + r'\b', all_row_text, re.I):
-                    extraction_stopped = True
-                    break
-                row_words_sanitized = _santander_sanitize_row_words_if_duplicated(row_words)
-                row_data = extract_movement_row(row_words_sanitized, columns_config, 'Santander', date_pattern)
-                fecha_val = str(row_data.get('fecha') or '').strip()
-                has_date = bool(date_pattern.search(fecha_val))
-                has_amount = any(row_data.get(k) for k in ('cargos', 'abonos', 'saldo') if row_data.get(k))
-                if has_date or has_amount:
-                    metas_rows.append(row_data)
-    if not metas_rows:
-        return None
-    df = pd.DataFrame([
-        {
-            'Fecha': str(r.get('fecha') or ''),
-            'Descripción': str(r.get('descripcion') or ''),
-            'Abonos': str(r.get('abonos') or ''),
-            'Cargos': str(r.get('cargos') or ''),
-            'Saldo': str(r.get('saldo') or ''),
-        }
-        for r in metas_rows
-    ])
-    return df
+    section = _MetasSection(columns_config, metas_start, metas_end)
+    scan_statement_sections([section], extracted_data)
+    return section.dataframe()
 
 
 def group_entries_from_lines(lines):
     """Group lines into transaction entries: a line starting with a date begins a new entry."""
     # Pattern for dates: supports multiple formats including "DIA MES AÑO" (06 mar 2023)
-    day_re = re.compile(r"\b(?:(?:0[1-9]|[12][0-9]|3[01])(?:[\/\-\s])[A-Za-z]{3}(?:[\/\-\s]\d{2,4})?|[A-Za-z]{3}(?:[\/\-\s])(?:0[1-9]|[12][0-9]|3[01])|(?:0[1-9]|[12][0-9]|3[01])\s+[A-Za-z]{3}\s+\d{2,4})\b", re.I)
+    day_re = MOVEMENT_DATE_PATTERN
     entries = []
     for line in lines:
         if day_re.search(line):
@@ -5781,9 +8540,31 @@ def group_entries_from_lines(lines):
 
 def group_words_by_row(words, y_tolerance=5):
     """Group words by Y-coordinate (rows) to extract table rows."""
+    with _metrics_stage('row_grouping'):
+        return _group_words_by_row(words, y_tolerance)
+
+
+# Below this many words the plain loop is faster than building NumPy arrays (same result either way);
+# measured break-even is about 160 words
+ROW_GROUPING_NUMPY_MIN_WORDS = 200
+
+
+def _group_words_by_row(words, y_tolerance=5):
     if not words:
         return []
-    
+    if len(words) < ROW_GROUPING_NUMPY_MIN_WORDS:
+        return _group_words_by_row_loop(words, y_tolerance)
+    try:
+        arrays = words_to_arrays(words, keys=('page', 'top'))
+    except (TypeError, ValueError):
+        # Non-numeric page/top (e.g. None): keep the loop's behaviour for such inputs
+        return _group_words_by_row_loop(words, y_tolerance)
+    order, starts = _row_starts(arrays['page'], arrays['top'], y_tolerance)
+    sorted_words = [words[i] for i in order.tolist()]
+    return [sorted_words[a:b] for a, b in zip(starts, starts[1:] + [len(words)])]
+
+
+def _group_words_by_row_loop(words, y_tolerance=5):
     # Sort by page first (if available), then by top coordinate
     # This ensures words from page 1 come before words from page 2, etc.
     sorted_words = sorted(words, key=lambda w: (w.get('page', 0), w.get('top', 0)))
@@ -5819,52 +8600,187 @@ def group_words_by_row(words, y_tolerance=5):
     return rows
 
 
+def words_to_arrays(words, keys=('page', 'top', 'x0', 'x1')) -> dict:
+    """
+    Struct-of-arrays view of word dicts: {key: float64 array}, missing values as 0
+    (same defaults as ``w.get(key, 0)``).
+    """
+    return {
+        key: np.fromiter((w.get(key, 0) for w in words), dtype=np.float64, count=len(words))
+        for key in keys
+    }
+
+
+def _row_starts(page, top, y_tolerance):
+    """
+    Sort order and row start positions (into the sorted order) for group_word_indices_by_row().
+    
+    Words are sorted by (page, top) with a stable sort; a row is anchored at its first word and
+    takes every following word of the same page with ``abs(top - anchor) <= y_tolerance`` (the
+    anchor does not move, so a slow drift of ``top`` starts new rows exactly as the loop does).
+    """
+    order = np.lexsort((top, page))
+    page_sorted = page[order]
+    top_sorted = top[order]
+    n = len(order)
+    # For every word: end of its page segment and first word of the page beyond anchor + tolerance
+    # (top is only sorted within a page, so the search runs per page segment)
+    page_end = np.searchsorted(page_sorted, page_sorted, side='right')
+    nxt = np.empty(n, dtype=np.int64)
+    seg_start = 0
+    for seg_end in np.unique(page_end).tolist():
+        seg_top = top_sorted[seg_start:seg_end]
+        nxt[seg_start:seg_end] = seg_start + np.searchsorted(seg_top, seg_top + y_tolerance, side='right')
+        seg_start = seg_end
+    # ``anchor + tol`` may round differently from ``abs(top - anchor) <= tol``; fix the few boundary cases
+    idx = np.arange(n)
+    while True:
+        inside = nxt < page_end
+        probe = np.minimum(nxt, n - 1)
+        grow = inside & (np.abs(top_sorted[probe] - top_sorted) <= y_tolerance)
+        back = nxt - 1
+        shrink = (back > idx) & ~(np.abs(top_sorted[back] - top_sorted) <= y_tolerance)
+        if not grow.any() and not shrink.any():
+            break
+        nxt = nxt + grow - shrink
+    nxt = nxt.tolist()
+    starts = []
+    i = 0
+    while i < n:
+        starts.append(i)
+        i = nxt[i]
+    return order, starts
+
+
+def group_word_indices_by_row(page, top, y_tolerance=5) -> list:
+    """
+    Row clustering of group_words_by_row() on arrays (see words_to_arrays): returns one index
+    array per row (indices into the input, in row order, words ordered by top within a row).
+    """
+    if len(top) == 0:
+        return []
+    order, starts = _row_starts(page, top, y_tolerance)
+    return np.split(order, starts[1:])
+
+
+# Amount columns win over overlapping text columns in column assignment (nearest range center among them)
+NUMERIC_COLUMNS = ('cargos', 'abonos', 'saldo')
+
+
+class ColumnLayout:
+    """
+    Precompiled column ranges ({name: (x_min, x_max)}) for assign_word_to_column().
+    The sorted range boundaries split the X axis into slots (each boundary point and each gap between
+    two boundaries); every slot stores the numeric columns covering it and the first other column
+    covering it, so a lookup is one bisect (or one np.searchsorted for a batch) instead of a scan.
+    Build with ColumnLayout.for_columns(columns): layouts are cached per distinct set of ranges.
+    """
+
+    _cache = {}
+
+    def __init__(self, columns: dict):
+        ranges = []
+        for col_name, (x_min, x_max) in columns.items():
+            if x_min > x_max:
+                if col_name in NUMERIC_COLUMNS:
+                    print(f"[WARNING] Inverted range for '{col_name}': ({x_min}, {x_max}). Correcting to ({x_max}, {x_min})")
+                x_min, x_max = x_max, x_min
+            ranges.append((col_name, x_min, x_max))
+        self.columns = {name: (x_min, x_max) for name, x_min, x_max in ranges}
+        self.bounds = sorted({b for _, x_min, x_max in ranges for b in (x_min, x_max)})
+        self._bounds_array = np.asarray(self.bounds, dtype=np.float64)
+        # Slot 2k = exactly bounds[k]; slot 2k+1 = strictly between bounds[k] and bounds[k+1]
+        numeric = [r for name in NUMERIC_COLUMNS for r in ranges if r[0] == name]
+        others = [r for r in ranges if r[0] not in NUMERIC_COLUMNS]
+        self.slot_numeric = []  # per slot: [(name, range_center), ...] in NUMERIC_COLUMNS order
+        self.slot_other = []    # per slot: first non-numeric column (dict order) or None
+        for slot in range(2 * len(self.bounds) - 1):
+            k = slot // 2
+            probe = self.bounds[k] if slot % 2 == 0 else (self.bounds[k] + self.bounds[k + 1]) / 2
+            self.slot_numeric.append([
+                (name, (x_min + x_max) / 2) for name, x_min, x_max in numeric if x_min <= probe <= x_max
+            ])
+            self.slot_other.append(next((name for name, x_min, x_max in others if x_min <= probe <= x_max), None))
+        # Slots with a single possible answer (no nearest-center tie-break needed)
+        self.slot_fixed = [
+            (cands[0][0] if len(cands) == 1 else None) if cands else other
+            for cands, other in zip(self.slot_numeric, self.slot_other)
+        ]
+
+    @classmethod
+    def for_columns(cls, columns):
+        """Cached layout for a columns dict (or the layout itself)."""
+        if isinstance(columns, ColumnLayout):
+            return columns
+        key = tuple(columns.items())
+        try:
+            layout = cls._cache.get(key)
+        except TypeError:  # list ranges
+            key = tuple((name, tuple(rng)) for name, rng in columns.items())
+            layout = cls._cache.get(key)
+        if layout is None:
+            if len(cls._cache) >= 256:  # column sets adjusted at run time must not grow this forever
+                cls._cache.clear()
+            layout = cls._cache[key] = ColumnLayout(columns)
+        return layout
+
+    def _slot(self, x: float) -> int:
+        k = bisect_left(self.bounds, x)
+        if k < len(self.bounds) and self.bounds[k] == x:
+            return 2 * k
+        if k == 0 or k == len(self.bounds):
+            return -1
+        return 2 * k - 1
+
+    def _resolve(self, slot: int, center: float):
+        cands = self.slot_numeric[slot]
+        if not cands:
+            return self.slot_other[slot]
+        if len(cands) == 1:
+            return cands[0][0]
+        # min() keeps the first of equal distances, like the stable sort it replaces
+        return min(cands, key=lambda c: abs(center - c[1]))[0]
+
+    def assign(self, word_x0: float, word_x1: float):
+        """Column of a word whose center is (x0 + x1) / 2, or None."""
+        center = (word_x0 + word_x1) / 2
+        if center != center:  # NaN matches no range
+            return None
+        slot = self._slot(center)
+        return None if slot < 0 else self._resolve(slot, center)
+
+    def assign_many(self, x0s, x1s) -> list:
+        """Batch assign(): one np.searchsorted for a whole row or page of words."""
+        centers = (np.asarray(x0s, dtype=np.float64) + np.asarray(x1s, dtype=np.float64)) / 2
+        if len(centers) == 0 or not self.bounds:
+            return [None] * len(centers)
+        k = np.searchsorted(self._bounds_array, centers, side='left')
+        k_clip = np.minimum(k, len(self.bounds) - 1)
+        exact = (k < len(self.bounds)) & (self._bounds_array[k_clip] == centers)
+        slots = np.where(exact, 2 * k, 2 * k - 1)
+        slots[~exact & ((k == 0) | (k == len(self.bounds)))] = -1
+        out = []
+        for slot, center in zip(slots.tolist(), centers.tolist()):
+            if slot < 0:
+                out.append(None)
+            else:
+                fixed = self.slot_fixed[slot]
+                out.append(fixed if fixed is not None or not self.slot_numeric[slot] else self._resolve(slot, center))
+        return out
+
+    def assign_words(self, words) -> list:
+        """Column of each word dict (x0/x1, missing as 0)."""
+        return self.assign_many([w.get('x0', 0) for w in words], [w.get('x1', 0) for w in words])
+
+
 def assign_word_to_column(word_x0, word_x1, columns):
     """Assign a word (with x0, x1 coordinates) to a column based on X-ranges.
     Returns column name or None if not in any range.
     Prioritizes numeric columns (cargos, abonos, saldo) over description when there's overlap.
     When a word falls in multiple overlapping ranges, assigns to the range whose center is closest.
+    ``columns`` is a {name: (x_min, x_max)} dict or a ColumnLayout (compiled once per set of ranges).
     """
-    word_center = (word_x0 + word_x1) / 2
-    
-    # First, check numeric columns (cargos, abonos, saldo) to prioritize them
-    # This fixes the issue where cargos (360-398) overlaps with descripcion (160-400)
-    numeric_cols = ['cargos', 'abonos', 'saldo']
-    
-    # Collect all matching columns and their distances to center
-    matching_cols = []
-    for col_name in numeric_cols:
-        if col_name in columns:
-            x_min, x_max = columns[col_name]
-            
-            # Validate and correct inverted ranges
-            if x_min > x_max:
-                print(f"[WARNING] Inverted range for '{col_name}': ({x_min}, {x_max}). Correcting to ({x_max}, {x_min})")
-                x_min, x_max = x_max, x_min  # Swap values
-            
-            if x_min <= word_center <= x_max:
-                # Calculate distance from amount center to range center
-                range_center = (x_min + x_max) / 2
-                distance = abs(word_center - range_center)
-                matching_cols.append((col_name, distance, range_center))
-    
-    # If there are multiple matches, return the closest to the range center
-    if matching_cols:
-        # Sort by distance (closest first)
-        matching_cols.sort(key=lambda x: x[1])
-        return matching_cols[0][0]  # Return the closest column
-    
-    # Then check other columns (fecha, liq, descripcion, etc.)
-    for col_name, (x_min, x_max) in columns.items():
-        if col_name not in numeric_cols:  # Skip numeric cols, already checked
-            # Validate and correct inverted ranges
-            if x_min > x_max:
-                x_min, x_max = x_max, x_min  # Swap values
-            
-            if x_min <= word_center <= x_max:
-                return col_name
-    
-    return None
+    return ColumnLayout.for_columns(columns).assign(word_x0, word_x1)
 
 
 def is_transaction_row(row_data, bank_name=None, debug_only_if_contains_iva=False):
@@ -5904,8 +8820,8 @@ def is_transaction_row(row_data, bank_name=None, debug_only_if_contains_iva=Fals
         has_date = bool(base_date_re.match(fecha))
     elif bank_name == 'Inbursa':
         # For Inbursa: full "MES. DD" / "MES DD" or month-only when date is split across 2 lines (e.g. "Nov.", "NOV.")
-        inbursa_full_date_re = re.compile(r'^(ENE|FEB|MAR|ABR|MAY|JUN|JUL|AGO|SEP|OCT|NOV|DIC)\.?\s+(0[1-9]|[12][0-9]|3[01])\b', re.I)
-        inbursa_month_only_re = re.compile(r'^(ENE|FEB|MAR|ABR|MAY|JUN|JUL|AGO|SEP|OCT|NOV|DIC)\.?$', re.I)
+        inbursa_full_date_re = INBURSA_DATE_PATTERN
+        inbursa_month_only_re = INBURSA_MONTH_ONLY_PATTERN
         has_date = bool(inbursa_full_date_re.match(fecha.strip()) or inbursa_month_only_re.match(fecha.strip()))
     elif bank_name == 'Mercury':
         # Mercury: "Jul 01" - 3-letter month (Jan, Feb, Mar, ...) + space + day (1-31)
@@ -5913,7 +8829,7 @@ def is_transaction_row(row_data, bank_name=None, debug_only_if_contains_iva=Fals
         has_date = bool(mercury_date_re.match(fecha.strip()))
     else:
         # For other banks, use the general date pattern
-        day_re = re.compile(r"\b(?:(?:0[1-9]|[12][0-9]|3[01])(?:[\/\-\s])[A-Za-z]{3}(?:[\/\-\s]\d{2,4})?|[A-Za-z]{3}(?:[\/\-\s])(?:0[1-9]|[12][0-9]|3[01])|(?:0[1-9]|[12][0-9]|3[01])\s+[A-Za-z]{3}\s+\d{2,4})\b", re.I)
+        day_re = MOVEMENT_DATE_PATTERN
         has_date = bool(day_re.search(fecha))
     
     # Must have at least one VALID numeric amount (must match DEC_AMOUNT_RE pattern)
@@ -5984,31 +8900,14 @@ def is_transaction_row(row_data, bank_name=None, debug_only_if_contains_iva=Fals
 def extract_movement_row(words, columns, bank_name=None, date_pattern=None, debug_only_if_contains_iva=False):
     """Extract a structured movement row from grouped words using coordinate-based column assignment."""
     row_data = {col: '' for col in columns.keys()}
+    column_layout = ColumnLayout.for_columns(columns)
     amounts = []
     # Show detailed debug for Banamex (disabled)
     show_detailed_debug = False
     
     # Pattern to detect dates (for separating date from description)
     if date_pattern is None:
-        if bank_name == 'HSBC':
-            # For HSBC, date is only 2 digits (01-31) at the start of the text
-            # Pattern should match "03" or "03 RETIRO ..." but not "003" or "30"
-            date_pattern = re.compile(r"^(0[1-9]|[12][0-9]|3[01])(?=\s|$)")
-        elif bank_name == 'Banregio':
-            # For Banregio, date is only 2 digits (01-31) at the start of the text
-            # Pattern should match "04" or "04 TRA ..." but not "004" or "40"
-            date_pattern = re.compile(r"^(0[1-9]|[12][0-9]|3[01])(?=\s|$)")
-        elif bank_name == 'INTERCAM':
-            # INTERCAM: fecha column is day only (1-31)
-            date_pattern = re.compile(r"^(0?[1-9]|[12][0-9]|3[01])$")
-        elif bank_name == 'Base':
-            # For Base, date format is DD/MM/YYYY (e.g., "30/04/2024")
-            date_pattern = re.compile(r'\b(0[1-9]|[12][0-9]|3[01])/(0[1-9]|1[0-2])/(\d{4})\b')
-        elif bank_name == 'Banorte':
-            # Banorte: DD/MM/YYYY (e.g. 31/12/2024) and DIA-MES-AÑO (e.g. 12-ENE-23) — hyphen form is DD-MMM-YY only
-            date_pattern = re.compile(r'\b(0[1-9]|[12][0-9]|3[01])/(0[1-9]|1[0-2])/(\d{4})\b|\b(\d{1,2}-[A-Z]{3}-\d{2})\b', re.I)
-        else:
-            date_pattern = re.compile(r"\b(?:(?:0[1-9]|[12][0-9]|3[01])(?:[\/\-\s])[A-Za-z]{3}(?:[\/\-\s]\d{2,4})?|[A-Za-z]{3}(?:[\/\-\s])(?:0[1-9]|[12][0-9]|3[01])|(?:0[1-9]|[12][0-9]|3[01])\s+[A-Za-z]{3}\s+\d{2,4})\b", re.I)
+        date_pattern = get_bank_profile(bank_name).row_date_pattern if bank_name else MOVEMENT_DATE_PATTERN
     
     # Sort words by X coordinate within the row
     sorted_words = sorted(words, key=lambda w: w.get('x0', 0))
@@ -6070,7 +8969,7 @@ def extract_movement_row(words, columns, bank_name=None, date_pattern=None, debu
             # 3. "31 mar" and "2023" in separate words -> "31 mar 2023"
             
             # Try to match full date pattern first
-            konfio_date_pattern = re.compile(r'\b(0[1-9]|[12][0-9]|3[01])\s+[A-Za-z]{3}\s+\d{2,4}\b', re.I)
+            konfio_date_pattern = KONFIO_FULL_DATE_PATTERN
             full_match = konfio_date_pattern.search(fecha_text)
             if full_match:
                 date_text = full_match.group()
@@ -6104,7 +9003,7 @@ def extract_movement_row(words, columns, bank_name=None, date_pattern=None, debu
     
     # For Banorte, first try to extract date (DD/MM/YYYY or DIA-MES-AÑO) from fecha column or from full row text
     if bank_name == 'Banorte' and 'fecha' in columns and not row_data.get('fecha'):
-        banorte_date_re = re.compile(r'\b(0[1-9]|[12][0-9]|3[01])/(0[1-9]|1[0-2])/(\d{4})\b|\b(\d{1,2}-[A-Z]{3}-\d{2})\b', re.I)
+        banorte_date_re = BANORTE_DATE_PATTERN
         # Try fecha column range first
         fecha_x0, fecha_x1 = columns['fecha']
         fecha_words = [w for w in sorted_words if fecha_x0 <= (w.get('x0', 0) + w.get('x1', 0)) / 2 <= fecha_x1]
@@ -6127,7 +9026,7 @@ def extract_movement_row(words, columns, bank_name=None, date_pattern=None, debu
         fecha_words = [w for w in sorted_words if fecha_x0 <= (w.get('x0', 0) + w.get('x1', 0)) / 2 <= fecha_x1]
         if fecha_words:
             fecha_text = ' '.join([w.get('text', '').strip() for w in fecha_words])
-            mercury_date_re = re.compile(r'\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(0?[1-9]|[12][0-9]|3[01])\b', re.I)
+            mercury_date_re = MERCURY_DATE_PATTERN
             m = mercury_date_re.search(fecha_text)
             if m:
                 row_data['fecha'] = m.group(0)
@@ -6348,8 +9247,8 @@ def extract_movement_row(words, columns, bank_name=None, date_pattern=None, debu
                     if abs(nxt_center - cur_center) <= 220:
                         cur_x0 = current.get('x0', 0)
                         cur_x1 = current.get('x1', 0)
-                        cur_col = assign_word_to_column(cur_x0, cur_x1, columns)
-                        nxt_col = assign_word_to_column(nxt.get('x0', 0), nxt.get('x1', 0), columns)
+                        cur_col = column_layout.assign(cur_x0, cur_x1)
+                        nxt_col = column_layout.assign(nxt.get('x0', 0), nxt.get('x1', 0))
                         can_merge = False
                         if nxt_col in ('cargos', 'abonos', 'saldo', 'saldo_liq'):
                             if cur_col == nxt_col:
@@ -6633,7 +9532,7 @@ def extract_movement_row(words, columns, bank_name=None, date_pattern=None, debu
                 # this word (e.g. "15" from "15 GRUPOS") is assigned to descripcion by X position.
         
         # Normal column assignment
-        col_name = assign_word_to_column(x0, x1, columns)
+        col_name = column_layout.assign(x0, x1)
         if col_name:
             # For Banamex and HSBC, prevent text from description range being assigned to cargos/abonos/saldo
             # Only assign to these columns if the word is actually an amount AND not in description range
@@ -6847,7 +9746,7 @@ def extract_movement_row(words, columns, bank_name=None, date_pattern=None, debu
     # Debug for Banamex: print final state before returning
     if bank_name == 'Banamex':
         # Check if footer pattern is in any column
-        banamex_footer_pattern = re.compile(r'\d+\.\w+\.OD\.\d+\.\d+', re.I)
+        banamex_footer_pattern = BANAMEX_FOOTER_PATTERN
         all_row_text = ' '.join([
             str(row_data.get('fecha', '')),
             str(row_data.get('descripcion', '')),
@@ -6923,7 +9822,7 @@ def split_row_if_multiple_movements(row_words, columns_config, date_pattern, ban
     
     # Pattern to exclude hours (like "17:47:53") from being detected as dates
     # Hours have format HH:MM:SS or HH:MM
-    hour_pattern = re.compile(r'\b\d{1,2}:\d{2}(?::\d{2})?\b')
+    hour_pattern = HOUR_PATTERN
     
     # Find all words that contain dates (either in fecha column or anywhere if no fecha column)
     date_words = []
@@ -7151,63 +10050,186 @@ def split_row_if_multiple_movements(row_words, columns_config, date_pattern, ban
     return [row_words]
 
 
-def main():
-    # Validate input
-    if len(sys.argv) < 2:
-        #print("Usage:")
-        #print("  python main2.py <input.pdf>              # Parse PDF and create Excel")
-        #print("  python main2.py <input.pdf> --find <page> # Find column coordinates on page N")
-        #print("\nExample:")
-        #print("  python main2.py BBVA.pdf")
-        #print("  python main2.py BBVA.pdf --find 2")
-        sys.exit(1)
+@dataclass
+class ConversionResult:
+    """Outcome of convert_statement() for one PDF (what main() used to report via prints/exit code)."""
+    pdf_path: str
+    output_excel: str = None
+    exit_code: int = 1
+    excel_created: bool = False
+    validation_ok: bool = None
+    error_type: str = ''
+    error_message: str = ''
+    bank: str = None
+    used_ocr: bool = False
+    movement_rows: int = 0
+    movements: list = None
+    rfc: str = None
+    name: str = None
+    period_text: str = None
+    elapsed: float = 0.0
+    metrics: dict = None
+
+    @property
+    def success(self) -> bool:
+        return self.excel_created and self.validation_ok is not False and not self.error_type
+
+    def fail(self, error_type: str, error_message: str, exit_code: int = 1) -> 'ConversionResult':
+        self.error_type = error_type
+        self.error_message = error_message
+        self.exit_code = exit_code
+        return self
+
+
+# convert_statement() options -> command-line flags read by the pipeline (_run_argv()).
+CONVERT_FLAG_OPTIONS = {
+    'debug': '--debug',
+    'ocr_save_visual': '--ocr-save-visual',
+    'no_ocr_cache': '--no-ocr-cache',
+    'ocr_roi': '--ocr-roi',
+    'ocr_adaptive': '--ocr-adaptive',
+    'stream_pages': '--stream-pages',
+}
+CONVERT_VALUE_OPTIONS = {
+    'output_excel': '--output-excel',
+    'ocr_zoom': '--ocr-zoom',
+    'ocr_workers': '--ocr-workers',
+    'ocr_cache_dir': '--ocr-cache-dir',
+    'ocr_cache_max_mb': '--ocr-cache-max-mb',
+    'metrics_json': '--metrics-json',
+    'text_engine': '--text-engine',
+    'ocr_engine': '--ocr-engine',
+    'ocr_contrast': '--ocr-contrast',
+    'ocr_queue_depth': '--ocr-queue-depth',
+}
+
+
+def convert_options_from_argv(argv: list) -> dict:
+    """Build a convert_statement() options dict from command-line arguments."""
+    options = {}
+    for key, flag in CONVERT_FLAG_OPTIONS.items():
+        if flag in argv:
+            options[key] = True
+    aliases = {'--out-xlsx': '--output-excel'}
+    for i, arg in enumerate(argv[:-1]):
+        flag = aliases.get(arg, arg)
+        for key, value_flag in CONVERT_VALUE_OPTIONS.items():
+            if flag == value_flag and key not in options and not argv[i + 1].startswith('-'):
+                options[key] = argv[i + 1]
+    return options
+
+
+def _convert_options_to_argv(pdf_path: str, options: dict) -> list:
+    argv = [os.path.abspath(__file__), pdf_path]
+    for key, value in options.items():
+        if key in CONVERT_FLAG_OPTIONS:
+            if value:
+                argv.append(CONVERT_FLAG_OPTIONS[key])
+        elif key in CONVERT_VALUE_OPTIONS:
+            if value is not None:
+                argv.extend([CONVERT_VALUE_OPTIONS[key], str(value)])
+        else:
+            raise ValueError(f"Unknown convert_statement option: {key}")
+    return argv
 
-    pdf_path = sys.argv[1]
-    debug_mode = '--debug' in sys.argv
-    debug_path = os.path.splitext(pdf_path)[0] + "_movements_debug.txt" if debug_mode else None
-    
-    # Normalize PDF path (handles UNC paths, spaces, etc.)
-    pdf_path = os.path.normpath(pdf_path)
-    if not os.path.isabs(pdf_path):
-        pdf_path = os.path.abspath(pdf_path)
-    
-    # Check for --find mode
-    if len(sys.argv) >= 3 and sys.argv[2] == '--find':
-        page_num = int(sys.argv[3]) if len(sys.argv) > 3 else 1
-        print(f"🔍 Buscando coordenadas en página {page_num}...")
-        find_column_coordinates(pdf_path, page_num)
-        sys.exit(0)
 
+def _check_input_pdf(pdf_path: str):
+    """Return an error message (already printed) when ``pdf_path`` is not an existing .pdf file, else None."""
     if not os.path.isfile(pdf_path):
-        print(f"❌ Error: File not found: {pdf_path}")
-        sys.exit(1)
+        msg = f"File not found: {pdf_path}"
+    elif not pdf_path.lower().endswith(".pdf"):
+        msg = f"El archivo debe ser un PDF: {pdf_path}"
+    else:
+        return None
+    print(f"❌ Error: {msg}")
+    return msg
 
-    if not pdf_path.lower().endswith(".pdf"):
-        print(f"❌ Error: El archivo debe ser un PDF: {pdf_path}")
-        sys.exit(1)
+
+def convert_statement(pdf_path: str, options: dict = None, session: PdfSession = None) -> ConversionResult:
+    """
+    Convert one bank statement PDF to Excel in the current process.
+    Same pipeline as the command line, but never reads sys.argv or calls sys.exit,
+    so batch drivers can reuse one warm interpreter for many files.
+    The options, metrics and debug logs of a call are context variables: calls may run at the same
+    time in several threads, or inside another conversion, without seeing each other's options.
     
-    if '--ocr-zoom-sweep-excel' in sys.argv:
-        try:
-            run_ocr_zoom_sweep_excel(pdf_path, zoom_min=1, zoom_max=8)
-        except Exception as e:
-            print(f"❌ PDF→Excel zoom sweep failed: {e}", flush=True)
-            import traceback
-            traceback.print_exc()
-            sys.exit(1)
-        sys.exit(0)
+    Args:
+        pdf_path: Path to PDF file
+        options: Optional dict with keys from CONVERT_FLAG_OPTIONS (bool) and CONVERT_VALUE_OPTIONS
+            (e.g. {'output_excel': 'out.xlsx', 'ocr_zoom': 4, 'debug': True})
+        session: Optional open PdfSession of ``pdf_path`` to reuse across runs of the same PDF (e.g. the zoom
+            sweep): its memoized page text, words and bank detection are computed once. ``text_engine`` is then
+            the session's.
     
-    if '--ocr-zoom-sweep' in sys.argv:
-        if not TESSERACT_AVAILABLE:
-            print("❌ OCR zoom sweep requires Tesseract. Install: pip install pytesseract pymupdf pillow", flush=True)
-            sys.exit(1)
-        try:
-            run_ocr_zoom_sweep(pdf_path, zoom_min=1, zoom_max=8)
-        except Exception as e:
-            print(f"❌ OCR zoom sweep failed: {e}", flush=True)
-            import traceback
-            traceback.print_exc()
-            sys.exit(1)
-        sys.exit(0)
+    Returns:
+        ConversionResult (exit_code 0 when the Excel file was written, as the CLI exit code).
+        ``result.metrics`` holds wall/CPU/peak RSS per stage (see RunMetrics); a one-line stage
+        summary is always printed, and ``metrics_json`` / ``--metrics-json <path>`` also writes it as JSON.
+    """
+    start_time = time.time()
+    pdf_path = os.path.abspath(os.path.normpath(pdf_path))
+    result = ConversionResult(pdf_path=pdf_path)
+    # Run in a copy of the caller's context: options, metrics and debug logs set here are this run's only
+    metrics_json_path = contextvars.copy_context().run(
+        _convert_statement_in_context, pdf_path, options or {}, result, session
+    )
+    result.elapsed = time.time() - start_time
+    print(RunMetrics.summary_line(result.metrics), flush=True)
+    if metrics_json_path:
+        _write_metrics_json(metrics_json_path, result)
+    return result
+
+
+def _convert_statement_in_context(pdf_path: str, options: dict, result: ConversionResult, session: PdfSession):
+    """convert_statement() body, run in its own context; returns the --metrics-json path (or None)."""
+    _RUN_ARGV.set(_convert_options_to_argv(pdf_path, options))
+    metrics = RunMetrics()
+    _RUN_METRICS.set(metrics)
+    RFC_DEBUG_LINES.set([])
+    NAME_DEBUG_LINES.set([])
+    try:
+        session_cm = nullcontext(session) if session is not None else PdfSession(
+            pdf_path, text_engine=_parse_text_engine_from_argv(), stream_pages='--stream-pages' in _run_argv()
+        )
+        with session_cm as run_session:
+            _convert_statement_impl(pdf_path, result, run_session)
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        result.fail('General error', str(e))
+    finally:
+        result.metrics = metrics.finish()
+    return _parse_metrics_json_path_from_argv()
+
+
+def _write_metrics_json(path: str, result: ConversionResult):
+    """Write ``result.metrics`` plus the run outcome (bank, OCR, success) as JSON."""
+    report = {
+        'pdf': result.pdf_path,
+        'bank': result.bank,
+        'used_ocr': result.used_ocr,
+        'success': result.success,
+        'error_type': result.error_type,
+        **result.metrics,
+    }
+    try:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"[INFO] Metrics written to -> {path}", flush=True)
+    except OSError as e:
+        print(f"[WARNING] --metrics-json: could not write {path}: {e}", flush=True)
+
+
+def _convert_statement_impl(pdf_path: str, result: ConversionResult, session: PdfSession):
+    """Body of convert_statement(): runs the full pipeline and fills ``result``."""
+    debug_mode = '--debug' in _run_argv()
+    debug_path = os.path.splitext(pdf_path)[0] + "_movements_debug.txt" if debug_mode else None
+    
+    error_msg = _check_input_pdf(pdf_path)
+    if error_msg:
+        result.fail('General error', error_msg)
+        return
     
     # Verificar que el PDF no esté bloqueado/abierto por otro proceso
     try:
@@ -7215,21 +10237,25 @@ def main():
             test_file.read(1)  # Intentar leer 1 byte
     except PermissionError:
         print(f"❌ Error: El archivo PDF está abierto o bloqueado por otro proceso: {pdf_path}")
-        sys.exit(1)
+        result.fail('General error', f"El archivo PDF está abierto o bloqueado por otro proceso: {pdf_path}")
+        return
     except IOError as e:
         print(f"❌ Error: No se puede acceder al archivo PDF: {pdf_path}")
         print(f"   Detalle: {e}")
-        sys.exit(1)
+        result.fail('General error', f"No se puede acceder al archivo PDF: {pdf_path}")
+        return
 
     # Normalize output path (optional: --output-excel / --out-xlsx <path>)
     output_excel = os.path.normpath(os.path.splitext(pdf_path)[0] + ".xlsx")
     output_excel = _parse_output_excel_path_from_argv(output_excel)
+    result.output_excel = output_excel
     
     # Validar permisos de escritura en el directorio de salida
     output_dir = os.path.dirname(output_excel) or os.getcwd()
     if not os.access(output_dir, os.W_OK):
         print(f"❌ Error: No write permissions in directory: {output_dir}")
-        sys.exit(1)
+        result.fail('General error', f"No write permissions in directory: {output_dir}")
+        return
     
     # Validate available disk space (optional but recommended)
     try:
@@ -7242,7 +10268,8 @@ def main():
         
         if free_space < estimated_excel_size:
             print(f"❌ Error: Insufficient disk space. Available: {free_space:,} bytes, Required: {estimated_excel_size:,} bytes")
-            sys.exit(1)
+            result.fail('General error', "Insufficient disk space")
+            return
     except ImportError:
         # shutil not available, continue without validation
         pass
@@ -7253,7 +10280,7 @@ def main():
     print("Reading PDF...", flush=True)
     
     # Now extract full data
-    extracted_data = extract_text_from_pdf(pdf_path)
+    extracted_data = extract_text_from_pdf(pdf_path, session=session)
     
     # Detectar si se usó OCR
     used_ocr = any(p.get('_used_ocr', False) for p in extracted_data)
@@ -7261,6 +10288,7 @@ def main():
     force_bank = (extracted_data[0].get('_force_bank') if extracted_data else None)
     
     # Detect bank: from extracted text if OCR was used, otherwise from PDF
+    _metrics_begin('bank_detection')
     if force_bank:
         detected_bank = force_bank
     elif used_ocr:
@@ -7273,9 +10301,13 @@ def main():
         detected_bank = detect_bank_from_text(first_page_content, from_ocr=True)
     else:
         # If OCR was not used, detect bank from PDF (normal method)
-        detected_bank = detect_bank_from_pdf(pdf_path)
+        detected_bank = detect_bank_from_pdf(pdf_path, session=session)
     
     print(f"🏦 Bank detected: {detected_bank}", flush=True)
+    result.bank = detected_bank
+    result.used_ocr = used_ocr
+    _metrics_end('bank_detection')
+    _metrics_begin('movement_parsing')
     
     is_hsbc = (detected_bank == "HSBC")
     
@@ -7297,6 +10329,7 @@ def main():
         bank_config = bank_config.copy()
         bank_config["name"] = detected_bank
     
+    bank_profile = get_bank_profile(detected_bank)
     columns_config = bank_config.get("columns", {})
     santander_ocr_mode = False
     # BBVA OCR: use OCR-calibrated coordinates so row splitting matches illegible PDFs.
@@ -7308,7 +10341,7 @@ def main():
 
     santander_ocr_start_re = None
     if santander_ocr_mode and bank_config.get('movements_start_ocr'):
-        santander_ocr_start_re = re.compile(bank_config['movements_start_ocr'], re.I)
+        santander_ocr_start_re = bank_profile.movements_start_ocr_pattern
 
     # find where movements start (first line anywhere that matches a date or contains header keywords)
     # Pattern for dates: supports multiple formats:
@@ -7318,69 +10351,19 @@ def main():
     # - "DIA-MES-AÑO" (12-ENE-23) - for Banorte
     # Common month abbreviations: ENE, FEB, MAR, ABR, MAY, JUN, JUL, AGO, SEP, OCT, NOV, DIC
     # Updated pattern to also match "DIA-MES-AÑO" format with hyphens (e.g., "12-ENE-23")
-    day_re = re.compile(r"\b(?:(?:0[1-9]|[12][0-9]|3[01])(?:[\/\-\s])[A-Za-z]{3}(?:[\/\-\s]\d{2,4})?|[A-Za-z]{3}(?:[\/\-\s])(?:0[1-9]|[12][0-9]|3[01])|(?:0[1-9]|[12][0-9]|3[01])\s+[A-Za-z]{3}\s+\d{2,4})\b", re.I)
+    day_re = MOVEMENT_DATE_PATTERN
     # match lines that contain both 'fecha' AND 'descripcion', OR lines that contain 'concepto'
     # Implemented with lookahead for the AND case, and an alternation for 'concepto'
     header_keywords_re = re.compile(r"(?:(?=.*\bfecha\b)(?=.*\bdescripcion\b))|(?:\bconcepto\b)", re.I)
-    # ensure a reusable date pattern is available for later checks
-    # For Banregio, date is only 2 digits (01-31) at the start
-    if bank_config['name'] == 'Banregio':
-        date_pattern = re.compile(r"^(0[1-9]|[12][0-9]|3[01])(?=\s|$)")
-    elif bank_config['name'] == 'INTERCAM':
-        # INTERCAM: fecha column is day only (1-31)
-        date_pattern = re.compile(r"^(0?[1-9]|[12][0-9]|3[01])$")
-    elif bank_config['name'] == 'Base':
-        # For Base, date format is DD/MM/YYYY (e.g., "30/04/2024")
-        date_pattern = re.compile(r'\b(0[1-9]|[12][0-9]|3[01])/(0[1-9]|1[0-2])/(\d{4})\b')
-    elif bank_config['name'] == 'Banorte':
-        # Banorte: DD/MM/YYYY (e.g. 31/12/2024) and DIA-MES-AÑO (e.g. 12-ENE-23) — hyphen form is DD-MMM-YY only
-        date_pattern = re.compile(r'\b(0[1-9]|[12][0-9]|3[01])/(0[1-9]|1[0-2])/(\d{4})\b|\b(\d{1,2}-[A-Z]{3}-\d{2})\b', re.I)
-    elif bank_config['name'] == 'Banbajío':
-        # For BanBajío, date format is "DIA MES" (e.g., "3 ENE") without year
-        date_pattern = re.compile(r'\b(0?[1-9]|[12][0-9]|3[01])\s+[A-Z]{3}\b', re.I)
-    elif bank_config['name'] == 'Mercury':
-        # Mercury: "Jul 01" - 3-char month + space + day (1-31)
-        date_pattern = re.compile(r'\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(0?[1-9]|[12][0-9]|3[01])\b', re.I)
-    else:
-        date_pattern = day_re
+    # ensure a reusable date pattern is available for later checks (per bank, see BANK_DATE_PATTERNS)
+    date_pattern = bank_profile.date_pattern
     movement_start_found = False
     movement_start_page = None
     movement_start_index = None
     movements_lines = []
     
     # Generic movement_start_pattern from BANK_CONFIGS (for all banks)
-    movement_start_pattern = None
-    movement_start_string = bank_config.get('movements_start')
-    if movement_start_string:
-        # INTERCAM: header may appear as "DIA" or "DÍA" with variable spacing; normalize for match
-        if bank_config['name'] == 'INTERCAM':
-            movement_start_pattern = re.compile(
-                r'D[IÍ]A\s+FOLIO\s+CONCEPTO\s+DEP[OÓ]SITOS\s+RETIROS\s+SALDO',
-                re.I
-            )
-        else:
-            movement_start_secondary = bank_config.get('movements_start_secondary')
-            movement_start_tertiary = bank_config.get('movements_start_tertiary')  # list of regex strings (e.g. OCR-duplicated)
-            if movement_start_secondary or movement_start_tertiary:
-                parts = [re.escape(movement_start_string)]
-                if movement_start_secondary:
-                    # Secondary can be a string (literal) or list of strings (literals and/or regex)
-                    sec_list = movement_start_secondary if isinstance(movement_start_secondary, list) else [movement_start_secondary]
-                    for s in sec_list:
-                        # Treat as regex if it contains '+' (one-or-more pattern) or other regex metacharacters we use
-                        if '+' in s or '(\s' in s or '+)' in s:
-                            parts.append(s)
-                        else:
-                            parts.append(re.escape(s))
-                if movement_start_tertiary:
-                    parts.extend(movement_start_tertiary)
-                movement_start_pattern = re.compile(
-                    r'(?:%s)' % '|'.join(parts),
-                    re.I
-                )
-            else:
-                # Create pattern from movements_start string (escape special chars)
-                movement_start_pattern = re.compile(re.escape(movement_start_string), re.I)
+    movement_start_pattern = bank_profile.movements_start_pattern
 
     if santander_ocr_start_re:
         movement_start_pattern = santander_ocr_start_re
@@ -7546,8 +10529,7 @@ def main():
                 if movement_section_found:
                     # For Inbursa, use strict date pattern: "MES. DD" or "MES DD" at start of line
                     if bank_config['name'] == 'Inbursa':
-                        inbursa_date_pattern = re.compile(r'^(ENE|FEB|MAR|ABR|MAY|JUN|JUL|AGO|SEP|OCT|NOV|DIC)\.?\s+(0[1-9]|[12][0-9]|3[01])\b', re.I)
-                        if inbursa_date_pattern.search(ln.strip()):
+                        if INBURSA_DATE_PATTERN.search(ln.strip()):
                             movement_start_found = True
                             movement_start_page = p['page']
                             movement_start_index = i
@@ -7565,8 +10547,7 @@ def main():
                     elif bank_config['name'] == 'Konfio':
                         konfio_date_in_line = date_pattern.search(ln)
                         if konfio_date_in_line:
-                            konfio_full_date_pattern = re.compile(r'\b(0[1-9]|[12][0-9]|3[01])\s+[A-Za-z]{3}\s+\d{2,4}\b', re.I)
-                            if konfio_full_date_pattern.search(ln):
+                            if KONFIO_FULL_DATE_PATTERN.search(ln):
                                 movement_start_found = True
                                 movement_start_page = p['page']
                                 movement_start_index = i
@@ -7672,7 +10653,7 @@ def main():
     # Banamex new format: use columns_new_format, date DD-mon-YYYY (e.g. 13-oct-2025), and movements_end_new_format
     if banamex_new_format and bank_config.get('columns_new_format'):
         columns_config = bank_config['columns_new_format'].copy()
-        date_pattern = re.compile(r'\b(0?[1-9]|[12][0-9]|3[01])-[a-z]{3}-\d{4}\b', re.I)  # 13-oct-2025
+        date_pattern = BANAMEX_NEW_FORMAT_DATE_PATTERN  # 13-oct-2025
 
     # build summary from first page (lines before movements start if movements begin on page 1)
     if pages_lines:
@@ -7754,6 +10735,22 @@ def main():
         r2 = _normalize_marker_text(' '.join([w.get('text', '') for w in rows[idx + 2]]))
         return (current == 'TOTAL' and r1 == 'DE' and r2.startswith('MOVIMIENTOS'))
     
+    # Section sinks fed by the movements walk over the pages below (see _SectionScanner):
+    # Banamex DIGITEM and TRANSFERENCIA, Santander METAS (Mis Metas)
+    section_scanner = None
+    metas_section = None
+    if bank_config['name'] == 'Banamex':
+        digitem_section = _DigitemSection(columns_config)
+        transferencia_section = _TransferenciaSection()
+        section_scanner = _SectionScanner([digitem_section, transferencia_section], extracted_data, session=session)
+    elif bank_config['name'] == 'Santander':
+        metas_start = bank_config.get('metas_start')
+        metas_end = bank_config.get('metas_end')
+        metas_columns = bank_config.get('columns') if (santander_ocr_mode and bank_config.get('columns')) else columns_config
+        if metas_start and metas_end and metas_columns and extracted_data:
+            metas_section = _MetasSection(metas_columns, metas_start, metas_end)
+            section_scanner = _SectionScanner([metas_section], extracted_data)
+    
     # Si es HSBC y se usó OCR, usar la misma lógica que otros bancos
     if is_hsbc and used_ocr:
         # Obtener columns_config desde BANK_CONFIGS
@@ -7786,7 +10783,7 @@ def main():
             word_rows = group_words_by_row(filtered_words, y_tolerance=5)
             
             # Patrón de fecha para HSBC (solo día: 01-31)
-            date_pattern = re.compile(r"^(0[1-9]|[12][0-9]|3[01])(?=\s|$)")
+            date_pattern = DAY_PREFIX_DATE_PATTERN
             hsbc_day_ok_re = re.compile(r'^(0[1-9]|[12][0-9]|3[01])$')
             hsbc_amt_valid_re = re.compile(r'^[\$]?\s*\d{1,3}(?:[\.,\s]\d{3})*(?:[\.,]\d{2})?$')
             
@@ -8031,13 +11028,13 @@ def main():
         # Debug: write movements debug file for HSBC OCR path (RFC log + summary + movements)
         if debug_path is not None:
             with open(debug_path, 'w', encoding='utf-8') as f:
-                for _line in RFC_DEBUG_LINES:
+                for _line in _debug_lines(RFC_DEBUG_LINES):
                     f.write(_line + "\n")
-                if RFC_DEBUG_LINES:
+                if _debug_lines(RFC_DEBUG_LINES):
                     f.write("\n")
-                for _line in NAME_DEBUG_LINES:
+                for _line in _debug_lines(NAME_DEBUG_LINES):
                     f.write(_line + "\n")
-                if NAME_DEBUG_LINES:
+                if _debug_lines(NAME_DEBUG_LINES):
                     f.write("\n")
                 _sum = pdf_summary or {}
                 f.write("RFC: " + ((_sum.get('rfc') or '').strip() or '(vacío)') + "\n")
@@ -8101,19 +11098,19 @@ def main():
         if bank_config['name'] == 'Banorte':
             banorte_secondary_end_string = bank_config.get('movements_end_secondary')
             if banorte_secondary_end_string:
-                banorte_secondary_end_pattern = re.compile(re.escape(banorte_secondary_end_string), re.I)
+                banorte_secondary_end_pattern = bank_profile.movements_end_secondary_pattern
         # For HSBC, create secondary pattern for "Información SPEI" (alternative to "Información CoDi")
         hsbc_secondary_end_pattern = None
         if bank_config['name'] == 'HSBC':
             hsbc_secondary_end_string = bank_config.get('movements_end_secondary')
             if hsbc_secondary_end_string:
-                hsbc_secondary_end_pattern = re.compile(re.escape(hsbc_secondary_end_string), re.I)
+                hsbc_secondary_end_pattern = bank_profile.movements_end_secondary_pattern
         # For Banamex, create secondary pattern for "SALDO MINIMO REQUERIDO" (alternative to "SALDO PROMEDIO MINIMO REQUERIDO")
         banamex_secondary_end_pattern = None
         if bank_config['name'] == 'Banamex':
             banamex_secondary_end_string = bank_config.get('movements_end_secondary')
             if banamex_secondary_end_string:
-                banamex_secondary_end_pattern = re.compile(re.escape(banamex_secondary_end_string), re.I)
+                banamex_secondary_end_pattern = bank_profile.movements_end_secondary_pattern
         
         extraction_stopped = False
         # Debug: number each line in movements section (from movements_start until movements_end)
@@ -8130,7 +11127,9 @@ def main():
         # 🔍 HSBC DEBUG: Buffer para guardar últimas 2 filas válidas antes de movements_end
         last_two_valid_rows = []
         total_pages = len(extracted_data)
-        for page_data in extracted_data:
+        for page_index, page_data in enumerate(extracted_data):
+            if section_scanner is not None:
+                section_scanner.feed(page_index)
             if extraction_stopped:
                 break
             
@@ -8272,13 +11271,10 @@ def main():
                             match_found = True
                         else:
                             # Try patterns from BANK_CONFIGS if available (fallback)
-                            end_patterns = bank_config.get('movements_end_patterns', [])
-                            if end_patterns:
-                                for pattern_str in end_patterns:
-                                    pattern = re.compile(pattern_str, re.I)
-                                    if pattern.search(all_text):
-                                        match_found = True
-                                        break
+                            for pattern in bank_profile.movements_end_fallback_patterns:
+                                if pattern.search(all_text):
+                                    match_found = True
+                                    break
                     elif bank_config['name'] == 'Clara':
                         # For Clara, check for "Total MXN" (movements_end string) or "Total MXN X MXN Y" pattern
                         # First check if movements_end string is present
@@ -8286,13 +11282,10 @@ def main():
                             match_found = True
                         else:
                             # Try patterns from BANK_CONFIGS if available (fallback)
-                            end_patterns = bank_config.get('movements_end_patterns', [])
-                            if end_patterns:
-                                for pattern_str in end_patterns:
-                                    pattern = re.compile(pattern_str, re.I)
-                                    if pattern.search(all_text):
-                                        match_found = True
-                                        break
+                            for pattern in bank_profile.movements_end_fallback_patterns:
+                                if pattern.search(all_text):
+                                    match_found = True
+                                    break
                     elif bank_config['name'] == 'Santander' and santander_ocr_mode:
                         if movement_end_pattern and movement_end_pattern.search(all_text):
                             match_found = True
@@ -8319,10 +11312,9 @@ def main():
                             has_cargos = False
                             has_abonos = False
                             has_saldo = False
-                            for w in row_words:
+                            row_cols = ColumnLayout.for_columns(columns_config).assign_words(row_words)
+                            for w, col in zip(row_words, row_cols):
                                 text = (w.get('text') or '').strip()
-                                x0, x1 = w.get('x0', 0), w.get('x1', 0)
-                                col = assign_word_to_column(x0, x1, columns_config)
                                 if col == 'fecha' and date_pattern.search(text):
                                     has_fecha = True
                                 elif col == 'descripcion' and text:
@@ -8408,7 +11400,7 @@ def main():
                 if bank_config['name'] == 'Banamex' and all_row_text_orig:
                     # DD-mon-YYYY with optional space between day and month (OCR may output "13 oct-2025")
                     _bnf_date_re = re.compile(r'\b(0?[1-9]|[12][0-9]|3[01])[- ]([a-z]{3})[- ]?(\d{4})\b', re.I)
-                    _bnf_date_re_strict = re.compile(r'\b(0?[1-9]|[12][0-9]|3[01])-[a-z]{3}-\d{4}\b', re.I)
+                    _bnf_date_re_strict = BANAMEX_NEW_FORMAT_DATE_PATTERN
                     # Amount: $ optional space digits/comma .XX (or standalone NNN.NN / N,NNN.NN not part of year)
                     _bnf_amt_re = re.compile(r'\$\s*[\d,]+\.\d{2}')
                     _bnf_amt_re_alt = re.compile(r'(?<!\d)(\d{1,3}(?:,\d{3})*\.\d{2})(?=\s|$|[^\d])')
@@ -8512,19 +11504,19 @@ def main():
                         has_date = bool(date_pattern.match(fecha_val.strip()))
                     elif bank_config['name'] == 'Clara':
                         # For Clara, check if fecha contains a valid date pattern (e.g., "01 ENE" or "01 E N E")
-                        clara_date_pattern = re.compile(r'\d{1,2}\s+[A-Z]{3}|\d{1,2}\s+[A-Z]\s+[A-Z]\s+[A-Z]', re.I)
+                        clara_date_pattern = CLARA_DATE_PATTERN
                         has_date = bool(clara_date_pattern.search(fecha_val))
                     elif bank_config['name'] == 'Santander' and santander_ocr_mode:
                         fv0 = ((fecha_val or '').strip().split() or [''])[0]
                         has_date = bool(re.match(r'^(?:0?[1-9]|[12][0-9]|3[01])-[A-Za-z]{3}-\d{4}$', fv0, re.I))
                     elif bank_config['name'] == 'Banamex':
                         # Classic: day + 3-letter month (e.g. "30 ENE"). New format: DD-mon-YYYY (e.g. 13-oct-2025)
-                        banamex_dd_mon_yyyy = re.compile(r'\b(0?[1-9]|[12][0-9]|3[01])-[a-z]{3}-\d{4}\b', re.I)
+                        banamex_dd_mon_yyyy = BANAMEX_NEW_FORMAT_DATE_PATTERN
                         if banamex_new_format or banamex_dd_mon_yyyy.search(fecha_val):
                             has_date = bool(banamex_dd_mon_yyyy.search(fecha_val))
                         else:
                             # Classic Banamex only
-                            banamex_date_pattern = re.compile(r'\b(0[1-9]|[12][0-9]|3[01])\s+[A-Z]{3}\b', re.I)
+                            banamex_date_pattern = BANAMEX_DATE_PATTERN
                             has_date = bool(banamex_date_pattern.search(fecha_val))
                     else:
                         has_date = bool(date_pattern.search(fecha_val))
@@ -8532,8 +11524,8 @@ def main():
                         # Valid months: ENE, FEB, MAR, ABR, MAY, JUN, JUL, AGO, SEP, OCT, NOV, DIC
                         # This prevents false positives like "01 BAL" or "IVA 16"
                         if bank_config['name'] == 'Inbursa':
-                            inbursa_date_pattern = re.compile(r'^(ENE|FEB|MAR|ABR|MAY|JUN|JUL|AGO|SEP|OCT|NOV|DIC)\.?\s+(0[1-9]|[12][0-9]|3[01])\b', re.I)
-                            inbursa_month_only_re = re.compile(r'^(ENE|FEB|MAR|ABR|MAY|JUN|JUL|AGO|SEP|OCT|NOV|DIC)\.?$', re.I)
+                            inbursa_date_pattern = INBURSA_DATE_PATTERN
+                            inbursa_month_only_re = INBURSA_MONTH_ONLY_PATTERN
                             # Check if fecha_val matches full pattern (MES. DD) or month-only (date split across 2 lines)
                             has_date = bool(inbursa_date_pattern.match(fecha_val.strip()))
                             if not has_date:
@@ -8595,7 +11587,7 @@ def main():
                         if bank_config['name'] == 'Konfio' and not has_date:
                             all_row_text = ' '.join([w.get('text', '') for w in row_words])
                             # Use strict Konfio date pattern: DIA MES AÑO format
-                            konfio_full_date_pattern = re.compile(r'\b(0[1-9]|[12][0-9]|3[01])\s+[A-Za-z]{3}\s+\d{2,4}\b', re.I)
+                            konfio_full_date_pattern = KONFIO_FULL_DATE_PATTERN
                             has_date = bool(konfio_full_date_pattern.search(all_row_text))
                             if has_date:
                                 # Extract the date from the row text and assign to fecha
@@ -8654,7 +11646,7 @@ def main():
                     if bank_config['name'] == 'Konfio':
                         # Verify the date is a valid Konfio date format (DIA MES AÑO), not just a number like "14"
                         fecha_val_check = str(row_data.get('fecha') or '').strip()
-                        konfio_full_date_pattern = re.compile(r'\b(0[1-9]|[12][0-9]|3[01])\s+[A-Za-z]{3}\s+\d{2,4}\b', re.I)
+                        konfio_full_date_pattern = KONFIO_FULL_DATE_PATTERN
                         if fecha_val_check and not konfio_full_date_pattern.search(fecha_val_check):
                             # Date is not in valid Konfio format (e.g., "14" instead of "14 mar 2023"), skip this row
                             _disp = "SKIPPED (Konfio date format)"
@@ -8664,7 +11656,7 @@ def main():
                         # Check if this is a sub-row pattern (like "SBO 020902DX1 - 02 abr 2023 4316 FÍSICA")
                         # These should be rejected as they are continuation lines, not main movement rows
                         all_row_text = ' '.join([w.get('text', '') for w in row_words])
-                        konfio_sub_row_pattern = re.compile(r'^[A-Z]{2,4}\s*[A-Z0-9]{8,15}\s*-\s*\d{1,2}\s+[A-Za-z]{3}\s+\d{2,4}', re.I)
+                        konfio_sub_row_pattern = KONFIO_SUB_ROW_PATTERN
                         # If the row starts with this pattern, it's a sub-row and should be skipped
                         if konfio_sub_row_pattern.match(all_row_text.strip()):
                             # This is a sub-row, skip it (it will be handled as continuation if needed)
@@ -8686,7 +11678,7 @@ def main():
                         all_row_text = desc_val_check + ' ' + fecha_val_check
                         
                         # Pattern to match footer: numbers.letters.OD.numbers.numbers
-                        banamex_footer_pattern = re.compile(r'\d+\.\w+\.OD\.\d+\.\d+', re.I)
+                        banamex_footer_pattern = BANAMEX_FOOTER_PATTERN
                         if banamex_footer_pattern.search(all_row_text):
                             # This is footer information, skip it
                             _disp = "SKIPPED (Banamex footer)"
@@ -8730,7 +11722,7 @@ def main():
                             all_row_text = desc_val_check + ' ' + fecha_val_check
                             
                             # Pattern to match footer: numbers.letters.OD.numbers.numbers
-                            banamex_footer_pattern = re.compile(r'\d+\.\w+\.OD\.\d+\.\d+', re.I)
+                            banamex_footer_pattern = BANAMEX_FOOTER_PATTERN
                             if banamex_footer_pattern.search(all_row_text):
                                 # This is footer information, skip it
                                 _disp = "SKIPPED (Banamex footer)"
@@ -8855,7 +11847,7 @@ def main():
                         
                         # Pattern to match footer: numbers.letters.OD.numbers.numbers
                         # Also check for partial patterns that might be split across words
-                        banamex_footer_pattern = re.compile(r'\d+\.\w+\.OD\.\d+\.\d+', re.I)
+                        banamex_footer_pattern = BANAMEX_FOOTER_PATTERN
                         # Also check for patterns that might be split: look for "OD" followed by numbers.numbers
                         banamex_footer_partial = re.compile(r'\.OD\.\d+\.\d+', re.I)
                         # Check if any word contains "OD" followed by numbers (part of footer)
@@ -8940,7 +11932,7 @@ def main():
                             
                             # Check if description contains footer pattern
                             all_row_text = ' '.join([w.get('text', '') for w in row_words])
-                            banamex_footer_pattern = re.compile(r'\d+\.\w+\.OD\.\d+\.\d+', re.I)
+                            banamex_footer_pattern = BANAMEX_FOOTER_PATTERN
                             banamex_footer_partial = re.compile(r'\.OD\.\d+\.\d+', re.I)
                             has_od_pattern = any('OD' in w.get('text', '') and re.search(r'OD[\.\s]*\d+[\.\s]*\d+', w.get('text', ''), re.I) for w in row_words)
                             
@@ -9140,7 +12132,7 @@ def main():
                                 
                                 # Check if this is a sub-row pattern (like "SBO 020902DX1 - 02 abr 2023 4316 FÍSICA")
                                 # These should be completely skipped, not added as continuation
-                                konfio_sub_row_pattern = re.compile(r'^[A-Z]{2,4}\s*[A-Z0-9]{8,15}\s*-\s*\d{1,2}\s+[A-Za-z]{3}\s+\d{2,4}', re.I)
+                                konfio_sub_row_pattern = KONFIO_SUB_ROW_PATTERN
                                 if konfio_sub_row_pattern.match(all_row_text.strip()):
                                     # This is a sub-row, skip it completely (don't add to description)
                                     continue
@@ -10350,6 +13342,8 @@ def main():
         if info_rows_to_remove:
             df_mov = df_mov.drop(index=info_rows_to_remove).reset_index(drop=True)
     
+    _metrics_end('movement_parsing')
+    _metrics_begin('sections')
     # Extract DIGITEM and Transferencias sections directly from PDF for Banamex
     # This must be done BEFORE calculating totals for validation
     df_transferencias = None
@@ -10357,11 +13351,11 @@ def main():
     if bank_config['name'] == 'Banamex':
         # print("🔍 Extrayendo secciones DIGITEM y TRANSFERENCIA directamente del PDF...")
         
-        # Extract DIGITEM section using already-extracted data to avoid second PDF/OCR pass
-        df_digitem = extract_digitem_section(pdf_path, columns_config, extracted_data=extracted_data)
-        
-        # Extract Transferencias section from PDF
-        df_transferencias = extract_transferencia_section(pdf_path)
+        # Both sections rode the movements walk: DIGITEM on the already-extracted words (no second PDF/OCR
+        # pass), Transferencias on the session's text layer; route the pages that walk did not reach
+        section_scanner.finish()
+        df_digitem = digitem_section.dataframe()
+        df_transferencias = transferencia_section.dataframe()
         
         # Add total row for DIGITEM if there are rows
         if df_digitem is not None and not df_digitem.empty and len(df_digitem) > 0:
@@ -10433,22 +13427,30 @@ def main():
             df_transferencias = pd.concat([df_transferencias, total_df_transferencia], ignore_index=True)
             #print(f"✅ Fila de totales agregada a Transferencias")
     
-    # Extract Santander METAS section (Mis Metas) into a separate tab (same structure as Movements)
+    # Santander METAS section (Mis Metas) into a separate tab (same structure as Movements), from the movements walk
     df_metas = None
-    if bank_config['name'] == 'Santander':
-        metas_start = bank_config.get('metas_start')
-        metas_end = bank_config.get('metas_end')
-        metas_columns = bank_config.get('columns') if (santander_ocr_mode and bank_config.get('columns')) else columns_config
-        if metas_start and metas_end and metas_columns:
-            df_metas = extract_santander_metas_from_pdf(extracted_data, metas_columns, metas_start, metas_end)
+    if metas_section is not None:
+        section_scanner.finish()
+        df_metas = metas_section.dataframe()
     
+    _metrics_end('sections')
+    _metrics_begin('summary_extraction')
     # Extract summary from PDF and calculate totals for validation
     # IMPORTANT: Calculate totals AFTER removing DIGITEM rows and BEFORE adding the "Total" row
     #print("🔍 Extrayendo información de resumen del PDF para validación...")
     # Para HSBC con OCR, el resumen ya fue extraído desde el texto OCR arriba
-    # Para otros casos, extraer desde PDF
+    # Other banks: from the pages already extracted (OCR text for illegible pages). Banamex mixed keeps its
+    # text layer, which is legible (OCR there is for images embedded in the pages).
     if not (is_hsbc and used_ocr):
-        pdf_summary = extract_summary_from_pdf(pdf_path, movement_start_page=movement_start_page)
+        if force_bank:
+            pdf_summary = extract_summary_from_pdf(pdf_path, movement_start_page=movement_start_page, session=session)
+        else:
+            pdf_summary = extract_summary_from_pages(
+                extracted_data, detected_bank, movement_start_page=movement_start_page, session=session
+            )
+    # All PDF reads are done; release the file handle and cached page data (unless the session is reused)
+    if not session.keep_open:
+        session.close()
     # Santander OCR (CID illegible PDF): totals for validation come from OCR text (+ Depósitos / - Retiros / Saldo final).
     if bank_config['name'] == 'Santander' and santander_ocr_mode and extracted_data:
         ocr_sum = extract_santander_summary_from_ocr_text(extracted_data)
@@ -10487,9 +13489,9 @@ def main():
                 continue
             rfc_ocr = extract_banamex_rfc_tarjeta_sucursal_only(page_txt)
             if rfc_ocr:
-                if '--debug' in sys.argv:
+                if '--debug' in _run_argv():
                     msg = "RFC_MATCH (Banamex tarjeta–sucursal, statement page %s): %s" % (p.get('page'), rfc_ocr)
-                    RFC_DEBUG_LINES.append(msg)
+                    _debug_lines(RFC_DEBUG_LINES).append(msg)
                     print(msg, flush=True)
                 break
         if not rfc_ocr:
@@ -10501,9 +13503,9 @@ def main():
                     continue
                 rfc_ocr = extract_banamex_rfc_loose_ocr_line(band_txt)
                 if rfc_ocr:
-                    if '--debug' in sys.argv:
+                    if '--debug' in _run_argv():
                         msg = "RFC_MATCH (Banamex band re-OCR, page %s): %s" % (p.get('page'), rfc_ocr)
-                        RFC_DEBUG_LINES.append(msg)
+                        _debug_lines(RFC_DEBUG_LINES).append(msg)
                         print(msg, flush=True)
                     break
         if not rfc_ocr:
@@ -10516,9 +13518,9 @@ def main():
                 rfc_geom = extract_banamex_rfc_from_ocr_words(p.get('words_rfc') or p.get('words') or [])
                 if rfc_geom:
                     rfc_ocr = rfc_geom
-                    if '--debug' in sys.argv:
+                    if '--debug' in _run_argv():
                         msg = "RFC_MATCH (Banamex OCR word geometry, page %s): %s" % (p.get('page'), rfc_ocr)
-                        RFC_DEBUG_LINES.append(msg)
+                        _debug_lines(RFC_DEBUG_LINES).append(msg)
                         print(msg, flush=True)
                     break
         if not rfc_ocr and rfc_source_pages_1_2.strip():
@@ -10592,7 +13594,7 @@ def main():
             m_direct = bbva_rfc_after_label_re.search(pre_movement_text_ocr or '')
             if m_direct:
                 rfc_ocr_pref = re.sub(r'\s+', '', m_direct.group(1)).upper()
-                if '--debug' in sys.argv:
+                if '--debug' in _run_argv():
                     print(f"RFC_MATCH (BBVA OCR pre-mov R.F.C direct): {rfc_ocr_pref}", flush=True)
             for i, ln in enumerate(pre_movement_lines):
                 if rfc_ocr_pref is not None:
@@ -10603,7 +13605,7 @@ def main():
                 m_label = bbva_rfc_label_re.search(line)
                 if not m_label:
                     continue
-                if '--debug' in sys.argv:
+                if '--debug' in _run_argv():
                     print(
                         "RFC_CHECK (BBVA OCR pre-mov R.F.C): %s" %
                         (line[:220] + '...' if len(line) > 220 else line),
@@ -10614,7 +13616,7 @@ def main():
                 m_val = bbva_rfc_value_re.search(after) or bbva_rfc_value_re.search(line)
                 if m_val is None and i + 1 < len(pre_movement_lines):
                     nxt = (pre_movement_lines[i + 1] or '').strip()
-                    if '--debug' in sys.argv and nxt:
+                    if '--debug' in _run_argv() and nxt:
                         print(
                             "RFC_CHECK (BBVA OCR pre-mov next): %s" %
                             (nxt[:220] + '...' if len(nxt) > 220 else nxt),
@@ -10623,7 +13625,7 @@ def main():
                     m_val = bbva_rfc_value_re.search(nxt)
                 if m_val:
                     rfc_ocr_pref = re.sub(r'\s+', '', m_val.group(1)).upper()
-                    if '--debug' in sys.argv:
+                    if '--debug' in _run_argv():
                         print(f"RFC_MATCH (BBVA OCR pre-mov R.F.C): {rfc_ocr_pref}", flush=True)
                     break
 
@@ -10689,7 +13691,7 @@ def main():
                                 if _v is not None and _v > 0:
                                     pdf_summary['total_abonos'] = _v
                                     pdf_summary['total_depositos'] = _v
-                                    if '--debug' in sys.argv:
+                                    if '--debug' in _run_argv():
                                         print(f"[DEBUG] BBVA OCR total_abonos detected (text) -> {_v:,.2f}", flush=True)
                                     break
                     if pdf_summary.get('total_cargos') is None:
@@ -10705,7 +13707,7 @@ def main():
                                 if _v is not None and _v > 0:
                                     pdf_summary['total_cargos'] = _v
                                     pdf_summary['total_retiros'] = _v
-                                    if '--debug' in sys.argv:
+                                    if '--debug' in _run_argv():
                                         print(f"[DEBUG] BBVA OCR total_cargos detected (text) -> {_v:,.2f}", flush=True)
                                     break
                     if pdf_summary.get('saldo_final') is None:
@@ -10719,7 +13721,7 @@ def main():
                                 _v = normalize_amount_str(_m.group(1))
                                 if _v is not None and _v > 0:
                                     pdf_summary['saldo_final'] = _v
-                                    if '--debug' in sys.argv:
+                                    if '--debug' in _run_argv():
                                         print(f"[DEBUG] BBVA OCR saldo_final detected (text) -> {_v:,.2f}", flush=True)
                                     break
 
@@ -10794,7 +13796,7 @@ def main():
                         if val is not None:
                             pdf_summary['total_abonos'] = val
                             pdf_summary['total_depositos'] = val
-                            if '--debug' in sys.argv:
+                            if '--debug' in _run_argv():
                                 print(f"[DEBUG] BBVA OCR total_abonos detected -> {val:,.2f} | line={_line_norm[:140]}", flush=True)
                     # Retiros / Cargos (-)
                     if (
@@ -10807,7 +13809,7 @@ def main():
                         if val is not None:
                             pdf_summary['total_cargos'] = val
                             pdf_summary['total_retiros'] = val
-                            if '--debug' in sys.argv:
+                            if '--debug' in _run_argv():
                                 print(f"[DEBUG] BBVA OCR total_cargos detected -> {val:,.2f} | line={_line_norm[:140]}", flush=True)
                     # Saldo Final (+) (split as SALDO / FINAL across adjacent lines)
                     if (
@@ -10819,7 +13821,7 @@ def main():
                         val = _rightmost_amount_from_words(win_words)
                         if val is not None:
                             pdf_summary['saldo_final'] = val
-                            if '--debug' in sys.argv:
+                            if '--debug' in _run_argv():
                                 print(f"[DEBUG] BBVA OCR saldo_final detected -> {val:,.2f} | line={_line_norm[:140]}", flush=True)
                     if (
                         pdf_summary.get('total_abonos') is not None
@@ -10929,13 +13931,13 @@ def main():
     # Debug: write movements debug file for coordinate path (RFC log + summary + movements; HSBC OCR path writes earlier)
     if debug_path is not None and not (is_hsbc and used_ocr):
         with open(debug_path, 'w', encoding='utf-8') as f:
-            for _line in RFC_DEBUG_LINES:
+            for _line in _debug_lines(RFC_DEBUG_LINES):
                 f.write(_line + "\n")
-            if RFC_DEBUG_LINES:
+            if _debug_lines(RFC_DEBUG_LINES):
                 f.write("\n")
-            for _line in NAME_DEBUG_LINES:
+            for _line in _debug_lines(NAME_DEBUG_LINES):
                 f.write(_line + "\n")
-            if NAME_DEBUG_LINES:
+            if _debug_lines(NAME_DEBUG_LINES):
                 f.write("\n")
             _sum = pdf_summary or {}
             f.write("RFC: " + ((_sum.get('rfc') or '').strip() or '(vacío)') + "\n")
@@ -10949,6 +13951,8 @@ def main():
                     f.write("DISPOSITION: " + (rec.get('disposition') or '') + "\n")
                     f.write("\n")
         print(f"Debug: movements debug written to -> {debug_path}", flush=True)
+    _metrics_end('summary_extraction')
+    _metrics_begin('validation')
     extracted_totals = calculate_extracted_totals(df_mov, bank_config['name'])
     
     # For INTERCAM and Mercury, use last Saldo from Bank Statement Report for validation "Valor en PDF" (Saldo Final)
@@ -11031,6 +14035,8 @@ def main():
             total_row[col] = ''
     
     # Append the total row to the dataframe
+    result.movement_rows = len(df_mov)
+    result.movements = df_mov.to_dict('records')
     total_df = pd.DataFrame([total_row])
     df_mov = pd.concat([df_mov, total_df], ignore_index=True)
     #print(f"✅ Fila de totales agregada (solo Abonos y Cargos)")
@@ -11097,6 +14103,9 @@ def main():
     print("📅 Periodo:", _p, flush=True)
     print("👤 Nombre:", _n, flush=True)
     print("🆔 RFC:", _r, flush=True)
+    result.rfc = (_summary.get('rfc') or '').strip() or None
+    result.name = (_summary.get('name') or '').strip() or None
+    result.period_text = (_summary.get('period_text') or '').strip() or None
     
     # Create validation sheet
     #print("📋 Creando pestaña de validación...")
@@ -11109,7 +14118,9 @@ def main():
     print("📊 Exporting to Excel...", flush=True)
     
     # Print validation summary to console
-    print_validation_summary(pdf_summary, extracted_totals, df_validation, df_mov)
+    result.validation_ok = print_validation_summary(pdf_summary, extracted_totals, df_validation, df_mov)
+    _metrics_end('validation')
+    _metrics_begin('excel_writing')
     
     # Determine number of sheets to write
     num_sheets = 3  # Summary, Movements, Data Validation
@@ -11228,21 +14239,82 @@ def main():
         # Validar que el Excel se creó correctamente
         if not os.path.isfile(output_excel):
             print(f"❌ Error: El archivo Excel no se creó: {output_excel}")
-            sys.exit(1)
+            result.fail('Excel creation error', f"El archivo Excel no se creó: {output_excel}")
+            return
         
         excel_size = os.path.getsize(output_excel)
         if excel_size == 0:
             print(f"❌ Error: El archivo Excel está vacío: {output_excel}")
-            sys.exit(1)
+            result.fail('Excel creation error', f"El archivo Excel está vacío: {output_excel}")
+            return
         
+        _metrics_end('excel_writing')
         print(f"✅ Excel file created successfully -> {output_excel} ({excel_size:,} bytes)" + "\n", flush=True)
-        sys.exit(0)
+        result.excel_created = True
+        result.exit_code = 0
+        if result.validation_ok is False:
+            result.error_type = 'Validation error'
+            result.error_message = '❌ VALIDATION: THERE ARE DIFFERENCES'
     except Exception as e:
         print(f"❌ Excel file not created -> {output_excel}")
         print(f"   Error: {str(e)}")
         import traceback
         traceback.print_exc()
+        result.fail('Excel creation error', str(e))
+
+
+def main():
+    # Validate input
+    if len(sys.argv) < 2:
+        #print("Usage:")
+        #print("  python main2.py <input.pdf>              # Parse PDF and create Excel")
+        #print("  python main2.py <input.pdf> --find <page> # Find column coordinates on page N")
+        #print("\nExample:")
+        #print("  python main2.py BBVA.pdf")
+        #print("  python main2.py BBVA.pdf --find 2")
+        sys.exit(1)
+
+    # Normalize PDF path (handles UNC paths, spaces, etc.)
+    pdf_path = os.path.normpath(sys.argv[1])
+    if not os.path.isabs(pdf_path):
+        pdf_path = os.path.abspath(pdf_path)
+    
+    # Check for --find mode
+    if len(sys.argv) >= 3 and sys.argv[2] == '--find':
+        page_num = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+        print(f"🔍 Buscando coordenadas en página {page_num}...")
+        with PdfSession(pdf_path) as find_session:
+            find_column_coordinates(pdf_path, page_num, session=find_session)
+        sys.exit(0)
+
+    if _check_input_pdf(pdf_path):
         sys.exit(1)
+    
+    if '--ocr-zoom-sweep-excel' in sys.argv:
+        try:
+            run_ocr_zoom_sweep_excel(pdf_path, zoom_min=1, zoom_max=8)
+        except Exception as e:
+            print(f"❌ PDF→Excel zoom sweep failed: {e}", flush=True)
+            import traceback
+            traceback.print_exc()
+            sys.exit(1)
+        sys.exit(0)
+    
+    if '--ocr-zoom-sweep' in sys.argv:
+        if not TESSERACT_AVAILABLE:
+            print("❌ OCR zoom sweep requires Tesseract. Install: pip install pytesseract pymupdf pillow", flush=True)
+            sys.exit(1)
+        try:
+            run_ocr_zoom_sweep(pdf_path, zoom_min=1, zoom_max=8)
+        except Exception as e:
+            print(f"❌ OCR zoom sweep failed: {e}", flush=True)
+            import traceback
+            traceback.print_exc()
+            sys.exit(1)
+        sys.exit(0)
+    
+    result = convert_statement(pdf_path, convert_options_from_argv(sys.argv))
+    sys.exit(result.exit_code)
 
 
 if __name__ == "__main__":
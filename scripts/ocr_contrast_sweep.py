@@ -2,21 +2,30 @@
 Run pdf_to_excel.py over a contrast grid (default 1.4 .. 1.8 step 0.1) and write
 one Excel per value: <pdf_stem>_ocr_contrast_<value>.xlsx in the PDF directory.
 
-Requires: pdf_to_excel.py with --ocr-contrast and --output-excel support.
+Everything runs in this process through ``run_ocr_contrast_sweep()``: each page that needs OCR is
+rendered once, the contrast variants of the raster are OCR'd in parallel worker processes, and each
+value is converted from those results (the text layer and bank detection are computed once).
 
 Example:
   python scripts/ocr_contrast_sweep.py ^
     "D:\\path\\to\\statement.pdf"
 
-Optional: scan each output for VIVAAEROBUS / amount substrings and print a table.
+Optional: search each value's movement rows for VIVAAEROBUS / amount substrings and print a table.
 """
 from __future__ import annotations
 
 import argparse
 import os
-import subprocess
 import sys
 
+# Substrings searched in the movement rows (label -> text)
+DEFAULT_MARKERS = {
+    "VIVAAEROBUS": "VIVAAEROBUS",
+    "23/AGO": "23/AGO",
+    "amt_2189_wrong": "2,189.27",
+    "amt_2789": "2,789.27",
+}
+
 
 def _repo_root() -> str:
     return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -39,28 +48,28 @@ def _contrast_values(start: float, end: float, step: float) -> list[float]:
     return out
 
 
-def _flatten_xlsx_text(path: str) -> str:
-    try:
-        import openpyxl
-    except ImportError:
-        return ""
-    try:
-        wb = openpyxl.load_workbook(path, data_only=True, read_only=True)
-        parts: list[str] = []
-        for ws in wb.worksheets:
-            for row in ws.iter_rows(values_only=True):
-                parts.append(
-                    "\t".join("" if c is None else str(c) for c in row)
-                )
-        wb.close()
-        return "\n".join(parts)
-    except Exception as e:
-        return f"<read error: {e}>"
+def _movements_text(movements: list | None) -> str:
+    """Movement rows as tab-separated lines; amounts held as numbers are formatted as in the Excel (1,234.56)."""
+    lines = []
+    for row in movements or []:
+        cells = []
+        for value in row.values():
+            if isinstance(value, float):
+                cells.append("" if value != value else f"{value:,.2f}")
+            else:
+                cells.append("" if value is None else str(value))
+        lines.append("\t".join(cells))
+    return "\n".join(lines)
+
+
+def _scan_markers(movements: list | None, markers: dict) -> str:
+    blob = _movements_text(movements).upper()
+    found = [label for label, text in markers.items() if text.upper() in blob]
+    return ", ".join(found) if found else "(no markers)"
 
 
 def main() -> int:
     root = _repo_root()
-    script = os.path.join(root, "pdf_to_excel.py")
     ap = argparse.ArgumentParser(description="OCR contrast sweep for pdf_to_excel.py")
     ap.add_argument(
         "pdf",
@@ -82,12 +91,19 @@ def main() -> int:
         "--extra-args",
         nargs="*",
         default=[],
-        help="Extra args forwarded to pdf_to_excel.py (e.g. --debug)",
+        help="pdf_to_excel.py options applied to every run (e.g. --debug, --ocr-zoom 4)",
+    )
+    ap.add_argument("--workers", type=int, help="OCR worker processes (default: --ocr-workers, else CPU count)")
+    ap.add_argument(
+        "--find",
+        nargs="*",
+        default=[],
+        help="Extra substrings to search in the movement rows",
     )
     ap.add_argument(
         "--no-scan",
         action="store_true",
-        help="Skip scanning Excel for VIVAAEROBUS / amount markers",
+        help="Skip searching the movement rows for VIVAAEROBUS / amount markers",
     )
     args = ap.parse_args()
 
@@ -95,59 +111,31 @@ def main() -> int:
     if not os.path.isfile(pdf):
         print(f"PDF not found: {pdf}", file=sys.stderr)
         return 1
-    if not os.path.isfile(script):
-        print(f"pdf_to_excel.py not found: {script}", file=sys.stderr)
-        return 1
 
-    pdf_dir = os.path.dirname(pdf)
-    stem = os.path.splitext(os.path.basename(pdf))[0]
+    sys.path.insert(0, root)
+    import pdf_to_excel as converter
+
     contrasts = _contrast_values(args.start, args.end, args.step)
     print(f"Contrasts: {contrasts}", flush=True)
+    options = converter.convert_options_from_argv(list(args.extra_args))
+    markers = dict(DEFAULT_MARKERS, **{text: text for text in args.find})
 
-    results: list[tuple[float, str, str]] = []
-    py = sys.executable
-
-    for c in contrasts:
-        out_xlsx = os.path.join(pdf_dir, f"{stem}_ocr_contrast_{c:.2f}.xlsx")
-        cmd = [
-            py,
-            script,
-            pdf,
-            "--ocr-contrast",
-            str(c),
-            "--output-excel",
-            out_xlsx,
-        ] + list(args.extra_args)
-        print(f"\n=== contrast {c} -> {out_xlsx} ===", flush=True)
-        r = subprocess.run(cmd, cwd=root)
-        if r.returncode != 0:
-            print(f"[FAIL] exit {r.returncode} for contrast {c}", flush=True)
-            results.append((c, out_xlsx, f"exit_{r.returncode}"))
-            continue
-        if args.no_scan:
-            results.append((c, out_xlsx, "ok"))
-            continue
-        blob = _flatten_xlsx_text(out_xlsx)
-        has_v = "VIVAAEROBUS" in blob.upper()
-        has_23 = "23/AGO" in blob
-        has_wrong = "2,189.27" in blob
-        has_right = "2,789.27" in blob
-        note = []
-        if has_v:
-            note.append("VIVAAEROBUS")
-        if has_23:
-            note.append("23/AGO")
-        if has_wrong:
-            note.append("amt_2189_wrong")
-        if has_right:
-            note.append("amt_2789")
-        flag = ", ".join(note) if note else "(no markers)"
-        print(f"  scan: {flag}", flush=True)
-        results.append((c, out_xlsx, flag))
+    sweep = converter.run_ocr_contrast_sweep(pdf, contrasts, options=options, workers=args.workers)
 
     print("\n--- summary ---", flush=True)
-    for c, path, flag in results:
-        print(f"  {c:>4}: {flag}  |  {path}", flush=True)
+    for row in sweep:
+        result = row["result"]
+        if result.error_type and not result.excel_created:
+            flag = f"[FAIL] {result.error_type}"
+        elif args.no_scan:
+            flag = "ok"
+        else:
+            flag = _scan_markers(result.movements, markers)
+        print(
+            f"  {row['contrast']:>4}: {flag}  |  {result.movement_rows} movements, {row['words']} OCR words, "
+            f"mean conf {row['mean_conf']:.1f}, OCR {row['ocr_wall_s']:.1f}s  |  {result.output_excel}",
+            flush=True,
+        )
 
     return 0
 
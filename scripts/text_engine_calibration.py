@@ -0,0 +1,143 @@
+"""
+Check that ``--text-engine pymupdf`` gives the same result as pdfplumber on a corpus of statements.
+
+For every PDF (files or folders, searched recursively):
+  1. word check: ``compare_text_engines()`` pairs the words of both engines and counts words that are
+     missing, extra or land in a different BANK_CONFIGS column, and pages whose text differs;
+  2. output check: the PDF is converted with each engine and every Excel sheet is compared.
+
+The table at the end groups the files by detected bank. A bank shows "parity" only when all of its
+files pass both checks; those are the candidates for TEXT_ENGINE_PYMUPDF_BANKS in pdf_to_excel.py.
+
+Example:
+  python scripts/text_engine_calibration.py "Test\\Bank Statement" --json calibration.json
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+
+def _repo_root() -> str:
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _find_pdfs(paths: list[str]) -> list[str]:
+    found: list[str] = []
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, _dirs, files in os.walk(path):
+                found.extend(os.path.join(dirpath, f) for f in sorted(files) if f.lower().endswith(".pdf"))
+        elif path.lower().endswith(".pdf"):
+            found.append(path)
+    return found
+
+
+def _sheets_equal(path_a: str, path_b: str) -> tuple[bool, str]:
+    import pandas as pd
+
+    if not (os.path.isfile(path_a) and os.path.isfile(path_b)):
+        return os.path.isfile(path_a) == os.path.isfile(path_b), "Excel not created by both engines"
+    sheets_a = pd.read_excel(path_a, sheet_name=None)
+    sheets_b = pd.read_excel(path_b, sheet_name=None)
+    if sheets_a.keys() != sheets_b.keys():
+        return False, f"sheets differ: {list(sheets_a)} vs {list(sheets_b)}"
+    for name in sheets_a:
+        if not sheets_a[name].equals(sheets_b[name]):
+            return False, f"sheet {name!r} differs"
+    return True, ""
+
+
+def _convert(converter, pdf_path: str, engine: str, output: str, verbose: bool) -> float:
+    buffer = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.ExitStack() as stack:
+        if not verbose:
+            stack.enter_context(contextlib.redirect_stdout(buffer))
+            stack.enter_context(contextlib.redirect_stderr(buffer))
+        converter.convert_statement(pdf_path, {"output_excel": output, "text_engine": engine, "no_ocr_cache": True})
+    return time.perf_counter() - start
+
+
+def calibrate_pdf(converter, pdf_path: str, verbose: bool = False) -> dict:
+    """Word check plus output check for one PDF."""
+    report = converter.compare_text_engines(pdf_path)
+    with tempfile.TemporaryDirectory(prefix="text_engine_calibration_") as tmp_dir:
+        out_plumber = os.path.join(tmp_dir, "pdfplumber.xlsx")
+        out_mupdf = os.path.join(tmp_dir, "pymupdf.xlsx")
+        report["seconds_pdfplumber"] = _convert(converter, pdf_path, "pdfplumber", out_plumber, verbose)
+        report["seconds_pymupdf"] = _convert(converter, pdf_path, "pymupdf", out_mupdf, verbose)
+        report["output_equal"], report["output_diff"] = _sheets_equal(out_plumber, out_mupdf)
+    report["parity"] = report["parity"] and report["output_equal"]
+    return report
+
+
+def print_table(reports: list[dict]) -> list[str]:
+    """Per-bank summary; returns the banks with parity on every file."""
+    by_bank: dict[str, list[dict]] = {}
+    for r in reports:
+        by_bank.setdefault(r["bank"], []).append(r)
+    header = f"{'bank':<12} {'files':>5} {'words':>8} {'missing':>8} {'extra':>6} {'col diff':>8} {'out diff':>8} {'speedup':>8}  verdict"
+    print(header)
+    print("-" * len(header))
+    parity_banks: list[str] = []
+    for bank, items in sorted(by_bank.items()):
+        plumber = sum(r["seconds_pdfplumber"] for r in items)
+        mupdf = sum(r["seconds_pymupdf"] for r in items)
+        ok = all(r["parity"] for r in items)
+        if ok:
+            parity_banks.append(bank)
+        print(
+            f"{bank:<12} {len(items):>5} {sum(r['words'] for r in items):>8} {sum(r['missing'] for r in items):>8} "
+            f"{sum(r['extra'] for r in items):>6} {sum(r['column_mismatches'] for r in items):>8} "
+            f"{sum(not r['output_equal'] for r in items):>8} {plumber / max(mupdf, 1e-9):>7.1f}x  "
+            f"{'✅ parity' if ok else '❌ differs'}"
+        )
+    return parity_banks
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Compare pdfplumber and PyMuPDF text engines on a corpus")
+    ap.add_argument("paths", nargs="+", help="PDF files or folders")
+    ap.add_argument("--json", help="Write the per-file reports to this JSON file")
+    ap.add_argument("--verbose", action="store_true", help="Show the converter output and the differences found")
+    args = ap.parse_args()
+
+    sys.path.insert(0, _repo_root())
+    import pdf_to_excel as converter
+
+    if not converter.PYMUPDF_AVAILABLE:
+        print("❌ PyMuPDF is not installed (pip install pymupdf)")
+        return 1
+    pdfs = _find_pdfs(args.paths)
+    if not pdfs:
+        print("❌ No PDF files found")
+        return 1
+
+    reports = []
+    for idx, pdf_path in enumerate(pdfs, 1):
+        print(f"[{idx}/{len(pdfs)}] {os.path.basename(pdf_path)}...", flush=True)
+        report = calibrate_pdf(converter, pdf_path, verbose=args.verbose)
+        reports.append(report)
+        if not report["parity"]:
+            for line in report["examples"] + ([report["output_diff"]] if report["output_diff"] else []):
+                print(f"   {line}")
+
+    print()
+    parity_banks = print_table(reports)
+    print(f"\nBanks with parity: {', '.join(parity_banks) if parity_banks else '(none)'}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(reports, f, indent=2, ensure_ascii=False)
+        print(f"✅ Reports written to -> {os.path.abspath(args.json)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,6 +5,9 @@ import glob
 from pathlib import Path
 import re
 import time
+import json
+import tempfile
+import multiprocessing
 
 
 def find_pdf_files(folder_path: str, recursive: bool = False) -> list:
@@ -85,7 +88,7 @@ def detect_error_from_output(stderr_text: str, stdout_text: str, return_code: in
     return (False, "", "")
 
 
-def process_single_pdf(pdf_path: str, script_path: str = "pdf_to_excel.py") -> tuple:
+def process_single_pdf(pdf_path: str, script_path: str = "pdf_to_excel.py", ocr_workers: int = None) -> tuple:
     """
     Process a single PDF file by executing pdf_to_excel.py.
     Shows output in real-time and captures errors.
@@ -93,11 +96,14 @@ def process_single_pdf(pdf_path: str, script_path: str = "pdf_to_excel.py") -> t
     Args:
         pdf_path: Path to the PDF file to process
         script_path: Path to pdf_to_excel.py script
+        ocr_workers: Optional --ocr-workers for the child (also limits Tesseract to one thread per process)
     
     Returns:
-        Tuple of (success: bool, error_type: str, error_message: str, elapsed_time: float, rfc_empty: bool)
+        Tuple of (success: bool, error_type: str, error_message: str, elapsed_time: float, rfc_empty: bool,
+        metrics: dict or None) — metrics is the --metrics-json report of the run (stage timings, bank)
     """
     start_time = time.time()
+    metrics_path = None
     
     try:
         # Get absolute paths
@@ -107,10 +113,16 @@ def process_single_pdf(pdf_path: str, script_path: str = "pdf_to_excel.py") -> t
         # Validate script exists
         if not os.path.isfile(script_path):
             elapsed_time = time.time() - start_time
-            return (False, "Script not found", f"pdf_to_excel.py not found at: {script_path}", elapsed_time, False)
+            return (False, "Script not found", f"pdf_to_excel.py not found at: {script_path}", elapsed_time, False, None)
         
-        # Build command
-        cmd = [sys.executable, script_path, pdf_path]
+        # Build command (stage timings come back through a temporary --metrics-json file)
+        fd, metrics_path = tempfile.mkstemp(prefix='pdf_to_excel_metrics_', suffix='.json')
+        os.close(fd)
+        cmd = [sys.executable, script_path, pdf_path, '--metrics-json', metrics_path]
+        env = None
+        if ocr_workers:
+            cmd += ['--ocr-workers', str(ocr_workers)]
+            env = dict(os.environ, OMP_THREAD_LIMIT='1')
         
         # Execute with real-time output
         process = subprocess.Popen(
@@ -121,7 +133,8 @@ def process_single_pdf(pdf_path: str, script_path: str = "pdf_to_excel.py") -> t
             bufsize=1,  # Line buffered
             encoding='utf-8',
             errors='replace',
-            cwd=os.path.dirname(script_path) or os.getcwd()
+            cwd=os.path.dirname(script_path) or os.getcwd(),
+            env=env
         )
         
         # Read output line by line and print in real-time
@@ -144,14 +157,142 @@ def process_single_pdf(pdf_path: str, script_path: str = "pdf_to_excel.py") -> t
         has_error, error_type, error_message = detect_error_from_output(stderr_text, stdout_text, return_code)
         # Detect empty RFC: pdf_to_excel.py prints "🆔 RFC: —" or "🆔 RFC: -" when RFC is missing
         rfc_empty = bool(re.search(r'RFC:\s*[—\-]\s*$', stdout_text, re.MULTILINE)) or '🆔 RFC: —' in stdout_text or 'RFC: —' in stdout_text
+        metrics = None
+        try:
+            with open(metrics_path, encoding='utf-8') as f:
+                metrics = json.load(f)
+        except (OSError, ValueError):
+            pass
         if has_error:
-            return (False, error_type, error_message, elapsed_time, rfc_empty)
+            return (False, error_type, error_message, elapsed_time, rfc_empty, metrics)
         else:
-            return (True, "", "", elapsed_time, rfc_empty)
+            return (True, "", "", elapsed_time, rfc_empty, metrics)
     
     except Exception as e:
         elapsed_time = time.time() - start_time
-        return (False, "Execution error", str(e), elapsed_time, False)
+        return (False, "Execution error", str(e), elapsed_time, False, None)
+    finally:
+        if metrics_path and os.path.exists(metrics_path):
+            os.remove(metrics_path)
+
+
+def load_converter(script_path: str = "pdf_to_excel.py"):
+    """
+    Import pdf_to_excel once so every PDF reuses the same warm interpreter
+    (pandas, pdfplumber, fitz and pytesseract are imported a single time).
+    
+    Args:
+        script_path: Path to pdf_to_excel.py script
+    
+    Returns:
+        The imported pdf_to_excel module
+    """
+    script_dir = os.path.dirname(os.path.abspath(script_path))
+    if script_dir not in sys.path:
+        sys.path.insert(0, script_dir)
+    import pdf_to_excel
+    return pdf_to_excel
+
+
+def process_single_pdf_in_process(pdf_path: str, script_path: str = "pdf_to_excel.py", options: dict = None) -> tuple:
+    """
+    Process a single PDF file with pdf_to_excel.convert_statement() in this process.
+    Output is printed in real-time by the converter itself.
+    
+    Args:
+        pdf_path: Path to the PDF file to process
+        script_path: Path to pdf_to_excel.py script
+        options: Optional convert_statement() options (e.g. {'ocr_zoom': 4})
+    
+    Returns:
+        Tuple of (success: bool, error_type: str, error_message: str, elapsed_time: float, rfc_empty: bool,
+        metrics: dict or None) — metrics has the same layout as the --metrics-json report
+    """
+    start_time = time.time()
+    
+    try:
+        if not os.path.isfile(os.path.abspath(script_path)):
+            elapsed_time = time.time() - start_time
+            return (False, "Script not found", f"pdf_to_excel.py not found at: {os.path.abspath(script_path)}", elapsed_time, False, None)
+        
+        converter = load_converter(script_path)
+        result = converter.convert_statement(os.path.abspath(pdf_path), options)
+        sys.stdout.flush()
+        
+        # Same rule as the "🆔 RFC: —" check in process_single_pdf; only when the run got that far
+        rfc_empty = result.excel_created and not result.rfc
+        metrics = dict(result.metrics or {}, bank=result.bank, used_ocr=result.used_ocr)
+        if result.success:
+            return (True, "", "", result.elapsed, rfc_empty, metrics)
+        return (False, result.error_type or "Unknown error", result.error_message, result.elapsed, rfc_empty, metrics)
+    
+    except Exception as e:
+        elapsed_time = time.time() - start_time
+        return (False, "Execution error", str(e), elapsed_time, False, None)
+
+
+class PrefixedLineWriter:
+    """
+    Minimal text stream that prefixes every output line (e.g. with the PDF name)
+    so output from parallel workers stays readable.
+    """
+    def __init__(self, stream, prefix: str):
+        self.stream = stream
+        self.prefix = prefix
+        self._pending = ''
+
+    def write(self, text: str) -> int:
+        self._pending += text
+        while '\n' in self._pending:
+            line, self._pending = self._pending.split('\n', 1)
+            self.stream.write(f"{self.prefix}{line}\n")
+        return len(text)
+
+    def flush(self):
+        if self._pending:
+            self.stream.write(f"{self.prefix}{self._pending}\n")
+            self._pending = ''
+        self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+def batch_ocr_workers(jobs: int, in_process: bool) -> int:
+    """
+    OCR processes per conversion when ``jobs`` PDFs run in parallel: the cores are shared between the jobs.
+    In-process jobs run in daemonic pool workers, which cannot start an OCR process pool, so they OCR
+    sequentially (rendering still overlaps Tesseract, see --ocr-queue-depth).
+    """
+    if in_process:
+        return 1
+    return max(1, (os.cpu_count() or 1) // max(jobs, 1))
+
+
+def _init_batch_worker(script_path: str):
+    """Pool initializer: import pdf_to_excel once per worker process."""
+    # The jobs already use every core; Tesseract's own OpenMP threads would oversubscribe the CPU
+    os.environ['OMP_THREAD_LIMIT'] = '1'
+    if script_path:
+        load_converter(script_path)
+
+
+def _process_pdf_job(pdf_path: str, in_process: bool, ocr_workers: int) -> tuple:
+    """Pool task: process one PDF with its output lines prefixed by the file name."""
+    original_stdout, original_stderr = sys.stdout, sys.stderr
+    prefix = f"[{os.path.basename(pdf_path)}] "
+    sys.stdout = PrefixedLineWriter(original_stdout, prefix)
+    sys.stderr = PrefixedLineWriter(original_stderr, prefix)
+    try:
+        if in_process:
+            outcome = process_single_pdf_in_process(pdf_path, options={'ocr_workers': ocr_workers})
+        else:
+            outcome = process_single_pdf(pdf_path, ocr_workers=ocr_workers)
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        sys.stdout, sys.stderr = original_stdout, original_stderr
+    return (pdf_path, outcome)
 
 
 def format_time(seconds: float) -> str:
@@ -177,13 +318,18 @@ def format_time(seconds: float) -> str:
         return f"{hours}h {minutes}m {secs:.2f}s"
 
 
-def process_folder(folder_path: str, recursive: bool = False) -> dict:
+def process_folder(folder_path: str, recursive: bool = False, in_process: bool = True, jobs: int = 1,
+                   max_tasks_per_child: int = 25) -> dict:
     """
     Process all PDF files in a folder.
     
     Args:
         folder_path: Path to folder containing PDFs
         recursive: If True, process PDFs in subdirectories too
+        in_process: If True, convert in this interpreter via convert_statement();
+            if False, start one pdf_to_excel.py subprocess per PDF
+        jobs: Number of PDFs processed in parallel (worker processes). 1 = sequential.
+        max_tasks_per_child: Worker processes are recycled after this many PDFs (bounds memory growth)
     
     Returns:
         Dictionary with statistics including failed list and total time
@@ -194,6 +340,7 @@ def process_folder(folder_path: str, recursive: bool = False) -> dict:
         'failed': 0,
         'failed_list': [],  # List of dicts: {'file': str, 'error_type': str, 'error_message': str}
         'rfc_empty_list': [],  # List of PDF file paths where RFC was empty or "—"
+        'metrics_by_bank': {},  # bank -> summed stage timings (see add_metrics_to_stats)
         'total_time': 0.0
     }
     
@@ -211,6 +358,11 @@ def process_folder(folder_path: str, recursive: bool = False) -> dict:
     # Start total timer
     total_start_time = time.time()
     
+    if jobs > 1:
+        _process_folder_parallel(pdf_files, stats, in_process, jobs, max_tasks_per_child)
+        stats['total_time'] = time.time() - total_start_time
+        return stats
+    
     # Process each PDF
     for idx, pdf_path in enumerate(pdf_files, 1):
         pdf_name = os.path.basename(pdf_path)
@@ -220,7 +372,11 @@ def process_folder(folder_path: str, recursive: bool = False) -> dict:
         print(f"[{idx}/{stats['total']}] Processing: {pdf_name}")
         print("=" * 60)
         
-        success, error_type, error_message, elapsed_time, rfc_empty = process_single_pdf(pdf_path)
+        if in_process:
+            success, error_type, error_message, elapsed_time, rfc_empty, metrics = process_single_pdf_in_process(pdf_path)
+        else:
+            success, error_type, error_message, elapsed_time, rfc_empty, metrics = process_single_pdf(pdf_path)
+        add_metrics_to_stats(stats, metrics)
         
         # Track PDFs with empty RFC
         if rfc_empty:
@@ -251,6 +407,93 @@ def process_folder(folder_path: str, recursive: bool = False) -> dict:
     return stats
 
 
+def add_metrics_to_stats(stats: dict, metrics: dict):
+    """
+    Add one PDF's stage timings (--metrics-json report) to stats['metrics_by_bank'].
+    
+    Args:
+        stats: Dictionary with processing statistics
+        metrics: Report returned by process_single_pdf / process_single_pdf_in_process (may be None)
+    """
+    if not metrics:
+        return
+    bank = metrics.get('bank') or 'Unknown'
+    entry = stats['metrics_by_bank'].setdefault(bank, {
+        'files': 0, 'ocr_files': 0, 'ocr_pages': 0, 'wall_s': 0.0, 'cpu_s': 0.0, 'max_rss_growth_mb': None, 'stages': {},
+    })
+    entry['files'] += 1
+    entry['ocr_files'] += 1 if metrics.get('used_ocr') else 0
+    entry['ocr_pages'] += len(metrics.get('ocr_pages') or [])
+    total = metrics.get('total') or {}
+    entry['wall_s'] += total.get('wall_s') or 0.0
+    entry['cpu_s'] += total.get('cpu_s') or 0.0
+    # Growth of the worker's RSS high-water mark during this PDF (not the cumulative mark, which in a
+    # warm worker also holds the memory of the PDFs it converted before)
+    growth = total.get('peak_rss_growth_mb')
+    if growth is not None:
+        entry['max_rss_growth_mb'] = max(entry['max_rss_growth_mb'] or 0.0, growth)
+    for name, stage in (metrics.get('stages') or {}).items():
+        summed = entry['stages'].setdefault(name, {'wall_s': 0.0, 'cpu_s': 0.0})
+        summed['wall_s'] += stage.get('wall_s') or 0.0
+        summed['cpu_s'] += stage.get('cpu_s') or 0.0
+
+
+def _record_result(stats: dict, pdf_path: str, outcome: tuple):
+    """Print the per-file result line and update stats (shared by the parallel path)."""
+    pdf_name = os.path.basename(pdf_path)
+    success, error_type, error_message, elapsed_time, rfc_empty, metrics = outcome
+    add_metrics_to_stats(stats, metrics)
+    if rfc_empty:
+        stats['rfc_empty_list'].append(pdf_path)
+    if success:
+        print(f"✅ Success: {pdf_name} ({format_time(elapsed_time)})", flush=True)
+        stats['successful'] += 1
+    else:
+        print(f"❌ Failed: {pdf_name} ({error_type}) ({format_time(elapsed_time)})", flush=True)
+        stats['failed'] += 1
+        stats['failed_list'].append({
+            'file': pdf_name,
+            'error_type': error_type,
+            'error_message': error_message
+        })
+
+
+def _process_folder_parallel(pdf_files: list, stats: dict, in_process: bool, jobs: int, max_tasks_per_child: int):
+    """
+    Process PDFs on a pool of warm worker processes, largest file first,
+    so one large scanned statement does not start last and stretch the total time.
+    File size is the cost estimate: scanned pages are much larger than text pages, and it needs no PDF parse.
+    """
+    script_path = "pdf_to_excel.py"
+    ordered = sorted(pdf_files, key=os.path.getsize, reverse=True)
+    ocr_workers = batch_ocr_workers(jobs, in_process)
+    
+    print(f"⚙️  Running {jobs} parallel job(s), largest file first, {ocr_workers} OCR process(es) per job\n", flush=True)
+    
+    pool = multiprocessing.Pool(
+        processes=jobs,
+        initializer=_init_batch_worker,
+        initargs=(script_path if in_process else None,),
+        maxtasksperchild=max_tasks_per_child,
+    )
+    try:
+        pending = [
+            pool.apply_async(_process_pdf_job, (pdf_path, in_process, ocr_workers))
+            for pdf_path in ordered
+        ]
+        pool.close()
+        done = 0
+        for async_result in pending:
+            pdf_path, outcome = async_result.get()
+            done += 1
+            print(f"[{done}/{stats['total']}] ", end='')
+            _record_result(stats, pdf_path, outcome)
+        pool.join()
+    except BaseException:
+        pool.terminate()
+        raise
+
+
 def print_summary(stats: dict):
     """
     Print final summary with statistics.
@@ -298,6 +541,17 @@ def print_summary(stats: dict):
     else:
         print(f"\n🆔 PDFs with empty RFC: none")
     
+    if stats.get('metrics_by_bank'):
+        print(f"\n⏱️  Time by bank and stage (wall, summed over files):")
+        for bank, entry in sorted(stats['metrics_by_bank'].items(), key=lambda kv: -kv[1]['wall_s']):
+            files = entry['files']
+            print(f"   {bank}: {files} file(s), {entry['ocr_files']} with OCR ({entry['ocr_pages']} page(s)), "
+                  f"{format_time(entry['wall_s'])} wall / {format_time(entry['cpu_s'])} CPU, "
+                  f"avg {format_time(entry['wall_s'] / files)} per file"
+                  + (f", peak RSS +{entry['max_rss_growth_mb']:.0f} MB" if entry.get('max_rss_growth_mb') is not None else ''))
+            stages = sorted(entry['stages'].items(), key=lambda kv: -kv[1]['wall_s'])
+            print("      " + " | ".join(f"{name} {format_time(st['wall_s'])}" for name, st in stages))
+    
     print("=" * 60)
 
 
@@ -318,6 +572,27 @@ def main():
         action='store_true',
         help='Process PDFs in subdirectories too'
     )
+    parser.add_argument(
+        '--subprocess',
+        action='store_true',
+        help='Run each PDF in its own pdf_to_excel.py subprocess instead of one warm interpreter'
+    )
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=1,
+        help='Number of PDFs to process in parallel (default: 1)'
+    )
+    parser.add_argument(
+        '--max-tasks-per-child',
+        type=int,
+        default=25,
+        help='Recycle each parallel worker process after this many PDFs (default: 25)'
+    )
+    parser.add_argument(
+        '--metrics-json',
+        help='Write stage timings aggregated by bank to this JSON file'
+    )
     
     args = parser.parse_args()
     
@@ -335,11 +610,26 @@ def main():
     
     # Process folder
     try:
-        stats = process_folder(folder_path, recursive=args.recursive)
+        stats = process_folder(
+            folder_path,
+            recursive=args.recursive,
+            in_process=not args.subprocess,
+            jobs=max(1, args.jobs),
+            max_tasks_per_child=max(1, args.max_tasks_per_child),
+        )
         
         # Print summary
         print_summary(stats)
         
+        if args.metrics_json:
+            with open(args.metrics_json, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'total_pdfs': stats['total'],
+                    'total_time': stats['total_time'],
+                    'metrics_by_bank': stats['metrics_by_bank'],
+                }, f, indent=2, ensure_ascii=False)
+            print(f"⏱️  Metrics written to -> {os.path.abspath(args.metrics_json)}")
+        
         # Exit with error code if any failed
         if stats['failed'] > 0:
             sys.exit(1)
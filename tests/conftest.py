@@ -0,0 +1,72 @@
+"""
+Shared fixtures. Tesseract is replaced by ``FakeOcrEngine`` (fixed text lines), so the OCR paths run
+without a Tesseract install; scanned statements are built as image-only PDFs.
+"""
+import os
+import sys
+
+import fitz
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import pdf_to_excel  # noqa: E402
+
+
+class FakeOcrEngine:
+    """OCR engine returning ``lines`` (one Tesseract line each, top of the image down) for every image."""
+
+    name = 'pytesseract'
+
+    def __init__(self, lines: list):
+        self.lines = lines
+
+    def image_to_data(self, img, lang: str, config: str = '') -> dict:
+        data = {col: [] for col in pdf_to_excel.OCR_DATA_COLUMNS}
+        line_height = max(1, img.height // (len(self.lines) + 1))
+        for line_num, line in enumerate(self.lines, start=1):
+            left = 20
+            for word_num, word in enumerate(line.split(), start=1):
+                width = 12 * len(word)
+                row = (5, 1, 1, 1, line_num, word_num, left, line_num * line_height, width, 20, 95, word)
+                for col, value in zip(pdf_to_excel.OCR_DATA_COLUMNS, row):
+                    data[col].append(value)
+                left += width + 12
+        return data
+
+    def image_to_string(self, img, lang: str, config: str = '') -> str:
+        return '\n'.join(self.lines)
+
+    @staticmethod
+    def version() -> str:
+        return 'fake'
+
+
+@pytest.fixture
+def fake_ocr(monkeypatch, tmp_path):
+    """Returns a function ``install(lines)`` that makes every OCR call in this process (and forked ones) read ``lines``."""
+    def install(lines: list) -> FakeOcrEngine:
+        engine = FakeOcrEngine(lines)
+        monkeypatch.setattr(pdf_to_excel, 'TESSERACT_AVAILABLE', True)
+        monkeypatch.setattr(pdf_to_excel, 'TESSEROCR_AVAILABLE', False)
+        monkeypatch.setattr(pdf_to_excel, 'configure_tesseract', lambda: True)
+        monkeypatch.setattr(pdf_to_excel, 'OCR_CACHE_DEFAULT_DIR', str(tmp_path / 'ocr_cache'))
+        monkeypatch.setitem(pdf_to_excel._OCR_ENGINE_CLASSES, 'pytesseract', FakeOcrEngine)
+        monkeypatch.setitem(pdf_to_excel._OCR_ENGINE_CACHE, 'pytesseract', engine)
+        return engine
+    return install
+
+
+def make_scanned_pdf(path: str, pages: int = 2) -> str:
+    """Image-only PDF (no text layer) with ``pages`` letter-size pages."""
+    doc = fitz.open()
+    for _ in range(pages):
+        page = doc.new_page(width=612, height=792)
+        pix = fitz.Pixmap(fitz.csGRAY, fitz.IRect(0, 0, 306, 396), False)
+        pix.set_rect(pix.irect, (255,))
+        page.insert_image(page.rect, pixmap=pix)
+    doc.save(path)
+    doc.close()
+    return path
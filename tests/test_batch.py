@@ -0,0 +1,70 @@
+import multiprocessing
+import os
+
+import pytest
+
+import test_multiple_pdf_to_excel as batch
+from conftest import ROOT, make_scanned_pdf
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != 'fork', reason="the fake OCR engine reaches workers by fork")
+def test_parallel_batch_ocrs_scanned_pdf(fake_ocr, tmp_path, monkeypatch):
+    fake_ocr(['ESTADO DE CUENTA', 'FECHA DESCRIPCION CARGOS ABONOS SALDO'])
+    folder = tmp_path / 'statements'
+    folder.mkdir()
+    make_scanned_pdf(str(folder / 'scanned.pdf'), pages=2)
+    make_scanned_pdf(str(folder / 'scanned_b.pdf'), pages=1)
+    monkeypatch.chdir(ROOT)
+    monkeypatch.setattr(os, 'cpu_count', lambda: 8)  # room for an OCR pool per job
+
+    stats = batch.process_folder(str(folder), jobs=2)
+
+    by_bank = stats['metrics_by_bank'].values()
+    assert sum(entry['ocr_files'] for entry in by_bank) == 2
+    assert sum(entry['ocr_pages'] for entry in by_bank) == 3
+
+
+def test_subprocess_jobs_share_the_cores_for_ocr(tmp_path, monkeypatch):
+    folder = tmp_path / 'statements'
+    folder.mkdir()
+    small = make_scanned_pdf(str(folder / 'small.pdf'), pages=1)
+    large = make_scanned_pdf(str(folder / 'large.pdf'), pages=3)
+    monkeypatch.chdir(ROOT)
+    monkeypatch.setattr(os, 'cpu_count', lambda: 8)
+    started = []
+
+    class FakeProcess:
+        stdout = []
+
+        def __init__(self, cmd, env=None, **kwargs):
+            started.append((cmd, env))
+
+        def wait(self):
+            return 0
+
+    monkeypatch.setattr(batch.subprocess, 'Popen', FakeProcess)
+    monkeypatch.setattr(batch.multiprocessing, 'Pool', _InlinePool)
+
+    batch.process_folder(str(folder), in_process=False, jobs=2)
+
+    assert [cmd[2] for cmd, _env in started] == [large, small]
+    for cmd, env in started:
+        assert cmd[cmd.index('--ocr-workers') + 1] == '4'
+        assert env['OMP_THREAD_LIMIT'] == '1'
+
+
+class _InlinePool:
+    """multiprocessing.Pool stand-in running each task in this process, in submission order."""
+
+    def __init__(self, processes, initializer=None, initargs=(), maxtasksperchild=None):
+        pass
+
+    def apply_async(self, func, args):
+        result = func(*args)
+        return type('AsyncResult', (), {'get': lambda self: result})()
+
+    def close(self):
+        pass
+
+    def join(self):
+        pass
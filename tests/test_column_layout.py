@@ -0,0 +1,56 @@
+import pytest
+
+import pdf_to_excel
+
+
+def linear_assign(word_x0, word_x1, columns):
+    """assign_word_to_column() before ColumnLayout: numeric columns by nearest range center, then the first other column."""
+    word_center = (word_x0 + word_x1) / 2
+    matching_cols = []
+    for col_name in ('cargos', 'abonos', 'saldo'):
+        if col_name in columns:
+            x_min, x_max = sorted(columns[col_name])
+            if x_min <= word_center <= x_max:
+                matching_cols.append((col_name, abs(word_center - (x_min + x_max) / 2)))
+    if matching_cols:
+        matching_cols.sort(key=lambda x: x[1])
+        return matching_cols[0][0]
+    for col_name, (x_min, x_max) in columns.items():
+        if col_name not in ('cargos', 'abonos', 'saldo'):
+            x_min, x_max = sorted((x_min, x_max))
+            if x_min <= word_center <= x_max:
+                return col_name
+    return None
+
+
+COLUMN_SETS = [
+    pytest.param(config[key], id=f"{bank}-{key}")
+    for bank, config in pdf_to_excel.BANK_CONFIGS.items()
+    for key in ('columns', 'columns_ocr', 'columns_new_format')
+    if config.get(key)
+] + [
+    # Overlapping numeric ranges with equal centers, a numeric range inside descripcion, an inverted range
+    pytest.param({'fecha': (10, 40), 'descripcion': (40, 300), 'cargos': (250, 330), 'abonos': (250, 330),
+                  'saldo': (400, 380)}, id='synthetic-overlaps'),
+]
+
+
+def probe_xs(columns: dict) -> list:
+    """Every range boundary, values just around it, the midpoints between boundaries and values outside every column."""
+    bounds = sorted({b for rng in columns.values() for b in rng})
+    xs = [bounds[0] - 50, bounds[-1] + 50, -1.0, 0.0]
+    for b in bounds:
+        xs += [b, b - 0.01, b + 0.01]
+    xs += [(a + b) / 2 for a, b in zip(bounds, bounds[1:])]
+    return xs
+
+
+@pytest.mark.parametrize('columns', COLUMN_SETS)
+def test_column_layout_matches_linear_scan(columns):
+    layout = pdf_to_excel.ColumnLayout(columns)
+    xs = probe_xs(columns)
+    expected = [linear_assign(x, x, columns) for x in xs]
+
+    assert [layout.assign(x, x) for x in xs] == expected
+    assert layout.assign_many(xs, xs) == expected
+    assert [pdf_to_excel.assign_word_to_column(x - 3, x + 3, columns) for x in xs] == expected
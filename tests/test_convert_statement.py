@@ -0,0 +1,51 @@
+import threading
+
+import pdf_to_excel
+from conftest import make_scanned_pdf
+
+
+def _record_run(seen: dict, barrier: threading.Barrier = None):
+    """Stand-in for _convert_statement_impl that records the options and metrics the run reads."""
+    def impl(pdf_path, result, session):
+        if barrier is not None:
+            barrier.wait(timeout=10)
+        seen[pdf_path] = (pdf_to_excel._parse_output_excel_path_from_argv(None),
+                          '--debug' in pdf_to_excel._run_argv(), pdf_to_excel._RUN_METRICS.get())
+    return impl
+
+
+def test_concurrent_conversions_read_their_own_options(tmp_path, monkeypatch):
+    pdfs = [make_scanned_pdf(str(tmp_path / f'statement_{i}.pdf'), pages=1) for i in range(2)]
+    seen = {}
+    monkeypatch.setattr(pdf_to_excel, '_convert_statement_impl', _record_run(seen, threading.Barrier(2)))
+    threads = [
+        threading.Thread(target=pdf_to_excel.convert_statement,
+                         args=(pdf, {'output_excel': pdf + '.xlsx', 'debug': i == 0}))
+        for i, pdf in enumerate(pdfs)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert [seen[pdf][:2] for pdf in pdfs] == [(pdfs[0] + '.xlsx', True), (pdfs[1] + '.xlsx', False)]
+    assert seen[pdfs[0]][2] is not seen[pdfs[1]][2]
+    assert pdf_to_excel._RUN_METRICS.get() is None
+
+
+def test_nested_conversion_does_not_leak_options(tmp_path, monkeypatch):
+    outer_pdf = make_scanned_pdf(str(tmp_path / 'outer.pdf'), pages=1)
+    inner_pdf = make_scanned_pdf(str(tmp_path / 'inner.pdf'), pages=1)
+    seen = {}
+    record = _record_run(seen)
+
+    def outer_impl(pdf_path, result, session):
+        if pdf_path == outer_pdf:
+            pdf_to_excel.convert_statement(inner_pdf, {'output_excel': str(tmp_path / 'inner.xlsx')})
+        record(pdf_path, result, session)
+
+    monkeypatch.setattr(pdf_to_excel, '_convert_statement_impl', outer_impl)
+    pdf_to_excel.convert_statement(outer_pdf, {'output_excel': str(tmp_path / 'outer.xlsx'), 'debug': True})
+
+    assert seen[inner_pdf][:2] == (str(tmp_path / 'inner.xlsx'), False)
+    assert seen[outer_pdf][:2] == (str(tmp_path / 'outer.xlsx'), True)
@@ -0,0 +1,22 @@
+import pdf_to_excel
+
+
+def test_stage_rss_is_growth_of_the_high_water_mark(monkeypatch):
+    # Process peak RSS (MB) read at: run start, outer begin, inner begin, inner end, outer end, second outer
+    # begin, second outer end, finish. A warm worker starts at 500 MB from an earlier PDF.
+    peaks = iter([500.0, 500.0, 500.0, 540.0, 560.0, 560.0, 560.0, 560.0])
+    monkeypatch.setattr(pdf_to_excel, '_peak_rss_mb', lambda children=False: None if children else next(peaks))
+    metrics = pdf_to_excel.RunMetrics()
+    with metrics.stage('movement_parsing'):
+        with metrics.stage('row_grouping'):
+            pass
+    with metrics.stage('excel_writing'):
+        pass
+    report = metrics.finish()
+
+    stages = report['stages']
+    assert stages['row_grouping']['peak_rss_growth_mb'] == 40.0
+    assert stages['movement_parsing']['peak_rss_growth_mb'] == 20.0
+    assert stages['excel_writing']['peak_rss_growth_mb'] == 0.0
+    assert stages['excel_writing']['process_peak_rss_mb'] == 560.0
+    assert report['total']['peak_rss_growth_mb'] == 60.0
@@ -0,0 +1,89 @@
+import gzip
+import os
+import shutil
+
+import fitz
+
+import pdf_to_excel
+from conftest import make_scanned_pdf
+
+
+def _count_ocr_calls(engine, monkeypatch) -> list:
+    calls = []
+    image_to_data = engine.image_to_data
+
+    def counting(img, lang, config=''):
+        calls.append(img.size)
+        return image_to_data(img, lang, config)
+
+    monkeypatch.setattr(engine, 'image_to_data', counting)
+    return calls
+
+
+def _ocr(pdf_path: str, cache_dir, **options) -> list:
+    with pdf_to_excel._run_options(pdf_path, dict(options, ocr_workers=1, ocr_cache_dir=str(cache_dir))):
+        return pdf_to_excel.extract_text_with_tesseract_ocr(pdf_path)
+
+
+def test_cache_hits_on_same_content_and_misses_on_content_zoom_and_roi(fake_ocr, tmp_path, monkeypatch):
+    calls = _count_ocr_calls(fake_ocr(['ESTADO DE CUENTA', '01 ENE DEPOSITO 1,000.00']), monkeypatch)
+    cache_dir = tmp_path / 'cache'
+    pdf_path = make_scanned_pdf(str(tmp_path / 'statement.pdf'), pages=2)
+
+    first = _ocr(pdf_path, cache_dir)
+    assert len(calls) == 2
+
+    # Same bytes under another name: content-addressed, so every page is a hit
+    copy_path = str(tmp_path / 'renamed.pdf')
+    shutil.copyfile(pdf_path, copy_path)
+    del calls[:]
+    assert _ocr(copy_path, cache_dir) == first
+    assert calls == []
+
+    del calls[:]
+    _ocr(pdf_path, cache_dir, ocr_zoom=2)
+    assert len(calls) == 2
+
+    del calls[:]
+    _ocr(pdf_path, cache_dir, ocr_roi=True)
+    assert calls
+
+    # One more page changes the content hash: nothing is reused
+    doc = fitz.open(pdf_path)
+    doc.insert_pdf(fitz.open(make_scanned_pdf(str(tmp_path / 'extra.pdf'), pages=1)))
+    changed_path = str(tmp_path / 'changed.pdf')
+    doc.save(changed_path)
+    del calls[:]
+    _ocr(changed_path, cache_dir)
+    assert len(calls) == 3
+
+
+def test_cache_entry_is_gzip_json_round_trip(tmp_path):
+    entry = {'page': 3, 'content': 'DEPÓSITO SPEI\nSALDO 1,234.56', '_used_ocr': True,
+             'words': [{'text': 'DEPÓSITO', 'x0': 10.5, 'x1': 60.25, 'top': 100.0, 'bottom': 110.0, 'conf': 96.58}]}
+
+    pdf_to_excel._ocr_cache_store(str(tmp_path), 'abc', entry)
+
+    path = tmp_path / 'abc.json.gz'
+    assert path.read_bytes()[:2] == b'\x1f\x8b'
+    assert [p.name for p in tmp_path.iterdir()] == ['abc.json.gz']
+    assert pdf_to_excel._ocr_cache_load(str(tmp_path), 'abc') == entry
+    assert pdf_to_excel._ocr_cache_load(str(tmp_path), 'missing') is None
+
+
+def test_eviction_removes_least_recently_used_entries_over_budget(tmp_path):
+    cache_dir = str(tmp_path)
+    payload = {'content': os.urandom(64 * 1024).hex()}  # incompressible, ~130 KB per entry
+    for age, key in enumerate(['newest', 'middle', 'oldest']):
+        pdf_to_excel._ocr_cache_store(cache_dir, key, payload)
+        mtime = 1_000_000 - age * 100
+        os.utime(os.path.join(cache_dir, key + '.json.gz'), (mtime, mtime))
+    # A hit marks the oldest entry as recently used
+    assert pdf_to_excel._ocr_cache_load(cache_dir, 'oldest') == payload
+    size = os.path.getsize(os.path.join(cache_dir, 'newest.json.gz'))
+
+    pdf_to_excel._ocr_cache_evict(cache_dir, 2.5 * size / (1024 * 1024))
+
+    assert sorted(os.listdir(cache_dir)) == ['newest.json.gz', 'oldest.json.gz']
+    with gzip.open(os.path.join(cache_dir, 'oldest.json.gz'), 'rt', encoding='utf-8') as f:
+        assert f.read().startswith('{"content": ')
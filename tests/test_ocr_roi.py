@@ -0,0 +1,89 @@
+import fitz
+
+import pdf_to_excel
+from conftest import make_scanned_pdf
+
+# Santander scan: summary page, movements table on pages 2-4, then legal pages
+PAGES = {
+    1: ['Banco Santander Mexico', 'ESTADO DE CUENTA', 'SALDO ANTERIOR 4,000.00'],
+    2: ['DETALLE DE MOVIMIENTOS CUENTA DE CHEQUES', 'FECHA DESCRIPCION CARGOS ABONOS SALDO', '01 ENE DEPOSITO 1,000.00'],
+    3: ['02 ENE DEPOSITO 1,000.00', '03 ENE RETIRO 500.00'],
+    4: ['04 ENE DEPOSITO 500.00', 'SALDO FINAL DEL PERIODO 5,000.00', 'Aviso de privacidad'],
+}
+LEGAL = ['Terminos y condiciones del contrato', 'Unidad especializada de atencion a usuarios']
+
+
+def make_paged_scan(path: str, pages: int) -> str:
+    """Image-only PDF whose page N is filled with gray level 100 + N, so a fake engine can tell pages apart."""
+    doc = fitz.open()
+    for page_no in range(1, pages + 1):
+        page = doc.new_page(width=612, height=792)
+        pix = fitz.Pixmap(fitz.csGRAY, fitz.IRect(0, 0, 306, 396), False)
+        pix.set_rect(pix.irect, (100 + page_no,))
+        page.insert_image(page.rect, pixmap=pix)
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def _record_paged_ocr(engine, monkeypatch) -> list:
+    calls = []
+    image_to_data = engine.image_to_data
+
+    def paged(img, lang, config=''):
+        page_no = img.convert('L').getpixel((0, 0)) - 100
+        calls.append((page_no, img.size))
+        engine.lines = PAGES.get(page_no, LEGAL)
+        return image_to_data(img, lang, config)
+
+    monkeypatch.setattr(engine, 'image_to_data', paged)
+    return calls
+
+
+def test_roi_scout_detects_bank_of_scanned_statement(fake_ocr, tmp_path, monkeypatch):
+    # No text layer: text-layer detection would fall back to DEFAULT_BANK (BBVA)
+    fake_ocr(['Banco Santander Mexico', 'ESTADO DE CUENTA', 'FECHA DESCRIPCION CARGOS ABONOS SALDO'])
+    pdf_path = make_scanned_pdf(str(tmp_path / 'santander_scanned.pdf'), pages=2)
+    roi_banks = []
+    roi_regions = pdf_to_excel._ocr_roi_regions
+
+    def spy(scouts, bank_name):
+        roi_banks.append(bank_name)
+        return roi_regions(scouts, bank_name)
+
+    monkeypatch.setattr(pdf_to_excel, '_ocr_roi_regions', spy)
+    pdf_to_excel.convert_statement(pdf_path, {
+        'ocr_roi': True, 'ocr_workers': 1, 'no_ocr_cache': True, 'output_excel': str(tmp_path / 'out.xlsx'),
+    })
+
+    assert set(roi_banks) == {'Santander'}
+
+
+def test_roi_scout_stops_at_table_end_and_ocrs_each_page_once(fake_ocr, tmp_path, monkeypatch):
+    calls = _record_paged_ocr(fake_ocr([]), monkeypatch)
+    pdf_path = make_paged_scan(str(tmp_path / 'santander_scanned.pdf'), pages=8)
+    scout_width = int(612 * pdf_to_excel.OCR_ROI_SCOUT_ZOOM)
+
+    with pdf_to_excel._run_options(pdf_path, {'ocr_roi': True, 'ocr_workers': 1, 'no_ocr_cache': True}):
+        entries = pdf_to_excel.extract_text_with_tesseract_ocr(pdf_path)
+
+    scouted = [page for page, (width, _height) in calls if width == scout_width]
+    full_zoom = [page for page, (width, _height) in calls if width != scout_width]
+    assert scouted == [1, 2, 3, 4]
+    # Summary page keeps the scout OCR; table pages are cropped; legal pages only get their header strip
+    assert 1 not in full_zoom and set(full_zoom) == set(range(2, 9))
+    header_strip = int(792 * pdf_to_excel.OCR_ROI_HEADER_STRIP * pdf_to_excel.OCR_RENDER_ZOOM)
+    assert all(abs(size[1] - header_strip) <= 1 for page, size in calls if page > 4)
+    assert [e['page'] for e in entries] == list(range(1, 9))
+    assert 'SALDO ANTERIOR' in entries[0]['content'] and 'SALDO FINAL DEL PERIODO' in entries[3]['content']
+
+
+def test_roi_without_table_ocrs_every_page_whole(fake_ocr, tmp_path, monkeypatch):
+    calls = _record_paged_ocr(fake_ocr([]), monkeypatch)
+    pdf_path = make_paged_scan(str(tmp_path / 'legal_only.pdf'), pages=8)
+
+    with pdf_to_excel._run_options(pdf_path, {'ocr_roi': True, 'ocr_workers': 1, 'no_ocr_cache': True}):
+        pdf_to_excel.extract_text_with_tesseract_ocr(pdf_path, pages=[5, 6, 7], bank_name='Santander')
+
+    full_page = (int(612 * pdf_to_excel.OCR_RENDER_ZOOM), int(792 * pdf_to_excel.OCR_RENDER_ZOOM))
+    assert [page for page, size in calls if size == full_page] == [5, 6, 7]
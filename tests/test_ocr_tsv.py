@@ -0,0 +1,46 @@
+import pytest
+
+import pdf_to_excel
+
+pytesseract = pytest.importorskip('pytesseract')
+
+HEADER = '\t'.join(pdf_to_excel.OCR_DATA_COLUMNS)
+ROWS = [
+    '1\t1\t0\t0\t0\t0\t0\t0\t1275\t1650\t-1\t',
+    '2\t1\t1\t0\t0\t0\t102\t96\t980\t40\t-1\t',
+    '4\t1\t1\t1\t1\t0\t102\t96\t980\t40\t-1\t',
+    '5\t1\t1\t1\t1\t1\t102\t96\t88\t38\t96.58\tFECHA',
+    '5\t1\t1\t1\t1\t2\t210\t97\t230\t38\t91.034203\tDESCRIPCIÓN',
+    '5\t1\t1\t1\t1\t3\t480\t98\t20\t36\t0\t$',
+    '5\t1\t1\t1\t1\t4\t980\t96\t102\t39\t-1\t',
+    '5\t1\t1\t1\t2\t1\t102\t150\t60\t38\t57.4\t1,234.56',
+    '5\t1\t1\t1\t2\t2\t300\t150\t12\t38\t95',  # last row without its trailing (empty) text cell
+]
+
+
+def reference_dict(tsv: str) -> dict:
+    """What pytesseract.image_to_data(output_type=DICT) returns for ``tsv``."""
+    return pytesseract.pytesseract.file_to_dict(tsv.strip(), '\t', -1)
+
+
+@pytest.mark.parametrize('rows', [ROWS, ROWS[:-1], ROWS[3:5]], ids=['last-row-short', 'complete', 'words-only'])
+def test_tsv_parser_matches_pytesseract(rows):
+    tsv = '\n'.join([HEADER] + rows) + '\n'
+
+    assert pdf_to_excel._ocr_tsv_to_dict(tsv.strip()) == reference_dict(tsv)
+
+
+def test_tsv_without_header_row_matches_pytesseract():
+    # tesserocr's GetTSVText() has no header row
+    tsv = '\n'.join(ROWS) + '\n'
+
+    assert pdf_to_excel._ocr_tsv_to_dict(tsv) == reference_dict(HEADER + '\n' + tsv)
+
+
+def test_words_from_parsed_tsv_match_pytesseract_dict():
+    tsv = '\n'.join([HEADER] + ROWS)
+    ours = pdf_to_excel._ocr_tsv_to_dict(tsv)
+    ref = reference_dict(tsv)
+
+    assert pdf_to_excel.convert_ocr_data_to_words_format(ours, 2.0) == pdf_to_excel.convert_ocr_data_to_words_format(ref, 2.0)
+    assert pdf_to_excel.extract_text_from_ocr_data(ours, True) == pdf_to_excel.extract_text_from_ocr_data(ref, True)
@@ -0,0 +1,56 @@
+import fitz
+
+import pdf_to_excel
+from conftest import make_scanned_pdf
+
+
+def _legible_pdf_with_scanned_annex(path: str) -> str:
+    """Two text pages followed by one image-only page."""
+    doc = fitz.open(make_scanned_pdf(path + '.annex.pdf', pages=1))
+    text_doc = fitz.open()
+    for page_num in range(2):
+        page = text_doc.new_page(width=612, height=792)
+        for line in range(6):
+            page.insert_text((50, 80 + 20 * line), f"ESTADO DE CUENTA PAGINA {page_num + 1} LINEA {line} SALDO 1,234.56")
+    text_doc.insert_pdf(doc)
+    text_doc.save(path)
+    return path
+
+
+def _spy_ocr(monkeypatch) -> list:
+    calls = []
+    ocr = pdf_to_excel.extract_text_with_tesseract_ocr
+
+    def spy(pdf_path, *args, **kwargs):
+        calls.append(kwargs.get('pages'))
+        return ocr(pdf_path, *args, **kwargs)
+
+    monkeypatch.setattr(pdf_to_excel, 'extract_text_with_tesseract_ocr', spy)
+    return calls
+
+
+def test_only_the_scanned_page_of_a_legible_pdf_is_ocrd(fake_ocr, tmp_path, monkeypatch):
+    fake_ocr(['ANEXO', 'COMPROBANTE'])
+    pdf_path = _legible_pdf_with_scanned_annex(str(tmp_path / 'annex.pdf'))
+    calls = _spy_ocr(monkeypatch)
+
+    with pdf_to_excel.PdfSession(pdf_path) as session:
+        pages = pdf_to_excel.extract_text_from_pdf(pdf_path, session=session)
+
+    assert calls == [[3]]
+    assert [p['_page_source'] for p in pages] == ['text', 'text', 'ocr']
+
+
+def test_illegible_pdf_is_ocrd_without_classifying_pages(fake_ocr, tmp_path, monkeypatch):
+    fake_ocr(['ESTADO DE CUENTA'])
+    pdf_path = make_scanned_pdf(str(tmp_path / 'scanned.pdf'), pages=3)
+    calls = _spy_ocr(monkeypatch)
+    classified = []
+    monkeypatch.setattr(pdf_to_excel, 'classify_pdf_page', lambda session, index, *a: classified.append(index))
+
+    with pdf_to_excel.PdfSession(pdf_path) as session:
+        pages = pdf_to_excel.extract_text_from_pdf(pdf_path, session=session)
+
+    assert calls == [None]
+    assert classified == []
+    assert len(pages) == 3
@@ -0,0 +1,110 @@
+import fitz
+import pandas as pd
+
+import pdf_to_excel
+
+
+def _banamex_pdf(path: str) -> str:
+    """Banamex statement: movements end on page 1, DIGITEM and TRANSFERENCIA follow on page 2."""
+    doc = fitz.open()
+
+    def page(rows):
+        p = doc.new_page(width=612, height=792)
+        for line, items in enumerate(rows):
+            for x, text in items:
+                p.insert_text((x, 40 + 12 * line), text, fontsize=7)
+
+    page([[(20, 'BANAMEX ESTADO DE CUENTA')], [(20, 'DETALLE DE OPERACIONES')],
+          [(20, '01 ABR'), (60, 'DEPOSITO CLIENTE'), (400, '100.00'), (520, '1,100.00')],
+          [(20, '02 ABR'), (60, 'PAGO SERVICIO'), (330, '50.00'), (520, '1,050.00')],
+          [(20, 'SALDO PROMEDIO MINIMO REQUERIDO')]])
+    rows = [[(20, 'DIGITEM')], [(20, 'DETALLE')]]
+    rows += [[(20, f'{i:02d} ABR'), (60, f'PAGO EMP {i} NOMINA'), (280, f'{i},234.56')] for i in range(1, 6)]
+    rows.append([(20, 'TRANSFERENCIA ELECTRONICA DE FONDOS')])
+    rows += [
+        [(20, f'{i:02d} MAY SPEI ENVIADO BANCO {i}'), (250, f'{i}00.00'), (300, '5.00'), (350, '0.80'), (400, f'{i}05.80')]
+        for i in range(1, 4)
+    ]
+    rows.append([(20, 'TOTALES: 1,000.00')])
+    page(rows)
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def _sections():
+    columns = pdf_to_excel.BANK_CONFIGS['Banamex']['columns']
+    return [pdf_to_excel._DigitemSection(columns), pdf_to_excel._TransferenciaSection()]
+
+
+def test_fed_scanner_matches_a_single_walk(tmp_path):
+    pdf_path = _banamex_pdf(str(tmp_path / 'banamex.pdf'))
+    with pdf_to_excel.PdfSession(pdf_path) as session:
+        pages = pdf_to_excel.extract_text_from_pdf(pdf_path, session=session)
+        reference = _sections()
+        pdf_to_excel.scan_statement_sections(reference, pages, session=session)
+
+        fed = _sections()
+        scanner = pdf_to_excel._SectionScanner(fed, pages, session=session)
+        scanner.feed(0)
+        scanner.feed(0)  # pages are routed once
+        scanner.finish()  # the walk stopped early: route the rest
+
+    for ref, section in zip(reference, fed):
+        assert len(section.dataframe()) > 0
+        pd.testing.assert_frame_equal(section.dataframe(), ref.dataframe())
+
+
+def test_banamex_sections_ride_the_movements_walk(tmp_path, monkeypatch):
+    pdf_path = _banamex_pdf(str(tmp_path / 'banamex.pdf'))
+    scanned, fed = [], []
+    scan_page, feed = pdf_to_excel._SectionScanner._scan_page, pdf_to_excel._SectionScanner.feed
+
+    def spy_scan(scanner, index):
+        scanned.append(index)
+        return scan_page(scanner, index)
+
+    def spy_feed(scanner, index):
+        fed.append(index)
+        return feed(scanner, index)
+
+    monkeypatch.setattr(pdf_to_excel._SectionScanner, '_scan_page', spy_scan)
+    monkeypatch.setattr(pdf_to_excel._SectionScanner, 'feed', spy_feed)
+    output = str(tmp_path / 'banamex.xlsx')
+    pdf_to_excel.convert_statement(pdf_path, {'output_excel': output})
+
+    # The movements loop routes every page it walks; each page is scanned once
+    assert fed == [0, 1]
+    assert scanned == [0, 1]
+    sheets = pd.read_excel(output, sheet_name=None)
+    assert list(sheets['DIGITEM']['Fecha']) == ['01 ABR', '02 ABR', '03 ABR', '04 ABR', '05 ABR', 'Total']
+    assert list(sheets['Transferencias']['Fecha']) == ['01 MAY', '02 MAY', '03 MAY', 'Total']
+
+
+def test_santander_metas_ride_the_movements_walk(tmp_path, monkeypatch):
+    doc = fitz.open()
+    for rows in (
+        [[(20, 'Banco Santander Mexico ESTADO DE CUENTA')], [(20, 'DETALLE DE MOVIMIENTOS CUENTA DE CHEQUES')],
+         [(20, '01-ABR-2024'), (110, 'DEPOSITO CLIENTE'), (380, '100.00'), (555, '1,100.00')],
+         [(20, 'TOTAL'), (380, '100.00')]],
+        [[(20, 'DETALLE DE MOVIMIENTOS MIS METAS SANTANDER')], [(20, 'DETALLE DE MOVIMIENTOS MIS METAS')],
+         [(20, '01-ABR-2024'), (110, 'ABONO META'), (380, '50.00'), (555, '150.00')],
+         [(20, '02-ABR-2024'), (110, 'RETIRO META'), (470, '20.00'), (555, '130.00')],
+         [(20, 'INFORMACION FISCAL')], [(20, '03-ABR-2024'), (110, 'FUERA'), (470, '1.00')]],
+    ):
+        page = doc.new_page(width=612, height=792)
+        for line, items in enumerate(rows):
+            for x, text in items:
+                page.insert_text((x, 40 + 12 * line), text, fontsize=7)
+    pdf_path = str(tmp_path / 'santander.pdf')
+    doc.save(pdf_path)
+    fed = []
+    feed = pdf_to_excel._SectionScanner.feed
+    monkeypatch.setattr(pdf_to_excel._SectionScanner, 'feed', lambda scanner, index: fed.append(index) or feed(scanner, index))
+    output = str(tmp_path / 'santander.xlsx')
+
+    pdf_to_excel.convert_statement(pdf_path, {'output_excel': output})
+
+    assert fed
+    metas = pd.read_excel(output, sheet_name='METAS')
+    assert list(metas['Descripción']) == ['ABONO META', 'RETIRO META']
@@ -0,0 +1,69 @@
+import tracemalloc
+
+import fitz
+
+import pdf_to_excel
+
+
+def _text_pdf(path: str, pages: int) -> str:
+    """Legible statement-like PDF with ``pages`` pages of 30 movement lines."""
+    doc = fitz.open()
+    for page_num in range(pages):
+        page = doc.new_page(width=612, height=792)
+        for line in range(30):
+            page.insert_text((40, 60 + 22 * line), f"{line + 1:02d} ENE DEPOSITO SPEI REF {page_num:04d}{line:03d} 1,234.56 9,876.54")
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def _retained_kb(pdf_path: str, stream_pages: bool) -> float:
+    """Memory still held by the page entries and the open session once extract_text_from_pdf() returns."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        with pdf_to_excel.PdfSession(pdf_path, stream_pages=stream_pages) as session:
+            pages = pdf_to_excel.extract_text_from_pdf(pdf_path, session=session)
+            retained = tracemalloc.get_traced_memory()[0] - before
+        assert len(pages) > 0
+    finally:
+        tracemalloc.stop()
+    return retained / 1024.0
+
+
+def test_stream_mode_parses_each_page_once_and_keeps_no_words_in_memory(tmp_path, monkeypatch):
+    pdf_path = _text_pdf(str(tmp_path / 'statement.pdf'), pages=12)
+    with pdf_to_excel.PdfSession(pdf_path) as session:
+        reference = [p['words'] for p in pdf_to_excel.extract_text_from_pdf(pdf_path, session=session)]
+
+    parsed = []
+    load = pdf_to_excel.PdfSession._load_streamed_page
+
+    def spy(session, index):
+        parsed.append(index)
+        return load(session, index)
+
+    monkeypatch.setattr(pdf_to_excel.PdfSession, '_load_streamed_page', spy)
+    with pdf_to_excel.PdfSession(pdf_path, stream_pages=True) as session:
+        pages = pdf_to_excel.extract_text_from_pdf(pdf_path, session=session)
+        assert not any(dict.__contains__(p, 'words') for p in pages)
+
+        # Every access returns a fresh copy read back from the spill file, without parsing the page again
+        assert [p['words'] for p in pages] == reference
+        assert [p.get('words') for p in pages] == reference
+        assert pages[0]['words'] is not pages[0]['words']
+        assert sorted(parsed) == list(range(12))
+        assert session._words == {}
+        assert all(not getattr(page, '_objects', None) for page in session.pdf.pages)
+    assert session._spill is None
+
+
+def test_stream_mode_memory_does_not_grow_with_words(tmp_path):
+    small = _text_pdf(str(tmp_path / 'small.pdf'), pages=2)
+    large = _text_pdf(str(tmp_path / 'large.pdf'), pages=6)
+
+    stream_growth = _retained_kb(large, True) - _retained_kb(small, True)
+    default_growth = _retained_kb(large, False) - _retained_kb(small, False)
+
+    # Default mode keeps every page's words (and pdfplumber layout); stream mode only the page text
+    assert stream_growth < default_growth / 5